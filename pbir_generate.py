@@ -22,6 +22,43 @@ Where --model can be:
 - A directory containing .tmdl files, or
 - A model.bim file
 
+Profiling (where does generation time go on big configs):
+  python pbir_generate.py --config dashboard_config.json --base pbir_base --out pbir_out --profile
+  python pbir_generate.py ... --profile --cprofile gen.prof --tracemalloc
+
+--profile records wall time and bytes per phase (config load, collect_model_fields,
+validate_fieldrefs_in_config, copy_base) and per visual (prepare, template load,
+render, JSON check, write) into the "profile" block of validation_report.json.
+
+Changes since last build:
+When --out already holds a previous build, the new output is compared to it with
+scripts/analyzers/pbir_diff.py (Merkle-hashed JSON, unchanged subtrees skipped) and
+the per-visual JSON-path changes (binding / title / formatting / layout) are written
+to the "changesSinceLastBuild" section of validation_report.json. --no-diff skips it.
+
+Pages and bookmarks (no re-export per dashboard variant):
+- _templates/pages/page.json (or _templates/pages/<name>/page.json for a page's "template")
+  is rendered to pages/<pageId>/page.json with __PAGE_NAME__, __PAGE_DISPLAY_NAME__,
+  __PAGE_WIDTH__, __PAGE_HEIGHT__, __DISPLAY_OPTION__, __BACKGROUND_NAME__, __BACKGROUND_ITEM__.
+  A page's "background" (a background_manifest.json page key, or true for the page id) is
+  resolved to its RegisteredResources item in report.json (registered there if missing);
+  the image must sit next to the manifest and is copied into the output's
+  StaticResources/RegisteredResources.
+  "hidden": true hides the page. Without page templates the base's page.json files are kept.
+- pages.json pageOrder follows config "pageOrder" (default: config page order) and
+  "activePageName"; base pages not in config stay at the end.
+- Config "bookmarks": [{"id", "displayName", "page", "targetVisuals", "hiddenVisuals",
+  "options", "template"}] are rendered from _templates/bookmarks/bookmark.json
+  (__BOOKMARK_NAME__, __BOOKMARK_DISPLAY_NAME__, __ACTIVE_SECTION__) into bookmarks/, and
+  bookmarks.json lists them in config order. "targetVisuals" also sets
+  applyOnlyToTargetVisuals, so "hiddenVisuals" must be among the targets.
+- Duplicate ids, unknown pages, visuals not on the bookmark's page, missing templates,
+  backgrounds missing from the manifest and background images missing next to it fail
+  config validation before anything is written.
+- Visuals, pages and bookmarks render on --workers threads (templates are compiled once).
+  --profile/--cprofile/--tracemalloc force --workers 1: cProfile only sees the main thread
+  and per-visual timings would include contention from the other workers.
+
 Notes:
 - Field refs in config: Table[Column] or Metrics[Measure]
 - PBIR queryRef commonly uses Table.Column / Table.Measure (dot form)
@@ -30,13 +67,29 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import cProfile
+import io
 import json
 import os
+import pstats
 import re
 import shutil
-from dataclasses import dataclass
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Structural diff against the previous build (optional: only when the scripts/ folder ships alongside)
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts" / "analyzers"))
+try:
+    from pbir_diff import diff_trees, snapshot_tree
+except ImportError:
+    diff_trees = snapshot_tree = None
 
 
 # -----------------------------
@@ -140,21 +193,169 @@ def replace_placeholders_in_text(text: str, mapping: Dict[str, str]) -> str:
     return PLACEHOLDER_RE.sub(repl, text)
 
 
-def patch_json_file(src: Path, dst: Path, mapping: Dict[str, str]) -> None:
+@dataclass(frozen=True)
+class CompiledTemplate:
     """
-    Read JSON as text, replace placeholders, then validate JSON parses.
+    A template split once into literal text (even indexes) and placeholder keys (odd indexes),
+    so rendering is a list fill + join instead of a regex pass per output file.
     """
-    raw = src.read_text(encoding="utf-8")
-    patched = replace_placeholders_in_text(raw, mapping)
+    parts: Tuple[str, ...]
+    size: int
+
+    def render(self, mapping: Dict[str, str]) -> str:
+        out = list(self.parts)
+        for i in range(1, len(out), 2):
+            out[i] = mapping.get(out[i], f"__{out[i]}__")
+        return "".join(out)
+
+
+_TEMPLATE_CACHE: Dict[Path, CompiledTemplate] = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+
+def compile_template(src: Path) -> CompiledTemplate:
+    """Read and split a template once per run (shared by all worker threads)."""
+    with _TEMPLATE_LOCK:
+        template = _TEMPLATE_CACHE.get(src)
+        if template is None:
+            raw = src.read_text(encoding="utf-8")
+            template = CompiledTemplate(parts=tuple(PLACEHOLDER_RE.split(raw)), size=len(raw.encode("utf-8")))
+            _TEMPLATE_CACHE[src] = template
+    return template
+
+
+def render_json_template(src: Path, dst: Path, mapping: Dict[str, str]) -> Tuple[str, Any]:
+    """Render a compiled template and parse the result (hard fail early on invalid JSON)."""
+    patched = compile_template(src).render(mapping)
+    try:
+        return patched, json.loads(patched)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Patched JSON is invalid for {dst}.\nOriginal: {src}\nError: {e}") from e
+
+
+def json_text(value: Any) -> str:
+    """Escape a value for a placeholder that sits inside a JSON string literal."""
+    return json.dumps(str(value), ensure_ascii=False)[1:-1]
+
+
+def patch_json_file(src: Path, dst: Path, mapping: Dict[str, str],
+                    timings: Optional[Dict[str, float]] = None) -> None:
+    """
+    Render the (compiled, cached) template, replace placeholders, then validate JSON parses.
+    If timings is given, per-step milliseconds and byte counts are stored in it.
+    """
+    t0 = time.perf_counter()
+    template = compile_template(src)
+    t1 = time.perf_counter()
+    patched = template.render(mapping)
+    t2 = time.perf_counter()
 
     # Validate JSON (hard fail early)
     try:
         json.loads(patched)
     except json.JSONDecodeError as e:
         raise ValueError(f"Patched JSON is invalid for {dst}.\nOriginal: {src}\nError: {e}") from e
+    t3 = time.perf_counter()
 
     dst.write_text(patched, encoding="utf-8")
 
+    if timings is not None:
+        timings["templateLoadMs"] = (t1 - t0) * 1000
+        timings["renderMs"] = (t2 - t1) * 1000
+        timings["jsonCheckMs"] = (t3 - t2) * 1000
+        timings["writeMs"] = (time.perf_counter() - t3) * 1000
+        timings["templateBytes"] = template.size
+        timings["outputBytes"] = len(patched.encode("utf-8"))
+
+
+# -----------------------------
+# Profiling
+# -----------------------------
+
+VISUAL_STEPS = ("prepareMs", "templateLoadMs", "renderMs", "jsonCheckMs", "writeMs")
+
+
+def tree_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(fp.stat().st_size for fp in path.rglob("*") if fp.is_file())
+
+
+@dataclass
+class GenerationProfile:
+    """
+    Wall time / bytes per generation phase, embedded in validation_report.json.
+    Disabled instances only run the wrapped code.
+    """
+    enabled: bool = False
+    trace_memory: bool = False
+    phases: List[Dict[str, Any]] = field(default_factory=list)
+    visuals: List[Dict[str, Any]] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Time a phase; the caller may set record["bytes"]."""
+        record: Dict[str, Any] = {"name": name}
+        if not self.enabled:
+            yield record
+            return
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["wallMs"] = round((time.perf_counter() - t0) * 1000, 3)
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record["memCurrentBytes"] = current
+                record["memPeakBytes"] = peak
+            self.phases.append(record)
+
+    def add_visual(self, page_id: str, visual_id: str, visual_type: str, timings: Dict[str, float]) -> None:
+        if self.enabled:
+            entry = {"id": f"{page_id}/{visual_id}", "type": visual_type}
+            entry.update({k: round(v, 3) if k.endswith("Ms") else v for k, v in timings.items()})
+            self.visuals.append(entry)
+
+    def to_report(self) -> Dict[str, Any]:
+        steps = {k: round(sum(v.get(k, 0.0) for v in self.visuals), 3) for k in VISUAL_STEPS}
+        slowest = sorted(self.visuals, key=lambda v: -sum(v.get(k, 0.0) for k in VISUAL_STEPS))
+        return {
+            "totalMs": round((time.perf_counter() - self.started) * 1000, 3),
+            "phases": self.phases,
+            "visualSteps": {
+                "count": len(self.visuals),
+                **steps,
+                "templateBytes": sum(v.get("templateBytes", 0) for v in self.visuals),
+                "outputBytes": sum(v.get("outputBytes", 0) for v in self.visuals),
+            },
+            "slowestVisuals": [v["id"] for v in slowest[:10]],
+            "visuals": self.visuals,
+        }
+
+    def print_summary(self) -> None:
+        report = self.to_report()
+        print(f"⏱  Profile ({report['totalMs']:.1f} ms total)")
+        for ph in self.phases:
+            size = f"  {ph['bytes']:,} B" if "bytes" in ph else ""
+            print(f"   {ph['name']:<32} {ph['wallMs']:>10.1f} ms{size}")
+        vs = report["visualSteps"]
+        print(f"   visuals ({vs['count']}): prepare {vs['prepareMs']:.1f} / load {vs['templateLoadMs']:.1f} / render {vs['renderMs']:.1f} / "
+              f"json check {vs['jsonCheckMs']:.1f} / write {vs['writeMs']:.1f} ms")
+
+
+def cprofile_summary(profiler: cProfile.Profile, limit: int = 20) -> List[Dict[str, Any]]:
+    """Top functions by cumulative time."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():  # type: ignore[attr-defined]
+        rows.append({"function": f"{Path(filename).name}:{line}({func})", "calls": nc,
+                     "tottimeMs": round(tt * 1000, 3), "cumtimeMs": round(ct * 1000, 3)})
+    rows.sort(key=lambda r: -r["cumtimeMs"])
+    return rows[:limit]
+
 
 # -----------------------------
 # Config structures
@@ -325,12 +526,14 @@ def write_validation_report(out_dir: Path, report: Dict[str, Any]) -> None:
     (out_dir / "validation_report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
 
 
-def generate_visual(out_dir: Path, page_id: str, visual_cfg: Dict[str, Any], base_dir: Path) -> None:
+def generate_visual(out_dir: Path, page_id: str, visual_cfg: Dict[str, Any], base_dir: Path,
+                    profile: Optional[GenerationProfile] = None) -> None:
     """
     Writes:
       pages/<pageId>/visuals/<visualId>/visual.json
     using the template for visualType and placeholder replacement.
     """
+    t0 = time.perf_counter()
     visual_id = visual_cfg["id"]
     visual_type = visual_cfg["type"]
 
@@ -346,7 +549,299 @@ def generate_visual(out_dir: Path, page_id: str, visual_cfg: Dict[str, Any], bas
     # Your exported template should already have a "name" placeholder; you patch it by replacing __VISUAL_NAME__ if you use it.
     mapping.setdefault("VISUAL_NAME", visual_id)
 
-    patch_json_file(template_visual_json, target_dir / "visual.json", mapping)
+    timings: Optional[Dict[str, float]] = None
+    if profile is not None and profile.enabled:
+        timings = {"prepareMs": (time.perf_counter() - t0) * 1000}
+    patch_json_file(template_visual_json, target_dir / "visual.json", mapping, timings)
+    if timings is not None:
+        profile.add_visual(page_id, visual_id, visual_type, timings)
+
+
+# -----------------------------
+# Pages, pages.json, bookmarks
+# -----------------------------
+
+PAGES_SCHEMA = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/pagesMetadata/1.0.0/schema.json"
+BOOKMARKS_SCHEMA = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/bookmarksMetadata/1.0.0/schema.json"
+
+
+def find_template(base_dir: Path, kind: str, filename: str, name: Optional[str] = None) -> Optional[Path]:
+    """
+    Convention:
+      pbir_base/_templates/<kind>/<filename>          (default)
+      pbir_base/_templates/<kind>/<name>/<filename>   (config "template": name)
+    """
+    root = base_dir / "_templates" / kind
+    fp = root / name / filename if name else root / filename
+    return fp if fp.exists() else None
+
+
+def registered_resources_dir(root: Path) -> Path:
+    """StaticResources/RegisteredResources of a PBIR folder (next to definition/ when root is one)."""
+    report_dir = root.parent if root.name == "definition" else root
+    return report_dir / "StaticResources" / "RegisteredResources"
+
+
+def find_background_manifest(base_dir: Path, explicit: Optional[str] = None) -> Optional[Path]:
+    candidates = [Path(explicit)] if explicit else [
+        base_dir / "background_manifest.json",
+        registered_resources_dir(base_dir) / "background_manifest.json",
+    ]
+    return next((c.resolve() for c in candidates if c.exists()), None)
+
+
+def load_background_manifest(path: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    """background_manifest.json: {"files": [{"page": key, "filename": ...}, ...]} -> key -> entry."""
+    if path is None:
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8-sig"))
+    return {f["page"]: f for f in data.get("files", []) if isinstance(f, dict) and "page" in f and "filename" in f}
+
+
+def page_background_key(page_cfg: Dict[str, Any]) -> Optional[str]:
+    """Config "background": manifest key, or true for the page id."""
+    bg = page_cfg.get("background")
+    if bg is True:
+        return page_cfg.get("id")
+    return bg if isinstance(bg, str) and bg else None
+
+
+def _desktop_name_re(filename: str) -> "re.Pattern[str]":
+    """Desktop registers imported images as stem + digits + suffix (background_channels4943707189684421.svg)."""
+    stem, suffix = os.path.splitext(filename)
+    return re.compile(re.escape(stem) + r"\d*" + re.escape(suffix) + "$")
+
+
+def find_background_file(manifest_dir: Path, filename: str) -> Optional[Path]:
+    """The image for a manifest entry next to the manifest: exact file name, else a Desktop-registered copy."""
+    if (manifest_dir / filename).is_file():
+        return manifest_dir / filename
+    desktop_name = _desktop_name_re(filename)
+    return next((fp for fp in sorted(manifest_dir.iterdir()) if fp.is_file() and desktop_name.match(fp.name)), None)
+
+
+def registered_resource_name(report_data: Dict[str, Any], filename: str) -> Optional[str]:
+    """Registered image for filename: exact name, or the name Desktop gives on import (stem + digits + suffix)."""
+    desktop_name = _desktop_name_re(filename)
+    for package in report_data.get("resourcePackages", []) or []:
+        if package.get("type") != "RegisteredResources":
+            continue
+        names = [item.get("name", "") for item in package.get("items", []) or []]
+        if filename in names:
+            return filename
+        match = next((n for n in names if desktop_name.match(n)), None)
+        if match:
+            return match
+    return None
+
+
+def resolve_page_backgrounds(cfg: Dict[str, Any], manifest: Dict[str, Dict[str, Any]], manifest_dir: Path,
+                             out_dir: Path) -> Tuple[Dict[str, Tuple[str, str]], List[str]]:
+    """
+    page id -> (image display name, RegisteredResources ItemName).
+    Images not registered yet are added to report.json (resourcePackages), and every
+    referenced image is copied into the output's StaticResources/RegisteredResources.
+    """
+    report_json = out_dir / "report.json"
+    resources_dir = registered_resources_dir(out_dir)
+    report_data = json.loads(report_json.read_text(encoding="utf-8-sig")) if report_json.exists() else None
+    backgrounds: Dict[str, Tuple[str, str]] = {}
+    registered: List[str] = []
+    for p in cfg.get("pages", []):
+        key = page_background_key(p)
+        if not key or not p.get("id"):
+            continue
+        filename = manifest[key]["filename"]
+        source = find_background_file(manifest_dir, filename)
+        if source is None:
+            raise FileNotFoundError(f"Background image for page {p['id']!r} not found next to the manifest: "
+                                    f"{manifest_dir / filename}")
+        item = registered_resource_name(report_data, filename) if report_data is not None else None
+        if item is None:
+            item = source.name
+            if report_data is not None:
+                packages = report_data.setdefault("resourcePackages", [])
+                package = next((pk for pk in packages if pk.get("type") == "RegisteredResources"), None)
+                if package is None:
+                    package = {"name": "RegisteredResources", "type": "RegisteredResources", "items": []}
+                    packages.append(package)
+                package.setdefault("items", []).append({"name": item, "path": item, "type": "Image"})
+                registered.append(item)
+        target = resources_dir / item
+        if not target.exists():
+            ensure_dir(resources_dir)
+            shutil.copy2(manifest_dir / item if (manifest_dir / item).is_file() else source, target)
+        backgrounds[p["id"]] = (filename, item)
+    if registered:
+        report_json.write_text(json.dumps(report_data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return backgrounds, registered
+
+
+def generate_page(out_dir: Path, page_cfg: Dict[str, Any], template: Path,
+                  background: Optional[Tuple[str, str]]) -> None:
+    """
+    Writes pages/<pageId>/page.json from a page template. Placeholders:
+      __PAGE_NAME__, __PAGE_DISPLAY_NAME__, __PAGE_WIDTH__, __PAGE_HEIGHT__, __DISPLAY_OPTION__,
+      __BACKGROUND_NAME__ (image file name), __BACKGROUND_ITEM__ (RegisteredResources item)
+    Pages without a background drop the template's objects.background; "hidden": true
+    sets visibility HiddenInViewMode.
+    """
+    page_id = page_cfg["id"]
+    target = out_dir / "pages" / page_id / "page.json"
+    ensure_dir(target.parent)
+
+    mapping = {
+        "PAGE_NAME": json_text(page_id),
+        "PAGE_DISPLAY_NAME": json_text(page_cfg.get("displayName", page_id)),
+        "PAGE_WIDTH": str(page_cfg.get("width", 1280)),
+        "PAGE_HEIGHT": str(page_cfg.get("height", 720)),
+        "DISPLAY_OPTION": json_text(page_cfg.get("displayOption", "FitToPage")),
+    }
+    if background is not None:
+        mapping["BACKGROUND_NAME"] = json_text(background[0])
+        mapping["BACKGROUND_ITEM"] = json_text(background[1])
+    patched, data = render_json_template(template, target, mapping)
+
+    changed = False
+    objects = data.get("objects")
+    if background is None and isinstance(objects, dict) and "background" in objects:
+        del objects["background"]
+        if not objects:
+            del data["objects"]
+        changed = True
+    if page_cfg.get("hidden"):
+        data["visibility"] = "HiddenInViewMode"
+        changed = True
+    target.write_text(json.dumps(data, indent=2, ensure_ascii=False) if changed else patched, encoding="utf-8")
+
+
+def write_pages_json(out_dir: Path, cfg: Dict[str, Any]) -> List[str]:
+    """pages.json pageOrder from config (config order, then base pages not in config)."""
+    pages_json = out_dir / "pages" / "pages.json"
+    existing = json.loads(pages_json.read_text(encoding="utf-8-sig")) if pages_json.exists() else {}
+    order = list(cfg.get("pageOrder") or [p["id"] for p in cfg.get("pages", []) if p.get("id")])
+    order += [pid for pid in existing.get("pageOrder", [])
+              if pid not in order and (out_dir / "pages" / pid / "page.json").exists()]
+    active = cfg.get("activePageName") or existing.get("activePageName")
+    data = {"$schema": existing.get("$schema", PAGES_SCHEMA), "pageOrder": order,
+            "activePageName": active if active in order else (order[0] if order else None)}
+    pages_json.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return order
+
+
+def generate_bookmark(out_dir: Path, bookmark_cfg: Dict[str, Any], template: Path,
+                      visual_types: Dict[Tuple[str, str], str]) -> None:
+    """
+    Writes bookmarks/<id>.bookmark.json from a bookmark template. Placeholders:
+      __BOOKMARK_NAME__, __BOOKMARK_DISPLAY_NAME__, __ACTIVE_SECTION__ (page id)
+    Lists are set structurally: "targetVisuals" -> options.targetVisualNames,
+    "hiddenVisuals" -> hidden visual state on the bookmark's page; "options" entries override.
+    With "targetVisuals" the bookmark applies only to those visuals (applyOnlyToTargetVisuals).
+    """
+    bookmark_id = bookmark_cfg["id"]
+    page_id = bookmark_cfg.get("page", "")
+    target = out_dir / "bookmarks" / f"{bookmark_id}.bookmark.json"
+    ensure_dir(target.parent)
+
+    mapping = {
+        "BOOKMARK_NAME": json_text(bookmark_id),
+        "BOOKMARK_DISPLAY_NAME": json_text(bookmark_cfg.get("displayName", bookmark_id)),
+        "ACTIVE_SECTION": json_text(page_id),
+    }
+    _, data = render_json_template(template, target, mapping)
+
+    options = data.setdefault("options", {})
+    if "targetVisuals" in bookmark_cfg:
+        options["targetVisualNames"] = list(bookmark_cfg["targetVisuals"])
+        options["applyOnlyToTargetVisuals"] = True
+    options.update(bookmark_cfg.get("options", {}))
+    hidden = bookmark_cfg.get("hiddenVisuals") or []
+    if hidden:
+        sections = data.setdefault("explorationState", {}).setdefault("sections", {})
+        containers = sections.setdefault(page_id, {}).setdefault("visualContainers", {})
+        for visual_id in hidden:
+            containers[visual_id] = {"singleVisual": {"visualType": visual_types.get((page_id, visual_id), ""),
+                                                      "display": {"mode": "hidden"}}}
+    target.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def write_bookmarks_json(out_dir: Path, cfg: Dict[str, Any]) -> None:
+    """bookmarks.json items from config order, then base bookmarks not in config."""
+    bookmarks_dir = out_dir / "bookmarks"
+    metadata = bookmarks_dir / "bookmarks.json"
+    existing = json.loads(metadata.read_text(encoding="utf-8-sig")) if metadata.exists() else {}
+    names = [b["id"] for b in cfg.get("bookmarks", [])]
+    items = [{"name": n} for n in names]
+    items += [item for item in existing.get("items", [])
+              if isinstance(item, dict) and item.get("name") not in names]
+    data = {"$schema": existing.get("$schema", BOOKMARKS_SCHEMA), "items": items}
+    metadata.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def validate_structure_in_config(cfg: Dict[str, Any], base_dir: Path, manifest: Dict[str, Dict[str, Any]],
+                                 manifest_dir: Optional[Path] = None) -> List[str]:
+    """Page/bookmark config consistency (ids, page order, targets, templates, backgrounds)."""
+    errors: List[str] = []
+    pages = [p for p in cfg.get("pages", []) if p.get("id")]
+    page_ids = [p["id"] for p in pages]
+    base_pages = {fp.parent.name for fp in (base_dir / "pages").glob("*/page.json")}
+    known_pages = set(page_ids) | base_pages
+    visuals_by_page = {p["id"]: [v.get("id") for v in p.get("visuals", [])] for p in pages}
+
+    for pid in sorted({pid for pid in page_ids if page_ids.count(pid) > 1}):
+        errors.append(f"page={pid} is defined more than once")
+    for pid, vids in visuals_by_page.items():
+        for vid in sorted({v for v in vids if vids.count(v) > 1}):
+            errors.append(f"page={pid} visual={vid} is defined more than once")
+    for pid in cfg.get("pageOrder", []) or []:
+        if pid not in known_pages:
+            errors.append(f"pageOrder: unknown page {pid!r}")
+    for p in pages:
+        if p.get("template") and find_template(base_dir, "pages", "page.json", p["template"]) is None:
+            errors.append(f"page={p['id']} template={p['template']!r}: missing _templates/pages/{p['template']}/page.json")
+        key = page_background_key(p)
+        if key and key not in manifest:
+            errors.append(f"page={p['id']} background={key!r}: not in background_manifest.json"
+                          if manifest else f"page={p['id']} background={key!r}: background_manifest.json not found")
+        elif key and manifest_dir is not None and find_background_file(manifest_dir, manifest[key]["filename"]) is None:
+            errors.append(f"page={p['id']} background={key!r}: {manifest[key]['filename']} is not next to "
+                          f"background_manifest.json ({manifest_dir})")
+
+    bookmark_ids = [b.get("id") for b in cfg.get("bookmarks", [])]
+    for b in cfg.get("bookmarks", []):
+        bid = b.get("id")
+        if not bid:
+            errors.append("bookmark without id")
+            continue
+        if bookmark_ids.count(bid) > 1:
+            errors.append(f"bookmark={bid} is defined more than once")
+        if find_template(base_dir, "bookmarks", "bookmark.json", b.get("template")) is None:
+            where = f"{b['template']}/" if b.get("template") else ""
+            errors.append(f"bookmark={bid}: missing _templates/bookmarks/{where}bookmark.json")
+        page_id = b.get("page")
+        if page_id and page_id not in known_pages:
+            errors.append(f"bookmark={bid}: unknown page {page_id!r}")
+        for key in ("targetVisuals", "hiddenVisuals"):
+            for vid in b.get(key, []) or []:
+                if page_id in visuals_by_page and vid not in visuals_by_page[page_id]:
+                    errors.append(f"bookmark={bid} {key}: visual {vid!r} is not on page {page_id!r}")
+        if "targetVisuals" in b:
+            # The bookmark applies only to its targets: hidden state of any other visual is never applied
+            for vid in b.get("hiddenVisuals", []) or []:
+                if vid not in b["targetVisuals"]:
+                    errors.append(f"bookmark={bid} hiddenVisuals: visual {vid!r} is not in targetVisuals")
+    return sorted(set(errors), key=errors.index)
+
+
+def run_parallel(fn, items: List[Any], workers: int) -> None:
+    """Run fn over items on a thread pool (file I/O bound); the first exception is re-raised."""
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(fn, items):
+            pass
 
 
 def main() -> None:
@@ -355,6 +850,23 @@ def main() -> None:
     ap.add_argument("--base", required=True, help="Path to base PBIR folder (exported PBIP/PBIR)")
     ap.add_argument("--out", required=True, help="Output folder for generated PBIR")
     ap.add_argument("--model", required=False, help="Optional: model.bim or directory of .tmdl files for validation")
+    ap.add_argument("--profile", action="store_true",
+                    help="Record wall time and bytes per phase/visual into validation_report.json")
+    ap.add_argument("--cprofile", metavar="FILE",
+                    help="With --profile: also run cProfile, dump stats to FILE and embed the top functions")
+    ap.add_argument("--tracemalloc", action="store_true",
+                    help="With --profile: also record Python memory (current/peak) per phase")
+    ap.add_argument("--no-diff", action="store_true",
+                    help="Skip the changesSinceLastBuild diff against the previous contents of --out")
+    ap.add_argument("--diff-paths", type=int, default=50,
+                    help="Max JSON paths recorded per changed file in changesSinceLastBuild (default: 50, 0 = all)")
+    ap.add_argument("--backgrounds", metavar="MANIFEST",
+                    help="background_manifest.json for page backgrounds (default: <base>/background_manifest.json, "
+                         "then the base's StaticResources/RegisteredResources/background_manifest.json)")
+    ap.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1),
+                    help="Threads used to render visuals, pages and bookmarks (default: min(8, CPUs); 1 = sequential). "
+                         "Forced to 1 with --profile/--cprofile/--tracemalloc so every visual is profiled "
+                         "on the main thread")
     args = ap.parse_args()
 
     config_path = Path(args.config).resolve()
@@ -372,39 +884,135 @@ def main() -> None:
             f"Create it and place one template visual.json per visual type."
         )
 
-    cfg = load_config(config_path)
+    profile = GenerationProfile(enabled=args.profile or bool(args.cprofile),
+                                trace_memory=args.tracemalloc)
+    profiler: Optional[cProfile.Profile] = None
+    if (profile.enabled or profile.trace_memory) and args.workers > 1:
+        print(f"⏱  Profiling: rendering sequentially (--workers {args.workers} ignored)")
+        args.workers = 1
+    if profile.enabled and profile.trace_memory:
+        tracemalloc.start()
+    if args.cprofile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    with profile.phase("config_load") as ph:
+        cfg = load_config(config_path)
+        ph["bytes"] = config_path.stat().st_size
 
     model_fields: Optional[Dict[str, Set[str]]] = None
     if model_path:
-        model_fields = collect_model_fields(model_path)
-
-    # Validate fieldrefs
-    errors = validate_fieldrefs_in_config(cfg, model_fields)
+        with profile.phase("collect_model_fields") as ph:
+            model_fields = collect_model_fields(model_path)
+            if profile.enabled:
+                ph["bytes"] = tree_size(model_path)
+
+    # Validate fieldrefs + page/bookmark structure
+    with profile.phase("validate_fieldrefs_in_config"):
+        errors = validate_fieldrefs_in_config(cfg, model_fields)
+    with profile.phase("validate_structure_in_config"):
+        manifest_path = find_background_manifest(base_dir, args.backgrounds)
+        if args.backgrounds and manifest_path is None:
+            raise FileNotFoundError(f"Background manifest not found: {args.backgrounds}")
+        manifest = load_background_manifest(manifest_path)
+        errors += validate_structure_in_config(cfg, base_dir, manifest,
+                                               manifest_path.parent if manifest_path else None)
     if errors:
         raise SystemExit("CONFIG VALIDATION FAILED:\n- " + "\n- ".join(errors))
 
+    # Keep the previous build in memory for the structural diff (copy_base wipes out_dir)
+    previous_build: Optional[Dict[str, bytes]] = None
+    if not args.no_diff and snapshot_tree is not None and out_dir.exists():
+        with profile.phase("snapshot_previous_build") as ph:
+            previous_build = snapshot_tree(out_dir)
+            ph["bytes"] = sum(len(b) for b in previous_build.values())
+
     # Copy base -> out
-    copy_base(base_dir, out_dir)
+    with profile.phase("copy_base") as ph:
+        copy_base(base_dir, out_dir)
+        if profile.enabled:
+            ph["bytes"] = tree_size(out_dir)
+
+    # Generate pages (only when the base has page templates; otherwise the base's page.json files are kept)
+    pages = [p for p in cfg.get("pages", []) if p.get("id")]
+    rendered_pages: List[Tuple[Dict[str, Any], Path]] = []
+    for p in pages:
+        template = find_template(base_dir, "pages", "page.json", p.get("template"))
+        if template is not None:
+            rendered_pages.append((p, template))
+    page_order: Optional[List[str]] = None
+    with profile.phase("generate_pages") as ph:
+        backgrounds, registered = resolve_page_backgrounds(
+            {"pages": [p for p, _ in rendered_pages]}, manifest,
+            manifest_path.parent if manifest_path else base_dir, out_dir)
+        run_parallel(lambda item: generate_page(out_dir, item[0], item[1], backgrounds.get(item[0]["id"])),
+                     rendered_pages, args.workers)
+        if rendered_pages or cfg.get("pageOrder"):
+            page_order = write_pages_json(out_dir, cfg)
+        if profile.enabled:
+            ph["bytes"] = sum((out_dir / "pages" / p["id"] / "page.json").stat().st_size for p, _ in rendered_pages)
 
     # Generate visuals per page
-    for p in cfg.get("pages", []):
-        page_id = p.get("id")
-        if not page_id:
-            continue
-        for v in p.get("visuals", []):
-            generate_visual(out_dir, page_id, v, base_dir)
+    with profile.phase("generate_visuals") as ph:
+        jobs = [(p["id"], v) for p in pages for v in p.get("visuals", [])]
+        run_parallel(lambda job: generate_visual(out_dir, job[0], job[1], base_dir, profile), jobs, args.workers)
+        ph["bytes"] = sum(v.get("outputBytes", 0) for v in profile.visuals)
+
+    # Generate bookmarks
+    bookmarks = cfg.get("bookmarks", [])
+    if bookmarks:
+        visual_types = {(p["id"], v.get("id")): v.get("type", "") for p in pages for v in p.get("visuals", [])}
+        with profile.phase("generate_bookmarks") as ph:
+            run_parallel(lambda b: generate_bookmark(out_dir, b, find_template(base_dir, "bookmarks", "bookmark.json",
+                                                                               b.get("template")), visual_types),
+                         bookmarks, args.workers)
+            write_bookmarks_json(out_dir, cfg)
+            if profile.enabled:
+                ph["bytes"] = tree_size(out_dir / "bookmarks")
+
+    changes: Optional[Dict[str, Any]] = None
+    if previous_build is not None:
+        with profile.phase("diff_previous_build"):
+            changes = diff_trees(previous_build, snapshot_tree(out_dir)).to_report(max_paths=args.diff_paths)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
 
     report = {
         "status": "ok",
         "generatedPages": [p.get("id") for p in cfg.get("pages", []) if p.get("id")],
+        "renderedPageFiles": [p["id"] for p, _ in rendered_pages],
+        "generatedBookmarks": [b["id"] for b in bookmarks],
         "notes": [
             "Generation is template-based. Ensure your templates contain placeholders matching your config bindings.",
             "If Power BI ignores a sortDefinition, confirm the sort field exists in projections (your locked guardrail)."
         ]
     }
+    if page_order is not None:
+        report["pageOrder"] = page_order
+    if registered:
+        report["registeredBackgrounds"] = registered
+    if changes is not None:
+        report["changesSinceLastBuild"] = changes
+    if profile.enabled:
+        report["profile"] = profile.to_report()
+        if profiler is not None:
+            report["profile"]["cprofile"] = {"statsFile": str(Path(args.cprofile).resolve()),
+                                             "topCumulative": cprofile_summary(profiler)}
+        if profile.trace_memory:
+            report["profile"]["memPeakBytes"] = max((ph.get("memPeakBytes", 0) for ph in profile.phases), default=0)
+            tracemalloc.stop()
     write_validation_report(out_dir, report)
     print(f"✅ Generated PBIR into: {out_dir}")
     print(f"🧾 Validation report: {out_dir / 'validation_report.json'}")
+    if changes is not None:
+        summary = changes["summary"]
+        by_cat = ", ".join(f"{c}={n}" for c, n in summary["visualsByCategory"].items()) or "none"
+        print(f"🔀 Changes since last build: {summary['visualsChanged']} visual(s) changed ({by_cat}), "
+              f"{summary['changed']} changed / {summary['added']} added / {summary['removed']} removed file(s)")
+    if profile.enabled:
+        profile.print_summary()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Column Storage Footprint Estimator
+
+Estimates how much VertiPaq memory each imported column takes, from the
+TMDL metadata (dataType, summarizeBy, isAvailableInMdx) and a sample of the
+local files the table's M partition reads (Csv.Document(File.Contents(...))
+and Folder.Files(...)), and ranks the columns by estimated size.
+
+Per column:
+- Cardinality: exact when the whole source fits in the sample, otherwise
+  the GEE estimator over a systematic sample (sqrt(N/n) * singletons +
+  values seen more than once)
+- Dictionary: strings are hash encoded (UTF-16 text + ~16 bytes per entry),
+  double/dateTime 8 bytes per distinct value, int64/decimal are value
+  encoded (no dictionary)
+- Data: row count * bits per value (bit-packed ids or value range), or RLE
+  runs when the sample shows long runs in load order
+- Hierarchy: attribute hierarchy kept while isAvailableInMdx is not false
+  (~8 bytes per distinct value)
+
+Calculated columns are not sampled; their cardinality is estimated as the
+largest cardinality of the columns they reference (the product of those
+cardinalities is kept as an upper bound) and they are ranked as
+low-confidence estimates. Calculated tables and sources that are not on disk
+are listed as not estimated.
+
+Suggested fixes:
+- split_datetime: dateTime with time parts -> separate date and time columns
+- hash_url: long text keys (URLs, paths) -> integer surrogate key
+- disable_mdx: column only used inside DAX -> isAvailableInMdx: false
+- remove: column nothing in the model or report uses
+
+Numbers are estimates for ranking, not what VertiPaq Analyzer will report.
+
+Usage:
+    python column_storage_estimator.py [semantic_model_path] [--data-dir ./data] [--sample-rows 200000] [--json out.json]
+
+Options:
+    --data-dir: Resolve the partition's source file/folder names in this folder
+    --sample-rows: Rows sampled per source (default: 200000)
+    --report: .Report folder bound to the model (default: sibling report)
+    --top: Show only the N largest columns
+    --min-savings: Smallest saving in bytes worth a suggestion (default: 65536)
+    --json: Write the ranked report as JSON
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fixers"))
+
+from dax_lexer import DaxSyntaxError, extract_references, tokenize  # noqa: E402
+from pbir_report import find_report_dir, load_report  # noqa: E402
+from prune_unused_model_objects import UsageGraph  # noqa: E402
+from tmdl_model import SemanticModel, TmdlNode, load_semantic_model  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+DEFAULT_SAMPLE_ROWS = 200000
+STRING_ENTRY_OVERHEAD = 16      # hash bucket + offset per dictionary entry
+HIERARCHY_BYTES_PER_VALUE = 8   # position-to-id and id-to-position maps
+RLE_RUN_BYTES = 8               # value id + run length
+VALUE_ENCODED_TYPES = {"int64", "decimal", "boolean"}
+LONG_TEXT_LENGTH = 40           # average characters before a text key is worth hashing
+MIN_SAVINGS_BYTES = 64 * 1024   # suggestions below this are not worth the model change
+URL_HINTS = ("url", "uri", "path", "link")
+SECONDS_PER_DAY = 86400
+
+CSV_SOURCE_RE = re.compile(r'Csv\.Document\(\s*File\.Contents\("([^"]+)"\)\s*(?:,\s*(\[[^\]]*\]))?')
+FOLDER_SOURCE_RE = re.compile(r'Folder\.Files\("([^"]+)"\)')
+RENAME_PAIR_RE = re.compile(r'\{\s*"([^"]+)"\s*,\s*"([^"]+)"\s*\}')
+TIME_PART_RE = re.compile(r"[T ](\d{1,2}):(\d{2})(?::(\d{2}))?")
+
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+@dataclass
+class ColumnSample:
+    """Sampled values of one source column (in load order)."""
+    counts: Counter = field(default_factory=Counter)
+    sampled: int = 0
+    changes: int = 0
+    time_values: int = 0
+    dates: Set[str] = field(default_factory=set)
+    times: Set[str] = field(default_factory=set)
+    numeric: int = 0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    _last: Optional[str] = None
+
+    def add(self, value: Optional[str]) -> None:
+        value = "" if value is None else value
+        if self.sampled and value != self._last:
+            self.changes += 1
+        self._last = value
+        self.sampled += 1
+        self.counts[value] += 1
+        time_part = TIME_PART_RE.search(value)
+        if time_part and any(int(p or 0) for p in time_part.groups()):
+            self.time_values += 1
+            self.dates.add(value[:time_part.start()])
+            self.times.add(time_part.group(0)[1:])
+        try:
+            number = float(value)
+        except ValueError:
+            return
+        self.numeric += 1
+        self.minimum = number if self.minimum is None else min(self.minimum, number)
+        self.maximum = number if self.maximum is None else max(self.maximum, number)
+
+    def distinct(self, rows: int) -> int:
+        """Estimated distinct values over `rows` rows (exact when fully sampled)."""
+        seen = len(self.counts)
+        if self.sampled == 0 or rows <= self.sampled:
+            return seen
+        singletons = sum(1 for c in self.counts.values() if c == 1)
+        return min(rows, int(round(math.sqrt(rows / self.sampled) * singletons + (seen - singletons))))
+
+    def scaled(self, seen: int, rows: int) -> int:
+        """Scale a distinct count seen in the sample the same way distinct() does."""
+        if not self.counts or rows <= self.sampled:
+            return seen
+        return min(rows, int(round(seen * self.distinct(rows) / max(len(self.counts), 1))))
+
+    @property
+    def average_length(self) -> float:
+        return sum(len(v) for v in self.counts) / len(self.counts) if self.counts else 0.0
+
+
+@dataclass
+class SourceSample:
+    """One sampled partition source."""
+    label: str
+    path: Path
+    rows: int = 0
+    columns: Dict[str, ColumnSample] = field(default_factory=dict)
+    error: str = ""
+
+
+def count_lines(path: Path) -> int:
+    lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return lines + (0 if last == b"\n" else 1)
+
+
+def csv_rows(path: Path, options: str) -> Iterator[List[str]]:
+    """Rows as Csv.Document reads them (QuoteStyle.None splits on every delimiter)."""
+    delimiter = re.search(r'Delimiter\s*=\s*"([^"]*)"', options or "")
+    delimiter = delimiter.group(1) if delimiter else ","
+    encoding = "cp1252" if re.search(r"Encoding\s*=\s*1252", options or "") else "utf-8-sig"
+    with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+        if "QuoteStyle.None" in (options or ""):
+            for line in f:
+                yield line.rstrip("\r\n").split(delimiter)
+        else:
+            yield from csv.reader(f, delimiter=delimiter)
+
+
+def sample_csv(label: str, path: Path, options: str, renames: Dict[str, str], sample_rows: int) -> SourceSample:
+    source = SourceSample(label=label, path=path)
+    source.rows = max(count_lines(path) - 1, 0)
+    stride = max(1, -(-source.rows // sample_rows))
+    rows = csv_rows(path, options)
+    header = [renames.get(h.strip(), h.strip()) for h in next(rows, [])]
+    source.columns = {name: ColumnSample() for name in header if name}
+    for index, row in enumerate(rows):
+        if index % stride:
+            continue
+        for position, name in enumerate(header):
+            if name:
+                source.columns[name].add(row[position] if position < len(row) else None)
+    return source
+
+
+def sample_folder(label: str, path: Path, sample_rows: int) -> SourceSample:
+    """Folder.Files: one row per file with Name, Extension, dates and Folder Path."""
+    source = SourceSample(label=label, path=path)
+    names = ["Name", "Extension", "Date accessed", "Date modified", "Date created", "Folder Path"]
+    source.columns = {name: ColumnSample() for name in names}
+    for folder, _, files in os.walk(path):
+        for name in sorted(files):
+            source.rows += 1
+            if source.rows > sample_rows:
+                continue
+            stat = os.stat(os.path.join(folder, name))
+            values = [
+                name, os.path.splitext(name)[1],
+                datetime.fromtimestamp(stat.st_atime).isoformat(sep=" ", timespec="seconds"),
+                datetime.fromtimestamp(stat.st_mtime).isoformat(sep=" ", timespec="seconds"),
+                datetime.fromtimestamp(stat.st_ctime).isoformat(sep=" ", timespec="seconds"),
+                folder.rstrip("\\/") + os.sep,
+            ]
+            for column, value in zip(names, values):
+                source.columns[column].add(value)
+    return source
+
+
+def resolve_source(value: str, data_dir: Optional[str]) -> Path:
+    name = re.split(r"[\\/]", value.rstrip("\\/"))[-1]
+    return Path(data_dir) / name if data_dir else Path(value)
+
+
+def sample_table(table: TmdlNode, data_dir: Optional[str], sample_rows: int) -> Tuple[List[SourceSample], str]:
+    """Sample every local source of the table's M partitions; returns (samples, note)."""
+    samples: List[SourceSample] = []
+    for partition in table.partitions:
+        if (partition.expression or "").strip().lower() != "m":
+            continue
+        code = "\n".join(l for l in partition.expression_properties.get("source", "").splitlines()
+                         if not l.strip().startswith("//"))
+        renames = {old: new for old, new in RENAME_PAIR_RE.findall(
+            " ".join(re.findall(r"Table\.RenameColumns\((.*?)\)\s*,?\s*$", code, re.MULTILINE)))}
+        for raw, options in CSV_SOURCE_RE.findall(code):
+            path = resolve_source(raw, data_dir)
+            if path.is_file():
+                samples.append(sample_csv(raw, path, options, renames, sample_rows))
+            else:
+                samples.append(SourceSample(label=raw, path=path, error="source file not found"))
+        for raw in FOLDER_SOURCE_RE.findall(code):
+            path = resolve_source(raw, data_dir)
+            if path.is_dir():
+                samples.append(sample_folder(raw, path, sample_rows))
+            else:
+                samples.append(SourceSample(label=raw, path=path, error="source folder not found"))
+    if not samples:
+        return samples, "no local file source (calculated or external table)"
+    missing = [s for s in samples if s.error]
+    return samples, "; ".join(f"{s.path}: {s.error}" for s in missing)
+
+
+# ============================================================================
+# ESTIMATION
+# ============================================================================
+
+@dataclass
+class ColumnEstimate:
+    table: str
+    column: str
+    data_type: str
+    summarize_by: str
+    rows: int
+    cardinality: int
+    average_length: float
+    dictionary_bytes: int
+    data_bytes: int
+    hierarchy_bytes: int
+    origin: str                      # sampled | derived
+    cardinality_upper_bound: Optional[int] = None
+    value_range: Optional[float] = None
+    has_time: bool = False
+    date_cardinality: int = 0
+    time_cardinality: int = 0
+    suggestions: List[Tuple[str, int, str]] = field(default_factory=list)  # (fix, bytes saved, detail)
+
+    @property
+    def label(self) -> str:
+        return f"{self.table}[{self.column}]"
+
+    @property
+    def confidence(self) -> str:
+        return "high" if self.origin == "sampled" else "low"
+
+    @property
+    def total_bytes(self) -> int:
+        return self.dictionary_bytes + self.data_bytes + self.hierarchy_bytes
+
+    def to_dict(self) -> Dict:
+        return {
+            "column": self.label, "dataType": self.data_type, "summarizeBy": self.summarize_by,
+            "rows": self.rows, "cardinality": self.cardinality, "averageLength": round(self.average_length, 1),
+            "dictionaryBytes": self.dictionary_bytes, "dataBytes": self.data_bytes,
+            "hierarchyBytes": self.hierarchy_bytes, "totalBytes": self.total_bytes, "origin": self.origin,
+            "confidence": self.confidence, "cardinalityUpperBound": self.cardinality_upper_bound,
+            "suggestions": [{"fix": f, "savedBytes": s, "detail": d} for f, s, d in self.suggestions],
+        }
+
+
+def bits_for(values: int) -> int:
+    return max(1, math.ceil(math.log2(max(values, 2))))
+
+
+def storage_bytes(data_type: str, rows: int, cardinality: int, average_length: float,
+                  value_range: Optional[float], run_ratio: float, mdx: bool) -> Tuple[int, int, int]:
+    """(dictionary, data, hierarchy) bytes for one column."""
+    if data_type in VALUE_ENCODED_TYPES and value_range is not None:
+        dictionary = 0
+        bits = bits_for(int(value_range) + 1)
+    elif data_type == "string":
+        dictionary = int(cardinality * (2 * average_length + STRING_ENTRY_OVERHEAD))
+        bits = bits_for(cardinality)
+    else:
+        dictionary = cardinality * 8
+        bits = bits_for(cardinality)
+    packed = rows * bits // 8
+    runs = int(rows * run_ratio)
+    data = min(packed, runs * RLE_RUN_BYTES) if runs else packed
+    hierarchy = cardinality * HIERARCHY_BYTES_PER_VALUE if mdx else 0
+    return dictionary, data, hierarchy
+
+
+def estimate_sampled(table: TmdlNode, column: TmdlNode, sample: ColumnSample, rows: int) -> ColumnEstimate:
+    data_type = column.get("dataType", "string")
+    cardinality = sample.distinct(rows)
+    all_numeric = sample.numeric and sample.numeric + sample.counts.get("", 0) == sample.sampled
+    value_range = sample.maximum - sample.minimum if all_numeric else None
+    run_ratio = (sample.changes + 1) / sample.sampled if sample.sampled else 1.0
+    dictionary, data, hierarchy = storage_bytes(
+        data_type, rows, cardinality, sample.average_length, value_range, run_ratio,
+        column.get("isAvailableInMdx") != "false")
+    return ColumnEstimate(
+        table=table.name, column=column.name, data_type=data_type,
+        summarize_by=column.get("summarizeBy", "default"), rows=rows, cardinality=cardinality,
+        average_length=sample.average_length, dictionary_bytes=dictionary, data_bytes=data,
+        hierarchy_bytes=hierarchy, origin="sampled", value_range=value_range,
+        has_time=data_type == "dateTime" and sample.time_values > 0,
+        date_cardinality=sample.scaled(len(sample.dates), rows),
+        time_cardinality=min(SECONDS_PER_DAY, sample.scaled(len(sample.times), rows)),
+    )
+
+
+def estimate_derived(table: TmdlNode, column: TmdlNode, known: Dict[Tuple[str, str], ColumnEstimate],
+                     rows: int) -> Optional[ColumnEstimate]:
+    """Calculated column: cardinality of its largest referenced column, product of all as upper bound."""
+    try:
+        refs = extract_references(tokenize(column.expression or ""))
+    except DaxSyntaxError:
+        return None
+    keys = {(r.table or table.name, r.name) for r in refs if r.kind in ("column", "measure")}
+    sources = [known[k] for k in sorted(keys) if k in known]
+    if not sources or rows == 0:
+        return None
+    # Most calculated columns are lookups, copies or bucketings of one column; the
+    # product only holds for columns that combine independent values
+    cardinality = min(rows, max(s.cardinality for s in sources))
+    upper_bound = min(rows, math.prod(s.cardinality for s in sources))
+    data_type = column.get("dataType", "string")
+    average_length = max(s.average_length for s in sources)
+    # A plain copy of a value-encoded column (Users = Fact[Active_Users]) keeps its value range
+    value_range = sources[0].value_range if len(sources) == 1 else None
+    dictionary, data, hierarchy = storage_bytes(
+        data_type, rows, cardinality, average_length, value_range, 1.0,
+        column.get("isAvailableInMdx") != "false")
+    return ColumnEstimate(
+        table=table.name, column=column.name, data_type=data_type,
+        summarize_by=column.get("summarizeBy", "default"), rows=rows, cardinality=cardinality,
+        average_length=average_length, dictionary_bytes=dictionary, data_bytes=data,
+        hierarchy_bytes=hierarchy, origin="derived", cardinality_upper_bound=upper_bound,
+        value_range=value_range)
+
+
+class StorageEstimator:
+    """Ranked per-column memory estimate for a semantic model."""
+
+    def __init__(self, model: SemanticModel, data_dir: Optional[str] = None,
+                 sample_rows: int = DEFAULT_SAMPLE_ROWS):
+        self.model = model
+        self.data_dir = data_dir
+        self.sample_rows = sample_rows
+        self.estimates: List[ColumnEstimate] = []
+        self.skipped: Dict[str, str] = {}
+        self.sources: List[SourceSample] = []
+
+    def run(self) -> List[ColumnEstimate]:
+        for table in self.model.tables.values():
+            samples, note = sample_table(table, self.data_dir, self.sample_rows)
+            self.sources.extend(samples)
+            usable = [s for s in samples if not s.error]
+            if not usable:
+                self.skipped[table.name] = note
+                continue
+            if note:
+                self.skipped[table.name] = note
+            rows = usable[0].rows  # the first source is the base of any join/append
+            known: Dict[Tuple[str, str], ColumnEstimate] = {}
+            for column in table.columns:
+                if column.is_calculated:
+                    continue
+                source_name = column.get("sourceColumn", column.name)
+                sample = next((s.columns[source_name] for s in usable if source_name in s.columns), None)
+                if sample is None:
+                    sample = next((s.columns[column.name] for s in usable if column.name in s.columns), None)
+                if sample is not None:
+                    known[(table.name, column.name)] = estimate_sampled(table, column, sample, rows)
+            for column in table.columns:
+                if column.is_calculated:
+                    derived = estimate_derived(table, column, known, rows)
+                    if derived is not None:
+                        known[(table.name, column.name)] = derived
+            self.estimates.extend(known.values())
+        self.estimates.sort(key=lambda e: -e.total_bytes)
+        return self.estimates
+
+    def suggest(self, used: Set[Tuple[str, str, str]], report_columns: Set[Tuple[str, str]],
+                structural_columns: Set[Tuple[str, str]], min_savings: int = MIN_SAVINGS_BYTES) -> None:
+        """Attach suggested fixes (largest saving first) to every estimate."""
+        for estimate in self.estimates:
+            key = (estimate.table, estimate.column)
+            fixes: List[Tuple[str, int, str]] = []
+            if ("column", estimate.table, estimate.column) not in used:
+                estimate.suggestions = [("remove", estimate.total_bytes,
+                                         "Nothing in the model or report uses this column")]
+                if estimate.total_bytes < min_savings:
+                    estimate.suggestions = []
+                continue
+            if estimate.has_time and estimate.date_cardinality and estimate.time_cardinality:
+                split = sum(c * (8 + HIERARCHY_BYTES_PER_VALUE)
+                            for c in (estimate.date_cardinality, estimate.time_cardinality))
+                saved = estimate.dictionary_bytes + estimate.hierarchy_bytes - split
+                fixes.append(("split_datetime", saved,
+                              f"{estimate.cardinality:,} values -> {estimate.date_cardinality:,} dates + "
+                              f"{estimate.time_cardinality:,} times (or drop the time part)"))
+            if estimate.origin == "sampled" and estimate.data_type == "string" and \
+                    estimate.average_length >= LONG_TEXT_LENGTH and \
+                    any(h in estimate.column.lower() for h in URL_HINTS):
+                fixes.append(("hash_url", estimate.dictionary_bytes,
+                              f"avg {estimate.average_length:.0f} chars; keep the text once in the dimension "
+                              "and join on an integer key"))
+            if estimate.hierarchy_bytes and key not in report_columns and key not in structural_columns:
+                fixes.append(("disable_mdx", estimate.hierarchy_bytes,
+                              "Not used on an axis, slicer or filter: set isAvailableInMdx: false"))
+            estimate.suggestions = sorted((f for f in fixes if f[1] >= min_savings),
+                                          key=lambda f: -f[1])
+
+
+def usage_sets(model: SemanticModel, reports: List[Path]) -> Tuple[Set, Set, Set]:
+    """(reachable objects, report-used columns, relationship/sort/hierarchy columns)."""
+    graph = UsageGraph(model)
+    graph.add_model_roots()
+    report_columns: Set[Tuple[str, str]] = set()
+    for report_path in reports:
+        graph.add_report_roots(report_path)
+        for _, ref in load_report(report_path).iter_all_field_refs():
+            if ref.kind == "Column":
+                report_columns.add((ref.entity, ref.prop))
+    structural = {(obj[1], obj[2]) for obj in graph.roots if obj[0] == "column"} - report_columns
+    for table, column in model.iter_columns():
+        if column.get("sortByColumn"):
+            structural.add((table.name, column.get("sortByColumn").strip("'").replace("''", "'")))
+    return graph.reachable(), report_columns, structural
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def format_bytes(value: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:,.0f} {unit}" if unit == "B" else f"{value:,.1f} {unit}"
+        value /= 1024
+    return str(value)
+
+
+def print_report(estimator: StorageEstimator, top: Optional[int], min_savings: int) -> None:
+    estimates = estimator.estimates[:top] if top else estimator.estimates
+    total = sum(e.total_bytes for e in estimator.estimates)
+
+    print("=" * 80)
+    print("Column Storage Footprint".center(80))
+    print("=" * 80)
+    print()
+    print("SOURCES")
+    print("-" * 80)
+    for source in estimator.sources:
+        status = source.error or f"{source.rows:,} rows"
+        print(f"  {source.path}  ({status})")
+    for table, note in sorted(estimator.skipped.items()):
+        print(f"  [INFO] {table}: {note}")
+    print()
+
+    print(f"RANKED COLUMNS (estimated total {format_bytes(total)})")
+    print("-" * 80)
+    print(f"  {'Column':<44} {'Type':<9} {'Distinct':>10} {'Dict':>10} {'Data':>10} {'Hier':>10} {'Total':>10}")
+    for estimate in estimates:
+        share = 100.0 * estimate.total_bytes / total if total else 0.0
+        origin = "" if estimate.confidence == "high" else \
+            f" ~ low confidence (<= {estimate.cardinality_upper_bound:,} distinct)"
+        print(f"  {estimate.label[:44]:<44} {estimate.data_type:<9} {estimate.cardinality:>10,} "
+              f"{format_bytes(estimate.dictionary_bytes):>10} {format_bytes(estimate.data_bytes):>10} "
+              f"{format_bytes(estimate.hierarchy_bytes):>10} {format_bytes(estimate.total_bytes):>10}"
+              f"  {share:4.1f}%{origin}")
+    print("  (~ = calculated column: distinct count of its largest referenced column, not sampled)")
+    print()
+
+    print("SUGGESTED FIXES")
+    print("-" * 80)
+    suggested = [(e, s) for e in estimator.estimates for s in e.suggestions]
+    if not suggested:
+        print(f"  [SUCCESS] No fix saves more than {format_bytes(min_savings)}.")
+    for estimate, (fix, saved, detail) in sorted(suggested, key=lambda item: -item[1][1]):
+        print(f"  [{fix}] {estimate.label}: saves ~{format_bytes(saved)}")
+        print(f"      {detail}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Estimate per-column VertiPaq memory from TMDL metadata and source samples",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Rank columns using the source files in ./data
+  python column_storage_estimator.py --data-dir ./data
+
+  # Top 10 columns as JSON
+  python column_storage_estimator.py --data-dir ./data --top 10 --json storage.json
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder")
+    parser.add_argument("--data-dir", help="Folder holding the source files named in the partitions")
+    parser.add_argument("--sample-rows", type=int, default=DEFAULT_SAMPLE_ROWS,
+                        help=f"Rows sampled per source (default: {DEFAULT_SAMPLE_ROWS})")
+    parser.add_argument("--report", action="append", default=[],
+                        help="Report folder bound to the model (repeatable)")
+    parser.add_argument("--top", type=int, help="Show only the N largest columns")
+    parser.add_argument("--min-savings", type=int, default=MIN_SAVINGS_BYTES,
+                        help=f"Smallest saving (bytes) worth suggesting (default: {MIN_SAVINGS_BYTES})")
+    parser.add_argument("--json", help="Write the ranked report to this JSON file")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+
+    reports = [Path(r) for r in args.report]
+    if not reports:
+        sibling = find_report_dir(model_path.resolve())
+        reports = [sibling] if sibling else []
+
+    model = load_semantic_model(model_path)
+    estimator = StorageEstimator(model, args.data_dir, max(args.sample_rows, 1))
+    estimator.run()
+    estimator.suggest(*usage_sets(model, reports), min_savings=args.min_savings)
+    print_report(estimator, args.top, args.min_savings)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "totalBytes": sum(e.total_bytes for e in estimator.estimates),
+            "columns": [e.to_dict() for e in estimator.estimates],
+            "notEstimated": estimator.skipped,
+        }, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2472 @@
+#!/usr/bin/env python3
+"""
+Columnar DAX Evaluator (benchmark stand-in)
+
+Loads the model's tables from local files into NumPy columns and evaluates
+measures taken straight from the TMDL, so measure logic can be timed and its
+numbers checked on Linux without Power BI Desktop.
+
+Data:
+- <Table>.csv in --data-dir (matched case-insensitively, e.g. the
+  fact_press_analytics.csv written by prejoin_fact_sources.py and the
+  Dim_Press_Releases.csv written by materialize_summary_tables.py), typed
+  from the TMDL dataType (inferred from the values when a column has none)
+- M calendar partitions (List.Dates, e.g. Dim_Date) are generated in Python
+- Calculated columns in the supported subset are computed after loading
+- Active relationships propagate filters one -> many (and back for
+  bothDirections); strings and keys are dictionary encoded
+
+Supported DAX:
+- Aggregations: SUM, AVERAGE, MIN, MAX, COUNT, COUNTROWS, DISTINCTCOUNT and
+  the X iterators (SUMX, AVERAGEX, MINX, MAXX, COUNTX)
+- CALCULATE / CALCULATETABLE with column predicates, FILTER, KEEPFILTERS,
+  ALL, REMOVEFILTERS, ALLEXCEPT, ALLSELECTED, VALUES, DISTINCT
+- DIVIDE, IF, SWITCH, VAR/RETURN, arithmetic, comparisons, IN, &&, ||, NOT
+- Time intelligence: DATESYTD, DATESQTD, DATESMTD, SAMEPERIODLASTYEAR,
+  DATEADD, DATESINPERIOD, DATESBETWEEN, PREVIOUSDAY/MONTH/YEAR
+- RANKX (SKIP/DENSE), SELECTEDVALUE, HASONEVALUE, ISFILTERED, scalar date
+  and text helpers (TODAY, DATE, YEAR, MONTH, DAY, WEEKDAY, DATEDIFF,
+  CONTAINSSTRING, ABS, ROUND, INT, ISBLANK, COALESCE)
+
+Anything else (FORMAT, SUMMARIZE, TOPN, USERELATIONSHIP, ...) is reported
+as unsupported for that measure instead of guessed.
+
+Iterations with context transition (RANKX over ALL(column), AVERAGEX over
+dates with CALCULATE, one row per visual group) are evaluated for all
+groups at once with np.bincount when the expression is a tree of
+aggregations, CALCULATE with static filters and arithmetic; otherwise one
+filter context per value.
+
+Filter contexts come from --filter predicates or, with --report, from each
+visual's queryState (grouping columns + measures) under the report, page,
+slicer and visual filters of its page.
+
+Usage:
+    python dax_columnar_engine.py --data-dir ./data [--measure "Total Views"] [--group-by "Dim_Date[Year_Month]"]
+    python dax_columnar_engine.py --data-dir ./data --report ../press-room-dashboard.Report
+    python dax_columnar_engine.py --self-test
+
+Options:
+    --data-dir: Folder with <Table>.csv files
+    --table: Explicit file for a table, "Table=path.csv" (repeatable)
+    --measure: Measure to evaluate (repeatable; default: every measure)
+    --expression: Ad-hoc DAX expression to evaluate
+    --variant: "Name=DAX" variant evaluated and compared against measure Name
+    --filter: DAX filter applied to the base context, e.g. 'Dim_Date[Year] = 2025'
+    --group-by: Grouping column, e.g. "Fact_Press_Analytics[Channel_Group]"
+    --report: Evaluate the data-bound visuals of this .Report folder
+    --page: Limit --report to one page (display name or id)
+    --repeat: Evaluate N times and report min/median time (default: 1)
+    --today: Date used for TODAY() and M calendars (default: today)
+    --rows: Rows printed per result (default: 20)
+    --json: Write results as JSON
+    --self-test: Check the engine against hand-computed values
+"""
+
+import argparse
+import csv
+import json
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from dax_lexer import DaxSyntaxError, Token, tokenize
+from pbir_report import load_report
+from relationship_graph import parse_relationships
+from tmdl_model import SemanticModel, TmdlNode, load_semantic_model
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+NUMERIC_TYPES = {"int64", "double", "decimal"}
+SECONDS_PER_DAY = 86400
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Functions whose column arguments are aggregated in the filter context (not row references)
+AGGREGATIONS = {"SUM", "AVERAGE", "MIN", "MAX", "COUNT", "COUNTA", "COUNTROWS", "DISTINCTCOUNT",
+                "SELECTEDVALUE", "HASONEVALUE", "ISFILTERED"}
+ITERATORS = {"SUMX", "AVERAGEX", "MINX", "MAXX", "COUNTX"}
+TIME_INTELLIGENCE = {"DATESYTD", "DATESQTD", "DATESMTD", "SAMEPERIODLASTYEAR", "DATEADD", "DATESINPERIOD",
+                     "DATESBETWEEN", "PREVIOUSDAY", "PREVIOUSMONTH", "PREVIOUSYEAR"}
+TABLE_FUNCTIONS = {"ALL", "REMOVEFILTERS", "ALLSELECTED", "VALUES", "DISTINCT", "FILTER", "CALCULATETABLE",
+                   "KEEPFILTERS"} | TIME_INTELLIGENCE
+FILTER_MODIFIERS = {"ALL", "REMOVEFILTERS", "ALLEXCEPT", "ALLSELECTED"}
+
+# queryState Aggregation.Function codes
+QUERY_AGGREGATIONS = {0: "SUM", 1: "AVERAGE", 2: "DISTINCTCOUNT", 3: "MIN", 4: "MAX", 5: "COUNT"}
+
+
+class UnsupportedDax(Exception):
+    """The expression uses something outside the supported DAX subset."""
+
+
+class NotGroupable(Exception):
+    """The expression cannot be evaluated for all groups at once."""
+
+
+# ============================================================================
+# PARSER
+# ============================================================================
+
+@dataclass(frozen=True)
+class Num:
+    value: float
+
+
+@dataclass(frozen=True)
+class Str:
+    value: str
+
+
+@dataclass(frozen=True)
+class ColRef:
+    table: str          # "" for [Name] (measure, or column in row context)
+    column: str
+
+
+@dataclass(frozen=True)
+class Name:
+    name: str           # variable, unquoted table name or keyword argument (DAY, DESC, DENSE)
+
+
+@dataclass(frozen=True)
+class Call:
+    name: str
+    args: Tuple[Any, ...]   # None for an omitted argument
+
+
+@dataclass(frozen=True)
+class BinOp:
+    op: str
+    left: Any
+    right: Any
+
+
+@dataclass(frozen=True)
+class Unary:
+    op: str
+    operand: Any
+
+
+@dataclass(frozen=True)
+class Braces:
+    items: Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class VarBlock:
+    bindings: Tuple[Tuple[str, Any], ...]
+    body: Any
+
+
+class DaxParser:
+    """Recursive-descent parser over dax_lexer tokens."""
+
+    COMPARISONS = {"=", "==", "<>", "<", ">", "<=", ">="}
+
+    def __init__(self, expression: str):
+        self.tokens: List[Token] = tokenize(expression)
+        self.i = 0
+
+    def parse(self):
+        node = self.expression()
+        if self.i != len(self.tokens):
+            raise DaxSyntaxError(f"Unexpected {self.tokens[self.i].value!r} at position {self.tokens[self.i].pos}")
+        return node
+
+    def peek(self) -> Optional[Token]:
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def take(self, kind: str, value: Optional[str] = None) -> Token:
+        tok = self.peek()
+        if tok is None or tok.kind != kind or (value is not None and tok.value != value):
+            found = "end of expression" if tok is None else repr(tok.value)
+            raise DaxSyntaxError(f"Expected {value or kind}, found {found}")
+        self.i += 1
+        return tok
+
+    def accept(self, kind: str, values: Iterable[str] = ()) -> Optional[Token]:
+        tok = self.peek()
+        if tok is not None and tok.kind == kind and (not values or tok.value in values):
+            self.i += 1
+            return tok
+        return None
+
+    def expression(self):
+        tok = self.peek()
+        if tok is not None and tok.kind == "KEYWORD" and tok.value == "VAR":
+            bindings = []
+            while self.accept("KEYWORD", ("VAR",)):
+                name = self.take("IDENT").value
+                self.take("OP", "=")
+                bindings.append((name.upper(), self.expression()))
+            self.take("KEYWORD", "RETURN")
+            return VarBlock(tuple(bindings), self.expression())
+        return self.or_expr()
+
+    def _binary(self, operand: Callable, ops: Set[str]):
+        node = operand()
+        while True:
+            tok = self.peek()
+            if tok is None or tok.kind != "OP" or tok.value not in ops:
+                return node
+            self.i += 1
+            node = BinOp(tok.value, node, operand())
+
+    def or_expr(self):
+        return self._binary(self.and_expr, {"||"})
+
+    def and_expr(self):
+        return self._binary(self.not_expr, {"&&"})
+
+    def not_expr(self):
+        if self.accept("KEYWORD", ("NOT",)):
+            return Unary("NOT", self.not_expr())
+        return self.comparison()
+
+    def comparison(self):
+        node = self.concat()
+        while True:
+            if self.accept("KEYWORD", ("IN",)):
+                node = BinOp("IN", node, self.concat())
+                continue
+            tok = self.peek()
+            if tok is None or tok.kind != "OP" or tok.value not in self.COMPARISONS:
+                return node
+            self.i += 1
+            node = BinOp("=" if tok.value == "==" else tok.value, node, self.concat())
+
+    def concat(self):
+        return self._binary(self.additive, {"&"})
+
+    def additive(self):
+        return self._binary(self.multiplicative, {"+", "-"})
+
+    def multiplicative(self):
+        return self._binary(self.power, {"*", "/"})
+
+    def power(self):
+        return self._binary(self.unary, {"^"})
+
+    def unary(self):
+        tok = self.peek()
+        if tok is not None and tok.kind == "OP" and tok.value in ("-", "+"):
+            self.i += 1
+            operand = self.unary()
+            return Unary("-", operand) if tok.value == "-" else operand
+        return self.primary()
+
+    def primary(self):
+        tok = self.peek()
+        if tok is None:
+            raise DaxSyntaxError("Unexpected end of expression")
+        self.i += 1
+        if tok.kind == "NUMBER":
+            return Num(float(tok.value))
+        if tok.kind == "STRING":
+            return Str(tok.value)
+        if tok.kind == "LPAREN":
+            node = self.expression()
+            self.take("RPAREN")
+            return node
+        if tok.kind == "LBRACE":
+            items = []
+            if not self.accept("RBRACE"):
+                while True:
+                    items.append(self.expression())
+                    if self.accept("RBRACE"):
+                        break
+                    self.take("COMMA")
+            return Braces(tuple(items))
+        if tok.kind == "FUNCTION":
+            self.take("LPAREN")
+            args: List[Any] = []
+            if not self.accept("RPAREN"):
+                while True:
+                    nxt = self.peek()
+                    args.append(None if nxt is not None and nxt.kind in ("COMMA", "RPAREN") else self.expression())
+                    if self.accept("RPAREN"):
+                        break
+                    self.take("COMMA")
+            return Call(tok.value, tuple(args))
+        if tok.kind in ("TABLE", "IDENT"):
+            nxt = self.peek()
+            if nxt is not None and nxt.kind == "COLUMN":
+                self.i += 1
+                return ColRef(tok.value, nxt.value)
+            return Name(tok.value) if tok.kind == "IDENT" else ColRef(tok.value, "")
+        if tok.kind == "COLUMN":
+            return ColRef("", tok.value)
+        if tok.kind == "KEYWORD" and tok.value in ("ASC", "DESC"):
+            return Name(tok.value)
+        raise DaxSyntaxError(f"Unexpected {tok.value!r} at position {tok.pos}")
+
+
+def parse_dax(expression: str):
+    return DaxParser(expression).parse()
+
+
+def walk(node) -> Iterable[Any]:
+    """All nodes of an expression tree."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            continue
+        yield item
+        if isinstance(item, Call):
+            stack.extend(item.args)
+        elif isinstance(item, BinOp):
+            stack.extend((item.left, item.right))
+        elif isinstance(item, Unary):
+            stack.append(item.operand)
+        elif isinstance(item, Braces):
+            stack.extend(item.items)
+        elif isinstance(item, VarBlock):
+            stack.extend(expr for _, expr in item.bindings)
+            stack.append(item.body)
+
+
+def row_columns(node) -> List[ColRef]:
+    """Column references used row by row (not inside aggregations or table functions)."""
+    found: List[ColRef] = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ColRef) and item.column:
+            found.append(item)
+        elif isinstance(item, Call):
+            if item.name not in AGGREGATIONS and item.name not in TABLE_FUNCTIONS and item.name not in ITERATORS:
+                stack.extend(a for a in item.args if a is not None)
+        elif isinstance(item, BinOp):
+            stack.append(item.left)
+            if item.op != "IN" or isinstance(item.right, Braces):
+                stack.append(item.right)
+        elif isinstance(item, Unary):
+            stack.append(item.operand)
+        elif isinstance(item, VarBlock):
+            stack.extend(expr for _, expr in item.bindings)
+            stack.append(item.body)
+    return found
+
+
+# ============================================================================
+# COLUMN STORE
+# ============================================================================
+
+class Column:
+    """One column: raw values plus a lazily built sorted dictionary and codes."""
+
+    def __init__(self, name: str, kind: str, data: "np.ndarray"):
+        self.name = name
+        self.kind = kind            # number | date | string | bool
+        self.data = data
+        self._dictionary = None
+        self._codes = None
+
+    def _encode(self) -> None:
+        self._dictionary, codes = np.unique(self.data, return_inverse=True)
+        self._codes = codes.ravel()
+
+    @property
+    def dictionary(self) -> "np.ndarray":
+        if self._dictionary is None:
+            self._encode()
+        return self._dictionary
+
+    @property
+    def codes(self) -> "np.ndarray":
+        if self._codes is None:
+            self._encode()
+        return self._codes
+
+
+@dataclass
+class ColumnTable:
+    name: str
+    rows: int
+    columns: Dict[str, Column] = field(default_factory=dict)
+
+
+@dataclass
+class Link:
+    """Active relationship: filters flow from the one side to the many side."""
+    many_table: str
+    many_column: str
+    one_table: str
+    one_column: str
+    both_directions: bool = False
+    row_of_key: Optional["np.ndarray"] = None   # many-side dictionary index -> one-side row (-1 = none)
+
+
+def to_datetime64(values: Sequence[str]) -> "np.ndarray":
+    cache: Dict[str, str] = {}
+    out = []
+    for value in values:
+        text = value.strip()
+        if text not in cache:
+            cache[text] = _iso(text)
+        out.append(cache[text])
+    return np.array(out, dtype="datetime64[s]")
+
+
+def _iso(text: str) -> str:
+    if not text:
+        return "NaT"
+    if re.fullmatch(r"\d{8}", text):
+        return f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    if re.match(r"\d{4}-\d{2}-\d{2}", text):
+        return text.replace(" ", "T").rstrip("Z")
+    for fmt in ("%m/%d/%Y %I:%M:%S %p", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(text, fmt).isoformat()
+        except ValueError:
+            continue
+    return "NaT"
+
+
+def infer_data_type(values: Sequence[str]) -> str:
+    """TMDL dataType for a column that does not declare one: double, dateTime or string."""
+    present = [v.strip() for v in values if v.strip()]
+    if not present:
+        return "string"
+    try:
+        for value in present:
+            float(value)
+        return "double"
+    except ValueError:
+        pass
+    if all(_iso(value) != "NaT" for value in set(present)):
+        return "dateTime"
+    return "string"
+
+
+def typed_column(name: str, data_type: Optional[str], values: Sequence[str]) -> Column:
+    if data_type is None:
+        data_type = infer_data_type(values)
+    if data_type in NUMERIC_TYPES:
+        out = np.empty(len(values), dtype=float)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except ValueError:
+                out[i] = np.nan
+        return Column(name, "number", out)
+    if data_type == "dateTime":
+        return Column(name, "date", to_datetime64(values))
+    if data_type == "boolean":
+        return Column(name, "bool", np.array([v.strip().lower() in ("true", "1") for v in values], dtype=bool))
+    return Column(name, "string", np.array(list(values), dtype=object))
+
+
+def column_from_values(name: str, values: "np.ndarray") -> Column:
+    """Wrap an evaluated array as a column."""
+    if values.dtype.kind == "M":
+        return Column(name, "date", values.astype("datetime64[s]"))
+    if values.dtype.kind == "b":
+        return Column(name, "bool", values)
+    if values.dtype.kind in "iuf":
+        return Column(name, "number", values.astype(float))
+    return Column(name, "string", np.array(["" if v is None else str(v) for v in values], dtype=object))
+
+
+def calendar_columns(start: date, end: date, today: date) -> Dict[str, "np.ndarray"]:
+    """Python transliteration of the List.Dates calendar partition (Dim_Date)."""
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    years = days.astype("datetime64[Y]").astype(int) + 1970
+    months = days.astype("datetime64[M]").astype(int) % 12 + 1
+    day = (days - days.astype("datetime64[M]")).astype(int) + 1
+    weekday = (days.astype(int) + 3) % 7                         # Monday = 0
+    year_start = days.astype("datetime64[Y]").astype("datetime64[D]")
+    jan1_sunday_based = (year_start.astype(int) + 4) % 7         # Sunday = 0
+    week = ((days - year_start).astype(int) + jan1_sunday_based) // 7 + 1   # Date.WeekOfYear (Sunday start)
+    return {
+        "Date": days.astype("datetime64[s]"),
+        "Year": years.astype(float),
+        "Month": months.astype(float),
+        "Month_Name": np.array(MONTH_NAMES, dtype=object)[months - 1],
+        "Day": day.astype(float),
+        "Day_Of_Week": np.array(DAY_NAMES, dtype=object)[weekday],
+        "Week_Of_Year": week.astype(float),
+        "Quarter": ((months - 1) // 3 + 1).astype(float),
+        "Year_Month": np.array([f"{y}-{m:02d}" for y, m in zip(years, months)], dtype=object),
+        "Is_YTD": years == today.year,
+    }
+
+
+def shift_months(values: "np.ndarray", months: int) -> "np.ndarray":
+    """Add months, clamping to the end of the target month (time of day kept)."""
+    day_start = values.astype("datetime64[D]")
+    month_start = values.astype("datetime64[M]")
+    offset = (day_start - month_start.astype("datetime64[D]")).astype(int)
+    target = month_start + months
+    length = ((target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")).astype(int)
+    shifted = target.astype("datetime64[D]") + np.minimum(offset, length - 1)
+    return shifted.astype("datetime64[s]") + (values - day_start.astype("datetime64[s]"))
+
+
+def is_month_end(values: "np.ndarray") -> "np.ndarray":
+    days = values.astype("datetime64[D]")
+    return (days + 1).astype("datetime64[M]") != days.astype("datetime64[M]")
+
+
+class ColumnarModel:
+    """Tables, relationships and measure definitions for the evaluator."""
+
+    def __init__(self):
+        self.tables: Dict[str, ColumnTable] = {}
+        self.links: List[Link] = []
+        self.date_tables: Dict[str, str] = {}          # table -> date key column
+        self.measures: Dict[str, str] = {}             # name -> DAX
+        self.notes: List[str] = []
+        self._reach: Dict[str, Set[str]] = {}
+
+    def add_table(self, name: str, columns: Dict[str, Column]) -> ColumnTable:
+        rows = len(next(iter(columns.values())).data) if columns else 0
+        table = ColumnTable(name, rows, dict(columns))
+        self.tables[name] = table
+        return table
+
+    def column(self, table: str, column: str) -> Column:
+        try:
+            return self.tables[table].columns[column]
+        except KeyError:
+            raise UnsupportedDax(f"{table}[{column}] is not loaded") from None
+
+    def add_link(self, link: Link) -> None:
+        many = self.column(link.many_table, link.many_column)
+        one = self.column(link.one_table, link.one_column).data
+        keys = many.dictionary
+        if many.kind != self.column(link.one_table, link.one_column).kind:
+            self.notes.append(f"relationship {link.many_table}[{link.many_column}] -> "
+                              f"{link.one_table}[{link.one_column}] skipped (key types differ)")
+            return
+        order = np.argsort(one, kind="stable")
+        ordered = one[order]
+        position = np.clip(np.searchsorted(ordered, keys), 0, max(len(ordered) - 1, 0))
+        if len(ordered):
+            matched = ordered[position] == keys
+            link.row_of_key = np.where(matched, order[position], -1)
+        else:
+            link.row_of_key = np.full(len(keys), -1)
+        self.links.append(link)
+        self._reach = {}
+
+    def reachable_from(self, table: str) -> Set[str]:
+        """Tables a filter on `table` propagates to (excluding itself)."""
+        if table not in self._reach:
+            seen: Set[str] = set()
+            stack = [table]
+            while stack:
+                current = stack.pop()
+                for link in self.links:
+                    targets = []
+                    if link.one_table == current:
+                        targets.append(link.many_table)
+                    if link.both_directions and link.many_table == current:
+                        targets.append(link.one_table)
+                    for target in targets:
+                        if target not in seen and target != table:
+                            seen.add(target)
+                            stack.append(target)
+            self._reach[table] = seen
+        return self._reach[table]
+
+    def expanded(self, table: str) -> Set[str]:
+        """The table plus every table on the one side of its relationships (its expanded table)."""
+        out = {table}
+        stack = [table]
+        while stack:
+            current = stack.pop()
+            for link in self.links:
+                if link.many_table == current and link.one_table not in out:
+                    out.add(link.one_table)
+                    stack.append(link.one_table)
+        return out
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def find_table_file(data_dir: Optional[Path], table: str) -> Optional[Path]:
+    if data_dir is None or not data_dir.is_dir():
+        return None
+    wanted = {f"{table}.csv".lower(), f"{table.replace(' ', '_')}.csv".lower()}
+    for path in sorted(data_dir.iterdir()):
+        if path.is_file() and path.name.lower() in wanted:
+            return path
+    return None
+
+
+def read_table_csv(path: Path, table: TmdlNode) -> Dict[str, Column]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        rows = list(reader)
+    index = {name: i for i, name in enumerate(header)}
+    columns: Dict[str, Column] = {}
+    for column in table.columns:
+        position = index.get(column.name, index.get(column.get("sourceColumn")))
+        if position is None:
+            continue
+        values = [row[position] if position < len(row) else "" for row in rows]
+        columns[column.name] = typed_column(column.name, column.get("dataType") or None, values)
+    return columns
+
+
+def calendar_partition(table: TmdlNode, today: date) -> Optional[Dict[str, "np.ndarray"]]:
+    for partition in table.partitions:
+        source = partition.expression_properties.get("source", "")
+        if "List.Dates" not in source:
+            continue
+        bounds = [date(int(y), int(m), int(d)) for y, m, d in
+                  re.findall(r"#date\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)", source)]
+        if not bounds:
+            return None
+        end = bounds[1] if len(bounds) > 1 and "LocalNow" not in source.split("EndDate", 1)[-1][:80] else today
+        return calendar_columns(bounds[0], end, today)
+    return None
+
+
+def load_columnar_model(model: SemanticModel, data_dir: Optional[Path], today: date,
+                        overrides: Optional[Dict[str, Path]] = None) -> ColumnarModel:
+    data = ColumnarModel()
+    overrides = overrides or {}
+    for table in model.tables.values():
+        path = overrides.get(table.name) or find_table_file(data_dir, table.name)
+        if path is not None:
+            columns = read_table_csv(path, table)
+            if columns:
+                data.add_table(table.name, columns)
+                missing = [c.name for c in table.columns if c.name not in columns and not c.is_calculated]
+                if missing:
+                    data.notes.append(f"{table.name}: not in {path.name}: {', '.join(missing)}")
+            continue
+        calendar = calendar_partition(table, today)
+        if calendar is not None:
+            wanted = {c.name for c in table.columns}
+            data.add_table(table.name, {
+                name: column_from_values(name, values) for name, values in calendar.items() if name in wanted
+            })
+
+    for table in model.tables.values():
+        if table.name in data.tables and table.get("dataCategory") == "Time":
+            key = next((c.name for c in table.columns if c.get("isKey") == "true"), "Date")
+            if key in data.tables[table.name].columns:
+                data.date_tables[table.name] = key
+
+    for table, measure in model.iter_measures():
+        data.measures[measure.name] = measure.expression or ""
+
+    pending = [(t, c) for t in model.tables.values() if t.name in data.tables
+               for c in t.columns if c.is_calculated and c.name not in data.tables[t.name].columns]
+    relationships = [r for r in parse_relationships(model) if r.is_active]
+
+    def _link_ready(rel) -> bool:
+        return (rel.from_column in data.tables.get(rel.from_table, ColumnTable("", 0)).columns and
+                rel.to_column in data.tables.get(rel.to_table, ColumnTable("", 0)).columns)
+
+    linked: Set[str] = set()
+    evaluator = DaxEvaluator(data, today)
+    for _ in range(3):
+        for rel in relationships:
+            if rel.name not in linked and _link_ready(rel):
+                linked.add(rel.name)
+                if rel.is_many_to_many:
+                    data.notes.append(f"relationship {rel.label} skipped (many-to-many)")
+                    continue
+                data.add_link(Link(rel.from_table, rel.from_column, rel.to_table, rel.to_column,
+                                   rel.is_bidirectional))
+        remaining = []
+        for table, column in pending:
+            try:
+                values = evaluator.calculated_column(table.name, parse_dax(column.expression or ""))
+                data.tables[table.name].columns[column.name] = column_from_values(column.name, values)
+            except (UnsupportedDax, DaxSyntaxError) as exc:
+                remaining.append((table, column, str(exc)))
+        if len(remaining) == len(pending):
+            break
+        pending = [(t, c) for t, c, _ in remaining]
+    for table, column in pending:
+        data.notes.append(f"{table.name}[{column.name}] (calculated) not computed")
+    return data
+
+
+# ============================================================================
+# FILTER CONTEXT
+# ============================================================================
+
+class Filter:
+    """Rows of one table allowed on a set of its columns."""
+    __slots__ = ("table", "columns", "mask")
+
+    def __init__(self, table: str, columns: Iterable[str], mask: "np.ndarray"):
+        self.table = table
+        self.columns = frozenset(columns)
+        self.mask = mask
+
+
+class FilterContext:
+    """Immutable filter context with a per-context cache of visible rows."""
+    __slots__ = ("filters", "selected", "cache")
+
+    def __init__(self, filters: Iterable[Filter] = (), selected: Optional["FilterContext"] = None):
+        self.filters = tuple(filters)
+        self.selected = selected
+        self.cache: Dict[str, Optional["np.ndarray"]] = {}
+
+    def derive(self, filters: Iterable[Filter]) -> "FilterContext":
+        return FilterContext(filters, self.selected)
+
+    def with_filter(self, new: Filter, date_tables: Dict[str, str], keep: bool = False) -> "FilterContext":
+        if keep:
+            return self.derive(self.filters + (new,))
+        whole_table = date_tables.get(new.table) in new.columns
+
+        def replaced(f: Filter) -> bool:
+            return f.table == new.table and (whole_table or bool(f.columns & new.columns))
+
+        return self.derive(tuple(f for f in self.filters if not replaced(f)) + (new,))
+
+    def without(self, predicate: Callable[[Filter], bool]) -> "FilterContext":
+        return self.derive(f for f in self.filters if not predicate(f))
+
+
+@dataclass
+class TableValue:
+    """Rows of a base table, optionally projected to some of its columns."""
+    table: str
+    columns: Optional[Tuple[str, ...]]
+    mask: "np.ndarray"
+
+
+@dataclass
+class Grouping:
+    """Evaluate for every value of one column at once."""
+    table: str
+    column: str
+    codes: "np.ndarray"
+    size: int
+
+
+class Frame:
+    """Vectorized row context: column values for a batch of rows of one table."""
+
+    def __init__(self, table: str, size: int, getter: Callable[[str], "np.ndarray"]):
+        self.table = table
+        self.size = size
+        self.getter = getter
+
+    def get(self, column: str) -> "np.ndarray":
+        return self.getter(column)
+
+
+class Symbol(str):
+    """Keyword argument such as DAY, MONTH, DESC, DENSE."""
+
+
+# ============================================================================
+# EVALUATOR
+# ============================================================================
+
+def is_blank(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value:
+        return True
+    return isinstance(value, np.datetime64) and np.isnat(value)
+
+
+def blank_to_nan(values) -> "np.ndarray":
+    if isinstance(values, np.ndarray):
+        return values.astype(float) if values.dtype.kind in "biuf" else \
+            np.array([np.nan if is_blank(v) else float(v) for v in values])
+    return np.nan if is_blank(values) else float(values)
+
+
+class DaxEvaluator:
+    """Evaluates parsed DAX against a ColumnarModel."""
+
+    def __init__(self, data: ColumnarModel, today: Optional[date] = None):
+        self.data = data
+        self.today = today or date.today()
+        self._measures: Dict[str, Any] = {}
+        self.mode_counts = {"grouped": 0, "loop": 0}
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+
+    def measure_ast(self, name: str):
+        if name not in self._measures:
+            if name not in self.data.measures:
+                raise UnsupportedDax(f"unknown measure [{name}]")
+            try:
+                self._measures[name] = parse_dax(self.data.measures[name])
+            except DaxSyntaxError as exc:
+                raise UnsupportedDax(f"[{name}] does not parse: {exc}") from None
+        return self._measures[name]
+
+    def evaluate(self, node, ctx: Optional[FilterContext] = None):
+        if isinstance(node, str):
+            node = parse_dax(node)
+        ctx = ctx or FilterContext()
+        if ctx.selected is None:
+            ctx.selected = ctx
+        return self.eval(node, ctx, None, {})
+
+    def base_context(self, filters: Sequence[Any]) -> FilterContext:
+        """Context from DAX filter expressions (as CALCULATE arguments)."""
+        ctx = self.calculate_context(list(filters), FilterContext(), {})
+        ctx.selected = ctx
+        return ctx
+
+    def calculated_column(self, table: str, node) -> "np.ndarray":
+        if table not in self.data.tables:
+            raise UnsupportedDax(f"{table} is not loaded")
+        refs = {r.column for r in row_columns(node) if r.table in ("", table)}
+        columns = self.data.tables[table].columns
+        if any(c not in columns for c in refs):
+            raise UnsupportedDax(f"needs {', '.join(sorted(c for c in refs if c not in columns))}")
+        ctx = FilterContext()
+        ctx.selected = ctx
+        if len(refs) == 1:
+            column = columns[next(iter(refs))]
+            frame = Frame(table, len(column.dictionary), lambda c: column.dictionary)
+            return self.as_array(self.eval(node, ctx, frame, {}), frame)[column.codes]
+        rows = self.data.tables[table].rows
+        frame = Frame(table, rows, lambda c: columns[c].data)
+        return self.as_array(self.eval(node, ctx, frame, {}), frame)
+
+    # ------------------------------------------------------------------
+    # Visibility
+    # ------------------------------------------------------------------
+
+    def visible(self, table: str, ctx: FilterContext) -> Optional["np.ndarray"]:
+        """Row mask of `table` under ctx (None = every row)."""
+        if table in ctx.cache:
+            return ctx.cache[table]
+        ctx.cache[table] = None          # cycle guard for bidirectional links
+        mask = None
+        for f in ctx.filters:
+            if f.table == table:
+                mask = f.mask if mask is None else mask & f.mask
+        for link in self.data.links:
+            if link.many_table == table:
+                one = self.visible(link.one_table, ctx)
+                if one is None:
+                    continue
+                key_visible = np.append(one, False)[link.row_of_key]
+                rows = key_visible[self.data.column(table, link.many_column).codes]
+                mask = rows if mask is None else mask & rows
+            elif link.one_table == table and link.both_directions:
+                many = self.visible(link.many_table, ctx)
+                if many is None:
+                    continue
+                codes = np.unique(self.data.column(link.many_table, link.many_column).codes[many])
+                targets = link.row_of_key[codes]
+                rows = np.zeros(self.data.tables[table].rows, dtype=bool)
+                rows[targets[targets >= 0]] = True
+                mask = rows if mask is None else mask & rows
+        ctx.cache[table] = mask
+        return mask
+
+    def visible_values(self, ref: ColRef, ctx: FilterContext) -> "np.ndarray":
+        column = self.data.column(ref.table, ref.column)
+        mask = self.visible(ref.table, ctx)
+        return column.data if mask is None else column.data[mask]
+
+    # ------------------------------------------------------------------
+    # Core evaluation
+    # ------------------------------------------------------------------
+
+    def eval(self, node, ctx: FilterContext, frame: Optional[Frame], env: Dict[str, Any]):
+        if isinstance(node, Num):
+            return node.value
+        if isinstance(node, Str):
+            return node.value
+        if isinstance(node, ColRef):
+            return self.eval_column(node, ctx, frame)
+        if isinstance(node, Name):
+            return self.eval_name(node, ctx, env)
+        if isinstance(node, Call):
+            handler = getattr(self, f"fn_{node.name.replace('.', '_')}", None)
+            if handler is None:
+                if node.name in TABLE_FUNCTIONS:
+                    return self.eval_table(node, ctx, env)
+                raise UnsupportedDax(f"{node.name}() is not supported")
+            return handler(node.args, ctx, frame, env)
+        if isinstance(node, BinOp):
+            return self.eval_binop(node, ctx, frame, env)
+        if isinstance(node, Unary):
+            value = self.eval(node.operand, ctx, frame, env)
+            if node.op == "NOT":
+                return ~self.as_bool(value) if isinstance(value, np.ndarray) else not self.truthy(value)
+            return arith("-", 0.0, value)
+        if isinstance(node, VarBlock):
+            scope = dict(env)
+            for name, expr in node.bindings:
+                scope[name] = self.eval(expr, ctx, frame, scope)
+            return self.eval(node.body, ctx, frame, scope)
+        if isinstance(node, Braces):
+            return [self.eval(item, ctx, frame, env) for item in node.items]
+        raise UnsupportedDax(f"cannot evaluate {node!r}")
+
+    def eval_column(self, ref: ColRef, ctx: FilterContext, frame: Optional[Frame]):
+        if not ref.column:
+            return self.eval_table(ref, ctx, {})
+        if frame is not None and ref.table in ("", frame.table):
+            try:
+                return frame.get(ref.column)
+            except KeyError:
+                pass
+        is_column = ref.table in self.data.tables and ref.column in self.data.tables[ref.table].columns
+        if ref.column in self.data.measures and not is_column:
+            if frame is not None:
+                raise UnsupportedDax(f"[{ref.column}] inside a row context")
+            return self.eval(self.measure_ast(ref.column), ctx, None, {})
+        if not ref.table and frame is None:
+            raise UnsupportedDax(f"unknown measure [{ref.column}]")
+        raise UnsupportedDax(f"{ref.table}[{ref.column}] used without a row context")
+
+    def eval_name(self, node: Name, ctx: FilterContext, env: Dict[str, Any]):
+        key = node.name.upper()
+        if key in env:
+            return env[key]
+        if node.name in self.data.tables:
+            return self.eval_table(node, ctx, env)
+        if key in ("TRUE", "FALSE"):
+            return key == "TRUE"
+        return Symbol(key)
+
+    def eval_binop(self, node: BinOp, ctx, frame, env):
+        left = self.eval(node.left, ctx, frame, env)
+        if node.op == "IN":
+            right = self.in_values(node.right, ctx, frame, env)
+            if isinstance(left, np.ndarray):
+                return np.isin(left, right)
+            return any(compare("=", left, v) for v in right)
+        right = self.eval(node.right, ctx, frame, env)
+        if node.op in ("&&", "||"):
+            if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+                a, b = self.as_bool(left, frame), self.as_bool(right, frame)
+                return a & b if node.op == "&&" else a | b
+            return (self.truthy(left) and self.truthy(right)) if node.op == "&&" else \
+                (self.truthy(left) or self.truthy(right))
+        if node.op == "&":
+            return concat(left, right)
+        if node.op in DaxParser.COMPARISONS:
+            return compare(node.op, left, right)
+        return arith(node.op, left, right)
+
+    def in_values(self, node, ctx, frame, env) -> list:
+        if isinstance(node, Braces):
+            return [self.eval(item, ctx, None, env) for item in node.items]
+        value = self.eval_table(node, ctx, env)
+        if value.columns is None or len(value.columns) != 1:
+            raise UnsupportedDax("IN needs a one-column table")
+        column = self.data.column(value.table, value.columns[0])
+        return list(np.unique(column.data[value.mask]))
+
+    @staticmethod
+    def truthy(value) -> bool:
+        if is_blank(value):
+            return False
+        return bool(value)
+
+    def as_bool(self, value, frame: Optional[Frame] = None) -> "np.ndarray":
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind == "f":
+                return np.nan_to_num(value) != 0
+            if value.dtype.kind == "O":
+                return np.array([self.truthy(v) for v in value], dtype=bool)
+            return value.astype(bool)
+        return np.full(frame.size if frame else 1, self.truthy(value))
+
+    def as_array(self, value, frame: Frame) -> "np.ndarray":
+        if isinstance(value, np.ndarray):
+            return value
+        if value is None:
+            return np.full(frame.size, np.nan)
+        if isinstance(value, str):
+            return np.full(frame.size, value, dtype=object)
+        return np.full(frame.size, value)
+
+    # ------------------------------------------------------------------
+    # Tables and filters
+    # ------------------------------------------------------------------
+
+    def loaded(self, table: str) -> ColumnTable:
+        if table not in self.data.tables:
+            raise UnsupportedDax(f"table {table} is not loaded")
+        return self.data.tables[table]
+
+    def all_rows(self, table: str) -> "np.ndarray":
+        return np.ones(self.loaded(table).rows, dtype=bool)
+
+    def column_args(self, args: Sequence[Any]) -> Tuple[str, Tuple[str, ...]]:
+        refs = [a for a in args if isinstance(a, ColRef) and a.column]
+        tables = {r.table for r in refs}
+        if len(refs) != len(args) or len(tables) != 1:
+            raise UnsupportedDax("expected columns of one table")
+        return tables.pop(), tuple(r.column for r in refs)
+
+    def table_name(self, node) -> Optional[str]:
+        if isinstance(node, ColRef) and not node.column:
+            return node.table
+        if isinstance(node, Name) and node.name in self.data.tables:
+            return node.name
+        return None
+
+    def eval_table(self, node, ctx: FilterContext, env: Dict[str, Any]) -> TableValue:
+        name = self.table_name(node)
+        if name is not None:
+            self.loaded(name)
+            mask = self.visible(name, ctx)
+            return TableValue(name, None, self.all_rows(name) if mask is None else mask)
+        if isinstance(node, Name) and node.name.upper() in env:
+            value = env[node.name.upper()]
+            if isinstance(value, TableValue):
+                return value
+        if not isinstance(node, Call):
+            raise UnsupportedDax(f"expected a table expression, got {type(node).__name__}")
+        fn = node.name
+        args = node.args
+        if fn in ("ALL", "REMOVEFILTERS", "ALLSELECTED", "VALUES", "DISTINCT"):
+            if not args or args[0] is None:
+                raise UnsupportedDax(f"{fn}() without arguments as a table")
+            table = self.table_name(args[0])
+            columns = None if table else self.column_args(args)[1]
+            table = table or self.column_args(args)[0]
+            self.loaded(table)
+            if fn in ("ALL", "REMOVEFILTERS"):
+                mask = self.all_rows(table)
+            elif fn == "ALLSELECTED":
+                selected = ctx.selected or FilterContext()
+                mask = self.visible(table, selected)
+            else:
+                mask = self.visible(table, ctx)
+            return TableValue(table, columns, self.all_rows(table) if mask is None else mask)
+        if fn == "FILTER":
+            source = self.eval_table(args[0], ctx, env)
+            keep = self.filter_rows(source, args[1], ctx, env)
+            return TableValue(source.table, source.columns, keep)
+        if fn == "CALCULATETABLE":
+            return self.eval_table(args[0], self.calculate_context(list(args[1:]), ctx, env), env)
+        if fn == "KEEPFILTERS":
+            return self.eval_table(args[0], ctx, env)
+        if fn in TIME_INTELLIGENCE:
+            return self.time_intelligence(fn, args, ctx, env)
+        raise UnsupportedDax(f"{fn}() is not supported as a table")
+
+    def combo_keys(self, table: str, columns: Tuple[str, ...]) -> "np.ndarray":
+        if len(columns) == 1:
+            return self.data.column(table, columns[0]).codes
+        stacked = np.stack([self.data.column(table, c).codes for c in columns], axis=1)
+        return np.unique(stacked, axis=0, return_inverse=True)[1].ravel()
+
+    def table_rows(self, value: TableValue) -> "np.ndarray":
+        """One representative row per distinct row of the (projected) table."""
+        rows = np.flatnonzero(value.mask)
+        if value.columns is None:
+            return rows
+        keys = self.combo_keys(value.table, value.columns)[rows]
+        return rows[np.unique(keys, return_index=True)[1]]
+
+    def as_filter(self, value: TableValue) -> Filter:
+        table = self.data.tables[value.table]
+        if value.columns is None:
+            return Filter(value.table, table.columns.keys(), value.mask)
+        keys = self.combo_keys(value.table, value.columns)
+        allowed = np.zeros(int(keys.max()) + 1 if len(keys) else 1, dtype=bool)
+        allowed[keys[value.mask]] = True
+        return Filter(value.table, value.columns, allowed[keys])
+
+    def filter_rows(self, source: TableValue, predicate, ctx, env) -> "np.ndarray":
+        rows = self.table_rows(source)
+        if has_transition(predicate, self.data):
+            results = self.iterate(source, predicate, ctx, env)
+            keep_rows = rows[np.array([self.truthy(v) for v in results], dtype=bool)] if len(rows) else rows
+        else:
+            columns = self.data.tables[source.table].columns
+            frame = Frame(source.table, len(rows), lambda c: columns[c].data[rows])
+            keep_rows = rows[self.as_bool(self.eval(predicate, ctx, frame, env), frame)]
+        if source.columns is None:
+            mask = np.zeros_like(source.mask)
+            mask[keep_rows] = True
+            return mask
+        keys = self.combo_keys(source.table, source.columns)
+        allowed = np.zeros(int(keys.max()) + 1 if len(keys) else 1, dtype=bool)
+        allowed[keys[keep_rows]] = True
+        return source.mask & allowed[keys]
+
+    def predicate_filter(self, node, ctx, env) -> Filter:
+        refs = row_columns(node)
+        tables = {r.table for r in refs}
+        if not refs or len(tables) != 1 or "" in tables:
+            raise UnsupportedDax("filter predicate must reference columns of exactly one table")
+        table = tables.pop()
+        names = {r.column for r in refs}
+        if len(names) == 1:
+            column = self.data.column(table, next(iter(names)))
+            frame = Frame(table, len(column.dictionary), lambda c: column.dictionary)
+            return Filter(table, names, self.as_bool(self.eval(node, ctx, frame, env), frame)[column.codes])
+        columns = self.data.tables[table].columns
+        for name in names:
+            self.data.column(table, name)
+        frame = Frame(table, self.data.tables[table].rows, lambda c: columns[c].data)
+        return Filter(table, names, self.as_bool(self.eval(node, ctx, frame, env), frame))
+
+    def is_table_expression(self, node, env) -> bool:
+        if isinstance(node, Call):
+            return node.name in TABLE_FUNCTIONS
+        if self.table_name(node) is not None:
+            return True
+        return isinstance(node, Name) and isinstance(env.get(node.name.upper()), TableValue)
+
+    def calculate_context(self, args: List[Any], ctx: FilterContext, env: Dict[str, Any]) -> FilterContext:
+        """Apply CALCULATE filter arguments (all evaluated in the outer context)."""
+        modifiers, filters = [], []
+        for arg in args:
+            if arg is None:
+                continue
+            if isinstance(arg, Call) and arg.name in FILTER_MODIFIERS:
+                modifiers.append(arg)
+            elif isinstance(arg, Call) and arg.name == "KEEPFILTERS":
+                filters.append((self.filter_argument(arg.args[0], ctx, env), True))
+            elif isinstance(arg, Call) and arg.name in ("USERELATIONSHIP", "CROSSFILTER"):
+                raise UnsupportedDax(f"{arg.name}() is not supported")
+            else:
+                filters.append((self.filter_argument(arg, ctx, env), False))
+        result = ctx
+        for modifier in modifiers:
+            result = self.apply_modifier(modifier, result)
+        for new, keep in filters:
+            result = result.with_filter(new, self.data.date_tables, keep)
+        return result
+
+    def filter_argument(self, node, ctx, env) -> Filter:
+        if self.is_table_expression(node, env):
+            return self.as_filter(self.eval_table(node, ctx, env))
+        return self.predicate_filter(node, ctx, env)
+
+    def apply_modifier(self, modifier: Call, ctx: FilterContext) -> FilterContext:
+        args = [a for a in modifier.args if a is not None]
+        if modifier.name == "ALLEXCEPT":
+            table = self.table_name(args[0])
+            kept = {a.column for a in args[1:] if isinstance(a, ColRef)}
+            return ctx.without(lambda f: f.table in self.data.expanded(table) and not f.columns <= kept)
+        if not args:
+            if modifier.name == "ALLSELECTED":
+                return (ctx.selected or FilterContext()).derive((ctx.selected or FilterContext()).filters)
+            return ctx.derive(())
+        table = self.table_name(args[0])
+        if table is not None:
+            scope = self.data.expanded(table)
+            result = ctx.without(lambda f: f.table in scope)
+            restore = [f for f in (ctx.selected.filters if ctx.selected else ()) if f.table in scope]
+        else:
+            table, columns = self.column_args(args)
+            names = set(columns)
+            result = ctx.without(lambda f: f.table == table and bool(f.columns & names))
+            restore = [f for f in (ctx.selected.filters if ctx.selected else ())
+                       if f.table == table and f.columns & names]
+        if modifier.name == "ALLSELECTED":
+            result = result.derive(result.filters + tuple(restore))
+        return result
+
+    # ------------------------------------------------------------------
+    # Time intelligence
+    # ------------------------------------------------------------------
+
+    def time_intelligence(self, fn: str, args, ctx: FilterContext, env) -> TableValue:
+        ref = args[0]
+        if not isinstance(ref, ColRef) or not ref.column:
+            raise UnsupportedDax(f"{fn}() needs a date column")
+        column = self.data.column(ref.table, ref.column)
+        all_dates = column.data
+        current = self.visible_values(ref, ctx)
+        current = current[~np.isnat(current)]
+
+        def between(start, end) -> TableValue:
+            mask = np.zeros(len(all_dates), dtype=bool) if start is None or end is None else \
+                (all_dates >= start) & (all_dates <= end)
+            return TableValue(ref.table, (ref.column,), mask)
+
+        def matching(dates) -> TableValue:
+            return TableValue(ref.table, (ref.column,), np.isin(all_dates, dates))
+
+        last = current.max() if len(current) else None
+        first = current.min() if len(current) else None
+        if fn in ("DATESYTD", "DATESQTD", "DATESMTD"):
+            if last is None:
+                return between(None, None)
+            unit = {"DATESYTD": "Y", "DATESMTD": "M"}.get(fn)
+            if unit:
+                start = last.astype(f"datetime64[{unit}]").astype("datetime64[s]")
+            else:
+                month = last.astype("datetime64[M]")
+                start = (month - (month.astype(int) % 3)).astype("datetime64[s]")
+            return between(start, last)
+        if fn == "SAMEPERIODLASTYEAR":
+            return self.shifted(ref, current, -12, "MONTH")
+        if fn == "DATEADD":
+            count = int(self.eval(args[1], ctx, None, env))
+            unit = str(self.eval(args[2], ctx, None, env)).upper()
+            return self.shifted(ref, current, count, unit)
+        if fn == "DATESINPERIOD":
+            anchor = self.eval(args[1], ctx, None, env)
+            count = int(self.eval(args[2], ctx, None, env))
+            unit = str(self.eval(args[3], ctx, None, env)).upper()
+            if is_blank(anchor):
+                return between(None, None)
+            other = shift_dates(np.array([anchor], dtype="datetime64[s]"), count, unit)[0]
+            day = np.timedelta64(1, "D")
+            return between(other + day, anchor) if count < 0 else between(anchor, other - day)
+        if fn == "DATESBETWEEN":
+            start = self.eval(args[1], ctx, None, env)
+            end = self.eval(args[2], ctx, None, env)
+            start = all_dates.min() if is_blank(start) else np.datetime64(start, "s")
+            end = all_dates.max() if is_blank(end) else np.datetime64(end, "s")
+            return between(start, end)
+        if fn == "PREVIOUSDAY":
+            if first is None:
+                return between(None, None)
+            day = first.astype("datetime64[D]") - 1
+            return between(day.astype("datetime64[s]"), day.astype("datetime64[s]"))
+        if fn in ("PREVIOUSMONTH", "PREVIOUSYEAR"):
+            anchor = first if fn == "PREVIOUSMONTH" else last
+            if anchor is None:
+                return between(None, None)
+            unit = "M" if fn == "PREVIOUSMONTH" else "Y"
+            period = anchor.astype(f"datetime64[{unit}]") - 1
+            start = period.astype("datetime64[s]")
+            end = ((period + 1).astype("datetime64[D]") - 1).astype("datetime64[s]")
+            return between(start, end)
+        raise UnsupportedDax(f"{fn}() is not supported")
+
+    def shifted(self, ref: ColRef, current, count: int, unit: str) -> TableValue:
+        all_dates = self.data.column(ref.table, ref.column).data
+        target = shift_dates(current, count, unit)
+        if unit in ("MONTH", "QUARTER", "YEAR") and len(current):
+            # A shifted month end covers the rest of the target month (DATEADD on whole months)
+            ends = target[is_month_end(current)]
+            if len(ends):
+                month_end = ((ends.astype("datetime64[M]") + 1).astype("datetime64[D]") - 1).astype("datetime64[s]")
+                extra = (all_dates[:, None] > ends[None, :]) & (all_dates[:, None] <= month_end[None, :])
+                return TableValue(ref.table, (ref.column,), np.isin(all_dates, target) | extra.any(axis=1))
+        return TableValue(ref.table, (ref.column,), np.isin(all_dates, target))
+
+    # ------------------------------------------------------------------
+    # Iteration (context transition)
+    # ------------------------------------------------------------------
+
+    def iterate(self, value: TableValue, expr, ctx: FilterContext, env) -> list:
+        """expr evaluated once per (distinct) row of the table, with context transition."""
+        rows = self.table_rows(value)
+        columns = value.columns or tuple(self.data.tables[value.table].columns)
+        if not has_transition(expr, self.data):
+            table_columns = self.data.tables[value.table].columns
+            frame = Frame(value.table, len(rows), lambda c: table_columns[c].data[rows])
+            result = self.as_array(self.eval(expr, ctx, frame, env), frame)
+            return [None if is_blank(v) else v for v in result]
+        if len(columns) == 1:
+            column = self.data.column(value.table, columns[0])
+            grouping = Grouping(value.table, columns[0], column.codes, len(column.dictionary))
+            base = ctx.without(lambda f: f.table == value.table and columns[0] in f.columns)
+            try:
+                grouped = self.grouped(expr, base, grouping, env)
+                self.mode_counts["grouped"] += 1
+                picked = grouped[column.codes[rows]]
+                return [None if v != v else float(v) for v in picked]
+            except NotGroupable:
+                pass
+        self.mode_counts["loop"] += 1
+        out = []
+        for row in rows:
+            inner = ctx
+            for name in columns:
+                column = self.data.column(value.table, name)
+                inner = inner.with_filter(Filter(value.table, (name,), column.codes == column.codes[row]),
+                                          self.data.date_tables)
+            out.append(self.eval(expr, inner, None, env))
+        return out
+
+    # ------------------------------------------------------------------
+    # Grouped evaluation (all values of one column at once)
+    # ------------------------------------------------------------------
+
+    def group_index(self, grouping: Grouping, table: str) -> Optional["np.ndarray"]:
+        if table == grouping.table:
+            return grouping.codes
+        for link in self.data.links:
+            if link.many_table == table and link.one_table == grouping.table and not link.both_directions:
+                ext = np.append(grouping.codes, -1)
+                return ext[link.row_of_key][self.data.column(table, link.many_column).codes]
+        if table in self.data.reachable_from(grouping.table):
+            raise NotGroupable(f"{grouping.table} reaches {table} indirectly")
+        return None
+
+    def depends_on_group(self, node, grouping: Grouping, env) -> bool:
+        reached = self.data.reachable_from(grouping.table) | {grouping.table}
+        for item in walk(node):
+            if isinstance(item, ColRef):
+                if item.table == "" and item.column in self.data.measures:
+                    return True
+            elif isinstance(item, Call) and (item.name in AGGREGATIONS or item.name in TABLE_FUNCTIONS
+                                               or item.name in ITERATORS):
+                for arg in item.args:
+                    if isinstance(arg, ColRef) and arg.table in reached:
+                        return True
+                    if isinstance(arg, Name) and arg.name in reached:
+                        return True
+            elif isinstance(item, Name) and isinstance(env.get(item.name.upper()), np.ndarray):
+                return True
+        return False
+
+    def grouped(self, node, ctx: FilterContext, g: Grouping, env) -> "np.ndarray":
+        if isinstance(node, Num):
+            return np.full(g.size, node.value)
+        if isinstance(node, Name):
+            value = env.get(node.name.upper())
+            if isinstance(value, np.ndarray) and value.shape == (g.size,):
+                return value
+            if isinstance(value, (int, float)) or value is None:
+                return np.full(g.size, blank_to_nan(value))
+            raise NotGroupable(node.name)
+        if isinstance(node, ColRef):
+            is_column = node.table in self.data.tables and node.column in self.data.tables[node.table].columns
+            if node.column in self.data.measures and not is_column:
+                return self.grouped(self.measure_ast(node.column), ctx, g, {})
+            raise NotGroupable("column outside an aggregation")
+        if isinstance(node, VarBlock):
+            scope = dict(env)
+            for name, expr in node.bindings:
+                scope[name] = self.grouped(expr, ctx, g, scope)
+            return self.grouped(node.body, ctx, g, scope)
+        if isinstance(node, Unary):
+            value = self.grouped(node.operand, ctx, g, env)
+            return np.where(np.nan_to_num(value) == 0, 1.0, 0.0) if node.op == "NOT" else -value
+        if isinstance(node, BinOp):
+            if node.op in ("IN", "&"):
+                raise NotGroupable(node.op)
+            left = self.grouped(node.left, ctx, g, env)
+            right = self.grouped(node.right, ctx, g, env)
+            if node.op in DaxParser.COMPARISONS:
+                return compare(node.op, np.nan_to_num(left), np.nan_to_num(right)).astype(float)
+            if node.op == "&&":
+                return ((np.nan_to_num(left) != 0) & (np.nan_to_num(right) != 0)).astype(float)
+            if node.op == "||":
+                return ((np.nan_to_num(left) != 0) | (np.nan_to_num(right) != 0)).astype(float)
+            return arith(node.op, left, right)
+        if isinstance(node, Call):
+            return self.grouped_call(node, ctx, g, env)
+        raise NotGroupable(type(node).__name__)
+
+    def grouped_call(self, node: Call, ctx: FilterContext, g: Grouping, env) -> "np.ndarray":
+        fn, args = node.name, node.args
+        if fn in ("SUM", "AVERAGE", "MIN", "MAX", "COUNT", "COUNTA", "DISTINCTCOUNT") and len(args) == 1 \
+                and isinstance(args[0], ColRef) and args[0].column:
+            return self.grouped_aggregate(fn, args[0].table, args[0].column, ctx, g)
+        if fn == "COUNTROWS" and len(args) == 1 and self.table_name(args[0]):
+            return self.grouped_aggregate(fn, self.table_name(args[0]), None, ctx, g)
+        if fn == "CALCULATE":
+            for arg in args[1:]:
+                if arg is None:
+                    continue
+                if self.depends_on_group(arg, g, env):
+                    raise NotGroupable("filter argument depends on the group")
+                if isinstance(arg, Call) and arg.name in FILTER_MODIFIERS:
+                    target = self.table_name(arg.args[0]) if arg.args and arg.args[0] is not None else None
+                    if not arg.args or arg.args[0] is None or arg.name in ("ALLSELECTED", "ALLEXCEPT") or \
+                            (target and g.table in self.data.expanded(target)) or \
+                            any(isinstance(a, ColRef) and a.table == g.table and a.column == g.column
+                                for a in arg.args):
+                        raise NotGroupable("modifier removes the group filter")
+            inner = self.calculate_context([a for a in args[1:] if a is not None], ctx, env)
+            date_column = self.data.date_tables.get(g.table)
+            for f in inner.filters[len(ctx.filters):]:
+                if f.table == g.table and (g.column in f.columns or date_column in f.columns):
+                    raise NotGroupable("filter replaces the group filter")
+            if any(f not in inner.filters for f in ctx.filters):
+                # A removed outer filter is fine; only the group column must stay untouched
+                pass
+            return self.grouped(args[0], inner, g, env)
+        if fn == "DIVIDE":
+            numerator = self.grouped(args[0], ctx, g, env)
+            denominator = self.grouped(args[1], ctx, g, env)
+            alternate = self.grouped(args[2], ctx, g, env) if len(args) > 2 and args[2] is not None \
+                else np.full(g.size, np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = numerator / denominator
+            return np.where(np.isnan(denominator) | (denominator == 0), alternate, result)
+        if fn == "IF":
+            condition = np.nan_to_num(self.grouped(args[0], ctx, g, env)) != 0
+            then = self.grouped(args[1], ctx, g, env)
+            other = self.grouped(args[2], ctx, g, env) if len(args) > 2 and args[2] is not None \
+                else np.full(g.size, np.nan)
+            return np.where(condition, then, other)
+        if fn == "BLANK":
+            return np.full(g.size, np.nan)
+        if fn in ("TRUE", "FALSE"):
+            return np.full(g.size, 1.0 if fn == "TRUE" else 0.0)
+        if fn == "ABS":
+            return np.abs(self.grouped(args[0], ctx, g, env))
+        if fn == "ISBLANK":
+            return np.isnan(self.grouped(args[0], ctx, g, env)).astype(float)
+        raise NotGroupable(fn)
+
+    def grouped_aggregate(self, fn: str, table: str, column: Optional[str], ctx: FilterContext,
+                          g: Grouping) -> "np.ndarray":
+        index = self.group_index(g, table)
+        if index is None:
+            scalar = self.aggregate(fn, table, column, ctx)
+            return np.full(g.size, blank_to_nan(scalar))
+        mask = self.visible(table, ctx)
+        selected = index >= 0 if mask is None else (index >= 0) & mask
+        groups = index[selected]
+        if fn == "COUNTROWS":
+            counts = np.bincount(groups, minlength=g.size).astype(float)
+            counts[counts == 0] = np.nan
+            return counts
+        col = self.data.column(table, column)
+        if fn == "DISTINCTCOUNT":
+            pairs = np.unique(np.stack([groups, col.codes[selected]], axis=1), axis=0)
+            counts = np.bincount(pairs[:, 0], minlength=g.size).astype(float) if len(pairs) else np.zeros(g.size)
+            counts[counts == 0] = np.nan
+            return counts
+        if col.kind != "number":
+            if fn in ("COUNT", "COUNTA"):
+                values_present = ~np.array([is_blank(v) or v == "" for v in col.data[selected]], dtype=bool)
+                counts = np.bincount(groups[values_present], minlength=g.size).astype(float)
+                counts[counts == 0] = np.nan
+                return counts
+            raise NotGroupable(f"{fn} over a {col.kind} column")
+        values = col.data[selected]
+        valid = ~np.isnan(values)
+        groups, values = groups[valid], values[valid]
+        counts = np.bincount(groups, minlength=g.size).astype(float)
+        if fn in ("COUNT", "COUNTA"):
+            counts[counts == 0] = np.nan
+            return counts
+        if fn in ("SUM", "AVERAGE"):
+            sums = np.bincount(groups, weights=values, minlength=g.size).astype(float)
+            result = sums / np.where(counts == 0, 1, counts) if fn == "AVERAGE" else sums
+        else:
+            result = np.full(g.size, np.inf if fn == "MIN" else -np.inf)
+            (np.minimum if fn == "MIN" else np.maximum).at(result, groups, values)
+        result[counts == 0] = np.nan
+        return result
+
+    # ------------------------------------------------------------------
+    # Scalar aggregation
+    # ------------------------------------------------------------------
+
+    def aggregate(self, fn: str, table: str, column: Optional[str], ctx: FilterContext):
+        rows = self.loaded(table).rows
+        mask = self.visible(table, ctx)
+        if fn == "COUNTROWS":
+            count = rows if mask is None else int(mask.sum())
+            return float(count) if count else None
+        col = self.data.column(table, column)
+        if fn == "DISTINCTCOUNT":
+            codes = col.codes if mask is None else col.codes[mask]
+            count = len(np.unique(codes))
+            return float(count) if count else None
+        if (fn in ("SUM", "AVERAGE") and col.kind != "number") or (fn in ("MIN", "MAX") and col.kind not in ("number", "date")):
+            raise UnsupportedDax(f"{fn}() over {table}[{column}], a {col.kind} column")
+        values = col.data if mask is None else col.data[mask]
+        if col.kind == "number":
+            values = values[~np.isnan(values)]
+        elif col.kind == "date":
+            values = values[~np.isnat(values)]
+        elif col.kind == "string":
+            values = values[values != ""]
+        if fn in ("COUNT", "COUNTA"):
+            return float(len(values)) if len(values) else None
+        if not len(values):
+            return None
+        if fn == "SUM":
+            return float(values.sum())
+        if fn == "AVERAGE":
+            return float(values.mean())
+        if fn == "MIN":
+            return values.min() if col.kind != "number" else float(values.min())
+        if fn == "MAX":
+            return values.max() if col.kind != "number" else float(values.max())
+        raise UnsupportedDax(f"{fn}() is not supported")
+
+    def _aggregate_call(self, fn: str, args, ctx, frame, env):
+        if len(args) == 1 and isinstance(args[0], ColRef) and args[0].column:
+            return self.broadcast(self.aggregate(fn, args[0].table, args[0].column, ctx), frame)
+        if fn in ("MIN", "MAX") and len(args) == 2:
+            a = self.eval(args[0], ctx, frame, env)
+            b = self.eval(args[1], ctx, frame, env)
+            if is_blank(a):
+                return b
+            if is_blank(b):
+                return a
+            return (min if fn == "MIN" else max)(a, b)
+        raise UnsupportedDax(f"{fn}() needs a single column")
+
+    def broadcast(self, value, frame: Optional[Frame]):
+        return value if frame is None else self.as_array(value, frame)
+
+    def fn_SUM(self, args, ctx, frame, env):
+        return self._aggregate_call("SUM", args, ctx, frame, env)
+
+    def fn_AVERAGE(self, args, ctx, frame, env):
+        return self._aggregate_call("AVERAGE", args, ctx, frame, env)
+
+    def fn_MIN(self, args, ctx, frame, env):
+        return self._aggregate_call("MIN", args, ctx, frame, env)
+
+    def fn_MAX(self, args, ctx, frame, env):
+        return self._aggregate_call("MAX", args, ctx, frame, env)
+
+    def fn_COUNT(self, args, ctx, frame, env):
+        return self._aggregate_call("COUNT", args, ctx, frame, env)
+
+    def fn_COUNTA(self, args, ctx, frame, env):
+        return self._aggregate_call("COUNTA", args, ctx, frame, env)
+
+    def fn_DISTINCTCOUNT(self, args, ctx, frame, env):
+        return self._aggregate_call("DISTINCTCOUNT", args, ctx, frame, env)
+
+    def fn_COUNTROWS(self, args, ctx, frame, env):
+        name = self.table_name(args[0])
+        if name is not None:
+            return self.broadcast(self.aggregate("COUNTROWS", name, None, ctx), frame)
+        count = len(self.table_rows(self.eval_table(args[0], ctx, env)))
+        return self.broadcast(float(count) if count else None, frame)
+
+    def _iterator(self, fn: str, args, ctx, frame, env):
+        if frame is not None:
+            raise UnsupportedDax(f"{fn}() inside a row context")
+        values = [v for v in self.iterate(self.eval_table(args[0], ctx, env), args[1], ctx, env)
+                  if not is_blank(v)]
+        if fn == "COUNTX":
+            return float(len(values)) if values else None
+        if not values:
+            return None
+        if fn == "SUMX":
+            return float(sum(values))
+        if fn == "AVERAGEX":
+            return float(sum(values)) / len(values)
+        return min(values) if fn == "MINX" else max(values)
+
+    def fn_SUMX(self, args, ctx, frame, env):
+        return self._iterator("SUMX", args, ctx, frame, env)
+
+    def fn_AVERAGEX(self, args, ctx, frame, env):
+        return self._iterator("AVERAGEX", args, ctx, frame, env)
+
+    def fn_MINX(self, args, ctx, frame, env):
+        return self._iterator("MINX", args, ctx, frame, env)
+
+    def fn_MAXX(self, args, ctx, frame, env):
+        return self._iterator("MAXX", args, ctx, frame, env)
+
+    def fn_COUNTX(self, args, ctx, frame, env):
+        return self._iterator("COUNTX", args, ctx, frame, env)
+
+    # ------------------------------------------------------------------
+    # CALCULATE / RANKX / selection
+    # ------------------------------------------------------------------
+
+    def fn_CALCULATE(self, args, ctx, frame, env):
+        if frame is not None:
+            raise UnsupportedDax("CALCULATE inside a vectorized row context")
+        return self.eval(args[0], self.calculate_context(list(args[1:]), ctx, env), None, env)
+
+    def fn_RANKX(self, args, ctx, frame, env):
+        if frame is not None:
+            raise UnsupportedDax("RANKX inside a row context")
+        values = self.iterate(self.eval_table(args[0], ctx, env), args[1], ctx, env)
+        current = self.eval(args[2] if len(args) > 2 and args[2] is not None else args[1], ctx, None, env)
+        order = str(self.eval(args[3], ctx, None, env)).upper() if len(args) > 3 and args[3] is not None else "DESC"
+        ties = str(self.eval(args[4], ctx, None, env)).upper() if len(args) > 4 and args[4] is not None else "SKIP"
+        numbers = np.array([0.0 if is_blank(v) else float(v) for v in values])
+        current = 0.0 if is_blank(current) else float(current)
+        ascending = order in ("ASC", "1", "TRUE")
+        better = numbers < current if ascending else numbers > current
+        if ties == "DENSE":
+            return float(len(np.unique(numbers[better])) + 1)
+        return float(better.sum() + 1)
+
+    def fn_SELECTEDVALUE(self, args, ctx, frame, env):
+        values = np.unique(self.visible_values(args[0], ctx))
+        alternate = self.eval(args[1], ctx, frame, env) if len(args) > 1 and args[1] is not None else None
+        value = values[0] if len(values) == 1 else alternate
+        if isinstance(value, np.generic) and not isinstance(value, np.datetime64):
+            value = value.item()
+        return self.broadcast(value, frame)
+
+    def fn_HASONEVALUE(self, args, ctx, frame, env):
+        return self.broadcast(len(np.unique(self.visible_values(args[0], ctx))) == 1, frame)
+
+    def fn_ISFILTERED(self, args, ctx, frame, env):
+        ref = args[0]
+        name = self.table_name(ref)
+        hit = any(f.table == (name or ref.table) and (name is not None or ref.column in f.columns)
+                  for f in ctx.filters)
+        return self.broadcast(hit, frame)
+
+    # ------------------------------------------------------------------
+    # Scalar functions (vectorized inside a Frame)
+    # ------------------------------------------------------------------
+
+    def _args(self, args, ctx, frame, env) -> list:
+        return [None if a is None else self.eval(a, ctx, frame, env) for a in args]
+
+    def fn_DIVIDE(self, args, ctx, frame, env):
+        values = self._args(args, ctx, frame, env)
+        numerator, denominator = values[0], values[1]
+        alternate = values[2] if len(values) > 2 else None
+        if frame is not None:
+            n, d = blank_to_nan(self.as_array(numerator, frame)), blank_to_nan(self.as_array(denominator, frame))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = n / d
+            return np.where(np.isnan(d) | (d == 0), blank_to_nan(self.as_array(alternate, frame)), result)
+        if is_blank(denominator) or float(denominator) == 0:
+            return alternate
+        if is_blank(numerator):
+            return None
+        return float(numerator) / float(denominator)
+
+    def fn_IF(self, args, ctx, frame, env):
+        condition = self.eval(args[0], ctx, frame, env)
+        if frame is None:
+            branch = args[1] if self.truthy(condition) else (args[2] if len(args) > 2 else None)
+            return None if branch is None else self.eval(branch, ctx, frame, env)
+        mask = self.as_bool(condition, frame)
+        then = self.as_array(self.eval(args[1], ctx, frame, env), frame)
+        other = self.as_array(self.eval(args[2], ctx, frame, env), frame) if len(args) > 2 and args[2] is not None \
+            else np.full(frame.size, np.nan)
+        return np.where(mask, then, other)
+
+    def fn_SWITCH(self, args, ctx, frame, env):
+        if frame is not None:
+            raise UnsupportedDax("SWITCH inside a row context")
+        subject = self.eval(args[0], ctx, None, env)
+        pairs = args[1:]
+        for i in range(0, len(pairs) - 1, 2):
+            if compare("=", subject, self.eval(pairs[i], ctx, None, env)):
+                return self.eval(pairs[i + 1], ctx, None, env)
+        return self.eval(pairs[-1], ctx, None, env) if len(pairs) % 2 else None
+
+    def fn_AND(self, args, ctx, frame, env):
+        return self.eval_binop(BinOp("&&", args[0], args[1]), ctx, frame, env)
+
+    def fn_OR(self, args, ctx, frame, env):
+        return self.eval_binop(BinOp("||", args[0], args[1]), ctx, frame, env)
+
+    def fn_NOT(self, args, ctx, frame, env):
+        return self.eval(Unary("NOT", args[0]), ctx, frame, env)
+
+    def fn_BLANK(self, args, ctx, frame, env):
+        return self.broadcast(None, frame)
+
+    def fn_TRUE(self, args, ctx, frame, env):
+        return self.broadcast(True, frame)
+
+    def fn_FALSE(self, args, ctx, frame, env):
+        return self.broadcast(False, frame)
+
+    def fn_ISBLANK(self, args, ctx, frame, env):
+        value = self.eval(args[0], ctx, frame, env)
+        if isinstance(value, np.ndarray):
+            return np.array([is_blank(v) for v in value], dtype=bool)
+        return is_blank(value)
+
+    def fn_COALESCE(self, args, ctx, frame, env):
+        if frame is not None:
+            raise UnsupportedDax("COALESCE inside a row context")
+        for arg in args:
+            value = self.eval(arg, ctx, None, env)
+            if not is_blank(value):
+                return value
+        return None
+
+    def _numeric(self, args, ctx, frame, env, fn: Callable):
+        value = self.eval(args[0], ctx, frame, env)
+        if isinstance(value, np.ndarray):
+            return fn(blank_to_nan(value))
+        return None if is_blank(value) else float(fn(float(value)))
+
+    def fn_ABS(self, args, ctx, frame, env):
+        return self._numeric(args, ctx, frame, env, np.abs)
+
+    def fn_INT(self, args, ctx, frame, env):
+        return self._numeric(args, ctx, frame, env, np.floor)
+
+    def fn_ROUND(self, args, ctx, frame, env):
+        digits = int(self.eval(args[1], ctx, None, env)) if len(args) > 1 and args[1] is not None else 0
+        return self._numeric(args, ctx, frame, env, lambda v: np.round(v, digits))
+
+    def fn_TODAY(self, args, ctx, frame, env):
+        return self.broadcast(np.datetime64(self.today, "s"), frame)
+
+    def fn_DATE(self, args, ctx, frame, env):
+        y, m, d = (int(v) for v in self._args(args, ctx, None, env))
+        value = np.datetime64(f"{y:04d}-01-01", "M") + (m - 1)
+        return self.broadcast(value.astype("datetime64[D]").astype("datetime64[s]") +
+                              np.timedelta64(d - 1, "D"), frame)
+
+    def _date_part(self, args, ctx, frame, env, part: str):
+        value = self.eval(args[0], ctx, frame, env)
+        values = np.atleast_1d(np.asarray(value, dtype="datetime64[s]"))
+        if part == "Y":
+            out = values.astype("datetime64[Y]").astype(int) + 1970
+        elif part == "M":
+            out = values.astype("datetime64[M]").astype(int) % 12 + 1
+        else:
+            out = (values.astype("datetime64[D]") - values.astype("datetime64[M]")).astype(int) + 1
+        out = np.where(np.isnat(values), np.nan, out.astype(float))
+        return out if isinstance(value, np.ndarray) else (None if np.isnan(out[0]) else float(out[0]))
+
+    def fn_YEAR(self, args, ctx, frame, env):
+        return self._date_part(args, ctx, frame, env, "Y")
+
+    def fn_MONTH(self, args, ctx, frame, env):
+        return self._date_part(args, ctx, frame, env, "M")
+
+    def fn_DAY(self, args, ctx, frame, env):
+        return self._date_part(args, ctx, frame, env, "D")
+
+    def fn_WEEKDAY(self, args, ctx, frame, env):
+        value = self.eval(args[0], ctx, frame, env)
+        kind = int(self.eval(args[1], ctx, None, env)) if len(args) > 1 and args[1] is not None else 1
+        days = np.atleast_1d(np.asarray(value, dtype="datetime64[s]")).astype("datetime64[D]")
+        monday0 = (days.astype(int) + 3) % 7
+        out = {1: (monday0 + 1) % 7 + 1, 2: monday0 + 1, 3: monday0}.get(kind)
+        if out is None:
+            raise UnsupportedDax(f"WEEKDAY return type {kind}")
+        out = np.where(np.isnat(days), np.nan, out.astype(float))
+        return out if isinstance(value, np.ndarray) else (None if np.isnan(out[0]) else float(out[0]))
+
+    def fn_DATEDIFF(self, args, ctx, frame, env):
+        start = self.eval(args[0], ctx, frame, env)
+        end = self.eval(args[1], ctx, frame, env)
+        unit = str(self.eval(args[2], ctx, None, env)).upper()
+        a = np.asarray(start, dtype="datetime64[s]")
+        b = np.asarray(end, dtype="datetime64[s]")
+        if unit == "DAY":
+            out = (b.astype("datetime64[D]") - a.astype("datetime64[D]")).astype(float)
+        elif unit == "MONTH":
+            out = (b.astype("datetime64[M]") - a.astype("datetime64[M]")).astype(float)
+        elif unit == "YEAR":
+            out = (b.astype("datetime64[Y]") - a.astype("datetime64[Y]")).astype(float)
+        else:
+            raise UnsupportedDax(f"DATEDIFF unit {unit}")
+        out = np.where(np.isnat(a) | np.isnat(b), np.nan, out)
+        if isinstance(start, np.ndarray) or isinstance(end, np.ndarray):
+            return out
+        return None if np.isnan(out) else float(out)
+
+    def fn_CONTAINSSTRING(self, args, ctx, frame, env):
+        within = self.eval(args[0], ctx, frame, env)
+        find = str(self.eval(args[1], ctx, None, env)).lower()
+        if isinstance(within, np.ndarray):
+            return np.char.find(np.char.lower(within.astype(str)), find) >= 0
+        return find in ("" if is_blank(within) else str(within)).lower()
+
+
+def has_transition(node, data: ColumnarModel) -> bool:
+    """True if evaluating node needs context transition (measure reference or CALCULATE)."""
+    for item in walk(node):
+        if isinstance(item, Call) and item.name in {"CALCULATE", "CALCULATETABLE", "RANKX"} | ITERATORS:
+            return True
+        if isinstance(item, ColRef) and item.column in data.measures and not (
+                item.table in data.tables and item.column in data.tables[item.table].columns):
+            return True
+    return False
+
+
+def shift_dates(values: "np.ndarray", count: int, unit: str) -> "np.ndarray":
+    unit = unit.upper()
+    if unit == "DAY":
+        return values + np.timedelta64(count, "D")
+    months = {"MONTH": 1, "QUARTER": 3, "YEAR": 12}.get(unit)
+    if months is None:
+        raise UnsupportedDax(f"interval {unit}")
+    return shift_months(values, count * months)
+
+
+def arith(op: str, a, b):
+    """DAX arithmetic: BLANK is 0 for + and -, and propagates through * / ^."""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        if (isinstance(a, np.ndarray) and a.dtype.kind == "M") or isinstance(a, np.datetime64):
+            days = blank_to_nan(b) if not isinstance(b, np.ndarray) or b.dtype.kind != "M" else None
+            if days is None:
+                return (np.asarray(a) - np.asarray(b)).astype("timedelta64[s]").astype(float) / SECONDS_PER_DAY
+            delta = (np.nan_to_num(days) * SECONDS_PER_DAY).astype("timedelta64[s]")
+            return a + delta if op == "+" else a - delta
+        x, y = blank_to_nan(a), blank_to_nan(b)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if op in ("+", "-"):
+                both = np.isnan(x) & np.isnan(y)
+                result = np.nan_to_num(x) + np.nan_to_num(y) if op == "+" else np.nan_to_num(x) - np.nan_to_num(y)
+                return np.where(both, np.nan, result)
+            if op == "*":
+                return x * y
+            if op == "/":
+                return x / y
+            if op == "^":
+                return x ** y
+    if isinstance(a, np.datetime64):
+        if isinstance(b, np.datetime64):
+            return float((a - b) / np.timedelta64(1, "s")) / SECONDS_PER_DAY
+        delta = np.timedelta64(int(round((0.0 if is_blank(b) else float(b)) * SECONDS_PER_DAY)), "s")
+        return a + delta if op == "+" else a - delta
+    if op in ("+", "-"):
+        if is_blank(a) and is_blank(b):
+            return None
+        x = 0.0 if is_blank(a) else float(a)
+        y = 0.0 if is_blank(b) else float(b)
+        return x + y if op == "+" else x - y
+    if is_blank(a) or is_blank(b):
+        return None
+    if op == "*":
+        return float(a) * float(b)
+    if op == "/":
+        return float(a) / float(b) if float(b) != 0 else float("inf")
+    if op == "^":
+        return float(a) ** float(b)
+    raise UnsupportedDax(f"operator {op}")
+
+
+def compare(op: str, a, b):
+    """DAX comparison: BLANK equals 0 / empty string."""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        if isinstance(a, np.ndarray) and a.dtype.kind == "f":
+            a = np.nan_to_num(a)
+        if isinstance(b, np.ndarray) and b.dtype.kind == "f":
+            b = np.nan_to_num(b)
+        if b is None:
+            b = "" if isinstance(a, np.ndarray) and a.dtype.kind in "OU" else 0.0
+        if a is None:
+            a = "" if isinstance(b, np.ndarray) and b.dtype.kind in "OU" else 0.0
+        if isinstance(b, np.datetime64) or (isinstance(b, np.ndarray) and b.dtype.kind == "M"):
+            a = np.asarray(a, dtype="datetime64[s]") if not isinstance(a, np.ndarray) or a.dtype.kind != "M" else a
+    else:
+        if is_blank(a) and is_blank(b):
+            a = b = 0.0
+        elif is_blank(a):
+            a = "" if isinstance(b, str) else (b * 0 if not isinstance(b, np.datetime64) else None)
+        elif is_blank(b):
+            b = "" if isinstance(a, str) else (a * 0 if not isinstance(a, np.datetime64) else None)
+        if a is None or b is None:
+            return op in ("<>", "<", "<=") if b is None else op in ("<>", ">", ">=")
+        if isinstance(a, bool) or isinstance(b, bool):
+            a, b = float(a), float(b)
+        if isinstance(a, str) != isinstance(b, str):
+            a, b = str(a), str(b)
+    if op == "=":
+        return a == b
+    if op == "<>":
+        return a != b
+    if op == "<":
+        return a < b
+    if op == ">":
+        return a > b
+    if op == "<=":
+        return a <= b
+    return a >= b
+
+
+def concat(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        size = len(a) if isinstance(a, np.ndarray) else len(b)
+        left = a if isinstance(a, np.ndarray) else np.full(size, a, dtype=object)
+        right = b if isinstance(b, np.ndarray) else np.full(size, b, dtype=object)
+        return np.array([format_value(x) + format_value(y) for x, y in zip(left, right)], dtype=object)
+    return format_value(a) + format_value(b)
+
+
+def format_value(value) -> str:
+    if is_blank(value):
+        return ""
+    if isinstance(value, np.datetime64):
+        text = str(value.astype("datetime64[s]"))
+        return text[:10] if text.endswith("T00:00:00") else text.replace("T", " ")
+    if isinstance(value, (float, np.floating)):
+        return str(int(value)) if float(value).is_integer() and abs(value) < 1e15 else f"{float(value):.6g}"
+    if isinstance(value, (bool, np.bool_)):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+# ============================================================================
+# REPORT FILTER CONTEXTS
+# ============================================================================
+
+def parse_literal(text: str):
+    if text == "null":
+        return None
+    if text in ("true", "false"):
+        return text == "true"
+    if text.startswith("datetime'"):
+        return np.datetime64(text[9:-1], "s")
+    if text.startswith("'"):
+        return text[1:-1].replace("''", "'")
+    if text[-1:] in ("L", "D", "M"):
+        text = text[:-1]
+    return float(text)
+
+
+def _column_of(expr: Dict[str, Any], aliases: Dict[str, str]) -> Tuple[str, str]:
+    column = expr.get("Column")
+    if not column:
+        raise UnsupportedDax(f"filter on {next(iter(expr), '?')} expression")
+    source = column.get("Expression", {}).get("SourceRef", {})
+    return source.get("Entity") or aliases.get(source.get("Source", ""), ""), column.get("Property", "")
+
+
+def condition_filter(evaluator: DaxEvaluator, condition: Dict[str, Any], aliases: Dict[str, str]) -> Filter:
+    """Semantic-query filter condition (In / Comparison / And / Or / Not) -> row mask."""
+    if "And" in condition or "Or" in condition:
+        key = "And" if "And" in condition else "Or"
+        left = condition_filter(evaluator, condition[key]["Left"], aliases)
+        right = condition_filter(evaluator, condition[key]["Right"], aliases)
+        if left.table != right.table:
+            raise UnsupportedDax(f"{key} across tables")
+        mask = left.mask & right.mask if key == "And" else left.mask | right.mask
+        return Filter(left.table, left.columns | right.columns, mask)
+    if "Not" in condition:
+        inner = condition_filter(evaluator, condition["Not"]["Expression"], aliases)
+        return Filter(inner.table, inner.columns, ~inner.mask)
+    if "In" in condition:
+        expressions = condition["In"].get("Expressions", [])
+        refs = [_column_of(e, aliases) for e in expressions]
+        tables = {t for t, _ in refs}
+        if len(tables) != 1:
+            raise UnsupportedDax("In filter across tables")
+        table = tables.pop()
+        mask = np.zeros(evaluator.data.tables[table].rows, dtype=bool) if table in evaluator.data.tables else None
+        if mask is None:
+            raise UnsupportedDax(f"table {table} is not loaded")
+        for row in condition["In"].get("Values", []):
+            hit = np.ones_like(mask)
+            for (t, c), item in zip(refs, row):
+                value = parse_literal(item.get("Literal", {}).get("Value", "null"))
+                hit &= np.asarray(compare("=", evaluator.data.column(t, c).data, value), dtype=bool)
+            mask |= hit
+        return Filter(table, [c for _, c in refs], mask)
+    if "Comparison" in condition:
+        comparison = condition["Comparison"]
+        table, column = _column_of(comparison["Left"], aliases)
+        value = parse_literal(comparison.get("Right", {}).get("Literal", {}).get("Value", "null"))
+        op = {0: "=", 1: ">", 2: ">=", 3: "<", 4: "<="}.get(comparison.get("ComparisonKind", 0), "=")
+        mask = np.asarray(compare(op, evaluator.data.column(table, column).data, value), dtype=bool)
+        return Filter(table, [column], mask)
+    raise UnsupportedDax(f"filter condition {next(iter(condition), '?')}")
+
+
+def filters_from_json(evaluator: DaxEvaluator, filter_json: Dict[str, Any]) -> List[Filter]:
+    aliases = {item.get("Name", ""): item.get("Entity", "") for item in filter_json.get("From", [])}
+    return [condition_filter(evaluator, where.get("Condition", {}), aliases)
+            for where in filter_json.get("Where", [])]
+
+
+def container_filters(evaluator: DaxEvaluator, data: Dict[str, Any], notes: List[str], label: str) -> List[Filter]:
+    out: List[Filter] = []
+    for item in data.get("filterConfig", {}).get("filters", []):
+        if "filter" not in item:
+            continue
+        try:
+            out.extend(filters_from_json(evaluator, item["filter"]))
+        except (UnsupportedDax, KeyError, ValueError) as exc:
+            notes.append(f"{label}: filter {item.get('name', '?')} ignored ({exc})")
+    return out
+
+
+def slicer_filters(evaluator: DaxEvaluator, visual_data: Dict[str, Any], notes: List[str], label: str) -> List[Filter]:
+    out: List[Filter] = []
+    for general in visual_data.get("visual", {}).get("objects", {}).get("general", []):
+        selection = general.get("properties", {}).get("filter", {}).get("filter")
+        if not selection:
+            continue
+        try:
+            out.extend(filters_from_json(evaluator, selection))
+        except (UnsupportedDax, KeyError, ValueError) as exc:
+            notes.append(f"{label}: slicer selection ignored ({exc})")
+    return out
+
+
+def projection_query(query_state: Dict[str, Any]) -> Tuple[List[Tuple[str, str]], List[Tuple[str, Any]], List[str]]:
+    """(group columns, (label, measure AST) pairs, unsupported projections) of a queryState."""
+    groups: List[Tuple[str, str]] = []
+    measures: List[Tuple[str, Any]] = []
+    skipped: List[str] = []
+    for bucket in query_state.values():
+        for projection in bucket.get("projections", []):
+            field_def = projection.get("field", {})
+            label = projection.get("queryRef", "?")
+            if "Measure" in field_def:
+                measures.append((label, ColRef("", field_def["Measure"].get("Property", ""))))
+            elif "Column" in field_def:
+                entity = field_def["Column"].get("Expression", {}).get("SourceRef", {}).get("Entity", "")
+                groups.append((entity, field_def["Column"].get("Property", "")))
+            elif "Aggregation" in field_def:
+                inner = field_def["Aggregation"].get("Expression", {}).get("Column", {})
+                entity = inner.get("Expression", {}).get("SourceRef", {}).get("Entity", "")
+                fn = QUERY_AGGREGATIONS.get(field_def["Aggregation"].get("Function"))
+                if fn is None:
+                    skipped.append(label)
+                else:
+                    measures.append((label, Call(fn, (ColRef(entity, inner.get("Property", "")),))))
+            else:
+                skipped.append(label)
+    return groups, measures, skipped
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+@dataclass
+class QueryResult:
+    label: str
+    groups: List[str]
+    measures: List[str]
+    rows: List[List[Any]] = field(default_factory=list)
+    total: List[Any] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    modes: Dict[str, str] = field(default_factory=dict)
+    timings_ms: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label, "groups": self.groups, "measures": self.measures,
+            "rows": [[format_value(v) if not isinstance(v, float) else v for v in row] for row in self.rows],
+            "total": [format_value(v) if not isinstance(v, float) else v for v in self.total],
+            "errors": self.errors, "modes": self.modes,
+            "timing_ms": summarize_timings(self.timings_ms),
+        }
+
+
+def summarize_timings(timings: List[float]) -> Dict[str, float]:
+    if not timings:
+        return {}
+    return {"min": round(min(timings), 3), "median": round(statistics.median(timings), 3),
+            "runs": len(timings)}
+
+
+def run_query(evaluator: DaxEvaluator, label: str, groups: List[Tuple[str, str]],
+              measures: List[Tuple[str, Any]], base: FilterContext) -> QueryResult:
+    """SUMMARIZECOLUMNS-like: one row per visible group value with a non-blank measure, plus a total."""
+    result = QueryResult(label, [f"{t}[{c}]" for t, c in groups], [m for m, _ in measures])
+    base.selected = base
+    columns: Dict[str, List[Any]] = {}
+
+    combos: List[Tuple[Any, ...]] = [()]
+    group_filters: List[List[Filter]] = [[]]
+    single: Optional[Grouping] = None
+    if groups:
+        for table, column in groups:
+            evaluator.data.column(table, column)
+        tables = {t for t, _ in groups}
+        if len(tables) == 1:
+            table = tables.pop()
+            visible = evaluator.visible(table, base)
+            value = TableValue(table, tuple(c for _, c in groups),
+                               evaluator.all_rows(table) if visible is None else visible)
+            rows = evaluator.table_rows(value)
+        else:
+            raise UnsupportedDax("grouping columns from several tables")
+        order = np.lexsort([evaluator.data.column(table, c).codes[rows] for _, c in reversed(groups)])
+        rows = rows[order]
+        combos = [tuple(evaluator.data.column(table, c).data[r] for _, c in groups) for r in rows]
+        group_filters = [[Filter(table, (c,), evaluator.data.column(table, c).codes ==
+                                 evaluator.data.column(table, c).codes[r]) for _, c in groups] for r in rows]
+        if len(groups) == 1:
+            column = evaluator.data.column(table, groups[0][1])
+            single = Grouping(table, groups[0][1], column.codes, len(column.dictionary))
+            picked_codes = column.codes[rows]
+
+    for name, node in measures:
+        values: List[Any] = []
+        try:
+            if single is not None:
+                try:
+                    grouped_ctx = base.without(lambda f: f.table == single.table and single.column in f.columns)
+                    grouped_ctx.selected = base
+                    grouped = evaluator.grouped(node, grouped_ctx, single, {})
+                    values = [None if v != v else float(v) for v in grouped[picked_codes]]
+                    result.modes[name] = "grouped"
+                except NotGroupable as exc:
+                    result.modes[name] = f"per-group ({exc})"
+                    values = []
+            if not values and groups:
+                for filters in group_filters:
+                    ctx = base
+                    for f in filters:
+                        ctx = ctx.with_filter(f, evaluator.data.date_tables)
+                    values.append(evaluator.eval(node, ctx, None, {}))
+                result.modes.setdefault(name, "per-group")
+            total = evaluator.eval(node, base, None, {})
+        except (UnsupportedDax, DaxSyntaxError) as exc:
+            result.errors[name] = str(exc)
+            values, total = [None] * len(combos), None
+        columns[name] = values
+        result.total.append(total)
+
+    for i, combo in enumerate(combos if groups else []):
+        row_values = [columns[m][i] if i < len(columns[m]) else None for m, _ in measures]
+        if measures and all(is_blank(v) for v in row_values):
+            continue
+        result.rows.append(list(combo) + row_values)
+    return result
+
+
+def timed_query(evaluator: DaxEvaluator, label, groups, measures, base_filters, repeat: int) -> QueryResult:
+    result = None
+    timings = []
+    for _ in range(max(repeat, 1)):
+        base = FilterContext(base_filters)
+        started = time.perf_counter()
+        result = run_query(evaluator, label, groups, measures, base)
+        timings.append((time.perf_counter() - started) * 1000)
+    result.timings_ms = timings
+    return result
+
+
+def report_queries(evaluator: DaxEvaluator, report_path: Path, page_filter: Optional[str],
+                   notes: List[str]) -> List[Tuple[str, List[Tuple[str, str]], List[Tuple[str, Any]], List[Filter]]]:
+    report = load_report(report_path)
+    report_level = container_filters(evaluator, report.report_data, notes, "report")
+    queries = []
+    for page_id in report.page_order or list(report.pages):
+        page = report.pages.get(page_id)
+        if page is None or (page_filter and page_filter not in (page.display_name, page_id)):
+            continue
+        page_level = report_level + container_filters(evaluator, page.data, notes, page.display_name)
+        for visual in page.visuals:
+            if visual.visual_type == "slicer":
+                page_level += slicer_filters(evaluator, visual.data, notes, f"{page.display_name}/{visual.visual_id}")
+        for visual in page.visuals:
+            if not visual.is_data_bound or visual.visual_type == "slicer":
+                continue
+            label = f"{page.display_name}/{visual.visual_id} ({visual.visual_type})"
+            groups, measures, skipped = projection_query(visual.query_state)
+            if skipped:
+                notes.append(f"{label}: projections not evaluated: {', '.join(skipped)}")
+            if not measures:
+                continue
+            own = container_filters(evaluator, visual.data, notes, label)
+            queries.append((label, groups, measures, page_level + own))
+    return queries
+
+
+# ============================================================================
+# SELF-TEST
+# ============================================================================
+
+SELF_TEST_MEASURES = {
+    "Total Views": "SUM(Fact[Views])",
+    "Direct Views": 'CALCULATE(SUM(Fact[Views]), Fact[Channel] = "Direct")',
+    "Direct %": "DIVIDE([Direct Views], [Total Views], 0)",
+    "Views YTD": "CALCULATE([Total Views], DATESYTD(Dim_Date[Date]))",
+    "Views SPLY": "CALCULATE([Total Views], SAMEPERIODLASTYEAR(Dim_Date[Date]))",
+    "Views PM": "CALCULATE([Total Views], DATEADD(Dim_Date[Date], -1, MONTH))",
+    "Running Views": "CALCULATE([Total Views], FILTER(ALL(Dim_Date[Date]), Dim_Date[Date] <= MAX(Dim_Date[Date])))",
+    "Press Views": 'CALCULATE([Total Views], Dim_Pages[Page_Type] = "Press Release")',
+    "All Views": "CALCULATE([Total Views], REMOVEFILTERS())",
+    "Share": "DIVIDE([Total Views], [All Views])",
+    "Page Rank": "RANKX(ALL(Fact[Page_URL]), CALCULATE(SUM(Fact[Views])), , DESC, DENSE)",
+    "YoY %": "VAR Cur = [Total Views] VAR Prior = [Views SPLY] RETURN DIVIDE(Cur - Prior, Prior, BLANK())",
+    "7-Day Avg": "AVERAGEX(DATESINPERIOD(Dim_Date[Date], MAX(Dim_Date[Date]), -7, DAY), CALCULATE([Total Views]))",
+}
+
+
+def self_test_model() -> ColumnarModel:
+    data = ColumnarModel()
+    dates = ["2024-01-10", "2024-02-15", "2024-02-20", "2025-01-05", "2025-02-10", "2025-02-15",
+             "2025-02-20", "2025-03-01"]
+    data.add_table("Fact", {
+        "Date": typed_column("Date", "dateTime", dates),
+        "Page_URL": typed_column("Page_URL", "string", ["a", "b", "a", "b", "a", "c", "b", "a"]),
+        "Channel": typed_column("Channel", "string", ["Direct", "Organic", "Direct", "Direct", "Organic",
+                                                       "Direct", "Organic", "Direct"]),
+        "Views": typed_column("Views", "int64", ["10", "20", "30", "40", "50", "60", "70", "80"]),
+    })
+    calendar = calendar_columns(date(2024, 1, 1), date(2025, 12, 31), date(2025, 3, 1))
+    data.add_table("Dim_Date", {name: column_from_values(name, values) for name, values in calendar.items()})
+    data.add_table("Dim_Pages", {
+        "Page_URL": typed_column("Page_URL", "string", ["a", "b", "c"]),
+        "Page_Type": typed_column("Page_Type", "string", ["Press Release", "Press Release", "Landing Page"]),
+    })
+    data.date_tables["Dim_Date"] = "Date"
+    data.add_link(Link("Fact", "Date", "Dim_Date", "Date"))
+    data.add_link(Link("Fact", "Page_URL", "Dim_Pages", "Page_URL"))
+    data.measures.update(SELF_TEST_MEASURES)
+    return data
+
+
+def run_self_test() -> bool:
+    data = self_test_model()
+    evaluator = DaxEvaluator(data, date(2025, 3, 1))
+    feb = [parse_dax('Dim_Date[Year_Month] = "2025-02"')]
+    expected = [
+        ("Total Views", [], 360.0),
+        ("Total Views", feb, 180.0),
+        ("Direct Views", feb, 60.0),
+        ("Direct %", feb, 60.0 / 180.0),
+        ("Views YTD", feb, 220.0),
+        ("Views SPLY", feb, 50.0),
+        ("Views PM", feb, 40.0),
+        ("Running Views", feb, 280.0),
+        ("Press Views", [], 300.0),
+        ("Share", feb, 0.5),
+        ("YoY %", feb, (180.0 - 50.0) / 50.0),
+        ("Page Rank", [parse_dax('Fact[Page_URL] = "c"')], 3.0),
+        ("7-Day Avg", [parse_dax('Dim_Date[Date] = DATE(2025, 2, 20)')], (60.0 + 70.0) / 2),
+    ]
+    ok = True
+    print("SELF-TEST")
+    print("-" * 80)
+    for measure, filters, want in expected:
+        got = evaluator.evaluate(ColRef("", measure), evaluator.base_context(filters))
+        passed = got is not None and abs(float(got) - want) < 1e-9
+        ok &= passed
+        where = " with filter" if filters else ""
+        print(f"  [{'PASS' if passed else 'FAIL'}] {measure}{where}: {format_value(got)} (expected {format_value(want)})")
+
+    # Grouped (bincount) evaluation must match one filter context per group
+    measures = [(m, ColRef("", m)) for m in SELF_TEST_MEASURES]
+    for group in (("Fact", "Channel"), ("Fact", "Page_URL"), ("Dim_Date", "Year_Month"), ("Dim_Pages", "Page_Type")):
+        grouped = run_query(evaluator, "grouped", [group], measures, FilterContext())
+        looped = []
+        for row in grouped.rows:
+            ctx = evaluator.base_context([BinOp("=", ColRef(*group), Str(row[0]))])
+            looped.append([row[0]] + [evaluator.eval(node, ctx, None, {}) for _, node in measures])
+        same = all(
+            (is_blank(a) and is_blank(b)) or (not is_blank(a) and not is_blank(b) and abs(float(a) - float(b)) < 1e-9)
+            for got_row, want_row in zip(grouped.rows, looped) for a, b in zip(got_row[1:], want_row[1:]))
+        ok &= same and len(grouped.rows) == len(looped)
+        fast = sum(1 for mode in grouped.modes.values() if mode == "grouped")
+        print(f"  [{'PASS' if same else 'FAIL'}] grouped by {group[0]}[{group[1]}] matches per-group "
+              f"evaluation ({fast}/{len(measures)} measures vectorized)")
+    print()
+    print("[SUCCESS] Self-test passed." if ok else "[ERROR] Self-test failed.")
+    return ok
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_result(result: QueryResult, max_rows: int) -> None:
+    timing = summarize_timings(result.timings_ms)
+    print(f"{result.label}  ({timing.get('min', 0):.2f} ms min, {timing.get('median', 0):.2f} ms median, "
+          f"{timing.get('runs', 0)} run(s))")
+    print("-" * 80)
+    headers = result.groups + result.measures
+    if result.groups:
+        widths = [max(len(h), 12) for h in headers]
+        print("  " + "  ".join(h[:40].ljust(min(w, 40)) for h, w in zip(headers, widths)))
+        for row in result.rows[:max_rows]:
+            print("  " + "  ".join(format_value(v)[:40].ljust(min(w, 40)) for v, w in zip(row, widths)))
+        if len(result.rows) > max_rows:
+            print(f"  ... {len(result.rows) - max_rows} more row(s)")
+        total = ["Total"] + [""] * (len(result.groups) - 1) + result.total
+        print("  " + "  ".join(format_value(v)[:40].ljust(min(w, 40)) for v, w in zip(total, widths)))
+    else:
+        for name, value in zip(result.measures, result.total):
+            status = f"UNSUPPORTED: {result.errors[name]}" if name in result.errors else format_value(value)
+            print(f"  {name[:50]:<50} {status}")
+    for name, error in result.errors.items():
+        if result.groups:
+            print(f"  [WARN] {name}: {error}")
+    for name, mode in result.modes.items():
+        if mode != "grouped":
+            print(f"  [INFO] {name}: {mode}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate and time DAX measures on local data with a NumPy columnar engine",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every measure at the grand total
+  python dax_columnar_engine.py --data-dir ./data
+
+  # Views by channel for 2025, timed over 20 runs
+  python dax_columnar_engine.py --data-dir ./data --measure "Total Views" --measure "Channel Rank" \\
+      --group-by "Fact_Press_Analytics[Channel_Group]" --filter "Dim_Date[Year] = 2025" --repeat 20
+
+  # Compare a rewrite against the shipped measure
+  python dax_columnar_engine.py --data-dir ./data --measure "Views YTD" \\
+      --variant "Views YTD=CALCULATE(SUM(Fact_Press_Analytics[Views]), DATESYTD(Dim_Date[Date]))" --repeat 50
+
+  # Visuals of the report with their slicer/page filters
+  python dax_columnar_engine.py --data-dir ./data --report ../press-room-dashboard.Report
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder")
+    parser.add_argument("--data-dir", help="Folder with <Table>.csv files")
+    parser.add_argument("--table", action="append", default=[], help='Explicit table file, "Table=path.csv"')
+    parser.add_argument("--measure", action="append", default=[], help="Measure to evaluate (repeatable)")
+    parser.add_argument("--expression", help="Ad-hoc DAX expression to evaluate")
+    parser.add_argument("--variant", action="append", default=[], help='"Name=DAX" variant of measure Name')
+    parser.add_argument("--filter", action="append", default=[], help="DAX filter for the base context")
+    parser.add_argument("--group-by", action="append", default=[], help='Grouping column "Table[Column]"')
+    parser.add_argument("--report", help="Evaluate the data-bound visuals of this .Report folder")
+    parser.add_argument("--page", help="Limit --report to this page (display name or id)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per query for timing (default: 1)")
+    parser.add_argument("--today", help="Date for TODAY() and M calendars (YYYY-MM-DD)")
+    parser.add_argument("--rows", type=int, default=20, help="Rows printed per result (default: 20)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--self-test", action="store_true", help="Check the engine against hand-computed values")
+    args = parser.parse_args()
+
+    if np is None:
+        print("ERROR: numpy is required (pip install numpy)")
+        sys.exit(1)
+    if args.self_test:
+        sys.exit(0 if run_self_test() else 1)
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+    today = date.fromisoformat(args.today) if args.today else date.today()
+    overrides = {}
+    for item in args.table:
+        name, _, path = item.partition("=")
+        overrides[name.strip()] = Path(path.strip())
+
+    model = load_semantic_model(model_path)
+    data = load_columnar_model(model, Path(args.data_dir) if args.data_dir else None, today, overrides)
+    evaluator = DaxEvaluator(data, today)
+
+    print("=" * 80)
+    print("Columnar DAX Evaluator".center(80))
+    print("=" * 80)
+    print()
+    print("TABLES")
+    print("-" * 80)
+    for table in data.tables.values():
+        print(f"  {table.name:<40} {table.rows:>10,} rows  {len(table.columns)} columns")
+    if not data.tables:
+        print("  [ERROR] No table data found; pass --data-dir or --table")
+        sys.exit(1)
+    notes = list(data.notes)
+    print()
+
+    try:
+        base_filters = [parse_dax(f) for f in args.filter]
+        groups = []
+        for item in args.group_by:
+            ref = parse_dax(item)
+            if not isinstance(ref, ColRef) or not ref.column:
+                raise DaxSyntaxError(f"--group-by expects Table[Column], got {item}")
+            groups.append((ref.table, ref.column))
+        variants = []
+        for item in args.variant:
+            name, _, expression = item.partition("=")
+            variants.append((name.strip(), parse_dax(expression)))
+        adhoc = parse_dax(args.expression) if args.expression else None
+    except DaxSyntaxError as exc:
+        print(f"ERROR: {exc}")
+        sys.exit(1)
+
+    queries = []
+    if args.report:
+        queries = [(label, g, m, f) for label, g, m, f in
+                   report_queries(evaluator, Path(args.report), args.page, notes)]
+        if not queries:
+            print("[INFO] No data-bound visuals with measures in the report")
+    else:
+        names = args.measure or ([] if adhoc is not None or variants else sorted(data.measures))
+        measures = [(n, ColRef("", n)) for n in names]
+        if adhoc is not None:
+            measures.append(("Expression", adhoc))
+        for name, node in variants:
+            if name in data.measures and name not in names:
+                measures.append((name, ColRef("", name)))
+            measures.append((f"{name} (variant)", node))
+        try:
+            base = evaluator.base_context(base_filters)
+        except UnsupportedDax as exc:
+            print(f"ERROR: filter not supported: {exc}")
+            sys.exit(1)
+        queries = [("Query", groups, measures, list(base.filters))]
+
+    results = []
+    for label, query_groups, measures, filters in queries:
+        try:
+            if len(measures) > 1 and not query_groups and args.repeat > 1:
+                # One timing per measure when timing grand totals
+                for name, node in measures:
+                    results.append(timed_query(evaluator, name, query_groups, [(name, node)], filters, args.repeat))
+            else:
+                results.append(timed_query(evaluator, label, query_groups, measures, filters, args.repeat))
+        except UnsupportedDax as exc:
+            notes.append(f"{label}: {exc}")
+
+    for result in results:
+        print_result(result, args.rows)
+
+    comparisons = []
+    for name, _ in variants:
+        original = next((r for r in results for m in r.measures if m == name), None)
+        variant = next((r for r in results for m in r.measures if m == f"{name} (variant)"), None)
+        if original is None or variant is None:
+            continue
+        a = original.total[original.measures.index(name)]
+        b = variant.total[variant.measures.index(f"{name} (variant)")]
+        same = (is_blank(a) and is_blank(b)) or (
+            not is_blank(a) and not is_blank(b) and abs(float(a) - float(b)) <= 1e-9 * max(1.0, abs(float(a))))
+        comparisons.append({"measure": name, "original": format_value(a), "variant": format_value(b), "match": same})
+
+    if comparisons:
+        print("VARIANTS")
+        print("-" * 80)
+        for item in comparisons:
+            marker = "[SUCCESS]" if item["match"] else "[ERROR]"
+            print(f"  {marker} {item['measure']}: original {item['original']}  variant {item['variant']}")
+        print()
+
+    if notes:
+        print("NOTES")
+        print("-" * 80)
+        for note in notes:
+            print(f"  [INFO] {note}")
+        print()
+    print(f"Iterations: {evaluator.mode_counts['grouped']} vectorized, {evaluator.mode_counts['loop']} per value")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "tables": {t.name: t.rows for t in data.tables.values()},
+            "results": [r.to_dict() for r in results],
+            "variants": comparisons,
+            "notes": notes,
+        }, indent=2, default=str), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    if any(not item["match"] for item in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
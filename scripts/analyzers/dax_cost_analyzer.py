@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Static DAX Cost Analyzer
+
+Flags expensive DAX patterns in semantic model measures without opening
+Power BI Desktop. Measures are read from the TMDL files, tokenized, grouped
+into a call tree and run through a rule engine. Each finding carries a cost
+weight; the report ranks measures and display folders by total weight so
+Performance Analyzer time goes to the right places first.
+
+Rules:
+- FILTER_WHOLE_TABLE            FILTER over an entire table where a column predicate would do
+- NESTED_ITERATOR               Iterator inside the row expression of another iterator
+- CONTEXT_TRANSITION_IN_ITERATOR Measure reference evaluated per row of a large table
+- REPEATED_SUBEXPRESSION        Identical sub-expression evaluated more than once (use VAR)
+- RANKX_HIGH_CARDINALITY        RANKX over a large table or high-cardinality column
+- SUMMARIZE_WITH_EXPRESSIONS    SUMMARIZE computing extension columns (use ADDCOLUMNS/SUMMARIZECOLUMNS)
+- DISTINCTCOUNT_HIGH_CARDINALITY DISTINCTCOUNT over a high-cardinality column
+
+Weights are relative, not milliseconds. Use them to rank, then confirm in
+Performance Analyzer.
+
+Usage:
+    python dax_cost_analyzer.py [semantic_model_path] [--table Metrics] [--top 25] [--json report.json]
+
+Options:
+    --table: Only analyze measures of this table (repeatable)
+    --large-table: Treat this table as large/high-cardinality (repeatable)
+    --high-cardinality-column: Table[Column] to treat as high cardinality (repeatable)
+    --top: Number of measures to show in the ranking (default: 25)
+    --json: Write the full report as JSON
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from dax_lexer import (
+    CallNode, DaxSyntaxError, Token, build_call_tree, declared_variables,
+    extract_references, iter_calls, normalize_tokens, tokenize,
+)
+from tmdl_model import SemanticModel, TmdlNode, load_semantic_model
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+# Functions that iterate a table and evaluate expressions in row context
+ITERATOR_FUNCTIONS = {
+    "SUMX", "AVERAGEX", "MINX", "MAXX", "COUNTX", "COUNTAX", "PRODUCTX", "MEDIANX",
+    "CONCATENATEX", "RANKX", "FILTER", "ADDCOLUMNS", "SELECTCOLUMNS", "GENERATE",
+    "GENERATEALL", "TOPN", "PERCENTILEX.INC", "PERCENTILEX.EXC", "STDEVX.P", "STDEVX.S",
+    "VARX.P", "VARX.S", "GEOMEANX", "SUMMARIZE",
+}
+
+# Functions whose result is "the whole table" when given a table argument
+TABLE_WRAPPERS = {"ALL", "ALLSELECTED", "ALLNOBLANKROW", "ALLCROSSFILTERED", "VALUES", "DISTINCT"}
+
+# Column-name fragments that usually mean one value per row (URLs, titles, keys)
+HIGH_CARDINALITY_HINTS = ("url", "title", "path", "_id", "key", "guid")
+
+RULE_WEIGHTS = {
+    "FILTER_WHOLE_TABLE": 8.0,
+    "NESTED_ITERATOR": 5.0,
+    "CONTEXT_TRANSITION_IN_ITERATOR": 4.0,
+    "REPEATED_SUBEXPRESSION": 3.0,
+    "RANKX_HIGH_CARDINALITY": 8.0,
+    "SUMMARIZE_WITH_EXPRESSIONS": 3.0,
+    "DISTINCTCOUNT_HIGH_CARDINALITY": 2.0,
+}
+
+# Multiplier applied when the pattern runs over a large (fact-grain) table
+LARGE_TABLE_FACTOR = 1.5
+
+# Minimum token length for a repeated sub-expression to be worth a VAR
+MIN_REPEAT_TOKENS = 6
+
+
+@dataclass
+class CostFinding:
+    """A single expensive pattern found in a measure."""
+    rule: str
+    weight: float
+    message: str
+    suggestion: str = ""
+
+
+@dataclass
+class MeasureCost:
+    """Static cost of one measure."""
+    table: str
+    measure: str
+    display_folder: str
+    cost: float = 0.0
+    token_count: int = 0
+    iterator_count: int = 0
+    findings: List[CostFinding] = field(default_factory=list)
+    parse_error: Optional[str] = None
+
+
+@dataclass
+class FolderCost:
+    """Aggregated cost for one display folder."""
+    display_folder: str
+    measures: int = 0
+    flagged_measures: int = 0
+    total_cost: float = 0.0
+    max_cost: float = 0.0
+    top_measure: str = ""
+
+
+@dataclass
+class _MeasureContext:
+    """Per-measure state shared by the rules."""
+    tokens: List[Token]
+    calls: List[CallNode]
+    variables: Set[str]
+
+
+class DaxCostAnalyzer:
+    """Rule engine that scores measures by expensive DAX patterns."""
+
+    def __init__(self, model: SemanticModel, large_tables: Optional[Set[str]] = None,
+                 high_cardinality_columns: Optional[Set[Tuple[str, str]]] = None):
+        self.model = model
+        self.measure_names = set(model.measure_index().keys())
+        self.large_tables = detect_large_tables(model) | set(large_tables or ())
+        self.high_cardinality_columns = set(high_cardinality_columns or ())
+
+    # ============================================================================
+    # DRIVER
+    # ============================================================================
+
+    def analyze_all(self, tables: Optional[Set[str]] = None) -> List[MeasureCost]:
+        """Analyze every measure (optionally restricted to some tables), ranked by cost."""
+        results = []
+        for table, measure in self.model.iter_measures():
+            if tables and table.name not in tables:
+                continue
+            results.append(self.analyze_measure(table, measure))
+        results.sort(key=lambda r: (-r.cost, -r.iterator_count, -r.token_count, r.measure))
+        return results
+
+    def analyze_measure(self, table: TmdlNode, measure: TmdlNode) -> MeasureCost:
+        """Run all rules over one measure."""
+        result = MeasureCost(
+            table=table.name,
+            measure=measure.name,
+            display_folder=measure.get("displayFolder", "(no folder)"),
+        )
+        try:
+            tokens = tokenize(measure.expression or "")
+        except DaxSyntaxError as e:
+            result.parse_error = str(e)
+            return result
+
+        ctx = _MeasureContext(tokens=tokens, calls=build_call_tree(tokens), variables=declared_variables(tokens))
+        result.token_count = len(tokens)
+        result.iterator_count = sum(1 for c in iter_calls(ctx.calls) if c.name in ITERATOR_FUNCTIONS)
+
+        for rule in (
+            self._rule_filter_whole_table,
+            self._rule_nested_iterator,
+            self._rule_context_transition_in_iterator,
+            self._rule_repeated_subexpression,
+            self._rule_rankx_high_cardinality,
+            self._rule_summarize_with_expressions,
+            self._rule_distinctcount_high_cardinality,
+        ):
+            result.findings.extend(rule(ctx))
+
+        result.cost = round(sum(f.weight for f in result.findings), 2)
+        return result
+
+    # ============================================================================
+    # RULES
+    # ============================================================================
+
+    def _rule_filter_whole_table(self, ctx: _MeasureContext) -> List[CostFinding]:
+        """FILTER(Table, predicate) / FILTER(ALL(Table), predicate) where predicate only needs columns."""
+        findings = []
+        for call in iter_calls(ctx.calls):
+            if call.name != "FILTER" or len(call.args) < 2:
+                continue
+            target = self._table_target(call, 0, ctx)
+            if not target or target[0] != "table":
+                continue
+            table_name = target[1]
+            predicate = call.arg_tokens(ctx.tokens, 1)
+            refs = extract_references(predicate, ctx.variables)
+            columns = sorted({r.name for r in refs if r.kind == "column" and r.table == table_name})
+            uses_measures = any(r.kind == "measure" and r.name in self.measure_names for r in refs)
+
+            weight = RULE_WEIGHTS["FILTER_WHOLE_TABLE"]
+            if table_name in self.large_tables:
+                weight *= LARGE_TABLE_FACTOR
+
+            if columns and not uses_measures:
+                cols = ", ".join(f"{table_name}[{c}]" for c in columns)
+                suggestion = (f"Filter only the column(s) {cols}: use a CALCULATE column predicate "
+                              f"or FILTER(ALL({table_name}[{columns[0]}]), ...) / KEEPFILTERS")
+            else:
+                suggestion = "Iterate the smallest column set the predicate needs instead of the whole table"
+            findings.append(CostFinding(
+                "FILTER_WHOLE_TABLE", weight,
+                f"FILTER iterates every row of {table_name}" + (" (large table)" if table_name in self.large_tables else ""),
+                suggestion,
+            ))
+        return findings
+
+    def _rule_nested_iterator(self, ctx: _MeasureContext) -> List[CostFinding]:
+        """Iterator evaluated inside the row expression of another iterator."""
+        findings = []
+        for call in iter_calls(ctx.calls):
+            if call.name not in ITERATOR_FUNCTIONS:
+                continue
+            depth = 0
+            outer_names = []
+            child = call
+            for ancestor in call.ancestors():
+                if ancestor.name in ITERATOR_FUNCTIONS:
+                    arg_idx = ancestor.arg_index_of(child.start)
+                    if arg_idx > _table_arg_index(ancestor.name):
+                        depth += 1
+                        outer_names.append(ancestor.name)
+                child = ancestor
+            if depth:
+                findings.append(CostFinding(
+                    "NESTED_ITERATOR", RULE_WEIGHTS["NESTED_ITERATOR"] * depth,
+                    f"{call.name} runs once per row of outer {' > '.join(reversed(outer_names))}",
+                    "Pre-compute the inner table in a VAR or aggregate at a coarser grain",
+                ))
+        return findings
+
+    def _rule_context_transition_in_iterator(self, ctx: _MeasureContext) -> List[CostFinding]:
+        """Measure references (implicit CALCULATE) evaluated per row of a large table."""
+        findings = []
+        for call in iter_calls(ctx.calls):
+            if call.name not in ITERATOR_FUNCTIONS:
+                continue
+            target = self._table_target(call, _table_arg_index(call.name), ctx)
+            if not target or target[1] not in self.large_tables:
+                continue
+            if target[0] == "columns" and not self._has_high_cardinality_column(target[1], target[2]):
+                continue
+            measures = set()
+            for arg_idx in range(_table_arg_index(call.name) + 1, len(call.args)):
+                for ref in extract_references(call.arg_tokens(ctx.tokens, arg_idx), ctx.variables):
+                    if ref.kind == "measure" and ref.name in self.measure_names:
+                        measures.add(ref.name)
+            if measures:
+                findings.append(CostFinding(
+                    "CONTEXT_TRANSITION_IN_ITERATOR", RULE_WEIGHTS["CONTEXT_TRANSITION_IN_ITERATOR"] * LARGE_TABLE_FACTOR,
+                    f"{call.name} over {target[1]} evaluates {', '.join('[' + m + ']' for m in sorted(measures))} per row",
+                    "Iterate a smaller column set (VALUES/SUMMARIZE) or reference base columns instead of measures",
+                ))
+        return findings
+
+    def _rule_repeated_subexpression(self, ctx: _MeasureContext) -> List[CostFinding]:
+        """Identical function calls that appear more than once (candidates for VAR)."""
+        texts: Dict[int, str] = {}
+        counts: Counter = Counter()
+        calls = list(iter_calls(ctx.calls))
+        for call in calls:
+            if call.end < 0:
+                continue
+            span = ctx.tokens[call.start:call.end + 1]
+            if len(span) < MIN_REPEAT_TOKENS:
+                continue
+            text = normalize_tokens(span)
+            texts[id(call)] = text
+            counts[text] += 1
+
+        findings = []
+        reported: Set[str] = set()
+        for call in calls:
+            text = texts.get(id(call))
+            if not text or counts[text] < 2 or text in reported:
+                continue
+            # Only report maximal repeats (skip if the enclosing call repeats too)
+            parent_text = texts.get(id(call.parent)) if call.parent else None
+            if parent_text and counts[parent_text] >= 2:
+                continue
+            reported.add(text)
+            extra = counts[text] - 1
+            preview = text if len(text) <= 80 else text[:77] + "..."
+            findings.append(CostFinding(
+                "REPEATED_SUBEXPRESSION", RULE_WEIGHTS["REPEATED_SUBEXPRESSION"] * extra,
+                f"{call.name}(...) evaluated {counts[text]} times: {preview}",
+                "Store it once in a VAR and reuse the variable",
+            ))
+        return findings
+
+    def _rule_rankx_high_cardinality(self, ctx: _MeasureContext) -> List[CostFinding]:
+        """RANKX over a large table or a high-cardinality column."""
+        findings = []
+        for call in iter_calls(ctx.calls):
+            if call.name != "RANKX" or not call.args:
+                continue
+            target = self._table_target(call, 0, ctx)
+            if not target:
+                continue
+            if target[0] == "table":
+                high = target[1] in self.large_tables
+                what = f"all rows of {target[1]}"
+            else:
+                high = self._has_high_cardinality_column(target[1], target[2])
+                what = ", ".join(f"{target[1]}[{c}]" for c in target[2])
+            if high:
+                findings.append(CostFinding(
+                    "RANKX_HIGH_CARDINALITY", RULE_WEIGHTS["RANKX_HIGH_CARDINALITY"],
+                    f"RANKX ranks over {what}",
+                    "Rank over the smallest column that identifies the item, or pre-rank in a calculated column/table",
+                ))
+        return findings
+
+    def _rule_summarize_with_expressions(self, ctx: _MeasureContext) -> List[CostFinding]:
+        """SUMMARIZE with name/expression pairs."""
+        findings = []
+        for call in iter_calls(ctx.calls):
+            if call.name != "SUMMARIZE":
+                continue
+            for arg_idx in range(1, len(call.args)):
+                arg = call.arg_tokens(ctx.tokens, arg_idx)
+                if len(arg) == 1 and arg[0].kind == "STRING":
+                    findings.append(CostFinding(
+                        "SUMMARIZE_WITH_EXPRESSIONS", RULE_WEIGHTS["SUMMARIZE_WITH_EXPRESSIONS"],
+                        f"SUMMARIZE computes extension column \"{arg[0].value}\"",
+                        "Use ADDCOLUMNS(SUMMARIZE(...), ...) or SUMMARIZECOLUMNS",
+                    ))
+                    break
+        return findings
+
+    def _rule_distinctcount_high_cardinality(self, ctx: _MeasureContext) -> List[CostFinding]:
+        """DISTINCTCOUNT over high-cardinality columns (hash of every distinct value)."""
+        findings = []
+        for call in iter_calls(ctx.calls):
+            if call.name != "DISTINCTCOUNT" or not call.args:
+                continue
+            refs = [r for r in extract_references(call.arg_tokens(ctx.tokens, 0), ctx.variables) if r.kind == "column"]
+            for ref in refs:
+                if ref.table in self.large_tables and self._has_high_cardinality_column(ref.table, [ref.name]):
+                    findings.append(CostFinding(
+                        "DISTINCTCOUNT_HIGH_CARDINALITY", RULE_WEIGHTS["DISTINCTCOUNT_HIGH_CARDINALITY"],
+                        f"DISTINCTCOUNT over {ref.table}[{ref.name}]",
+                        "Count rows of the dimension (COUNTROWS(Dim)) or use an integer surrogate key",
+                    ))
+        return findings
+
+    # ============================================================================
+    # HELPERS
+    # ============================================================================
+
+    def _table_target(self, call: CallNode, arg_idx: int, ctx: _MeasureContext):
+        """
+        Classify what a table argument iterates:
+          ("table", name)                whole table (Table, ALL(Table), FILTER(ALL(Table), ...))
+          ("columns", table, [cols])     column(s) (ALL(T[C]), VALUES(T[C]))
+          None                           anything else (variables, table constructors, ...)
+        """
+        tokens = call.arg_tokens(ctx.tokens, arg_idx)
+        if not tokens:
+            return None
+        if len(tokens) == 1 and tokens[0].kind in ("TABLE", "IDENT") and tokens[0].value in self.model.tables:
+            return ("table", tokens[0].value)
+        if tokens[0].kind != "FUNCTION":
+            return None
+        inner = next((c for c in call.children if c.start == call.args[arg_idx][0]), None)
+        if inner is None or inner.end != call.args[arg_idx][1] - 1:
+            return None
+        if inner.name in TABLE_WRAPPERS:
+            refs = extract_references(ctx.tokens[inner.start + 2:inner.end], ctx.variables)
+            cols = [r for r in refs if r.kind == "column"]
+            tables = [r for r in refs if r.kind == "table" and r.table in self.model.tables]
+            if tables and not cols:
+                return ("table", tables[0].table)
+            if cols:
+                return ("columns", cols[0].table, sorted({c.name for c in cols if c.table == cols[0].table}))
+            return None
+        if inner.name in ("FILTER", "CALCULATETABLE", "KEEPFILTERS"):
+            return self._table_target(inner, 0, ctx)
+        return None
+
+    def _has_high_cardinality_column(self, table: str, columns: List[str]) -> bool:
+        for c in columns:
+            if (table, c) in self.high_cardinality_columns:
+                return True
+            if table in self.large_tables and any(h in c.lower() for h in HIGH_CARDINALITY_HINTS):
+                return True
+        return False
+
+
+def _table_arg_index(function_name: str) -> int:
+    """Index of the table argument for an iterator (TOPN takes N first)."""
+    return 1 if function_name == "TOPN" else 0
+
+
+def detect_large_tables(model: SemanticModel) -> Set[str]:
+    """
+    Heuristic: fact-grain tables are imported (M) tables with summable columns,
+    plus calculated tables whose source summarizes one of them.
+    """
+    large = set()
+    for table in model.tables.values():
+        has_m = any((p.expression or "").strip().lower() == "m" for p in table.partitions)
+        if has_m and any(c.get("summarizeBy") == "sum" for c in table.columns):
+            large.add(table.name)
+
+    for table in model.tables.values():
+        for partition in table.partitions:
+            if not partition.is_calculated:
+                continue
+            source = partition.expression_properties.get("source", "")
+            try:
+                refs = extract_references(tokenize(source))
+            except DaxSyntaxError:
+                continue
+            if any(r.table in large for r in refs) and "SUMMARIZE" in source.upper():
+                large.add(table.name)
+    return large
+
+
+def summarize_by_folder(results: List[MeasureCost]) -> List[FolderCost]:
+    """Aggregate measure costs per display folder, ranked by total cost."""
+    folders: Dict[str, FolderCost] = {}
+    for r in results:
+        f = folders.setdefault(r.display_folder, FolderCost(display_folder=r.display_folder))
+        f.measures += 1
+        f.total_cost += r.cost
+        if r.findings:
+            f.flagged_measures += 1
+        if r.cost > f.max_cost:
+            f.max_cost = r.cost
+            f.top_measure = r.measure
+    ranked = sorted(folders.values(), key=lambda f: (-f.total_cost, f.display_folder))
+    for f in ranked:
+        f.total_cost = round(f.total_cost, 2)
+    return ranked
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_report(results: List[MeasureCost], folders: List[FolderCost], top: int) -> None:
+    print("=" * 80)
+    print("DAX Static Cost Report".center(80))
+    print("=" * 80)
+    print()
+
+    flagged = [r for r in results if r.findings]
+    print(f"Measures analyzed: {len(results)}")
+    print(f"Measures with findings: {len(flagged)}")
+    rule_counts = Counter(f.rule for r in results for f in r.findings)
+    for rule, count in rule_counts.most_common():
+        print(f"  {rule}: {count}")
+    print()
+
+    print(f"TOP {min(top, len(flagged))} MEASURES BY COST")
+    print("-" * 80)
+    for rank, r in enumerate(flagged[:top], start=1):
+        print(f"{rank:>3}. [{r.cost:>6.1f}] {r.measure}  ({r.display_folder})")
+        for f in r.findings:
+            print(f"       - {f.rule} (+{f.weight:g}): {f.message}")
+            if f.suggestion:
+                print(f"         Fix: {f.suggestion}")
+    print()
+
+    print("COST BY DISPLAY FOLDER")
+    print("-" * 80)
+    print(f"  {'Folder':<32} {'Measures':>8} {'Flagged':>8} {'Total':>8} {'Max':>7}  Top measure")
+    for f in folders:
+        print(f"  {f.display_folder[:32]:<32} {f.measures:>8} {f.flagged_measures:>8} "
+              f"{f.total_cost:>8.1f} {f.max_cost:>7.1f}  {f.top_measure}")
+    print()
+
+    errors = [r for r in results if r.parse_error]
+    if errors:
+        print("UNPARSEABLE MEASURES")
+        print("-" * 80)
+        for r in errors:
+            print(f"  [WARN] {r.table}[{r.measure}]: {r.parse_error}")
+        print()
+
+
+def _parse_column_arg(value: str) -> Tuple[str, str]:
+    table, _, rest = value.partition("[")
+    if not rest.endswith("]"):
+        raise argparse.ArgumentTypeError(f"Expected Table[Column], got {value!r}")
+    return table.strip().strip("'"), rest[:-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Static DAX cost analyzer for TMDL measures",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Rank all measures in the bundled model
+  python dax_cost_analyzer.py
+
+  # Only the Metrics table, write JSON
+  python dax_cost_analyzer.py path/to/model.SemanticModel --table Metrics --json dax_cost.json
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder (or its definition folder)")
+    parser.add_argument("--table", action="append", default=[], help="Only analyze measures of this table")
+    parser.add_argument("--large-table", action="append", default=[], help="Treat table as large/high-cardinality")
+    parser.add_argument("--high-cardinality-column", action="append", default=[], type=_parse_column_arg,
+                        help="Table[Column] to treat as high cardinality")
+    parser.add_argument("--top", type=int, default=25, help="Number of measures to show (default: 25)")
+    parser.add_argument("--json", help="Write full report to this JSON file")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+
+    model = load_semantic_model(model_path)
+    analyzer = DaxCostAnalyzer(
+        model,
+        large_tables=set(args.large_table),
+        high_cardinality_columns=set(args.high_cardinality_column),
+    )
+    results = analyzer.analyze_all(set(args.table) or None)
+    folders = summarize_by_folder(results)
+    print_report(results, folders, args.top)
+
+    if args.json:
+        report = {
+            "large_tables": sorted(analyzer.large_tables),
+            "measures": [asdict(r) for r in results],
+            "folders": [asdict(f) for f in folders],
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
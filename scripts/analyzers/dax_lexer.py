@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+DAX Tokenizer and Call-Tree Builder
+
+Dependency-free lexer for DAX expressions taken from TMDL measures,
+calculated columns and calculated tables.
+
+Token kinds:
+- FUNCTION   identifier immediately followed by "(" (SUM, CALCULATE, PERCENTILEX.INC)
+- IDENT      unquoted identifier (table names, VAR names, TRUE/FALSE without parens)
+- KEYWORD    VAR, RETURN, IN, NOT, ASC, DESC, ...
+- TABLE      'Quoted Table Name'
+- COLUMN     [Column or Measure]  (value is the bare name)
+- STRING     "text"               (value is the unescaped text)
+- NUMBER     123, 1.5, 1e3
+- OP         operators (+ - * / ^ & && || = == <> < <= > >=)
+- LPAREN RPAREN LBRACE RBRACE COMMA
+
+Comments (//, --, /* */) and whitespace are dropped.
+
+The call tree (build_call_tree) groups tokens into nested function calls with
+their argument token spans, which is enough for static pattern analysis
+without a full DAX grammar.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+
+KEYWORDS = {"VAR", "RETURN", "IN", "NOT", "ASC", "DESC", "DEFINE", "EVALUATE", "ORDER", "BY", "MEASURE"}
+
+_NUMBER_RE = re.compile(r"\d+(\.\d*)?([eE][+-]?\d+)?|\.\d+([eE][+-]?\d+)?")
+_IDENT_RE = re.compile(r"[A-Za-z_@][A-Za-z0-9_.@]*")
+_OPERATORS = ["&&", "||", "<=", ">=", "<>", "==", "=", "<", ">", "+", "-", "*", "/", "^", "&"]
+
+
+class DaxSyntaxError(ValueError):
+    """Raised when a DAX expression cannot be tokenized."""
+
+
+@dataclass
+class Token:
+    kind: str
+    value: str
+    pos: int
+
+    def __repr__(self) -> str:
+        return f"{self.kind}({self.value!r})"
+
+
+def tokenize(expression: str) -> List[Token]:
+    """Tokenize a DAX expression."""
+    tokens: List[Token] = []
+    text = expression
+    i = 0
+    n = len(text)
+
+    while i < n:
+        ch = text[i]
+
+        if ch.isspace():
+            i += 1
+            continue
+
+        # Comments
+        if text.startswith("//", i) or text.startswith("--", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end + 1
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+
+        # "string" with "" escape
+        if ch == '"':
+            j = i + 1
+            out = []
+            while j < n:
+                if text[j] == '"':
+                    if j + 1 < n and text[j + 1] == '"':
+                        out.append('"')
+                        j += 2
+                        continue
+                    break
+                out.append(text[j])
+                j += 1
+            if j >= n:
+                raise DaxSyntaxError(f"Unterminated string literal at position {i}")
+            tokens.append(Token("STRING", "".join(out), i))
+            i = j + 1
+            continue
+
+        # 'Quoted Table' with '' escape
+        if ch == "'":
+            j = i + 1
+            out = []
+            while j < n:
+                if text[j] == "'":
+                    if j + 1 < n and text[j + 1] == "'":
+                        out.append("'")
+                        j += 2
+                        continue
+                    break
+                out.append(text[j])
+                j += 1
+            if j >= n:
+                raise DaxSyntaxError(f"Unterminated table name at position {i}")
+            tokens.append(Token("TABLE", "".join(out), i))
+            i = j + 1
+            continue
+
+        # [Column] with ]] escape
+        if ch == "[":
+            j = i + 1
+            out = []
+            while j < n:
+                if text[j] == "]":
+                    if j + 1 < n and text[j + 1] == "]":
+                        out.append("]")
+                        j += 2
+                        continue
+                    break
+                out.append(text[j])
+                j += 1
+            if j >= n:
+                raise DaxSyntaxError(f"Unterminated column reference at position {i}")
+            tokens.append(Token("COLUMN", "".join(out), i))
+            i = j + 1
+            continue
+
+        if ch.isdigit() or (ch == "." and i + 1 < n and text[i + 1].isdigit()):
+            m = _NUMBER_RE.match(text, i)
+            tokens.append(Token("NUMBER", m.group(0), i))
+            i = m.end()
+            continue
+
+        m = _IDENT_RE.match(text, i)
+        if m:
+            word = m.group(0)
+            j = m.end()
+            k = j
+            while k < n and text[k] in " \t\r\n":
+                k += 1
+            if k < n and text[k] == "(" and word.upper() not in KEYWORDS:
+                tokens.append(Token("FUNCTION", word.upper(), i))
+            elif word.upper() in KEYWORDS:
+                tokens.append(Token("KEYWORD", word.upper(), i))
+            else:
+                tokens.append(Token("IDENT", word, i))
+            i = j
+            continue
+
+        if ch == "(":
+            tokens.append(Token("LPAREN", ch, i))
+            i += 1
+            continue
+        if ch == ")":
+            tokens.append(Token("RPAREN", ch, i))
+            i += 1
+            continue
+        if ch == "{":
+            tokens.append(Token("LBRACE", ch, i))
+            i += 1
+            continue
+        if ch == "}":
+            tokens.append(Token("RBRACE", ch, i))
+            i += 1
+            continue
+        if ch == ",":
+            tokens.append(Token("COMMA", ch, i))
+            i += 1
+            continue
+
+        for op in _OPERATORS:
+            if text.startswith(op, i):
+                tokens.append(Token("OP", op, i))
+                i += len(op)
+                break
+        else:
+            raise DaxSyntaxError(f"Unexpected character {ch!r} at position {i}")
+
+    return tokens
+
+
+# -----------------------------
+# References
+# -----------------------------
+
+@dataclass(frozen=True)
+class DaxReference:
+    """A reference found in a DAX expression."""
+    kind: str          # "column" (Table[Col]), "measure" ([Name] without table), "table" (bare table)
+    table: str
+    name: str
+
+
+def extract_references(tokens: List[Token], var_names: Optional[Set[str]] = None) -> List[DaxReference]:
+    """
+    Extract Table[Column], [Measure] and bare table references.
+
+    [Name] without a preceding table is reported as kind="measure"; the caller
+    decides whether it is really a measure or a column in row context.
+    """
+    refs: List[DaxReference] = []
+    var_names = var_names if var_names is not None else declared_variables(tokens)
+    for idx, tok in enumerate(tokens):
+        prev = tokens[idx - 1] if idx > 0 else None
+        nxt = tokens[idx + 1] if idx + 1 < len(tokens) else None
+        if tok.kind == "COLUMN":
+            if prev is not None and prev.kind in ("TABLE", "IDENT") and prev.pos + len(prev.value) <= tok.pos:
+                if prev.kind == "IDENT" and prev.value in var_names:
+                    continue  # Column of a table variable, not a model object
+                refs.append(DaxReference("column", prev.value, tok.value))
+            else:
+                refs.append(DaxReference("measure", "", tok.value))
+        elif tok.kind in ("TABLE", "IDENT"):
+            if nxt is not None and nxt.kind == "COLUMN":
+                continue
+            if tok.kind == "IDENT" and (tok.value in var_names or tok.value.upper() in {"TRUE", "FALSE", "BLANK"}):
+                continue
+            if prev is not None and prev.kind == "KEYWORD" and prev.value == "VAR":
+                continue
+            refs.append(DaxReference("table", tok.value, ""))
+    return refs
+
+
+def declared_variables(tokens: List[Token]) -> Set[str]:
+    """Names declared with VAR in the expression."""
+    return {
+        tokens[i + 1].value
+        for i, tok in enumerate(tokens[:-1])
+        if tok.kind == "KEYWORD" and tok.value == "VAR" and tokens[i + 1].kind == "IDENT"
+    }
+
+
+# -----------------------------
+# Call tree
+# -----------------------------
+
+@dataclass
+class CallNode:
+    """A function call with its argument token spans and nested calls."""
+    name: str
+    start: int                                   # index of FUNCTION token
+    end: int = -1                                # index of closing RPAREN
+    args: List[Tuple[int, int]] = field(default_factory=list)  # [start, end) token ranges
+    children: List["CallNode"] = field(default_factory=list)
+    parent: Optional["CallNode"] = field(default=None, repr=False)
+
+    def arg_tokens(self, tokens: List[Token], index: int) -> List[Token]:
+        if index >= len(self.args):
+            return []
+        s, e = self.args[index]
+        return tokens[s:e]
+
+    def arg_index_of(self, token_index: int) -> int:
+        """Which argument a token index falls into (-1 if none)."""
+        for i, (s, e) in enumerate(self.args):
+            if s <= token_index < e:
+                return i
+        return -1
+
+    def walk(self):
+        yield self
+        for c in self.children:
+            yield from c.walk()
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+
+def build_call_tree(tokens: List[Token]) -> List[CallNode]:
+    """Group tokens into nested function calls. Returns top-level calls."""
+    roots: List[CallNode] = []
+    # Stack entries: CallNode for function parens, None for grouping parens / braces
+    stack: List[Optional[CallNode]] = []
+    arg_start: List[int] = []
+
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        if tok.kind == "FUNCTION" and i + 1 < len(tokens) and tokens[i + 1].kind == "LPAREN":
+            node = CallNode(name=tok.value, start=i)
+            parent = next((s for s in reversed(stack) if s is not None), None)
+            if parent is not None:
+                node.parent = parent
+                parent.children.append(node)
+            else:
+                roots.append(node)
+            stack.append(node)
+            arg_start.append(i + 2)
+            i += 2
+            continue
+        if tok.kind in ("LPAREN", "LBRACE"):
+            stack.append(None)
+            arg_start.append(-1)
+        elif tok.kind in ("RPAREN", "RBRACE"):
+            if stack:
+                node = stack.pop()
+                start = arg_start.pop()
+                if node is not None:
+                    if i > start or node.args:
+                        node.args.append((start, i))
+                    node.end = i
+        elif tok.kind == "COMMA" and stack and stack[-1] is not None:
+            node = stack[-1]
+            node.args.append((arg_start[-1], i))
+            arg_start[-1] = i + 1
+        i += 1
+
+    return roots
+
+
+def iter_calls(roots: List[CallNode]):
+    for root in roots:
+        yield from root.walk()
+
+
+def normalize_tokens(tokens: List[Token]) -> str:
+    """Canonical text for a token span (case-insensitive for functions/identifiers)."""
+    parts = []
+    for t in tokens:
+        if t.kind == "STRING":
+            parts.append('"' + t.value + '"')
+        elif t.kind == "TABLE":
+            parts.append("'" + t.value + "'")
+        elif t.kind == "COLUMN":
+            parts.append("[" + t.value + "]")
+        else:
+            parts.append(t.value)
+    return " ".join(parts)
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Measure Dependency Graph and Query Fan-Out Report
+
+Builds the measure -> measure and measure -> column dependency DAG from the
+parsed semantic model, then joins it with the fields each visual projects in
+its queryState. For every visual and page it reports the full set of
+measures and base columns the engine has to evaluate - a static "query
+fan-out" number to budget page load time against.
+
+It also reports:
+- Dependency depth (longest measure chain) per measure
+- Transitive static cost (own + all dependencies, from dax_cost_analyzer)
+- Cycles (circular measure references) and unresolved references
+
+Usage:
+    python measure_dependency_graph.py [semantic_model_path] [--report path.Report] [--measure "Total Views"] [--json out.json]
+
+Options:
+    --report: Path to the .Report folder (default: sibling of the semantic model)
+    --measure: Print the dependency tree of one measure
+    --top: Number of measures to list by depth/transitive cost (default: 15)
+    --json: Write the full graph and fan-out report as JSON
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from dax_cost_analyzer import DaxCostAnalyzer
+from dax_lexer import DaxSyntaxError, declared_variables, extract_references, tokenize
+from pbir_report import ReportModel, find_report_dir, load_report
+from tmdl_model import SemanticModel, load_semantic_model
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+ColumnKey = Tuple[str, str]
+
+
+@dataclass
+class MeasureNode:
+    """Direct dependencies of one measure."""
+    name: str
+    table: str
+    measures: Set[str] = field(default_factory=set)
+    columns: Set[ColumnKey] = field(default_factory=set)
+    tables: Set[str] = field(default_factory=set)
+    unresolved: Set[str] = field(default_factory=set)
+    parse_error: Optional[str] = None
+
+
+@dataclass
+class Closure:
+    """Everything a measure forces the engine to evaluate."""
+    measures: Set[str] = field(default_factory=set)
+    columns: Set[ColumnKey] = field(default_factory=set)
+    tables: Set[str] = field(default_factory=set)
+    depth: int = 0
+
+
+@dataclass
+class FanOut:
+    """Static query fan-out of a visual or page."""
+    name: str
+    page: str
+    visual_type: str = ""
+    visuals: int = 0
+    direct_measures: Set[str] = field(default_factory=set)
+    measures: Set[str] = field(default_factory=set)
+    columns: Set[ColumnKey] = field(default_factory=set)
+    measure_evaluations: int = 0     # Sum over visuals (each visual queries separately)
+    max_depth: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "page": self.page,
+            "visual_type": self.visual_type,
+            "visuals": self.visuals,
+            "direct_measures": sorted(self.direct_measures),
+            "measures": sorted(self.measures),
+            "columns": [f"{t}[{c}]" for t, c in sorted(self.columns)],
+            "measure_count": len(self.measures),
+            "column_count": len(self.columns),
+            "measure_evaluations": self.measure_evaluations,
+            "max_depth": self.max_depth,
+        }
+
+
+class MeasureDependencyGraph:
+    """Measure/column dependency DAG with memoized transitive closures."""
+
+    def __init__(self, model: SemanticModel):
+        self.model = model
+        self.nodes: Dict[str, MeasureNode] = {}
+        self.cycles: List[List[str]] = []
+        self._closures: Dict[str, Closure] = {}
+        self._build()
+        self._find_cycles()
+
+    # ============================================================================
+    # BUILD
+    # ============================================================================
+
+    def _build(self) -> None:
+        measure_names = set(self.model.measure_index().keys())
+        column_names = {(t.name, c.name) for t, c in self.model.iter_columns()}
+
+        for table, measure in self.model.iter_measures():
+            node = MeasureNode(name=measure.name, table=table.name)
+            self.nodes[measure.name] = node
+            try:
+                tokens = tokenize(measure.expression or "")
+            except DaxSyntaxError as e:
+                node.parse_error = str(e)
+                continue
+
+            for ref in extract_references(tokens, declared_variables(tokens)):
+                if ref.kind == "measure":
+                    if ref.name in measure_names:
+                        node.measures.add(ref.name)
+                    # Otherwise: a column in row context or a local extension column
+                elif ref.kind == "column":
+                    if (ref.table, ref.name) in column_names:
+                        node.columns.add((ref.table, ref.name))
+                    elif ref.table in self.model.tables and ref.name in measure_names:
+                        node.measures.add(ref.name)   # Table[Measure] syntax
+                    elif ref.table in self.model.tables:
+                        node.unresolved.add(f"{ref.table}[{ref.name}]")
+                elif ref.kind == "table" and ref.table in self.model.tables:
+                    node.tables.add(ref.table)
+
+    def _find_cycles(self) -> None:
+        """Tarjan's SCC: every strongly connected component with >1 node (or a self-loop) is a cycle."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        counter = [0]
+
+        def strongconnect(v: str) -> None:
+            # Iterative to stay clear of the recursion limit on long chains
+            work = [(v, iter(sorted(self.nodes[v].measures)))]
+            index[v] = low[v] = counter[0]
+            counter[0] += 1
+            stack.append(v)
+            on_stack.add(v)
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for w in children:
+                    if w not in self.nodes:
+                        continue
+                    if w not in index:
+                        index[w] = low[w] = counter[0]
+                        counter[0] += 1
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(sorted(self.nodes[w].measures))))
+                        advanced = True
+                        break
+                    if w in on_stack:
+                        low[node] = min(low[node], index[w])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == node:
+                            break
+                    if len(component) > 1 or node in self.nodes[node].measures:
+                        self.cycles.append(sorted(component))
+
+        for name in sorted(self.nodes):
+            if name not in index:
+                strongconnect(name)
+
+    # ============================================================================
+    # QUERIES
+    # ============================================================================
+
+    def closure(self, measure: str) -> Closure:
+        """Transitive dependencies of a measure (cycles are cut, not followed twice)."""
+        if measure in self._closures:
+            return self._closures[measure]
+        result = Closure()
+        node = self.nodes.get(measure)
+        if node is None:
+            return result
+        self._closures[measure] = result   # Placeholder breaks cycles
+        result.columns |= node.columns
+        result.tables |= node.tables
+        for dep in node.measures:
+            result.measures.add(dep)
+            sub = self.closure(dep)
+            result.measures |= sub.measures
+            result.columns |= sub.columns
+            result.tables |= sub.tables
+            result.depth = max(result.depth, sub.depth + 1)
+        result.measures.discard(measure)
+        return result
+
+    def dependents(self) -> Dict[str, Set[str]]:
+        """Reverse edges: measure -> measures that reference it directly."""
+        reverse: Dict[str, Set[str]] = {name: set() for name in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.measures:
+                reverse.setdefault(dep, set()).add(node.name)
+        return reverse
+
+    def transitive_cost(self, own_costs: Dict[str, float], measure: str) -> float:
+        closure = self.closure(measure)
+        return own_costs.get(measure, 0.0) + sum(own_costs.get(m, 0.0) for m in closure.measures)
+
+    def fan_out_for_fields(self, name: str, page: str, measures: Set[str], columns: Set[ColumnKey]) -> FanOut:
+        fan = FanOut(name=name, page=page, visuals=1)
+        fan.direct_measures = set(measures)
+        fan.columns = set(columns)
+        for m in measures:
+            closure = self.closure(m)
+            fan.measures.add(m)
+            fan.measures |= closure.measures
+            fan.columns |= closure.columns
+            fan.max_depth = max(fan.max_depth, closure.depth + 1)
+        fan.measure_evaluations = len(fan.measures)
+        return fan
+
+    def print_tree(self, measure: str, indent: str = "", seen: Optional[Set[str]] = None) -> None:
+        seen = set() if seen is None else seen
+        node = self.nodes.get(measure)
+        if node is None:
+            print(f"{indent}[{measure}] (not found)")
+            return
+        marker = " (cycle)" if measure in seen else ""
+        print(f"{indent}[{measure}]{marker}")
+        if marker:
+            return
+        seen = seen | {measure}
+        for table, column in sorted(node.columns):
+            print(f"{indent}    {table}[{column}]")
+        for dep in sorted(node.measures):
+            self.print_tree(dep, indent + "    ", seen)
+
+
+def compute_fan_out(graph: MeasureDependencyGraph, report: ReportModel) -> Tuple[List[FanOut], List[FanOut]]:
+    """Per-visual and per-page fan-out for all data-bound visuals."""
+    measure_names = set(graph.nodes)
+    visual_fans: List[FanOut] = []
+    page_fans: List[FanOut] = []
+
+    for page in report.pages.values():
+        page_fan = FanOut(name=page.display_name, page=page.page_id)
+        for visual in page.visuals:
+            measures = {prop for _, prop in visual.measures() if prop in measure_names}
+            columns = visual.columns()
+            if not measures and not columns:
+                continue
+            fan = graph.fan_out_for_fields(visual.visual_id, page.page_id, measures, columns)
+            fan.visual_type = visual.visual_type
+            visual_fans.append(fan)
+
+            page_fan.visuals += 1
+            page_fan.direct_measures |= fan.direct_measures
+            page_fan.measures |= fan.measures
+            page_fan.columns |= fan.columns
+            page_fan.measure_evaluations += fan.measure_evaluations
+            page_fan.max_depth = max(page_fan.max_depth, fan.max_depth)
+        page_fans.append(page_fan)
+
+    visual_fans.sort(key=lambda f: (-len(f.measures), -len(f.columns), f.name))
+    page_fans.sort(key=lambda f: (-f.measure_evaluations, f.name))
+    return visual_fans, page_fans
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_report(graph: MeasureDependencyGraph, own_costs: Dict[str, float],
+                 visual_fans: List[FanOut], page_fans: List[FanOut], top: int) -> None:
+    print("=" * 80)
+    print("Measure Dependency Graph".center(80))
+    print("=" * 80)
+    print()
+
+    edges = sum(len(n.measures) for n in graph.nodes.values())
+    column_edges = sum(len(n.columns) for n in graph.nodes.values())
+    print(f"Measures: {len(graph.nodes)}")
+    print(f"Measure -> measure edges: {edges}")
+    print(f"Measure -> column edges: {column_edges}")
+    print()
+
+    if graph.cycles:
+        print(f"❌ CYCLES ({len(graph.cycles)})")
+        print("-" * 80)
+        for cycle in graph.cycles:
+            print(f"  {' -> '.join(cycle)} -> {cycle[0]}")
+        print()
+
+    unresolved = {n.name: n.unresolved for n in graph.nodes.values() if n.unresolved}
+    if unresolved:
+        print(f"UNRESOLVED REFERENCES ({len(unresolved)} measures)")
+        print("-" * 80)
+        for name, refs in sorted(unresolved.items()):
+            print(f"  [WARN] [{name}] -> {', '.join(sorted(refs))}")
+        print()
+
+    by_depth = sorted(graph.nodes, key=lambda m: (-graph.closure(m).depth, -len(graph.closure(m).measures), m))
+    print(f"DEEPEST MEASURE CHAINS (top {top})")
+    print("-" * 80)
+    print(f"  {'Measure':<45} {'Depth':>5} {'Deps':>5} {'Cols':>5} {'Cost':>7}")
+    for name in by_depth[:top]:
+        c = graph.closure(name)
+        print(f"  {name[:45]:<45} {c.depth:>5} {len(c.measures):>5} {len(c.columns):>5} "
+              f"{graph.transitive_cost(own_costs, name):>7.1f}")
+    print()
+
+    dependents = graph.dependents()
+    hubs = sorted(dependents, key=lambda m: (-len(dependents[m]), m))
+    print(f"MOST REFERENCED MEASURES (top {top})")
+    print("-" * 80)
+    for name in hubs[:top]:
+        if not dependents[name]:
+            break
+        print(f"  {name[:60]:<60} used by {len(dependents[name])}")
+    print()
+
+    print("QUERY FAN-OUT PER PAGE")
+    print("-" * 80)
+    print(f"  {'Page':<30} {'Visuals':>7} {'Evals':>6} {'Measures':>8} {'Columns':>7} {'Depth':>5}")
+    for f in page_fans:
+        print(f"  {f.name[:30]:<30} {f.visuals:>7} {f.measure_evaluations:>6} {len(f.measures):>8} "
+              f"{len(f.columns):>7} {f.max_depth:>5}")
+    print()
+
+    print("QUERY FAN-OUT PER VISUAL")
+    print("-" * 80)
+    print(f"  {'Visual':<22} {'Type':<22} {'Direct':>6} {'Measures':>8} {'Columns':>7} {'Depth':>5}")
+    for f in visual_fans[:top]:
+        print(f"  {f.name[:22]:<22} {f.visual_type[:22]:<22} {len(f.direct_measures):>6} "
+              f"{len(f.measures):>8} {len(f.columns):>7} {f.max_depth:>5}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure dependency graph and per-visual query fan-out",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Full report for the bundled dashboard
+  python measure_dependency_graph.py
+
+  # Dependency tree of one measure
+  python measure_dependency_graph.py --measure "Key Insight - Signal"
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder (or its definition folder)")
+    parser.add_argument("--report", help="Path to the .Report folder (default: sibling of the semantic model)")
+    parser.add_argument("--measure", help="Print the dependency tree of this measure")
+    parser.add_argument("--top", type=int, default=15, help="Rows per ranking (default: 15)")
+    parser.add_argument("--json", help="Write the graph and fan-out report to this JSON file")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+
+    model = load_semantic_model(model_path)
+    graph = MeasureDependencyGraph(model)
+
+    if args.measure:
+        graph.print_tree(args.measure)
+        c = graph.closure(args.measure)
+        print()
+        print(f"Depth: {c.depth}  Measures: {len(c.measures)}  Columns: {len(c.columns)}  Tables scanned: {len(c.tables)}")
+        return
+
+    own_costs = {r.measure: r.cost for r in DaxCostAnalyzer(model).analyze_all()}
+
+    report_path = Path(args.report) if args.report else find_report_dir(model_path.resolve())
+    visual_fans: List[FanOut] = []
+    page_fans: List[FanOut] = []
+    if report_path and report_path.exists():
+        report = load_report(report_path)
+        visual_fans, page_fans = compute_fan_out(graph, report)
+    else:
+        print("[WARN] No .Report folder found - skipping visual fan-out")
+
+    print_report(graph, own_costs, visual_fans, page_fans, args.top)
+
+    if args.json:
+        out = {
+            "measures": {
+                name: {
+                    "table": node.table,
+                    "measures": sorted(node.measures),
+                    "columns": [f"{t}[{c}]" for t, c in sorted(node.columns)],
+                    "tables": sorted(node.tables),
+                    "unresolved": sorted(node.unresolved),
+                    "parse_error": node.parse_error,
+                    "depth": graph.closure(name).depth,
+                    "transitive_measures": sorted(graph.closure(name).measures),
+                    "transitive_columns": [f"{t}[{c}]" for t, c in sorted(graph.closure(name).columns)],
+                    "own_cost": own_costs.get(name, 0.0),
+                    "transitive_cost": round(graph.transitive_cost(own_costs, name), 2),
+                }
+                for name, node in sorted(graph.nodes.items())
+            },
+            "cycles": graph.cycles,
+            "pages": [f.to_dict() for f in page_fans],
+            "visuals": [f.to_dict() for f in visual_fans],
+        }
+        Path(args.json).write_text(json.dumps(out, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    if graph.cycles:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
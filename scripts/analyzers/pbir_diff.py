@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Structural Diff of PBIR Output Trees
+
+Answers "which visuals actually changed?" after a generator or template
+change, without the noise of a textual diff -r over formatted JSON.
+
+How it works:
+- Every *.json file of both trees is read as bytes; byte-identical files are
+  skipped without parsing.
+- Changed files are parsed and Merkle-hashed: each JSON subtree gets a digest
+  of its children (object keys sorted, so key order and whitespace do not
+  count as changes). Walking both trees, any subtree whose digests match is
+  skipped in O(1); only differing branches are descended.
+- Each leaf difference is reported as a JSON path with old/new values and a
+  category: binding (query/filters/sort), title, formatting (objects,
+  visualContainerObjects), layout (position) or other.
+
+Results are grouped per visual (pages/<page>/visuals/<visual>/visual.json)
+and per other file. pbir_generate.py uses this module to embed a
+"changesSinceLastBuild" section in validation_report.json.
+
+Usage:
+    python pbir_diff.py OLD_TREE NEW_TREE [--json diff.json] [--paths 20]
+    python pbir_diff.py pbir_out_prev pbir_out --category binding
+
+Options:
+    --json: Write the full diff (the validation_report.json section) to a file
+    --paths: JSON paths printed per visual (default: 10, 0 = all)
+    --category: Only show visuals with changes in these categories (repeatable)
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+VISUAL_FILE_RE = re.compile(r"(?:^|/)pages/(?P<page>[^/]+)/visuals/(?P<visual>[^/]+)/visual\.json$")
+IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Generator artefacts that always differ between builds
+IGNORED_FILES = {"validation_report.json"}
+
+CATEGORIES = ("binding", "title", "formatting", "layout", "other")
+MAX_VALUE_CHARS = 200
+
+
+# ============================================================================
+# Merkle hashing
+# ============================================================================
+
+@dataclass
+class HashedNode:
+    """A JSON value with the digest of its subtree."""
+    digest: bytes
+    value: Any
+    children: Optional[Dict[Any, "HashedNode"]] = None   # Object keys or list indexes; None for scalars
+
+
+def merkle(value: Any) -> HashedNode:
+    """Hash a parsed JSON value bottom-up (object keys sorted, list order kept)."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(value, dict):
+        children = {k: merkle(v) for k, v in value.items()}
+        h.update(b"{")
+        for key in sorted(children):
+            h.update(key.encode("utf-8"))
+            h.update(b"\0")
+            h.update(children[key].digest)
+        return HashedNode(h.digest(), value, children)
+    if isinstance(value, list):
+        children = {i: merkle(v) for i, v in enumerate(value)}
+        h.update(b"[")
+        for child in children.values():
+            h.update(child.digest)
+        return HashedNode(h.digest(), value, children)
+    h.update(json.dumps(value).encode("utf-8"))
+    return HashedNode(h.digest(), value)
+
+
+# ============================================================================
+# Diff
+# ============================================================================
+
+@dataclass
+class Change:
+    """One structural difference inside a JSON file."""
+    op: str          # added / removed / changed
+    path: str        # JSON path, e.g. $.visual.query.queryState.Y.projections[0]
+    category: str
+    old: Any = None
+    new: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"op": self.op, "path": self.path, "category": self.category}
+        if self.op != "added":
+            entry["old"] = _preview(self.old)
+        if self.op != "removed":
+            entry["new"] = _preview(self.new)
+        return entry
+
+
+@dataclass
+class FileDiff:
+    """Changes of one file between two trees."""
+    rel_path: str
+    status: str                      # changed / added / removed / unparseable
+    changes: List[Change] = field(default_factory=list)
+
+    @property
+    def categories(self) -> List[str]:
+        found = {c.category for c in self.changes}
+        return [c for c in CATEGORIES if c in found]
+
+
+@dataclass
+class TreeDiff:
+    """Result of comparing two PBIR output trees."""
+    files_compared: int = 0
+    unchanged: int = 0
+    reformatted_only: int = 0       # Bytes differ, JSON structure identical
+    files: List[FileDiff] = field(default_factory=list)
+
+    def visual_diffs(self) -> Dict[str, FileDiff]:
+        result = {}
+        for fd in self.files:
+            m = VISUAL_FILE_RE.search(fd.rel_path)
+            if m:
+                result[f"{m.group('page')}/{m.group('visual')}"] = fd
+        return result
+
+    def to_report(self, max_paths: int = 0) -> Dict[str, Any]:
+        """The changesSinceLastBuild section of validation_report.json."""
+        visuals = self.visual_diffs()
+        visual_paths = {fd.rel_path for fd in visuals.values()}
+        statuses = Counter(fd.status for fd in self.files)
+        by_category = Counter(cat for fd in visuals.values() for cat in fd.categories)
+
+        def entry(fd: FileDiff) -> Dict[str, Any]:
+            changes = fd.changes if max_paths <= 0 else fd.changes[:max_paths]
+            item: Dict[str, Any] = {"status": fd.status, "categories": fd.categories,
+                                    "changes": [c.to_dict() for c in changes]}
+            if len(changes) < len(fd.changes):
+                item["truncated"] = len(fd.changes) - len(changes)
+            return item
+
+        return {
+            "summary": {
+                "filesCompared": self.files_compared,
+                "unchanged": self.unchanged,
+                "reformattedOnly": self.reformatted_only,
+                "changed": statuses.get("changed", 0),
+                "added": statuses.get("added", 0),
+                "removed": statuses.get("removed", 0),
+                "unparseable": statuses.get("unparseable", 0),
+                "visualsChanged": len(visuals),
+                "visualsByCategory": {c: by_category[c] for c in CATEGORIES if by_category[c]},
+            },
+            "visuals": {key: entry(fd) for key, fd in sorted(visuals.items())},
+            "files": {fd.rel_path: entry(fd) for fd in self.files if fd.rel_path not in visual_paths},
+        }
+
+
+def _preview(value: Any) -> Any:
+    """Keep reported values short: large subtrees become a size summary."""
+    text = json.dumps(value, ensure_ascii=False)
+    if len(text) <= MAX_VALUE_CHARS:
+        return value
+    if isinstance(value, dict):
+        return f"<object: {len(value)} keys, {len(text)} chars>"
+    if isinstance(value, list):
+        return f"<array: {len(value)} items, {len(text)} chars>"
+    return text[:MAX_VALUE_CHARS] + "..."
+
+
+def json_path(parent: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{parent}[{key}]"
+    if IDENTIFIER_RE.match(key):
+        return f"{parent}.{key}"
+    return f"{parent}[{json.dumps(key)}]"
+
+
+def categorize(keys: List[Any]) -> str:
+    """Category of a change from the object keys on its path."""
+    names = [k for k in keys if isinstance(k, str)]
+    if any(k in ("query", "queryState", "sortDefinition", "filterConfig", "filters", "queryRef") for k in names):
+        return "binding"
+    if "title" in names or ("header" in names and "text" in names):   # Slicer header text is its title
+        return "title"
+    if any(k in ("objects", "visualContainerObjects") for k in names):
+        return "formatting"
+    if "position" in names:
+        return "layout"
+    return "other"
+
+
+def diff_nodes(old: HashedNode, new: HashedNode, path: str = "$",
+               keys: Optional[List[Any]] = None, out: Optional[List[Change]] = None) -> List[Change]:
+    """Leaf-level changes between two hashed JSON values; equal subtrees are skipped by digest."""
+    keys = keys or []
+    out = out if out is not None else []
+    if old.digest == new.digest:
+        return out
+    same_container = (old.children is not None and new.children is not None
+                      and isinstance(old.value, dict) == isinstance(new.value, dict))
+    if not same_container:
+        out.append(Change("changed", path, categorize(keys), old.value, new.value))
+        return out
+
+    if isinstance(old.value, dict):
+        for key in old.children:
+            child_path = json_path(path, key)
+            if key not in new.children:
+                out.append(Change("removed", child_path, categorize(keys + [key]), old=old.value[key]))
+            else:
+                diff_nodes(old.children[key], new.children[key], child_path, keys + [key], out)
+        for key in new.children:
+            if key not in old.children:
+                out.append(Change("added", json_path(path, key), categorize(keys + [key]), new=new.value[key]))
+        return out
+
+    # Arrays: trim the common prefix/suffix by digest so one inserted projection
+    # shows up as one addition instead of every following index changing.
+    old_items, new_items = list(old.children.values()), list(new.children.values())
+    start = 0
+    while start < min(len(old_items), len(new_items)) and old_items[start].digest == new_items[start].digest:
+        start += 1
+    old_end, new_end = len(old_items), len(new_items)
+    while old_end > start and new_end > start and old_items[old_end - 1].digest == new_items[new_end - 1].digest:
+        old_end -= 1
+        new_end -= 1
+    paired = min(old_end, new_end) - start
+    for offset in range(paired):
+        i = start + offset
+        diff_nodes(old_items[i], new_items[i], json_path(path, i), keys + [i], out)
+    category = categorize(keys)
+    for i in range(start + paired, old_end):
+        out.append(Change("removed", json_path(path, i), category, old=old_items[i].value))
+    for i in range(start + paired, new_end):
+        out.append(Change("added", json_path(path, i), category, new=new_items[i].value))
+    return out
+
+
+# ============================================================================
+# Trees
+# ============================================================================
+
+def snapshot_tree(root: Path) -> Dict[str, bytes]:
+    """Raw bytes of every JSON file under root, keyed by POSIX relative path."""
+    root = Path(root)
+    if not root.is_dir():
+        return {}
+    return {fp.relative_to(root).as_posix(): fp.read_bytes()
+            for fp in sorted(root.rglob("*.json")) if fp.name not in IGNORED_FILES}
+
+
+def _parse(data: bytes) -> Any:
+    return json.loads(data.decode("utf-8-sig"))
+
+
+def diff_trees(old: Dict[str, bytes], new: Dict[str, bytes]) -> TreeDiff:
+    """Compare two snapshots (see snapshot_tree)."""
+    result = TreeDiff(files_compared=len(set(old) | set(new)))
+    for rel in sorted(set(old) | set(new)):
+        old_bytes, new_bytes = old.get(rel), new.get(rel)
+        if old_bytes == new_bytes:
+            result.unchanged += 1
+            continue
+        if old_bytes is None or new_bytes is None:
+            result.files.append(FileDiff(rel, "added" if old_bytes is None else "removed"))
+            continue
+        try:
+            old_tree, new_tree = merkle(_parse(old_bytes)), merkle(_parse(new_bytes))
+        except ValueError:
+            result.files.append(FileDiff(rel, "unparseable"))
+            continue
+        changes = diff_nodes(old_tree, new_tree)
+        if changes:
+            result.files.append(FileDiff(rel, "changed", changes))
+        else:
+            result.unchanged += 1
+            result.reformatted_only += 1
+    return result
+
+
+def print_diff(diff: TreeDiff, max_paths: int = 10, categories: Optional[List[str]] = None) -> None:
+    summary = diff.to_report()["summary"]
+    print("=" * 80)
+    print("PBIR STRUCTURAL DIFF".center(80))
+    print("=" * 80)
+    print(f"Files compared: {summary['filesCompared']}  unchanged: {summary['unchanged']}"
+          f" (reformatted only: {summary['reformattedOnly']})")
+    print(f"Changed: {summary['changed']}  added: {summary['added']}  removed: {summary['removed']}"
+          f"  unparseable: {summary['unparseable']}")
+    by_cat = ", ".join(f"{c}={n}" for c, n in summary["visualsByCategory"].items()) or "none"
+    print(f"Visuals changed: {summary['visualsChanged']}  ({by_cat})")
+    print()
+
+    visuals = diff.visual_diffs()
+    visual_paths = {fd.rel_path for fd in visuals.values()}
+    sections = [("Visuals", sorted(visuals.items())),
+                ("Other files", [(fd.rel_path, fd) for fd in diff.files if fd.rel_path not in visual_paths])]
+    for title, items in sections:
+        if categories:
+            items = [(k, fd) for k, fd in items if set(fd.categories) & set(categories)]
+        if not items:
+            continue
+        print(title)
+        print("-" * 80)
+        for key, fd in items:
+            cats = ", ".join(fd.categories)
+            print(f"  [{fd.status.upper()}] {key}" + (f"  ({cats})" if cats else ""))
+            shown = fd.changes if max_paths <= 0 else fd.changes[:max_paths]
+            for c in shown:
+                if c.op == "changed":
+                    detail = f"{json.dumps(_preview(c.old), ensure_ascii=False)} -> {json.dumps(_preview(c.new), ensure_ascii=False)}"
+                else:
+                    detail = json.dumps(_preview(c.new if c.op == "added" else c.old), ensure_ascii=False)
+                print(f"      {c.op:<7} {c.path}: {detail}")
+            if len(shown) < len(fd.changes):
+                print(f"      ... {len(fd.changes) - len(shown)} more")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merkle-hash structural diff of two PBIR output trees",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # What did the template change do to the generated visuals?
+  python pbir_diff.py pbir_out_before pbir_out
+
+  # Only binding changes, full JSON for review
+  python pbir_diff.py pbir_out_before pbir_out --category binding --json diff.json
+        """
+    )
+    parser.add_argument("old", help="Previous PBIR tree (e.g. an earlier pbir_out or .Report/definition)")
+    parser.add_argument("new", help="New PBIR tree")
+    parser.add_argument("--json", help="Write the diff to this JSON file")
+    parser.add_argument("--paths", type=int, default=10, help="JSON paths printed per file (default: 10, 0 = all)")
+    parser.add_argument("--category", action="append", choices=CATEGORIES,
+                        help="Only show files with changes in this category (repeatable)")
+    args = parser.parse_args()
+
+    old_root, new_root = Path(args.old), Path(args.new)
+    for root in (old_root, new_root):
+        if not root.is_dir():
+            print(f"ERROR: Folder not found: {root}")
+            sys.exit(1)
+
+    diff = diff_trees(snapshot_tree(old_root), snapshot_tree(new_root))
+    print_diff(diff, args.paths, args.category)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(diff.to_report(), indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+PBIR Report Reader
+
+Shared loader for the PBIR report definition (pages, visuals, bookmarks)
+used by the analysis tools. It walks definition/pages/<pageId>/page.json and
+definition/pages/<pageId>/visuals/<visualId>/visual.json and extracts every
+semantic-model field a visual touches:
+
+- queryState projections (per bucket)
+- sortDefinition fields
+- Measure/Column expressions in objects / visualContainerObjects (conditional formatting)
+- filterConfig filters (with From/Source alias resolution)
+
+ReportModel.iter_all_field_refs() adds page- and report-level filters and
+bookmark state, i.e. every place a report can keep a model object alive.
+
+Usage (as a module):
+    from pbir_report import load_report
+    report = load_report(Path("press-room-dashboard.Report"))
+    for visual in report.iter_visuals():
+        print(visual.page_id, visual.visual_id, visual.visual_type, visual.measures())
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class FieldRef:
+    """A semantic-model field referenced from a report file."""
+    kind: str          # "Measure" or "Column" (Aggregation/HierarchyLevel resolve to their Column)
+    entity: str
+    prop: str
+    source: str = "projection"   # projection | sort | objects | filter | bookmark
+    bucket: str = ""
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.entity, self.prop)
+
+
+@dataclass
+class VisualInfo:
+    """One visual.json."""
+    page_id: str
+    visual_id: str
+    path: Path
+    data: Dict[str, Any]
+    field_refs: List[FieldRef] = field(default_factory=list)
+
+    @property
+    def visual_type(self) -> str:
+        return self.data.get("visual", {}).get("visualType", "")
+
+    @property
+    def query_state(self) -> Dict[str, Any]:
+        return self.data.get("visual", {}).get("query", {}).get("queryState", {}) or {}
+
+    @property
+    def is_data_bound(self) -> bool:
+        """True if the visual issues a query (has at least one projection)."""
+        return any(r.source == "projection" for r in self.field_refs)
+
+    def projections_by_bucket(self) -> Dict[str, List[FieldRef]]:
+        buckets: Dict[str, List[FieldRef]] = {}
+        for ref in self.field_refs:
+            if ref.source == "projection":
+                buckets.setdefault(ref.bucket, []).append(ref)
+        return buckets
+
+    def measures(self) -> Set[Tuple[str, str]]:
+        return {r.key for r in self.field_refs if r.kind == "Measure"}
+
+    def columns(self) -> Set[Tuple[str, str]]:
+        return {r.key for r in self.field_refs if r.kind == "Column"}
+
+
+@dataclass
+class PageInfo:
+    """One page folder."""
+    page_id: str
+    path: Path
+    data: Dict[str, Any]
+    visuals: List[VisualInfo] = field(default_factory=list)
+
+    @property
+    def display_name(self) -> str:
+        return self.data.get("displayName", self.page_id)
+
+
+@dataclass
+class ReportModel:
+    """Parsed PBIR report definition."""
+    root: Path
+    report_data: Dict[str, Any] = field(default_factory=dict)
+    pages: Dict[str, PageInfo] = field(default_factory=dict)
+    page_order: List[str] = field(default_factory=list)
+    bookmarks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    bookmark_paths: Dict[str, Path] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    def iter_visuals(self) -> Iterator[VisualInfo]:
+        for page in self.pages.values():
+            yield from page.visuals
+
+    def find_visual(self, visual_id: str) -> Optional[VisualInfo]:
+        for visual in self.iter_visuals():
+            if visual.visual_id == visual_id:
+                return visual
+        return None
+
+    def iter_all_field_refs(self) -> Iterator[Tuple[str, FieldRef]]:
+        """Yield (location, ref) for visuals, page/report filters and bookmarks."""
+        for page in self.pages.values():
+            for visual in page.visuals:
+                for ref in visual.field_refs:
+                    yield f"visual {page.page_id}/{visual.visual_id}", ref
+            for ref in extract_field_refs(page.data.get("filterConfig", {}), "filter"):
+                yield f"page {page.page_id}", ref
+        for ref in extract_field_refs(self.report_data.get("filterConfig", {}), "filter"):
+            yield "report", ref
+        for name, bookmark in self.bookmarks.items():
+            for ref in extract_field_refs(bookmark.get("explorationState", {}), "bookmark"):
+                yield f"bookmark {name}", ref
+
+
+# -----------------------------
+# Field extraction
+# -----------------------------
+
+def _field_from_expr(kind: str, expr: Dict[str, Any], aliases: Dict[str, str]) -> Optional[Tuple[str, str]]:
+    """Resolve {"Expression": {"SourceRef": {...}}, "Property": ...} to (entity, property)."""
+    if not isinstance(expr, dict) or "Property" not in expr:
+        return None
+    source_ref = expr.get("Expression", {}).get("SourceRef", {})
+    entity = source_ref.get("Entity") or aliases.get(source_ref.get("Source", ""), "")
+    if not entity:
+        return None
+    return entity, expr["Property"]
+
+
+def extract_field_refs(obj: Any, source: str, bucket: str = "",
+                       aliases: Optional[Dict[str, str]] = None) -> List[FieldRef]:
+    """Walk any PBIR JSON fragment and collect Measure/Column references."""
+    refs: List[FieldRef] = []
+    aliases = dict(aliases or {})
+
+    def walk(node: Any, aliases: Dict[str, str]) -> None:
+        if isinstance(node, dict):
+            if isinstance(node.get("From"), list):
+                aliases = dict(aliases)
+                for item in node["From"]:
+                    if isinstance(item, dict) and "Name" in item and "Entity" in item:
+                        aliases[item["Name"]] = item["Entity"]
+            for kind in ("Measure", "Column"):
+                if kind in node:
+                    resolved = _field_from_expr(kind, node[kind], aliases)
+                    if resolved:
+                        refs.append(FieldRef(kind, resolved[0], resolved[1], source, bucket))
+            if "HierarchyLevel" in node:
+                level = node["HierarchyLevel"]
+                hierarchy = level.get("Expression", {}).get("Hierarchy", {})
+                resolved = _field_from_expr("Column", {
+                    "Expression": hierarchy.get("Expression", {}),
+                    "Property": level.get("Level", ""),
+                }, aliases)
+                if resolved:
+                    refs.append(FieldRef("Column", resolved[0], resolved[1], source, bucket))
+            for value in node.values():
+                walk(value, aliases)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, aliases)
+
+    walk(obj, aliases)
+    return refs
+
+
+def extract_visual_field_refs(visual_data: Dict[str, Any]) -> List[FieldRef]:
+    """All field references of a visual.json, tagged by where they are used."""
+    refs: List[FieldRef] = []
+    visual = visual_data.get("visual", {})
+    query = visual.get("query", {}) or {}
+    query_state = query.get("queryState", {}) or {}
+
+    for bucket, bucket_data in query_state.items():
+        if isinstance(bucket_data, dict) and isinstance(bucket_data.get("projections"), list):
+            for proj in bucket_data["projections"]:
+                refs.extend(extract_field_refs(proj.get("field", {}), "projection", bucket))
+
+    if "sortDefinition" in query:
+        refs.extend(extract_field_refs(query["sortDefinition"], "sort"))
+    for key in ("objects", "visualContainerObjects"):
+        if key in visual:
+            refs.extend(extract_field_refs(visual[key], "objects"))
+    if "filterConfig" in visual_data:
+        refs.extend(extract_field_refs(visual_data["filterConfig"], "filter"))
+    return refs
+
+
+# -----------------------------
+# Loader
+# -----------------------------
+
+def _read_json(path: Path, errors: List[str]) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8-sig"))
+    except (OSError, json.JSONDecodeError) as e:
+        errors.append(f"{path}: {e}")
+        return None
+
+
+def load_visual(visual_json_path: Path, errors: Optional[List[str]] = None) -> Optional[VisualInfo]:
+    """Load a single visual.json (pages/<pageId>/visuals/<visualId>/visual.json)."""
+    data = _read_json(visual_json_path, errors if errors is not None else [])
+    if data is None:
+        return None
+    return VisualInfo(
+        page_id=visual_json_path.parent.parent.parent.name,
+        visual_id=visual_json_path.parent.name,
+        path=visual_json_path,
+        data=data,
+        field_refs=extract_visual_field_refs(data),
+    )
+
+
+def resolve_report_dir(path: Path) -> Path:
+    """Accept a .Report folder or its definition/ folder; returns the .Report folder."""
+    path = Path(path)
+    if path.name == "definition" and (path / "pages").is_dir():
+        return path.parent
+    return path
+
+
+def load_report(report_path: Path) -> ReportModel:
+    """Load pages, visuals and bookmarks of a .Report folder."""
+    report_path = resolve_report_dir(report_path)
+    definition = report_path / "definition"
+    pages_dir = definition / "pages"
+    if not pages_dir.is_dir():
+        raise FileNotFoundError(f"Report pages folder not found: {pages_dir}")
+
+    report = ReportModel(root=report_path)
+
+    if (definition / "report.json").exists():
+        report.report_data = _read_json(definition / "report.json", report.errors) or {}
+
+    pages_json = _read_json(pages_dir / "pages.json", report.errors) if (pages_dir / "pages.json").exists() else None
+    if pages_json:
+        report.page_order = list(pages_json.get("pageOrder", []))
+
+    for page_json_path in sorted(pages_dir.glob("*/page.json")):
+        data = _read_json(page_json_path, report.errors)
+        if data is None:
+            continue
+        page = PageInfo(page_id=page_json_path.parent.name, path=page_json_path, data=data)
+        for visual_json_path in sorted(page_json_path.parent.glob("visuals/*/visual.json")):
+            visual = load_visual(visual_json_path, report.errors)
+            if visual is not None:
+                page.visuals.append(visual)
+        report.pages[page.page_id] = page
+
+    bookmarks_dir = definition / "bookmarks"
+    if bookmarks_dir.is_dir():
+        for bookmark_path in sorted(bookmarks_dir.glob("*.bookmark.json")):
+            data = _read_json(bookmark_path, report.errors)
+            if data is not None:
+                name = data.get("name", bookmark_path.name[:-len(".bookmark.json")])
+                report.bookmarks[name] = data
+                report.bookmark_paths[name] = bookmark_path
+
+    return report
+
+
+def find_report_dir(semantic_model_path: Path) -> Optional[Path]:
+    """Locate the sibling .Report folder of a .SemanticModel folder."""
+    semantic_model_path = Path(semantic_model_path)
+    if semantic_model_path.name == "definition":
+        semantic_model_path = semantic_model_path.parent
+    for item in semantic_model_path.parent.iterdir():
+        if item.is_dir() and item.name.endswith(".Report"):
+            return item
+    return None
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Performance Analyzer Export Ingestion
+
+Parses the JSON files exported from Power BI Desktop's Performance Analyzer
+pane and attributes the recorded timings to the repo: every visualId is
+mapped back to definition/pages/<pageId>/visuals/<visualId>/visual.json and
+to the measures its DAX query evaluates (from the captured query text, or
+the visual's projections when the export has no query text).
+
+Timings follow the Performance Analyzer pane:
+- DAX query: duration of the "Execute DAX Query" events of the visual
+- Visual display: duration of the "Render" events
+- Other: the rest of the "Visual Container Lifecycle" (waiting, data view transform)
+
+Every export file is one session; within a session each "User Action"
+(start recording, refresh visuals, page change) starts a new load. Samples
+from all sessions are combined per visual, per measure and per page.
+
+- Slowest visuals: median / p90 of total, DAX, display and other
+- Slowest measures: DAX time split evenly over the measures of each query,
+  with the .tmdl file that defines the measure
+- Pages over budget: wall time from the first visual starting to the last
+  visual finishing in one load, at --budget-percentile
+
+Usage:
+    python perf_analyzer_ingest.py export.json [more.json | exports_dir ...] [--report path.Report] [--model path.SemanticModel] [--page-budget-ms 2000] [--json out.json]
+
+Options:
+    --report: Path to the .Report folder (default: sibling of the semantic model)
+    --model: Path to the .SemanticModel folder (default: bundled dashboard model)
+    --page-budget-ms: Page load latency budget in milliseconds (default: 2000)
+    --budget-percentile: Percentile of page loads compared to the budget (default: 90)
+    --top: Rows per ranking (default: 15)
+    --json: Write the full ranked report as JSON
+"""
+
+import argparse
+import bisect
+import json
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from dax_lexer import DaxSyntaxError, declared_variables, extract_references, tokenize
+from pbir_report import ReportModel, find_report_dir, load_report
+from tmdl_model import SemanticModel, load_semantic_model
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+LIFECYCLE_EVENT = "Visual Container Lifecycle"
+DAX_QUERY_EVENT = "Execute DAX Query"
+RENDER_EVENT = "Render"
+USER_ACTION_EVENT = "User Action"
+
+UNKNOWN_PAGE = "(not in report)"
+
+
+@dataclass
+class VisualSample:
+    """One visual load (a Visual Container Lifecycle event and its children)."""
+    session: str
+    action: int
+    visual_id: str
+    title: str
+    visual_type: str
+    start: float       # epoch milliseconds
+    end: float
+    dax_ms: float = 0.0
+    render_ms: float = 0.0
+    query_texts: List[str] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return self.end - self.start
+
+    @property
+    def other_ms(self) -> float:
+        return max(0.0, self.total_ms - self.dax_ms - self.render_ms)
+
+
+@dataclass
+class VisualStats:
+    """All samples of one visual, joined with its visual.json."""
+    visual_id: str
+    title: str = ""
+    visual_type: str = ""
+    page_id: str = UNKNOWN_PAGE
+    page_name: str = UNKNOWN_PAGE
+    path: Optional[Path] = None
+    measures: Set[str] = field(default_factory=set)
+    samples: List[VisualSample] = field(default_factory=list)
+
+    def stat(self, attr: str, pct: float = 50) -> float:
+        return percentile([getattr(s, attr) for s in self.samples], pct)
+
+    def to_dict(self) -> Dict:
+        return {
+            "visualId": self.visual_id,
+            "title": self.title,
+            "visualType": self.visual_type,
+            "pageId": self.page_id,
+            "page": self.page_name,
+            "path": str(self.path) if self.path else None,
+            "measures": sorted(self.measures),
+            "samples": len(self.samples),
+            "sessions": len({s.session for s in self.samples}),
+            **{f"{attr[:-3]}Ms": {"p50": round(self.stat(attr), 1), "p90": round(self.stat(attr, 90), 1),
+                                  "max": round(max(getattr(s, attr) for s in self.samples), 1)}
+               for attr in ("total_ms", "dax_ms", "render_ms", "other_ms")},
+        }
+
+
+@dataclass
+class MeasureStats:
+    """DAX time attributed to one measure over every visual that queries it."""
+    name: str
+    table: str = ""
+    file: str = ""
+    attributed_ms: float = 0.0
+    worst_visual_dax_ms: float = 0.0
+    visuals: List[str] = field(default_factory=list)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile (numpy's default method)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# ============================================================================
+# EXPORT PARSING
+# ============================================================================
+
+def parse_timestamp(value) -> Optional[float]:
+    """Export timestamps ("2024-05-01T10:00:00.1234567Z") -> epoch milliseconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str) or not value:
+        return None
+    text = value.strip().replace("Z", "+00:00")
+    text = re.sub(r"(\.\d{6})\d+", r"\1", text)   # fromisoformat takes at most 6 fraction digits
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp() * 1000.0
+
+
+def _duration(event: Dict) -> float:
+    start, end = parse_timestamp(event.get("start")), parse_timestamp(event.get("end"))
+    if start is None or end is None:
+        return 0.0
+    return max(0.0, end - start)
+
+
+def parse_export(path: Path) -> Tuple[List[VisualSample], List[str]]:
+    """Visual samples of one Performance Analyzer export file, plus warnings."""
+    warnings: List[str] = []
+    try:
+        data = json.loads(path.read_text(encoding="utf-8-sig"))
+    except (OSError, ValueError) as e:
+        return [], [f"{path.name}: cannot read export ({e})"]
+    events = data.get("events", []) if isinstance(data, dict) else data
+    if not isinstance(events, list):
+        return [], [f"{path.name}: no 'events' list - not a Performance Analyzer export"]
+
+    by_id: Dict[str, Dict] = {e["id"]: e for e in events if isinstance(e, dict) and e.get("id")}
+    actions = sorted(t for t in (parse_timestamp(e.get("start")) for e in events
+                                 if isinstance(e, dict) and e.get("name") == USER_ACTION_EVENT) if t is not None)
+
+    samples: Dict[str, VisualSample] = {}
+    for event in events:
+        if not isinstance(event, dict) or event.get("name") != LIFECYCLE_EVENT:
+            continue
+        metrics = event.get("metrics", {}) or {}
+        start, end = parse_timestamp(event.get("start")), parse_timestamp(event.get("end"))
+        visual_id = metrics.get("visualId")
+        if not visual_id or start is None or end is None:
+            continue  # Still running when the recording stopped
+        action = bisect.bisect_right(actions, start)
+        samples[event.get("id", f"{visual_id}@{start}")] = VisualSample(
+            session=path.name, action=action, visual_id=visual_id,
+            title=metrics.get("visualTitle", ""), visual_type=metrics.get("visualType", ""),
+            start=start, end=end,
+        )
+    if not samples:
+        warnings.append(f"{path.name}: no completed visual lifecycle events")
+
+    def lifecycle_of(event: Dict) -> Optional[str]:
+        seen = set()
+        parent = event.get("parentId")
+        while parent and parent not in seen:
+            if parent in samples:
+                return parent
+            seen.add(parent)
+            parent = by_id.get(parent, {}).get("parentId")
+        return None
+
+    for event in events:
+        if not isinstance(event, dict) or event.get("name") not in (DAX_QUERY_EVENT, RENDER_EVENT):
+            continue
+        owner = lifecycle_of(event)
+        if owner is None:
+            continue
+        sample = samples[owner]
+        if event["name"] == RENDER_EVENT:
+            sample.render_ms += _duration(event)
+        else:
+            sample.dax_ms += _duration(event)
+            query_text = (event.get("metrics", {}) or {}).get("QueryText")
+            if query_text:
+                sample.query_texts.append(query_text)
+
+    return list(samples.values()), warnings
+
+
+def collect_export_files(inputs: List[str]) -> List[Path]:
+    files: List[Path] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.json")))
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+# ============================================================================
+# ATTRIBUTION
+# ============================================================================
+
+def query_measures(query_text: str, model: Optional[SemanticModel]) -> Set[str]:
+    """Model measures referenced by a captured DAX query ('Metrics'[Total Views] or [Total Views])."""
+    if model is None:
+        return set()
+    measure_names = set(model.measure_index().keys())
+    try:
+        tokens = tokenize(query_text)
+    except DaxSyntaxError:
+        return set()
+    found = set()
+    for ref in extract_references(tokens, declared_variables(tokens)):
+        if ref.kind in ("measure", "column") and ref.name in measure_names:
+            if ref.kind == "measure" or ref.table in model.tables:
+                found.add(ref.name)
+    return found
+
+
+def build_visual_stats(samples: List[VisualSample], report: Optional[ReportModel],
+                       model: Optional[SemanticModel]) -> Tuple[List[VisualStats], List[str]]:
+    """Group samples per visual and join them with visual.json."""
+    warnings: List[str] = []
+    stats: Dict[str, VisualStats] = {}
+    for sample in samples:
+        vs = stats.setdefault(sample.visual_id, VisualStats(sample.visual_id))
+        vs.samples.append(sample)
+        vs.title = vs.title or sample.title
+        vs.visual_type = vs.visual_type or sample.visual_type
+        for text in sample.query_texts:
+            vs.measures |= query_measures(text, model)
+
+    for vs in stats.values():
+        visual = report.find_visual(vs.visual_id) if report else None
+        if visual is None:
+            if report is not None:
+                warnings.append(f"Visual {vs.visual_id} ('{vs.title}') is not in the report - stale export?")
+            continue
+        page = report.pages.get(visual.page_id)
+        vs.page_id = visual.page_id
+        vs.page_name = page.display_name if page else visual.page_id
+        vs.path = visual.path
+        vs.visual_type = visual.visual_type or vs.visual_type
+        if not vs.measures:
+            vs.measures = {r.prop for r in visual.field_refs if r.kind == "Measure"}
+    return sorted(stats.values(), key=lambda v: v.stat("total_ms"), reverse=True), warnings
+
+
+def build_measure_stats(visuals: List[VisualStats], model: Optional[SemanticModel]) -> List[MeasureStats]:
+    index = model.measure_index() if model else {}
+    root = model.root if model else None
+    measures: Dict[str, MeasureStats] = {}
+    for vs in visuals:
+        if not vs.measures:
+            continue
+        dax = vs.stat("dax_ms")
+        share = dax / len(vs.measures)
+        for name in vs.measures:
+            ms = measures.get(name)
+            if ms is None:
+                ms = MeasureStats(name)
+                if name in index:
+                    table, node = index[name]
+                    ms.table = table.name
+                    try:
+                        ms.file = str(node.file_path.relative_to(root))
+                    except ValueError:
+                        ms.file = str(node.file_path)
+                measures[name] = ms
+            ms.attributed_ms += share
+            ms.worst_visual_dax_ms = max(ms.worst_visual_dax_ms, dax)
+            ms.visuals.append(vs.visual_id)
+    return sorted(measures.values(), key=lambda m: m.attributed_ms, reverse=True)
+
+
+def build_page_loads(visuals: List[VisualStats]) -> Dict[str, List[float]]:
+    """page name -> wall time of every (session, user action) load of that page."""
+    windows: Dict[Tuple[str, str, int], List[float]] = {}
+    for vs in visuals:
+        if vs.page_id == UNKNOWN_PAGE:
+            continue  # Page unknown: cannot tell which load it belongs to
+        for s in vs.samples:
+            key = (vs.page_name, s.session, s.action)
+            window = windows.setdefault(key, [s.start, s.end])
+            window[0] = min(window[0], s.start)
+            window[1] = max(window[1], s.end)
+    loads: Dict[str, List[float]] = defaultdict(list)
+    for (page, _, _), (start, end) in sorted(windows.items()):
+        loads[page].append(end - start)
+    return dict(loads)
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def print_report(files: List[Path], visuals: List[VisualStats], measures: List[MeasureStats],
+                 page_loads: Dict[str, List[float]], budget_ms: float, budget_pct: float, top: int) -> List[str]:
+    """Print the ranked report; returns the pages over budget."""
+    print("=" * 80)
+    print("PERFORMANCE ANALYZER REPORT".center(80))
+    print("=" * 80)
+    print(f"Sessions: {len(files)}  Visual loads: {sum(len(v.samples) for v in visuals)}  Visuals: {len(visuals)}")
+    print()
+
+    print(f"SLOWEST VISUALS (median ms over all loads, top {top})")
+    print("-" * 80)
+    print(f"  {'Visual':<34} {'Page':<14} {'n':>3} {'Total':>7} {'p90':>7} {'DAX':>7} {'Disp':>6} {'Other':>6}")
+    for vs in visuals[:top]:
+        label = f"{vs.title or vs.visual_type} ({vs.visual_id[:8]})"
+        print(f"  {label[:34]:<34} {vs.page_name[:14]:<14} {len(vs.samples):>3} "
+              f"{vs.stat('total_ms'):>7.0f} {vs.stat('total_ms', 90):>7.0f} {vs.stat('dax_ms'):>7.0f} "
+              f"{vs.stat('render_ms'):>6.0f} {vs.stat('other_ms'):>6.0f}")
+    print()
+
+    print(f"SLOWEST MEASURES (median DAX ms split over each query's measures, top {top})")
+    print("-" * 80)
+    if not measures:
+        print("  No measures attributed (exports without query text and visuals not found in the report)")
+    for ms in measures[:top]:
+        where = ms.file or "(not in model)"
+        print(f"  {ms.attributed_ms:>7.0f} ms  {ms.name[:40]:<40} {len(ms.visuals):>2} visual(s)  {where}")
+    print()
+
+    over = []
+    print(f"PAGE LOAD (p{budget_pct:g} of {sum(len(v) for v in page_loads.values())} loads vs {budget_ms:g} ms budget)")
+    print("-" * 80)
+    for page, loads in sorted(page_loads.items(), key=lambda kv: -percentile(kv[1], budget_pct)):
+        value = percentile(loads, budget_pct)
+        marker = "[ERROR]" if value > budget_ms else "[OK]"
+        if value > budget_ms:
+            over.append(page)
+        print(f"  {marker} {page}: p50 {percentile(loads, 50):.0f} ms, p{budget_pct:g} {value:.0f} ms "
+              f"({len(loads)} load(s))")
+    print()
+    return over
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Attribute Performance Analyzer exports to report visuals and model measures",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # One export
+  python perf_analyzer_ingest.py PowerBIPerformanceData.json
+
+  # Every export in a folder, 1.5 s page budget, JSON for the ticket
+  python perf_analyzer_ingest.py perf_exports/ --page-budget-ms 1500 --json perf.json
+        """
+    )
+    parser.add_argument("exports", nargs="+", help="Performance Analyzer export files or folders of them")
+    parser.add_argument("--report", help="Path to the .Report folder (default: sibling of the semantic model)")
+    parser.add_argument("--model", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder (or its definition folder)")
+    parser.add_argument("--page-budget-ms", type=float, default=2000.0,
+                        help="Page load latency budget in ms (default: 2000)")
+    parser.add_argument("--budget-percentile", type=float, default=90.0,
+                        help="Percentile of page loads compared to the budget (default: 90)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per ranking (default: 15)")
+    parser.add_argument("--json", help="Write the ranked report to this JSON file")
+    args = parser.parse_args()
+
+    files = collect_export_files(args.exports)
+    if not files:
+        print(f"ERROR: No export files found in: {', '.join(args.exports)}")
+        sys.exit(1)
+
+    model_path = Path(args.model)
+    model = load_semantic_model(model_path) if model_path.exists() else None
+    if model is None:
+        print(f"[WARN] Semantic model not found: {model_path} - measures are not linked to .tmdl files")
+
+    report_path = Path(args.report) if args.report else (find_report_dir(model_path.resolve()) if model else None)
+    report = load_report(report_path) if report_path and report_path.exists() else None
+    if report is None:
+        print("[WARN] No .Report folder found - visuals are not mapped to visual.json")
+
+    samples: List[VisualSample] = []
+    warnings: List[str] = []
+    for path in files:
+        file_samples, file_warnings = parse_export(path)
+        samples.extend(file_samples)
+        warnings.extend(file_warnings)
+
+    visuals, join_warnings = build_visual_stats(samples, report, model)
+    warnings.extend(join_warnings)
+    for warning in warnings:
+        print(f"[WARN] {warning}")
+    if warnings:
+        print()
+    if not visuals:
+        print("ERROR: No visual timings found in the exports")
+        sys.exit(1)
+
+    measures = build_measure_stats(visuals, model)
+    page_loads = build_page_loads(visuals)
+    over = print_report(files, visuals, measures, page_loads,
+                        args.page_budget_ms, args.budget_percentile, args.top)
+
+    if args.json:
+        out = {
+            "sessions": [str(p) for p in files],
+            "pageBudgetMs": args.page_budget_ms,
+            "budgetPercentile": args.budget_percentile,
+            "visuals": [v.to_dict() for v in visuals],
+            "measures": [
+                {"name": m.name, "table": m.table, "file": m.file, "attributedDaxMs": round(m.attributed_ms, 1),
+                 "worstVisualDaxMs": round(m.worst_visual_dax_ms, 1), "visuals": m.visuals}
+                for m in measures
+            ],
+            "pages": [
+                {"page": page, "loads": len(loads), "p50Ms": round(percentile(loads, 50), 1),
+                 "budgetValueMs": round(percentile(loads, args.budget_percentile), 1),
+                 "overBudget": page in over}
+                for page, loads in sorted(page_loads.items())
+            ],
+            "warnings": warnings,
+        }
+        Path(args.json).write_text(json.dumps(out, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    if over:
+        print(f"[ERROR] {len(over)} page(s) over the {args.page_budget_ms:g} ms budget: {', '.join(over)}")
+        sys.exit(1)
+    print("[SUCCESS] All pages within the latency budget.")
+
+
+if __name__ == "__main__":
+    main()
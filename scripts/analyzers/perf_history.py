@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Performance History Store and Regression Gate
+
+SQLite-backed record of performance numbers keyed by git commit, so changes
+in generation time, validation time, model size and measured visual latency
+can be compared across commits.
+
+Sources:
+- bench: times master_pbip_validator.py (and optionally pbir_generate.py)
+  --repeat times and records the size of the semantic model and report
+- ingest-json: numeric leaves of any JSON result file (for example the
+  profile block of validation_report.json), flattened to dotted metric names
+- ingest-pa: Performance Analyzer exports (per-visual and per-page load times,
+  via perf_analyzer_ingest.py)
+
+compare <base> <head> pools every run recorded for each commit and flags a
+metric as a regression when the head median is worse than the base median
+by more than the metric's threshold AND, for timings, a one-sided
+Mann-Whitney U test says the shift is significant (p < --alpha). Sizes and
+counts are deterministic and only use the threshold. Exit code 1 on any
+regression.
+
+Usage:
+    python perf_history.py bench [--repeat 5] [--report path.Report] [--model path.SemanticModel]
+    python perf_history.py ingest-json validation_report.json --prefix generator
+    python perf_history.py ingest-pa PowerBIPerformanceData.json [more.json ...]
+    python perf_history.py list [--metric "validator.*"]
+    python perf_history.py compare main HEAD [--alpha 0.05] [--threshold "*_ms=0.15"] [--config perf_thresholds.json]
+
+Options:
+    --db: SQLite database (default: .perf_history.sqlite at the repo root)
+    --commit: Record results against this commit instead of HEAD
+    --alpha: Significance level for timing metrics (default: 0.05)
+    --threshold: GLOB=FRACTION relative threshold override (repeatable)
+    --config: JSON file {"alpha": 0.05, "thresholds": {"GLOB": FRACTION}}
+"""
+
+import argparse
+import fnmatch
+import json
+import math
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DB_PATH = REPO_ROOT / ".perf_history.sqlite"
+DEFAULT_MODEL_PATH = REPO_ROOT / "press-room-dashboard.SemanticModel"
+DEFAULT_REPORT_PATH = REPO_ROOT / "press-room-dashboard.Report"
+VALIDATOR_SCRIPT = REPO_ROOT / "scripts" / "validators" / "master_pbip_validator.py"
+GENERATOR_SCRIPT = REPO_ROOT / "pbir_generate.py"
+
+# Relative increase tolerated before a metric counts as a regression
+DEFAULT_THRESHOLDS = {"ms": 0.10, "bytes": 0.02, "count": 0.0}
+DEFAULT_ALPHA = 0.05
+# Timing metrics need this many samples on each side before they can fail the gate
+MIN_TIMING_SAMPLES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    commit_sha TEXT NOT NULL,
+    dirty INTEGER NOT NULL DEFAULT 0,
+    source TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    host TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS idx_samples_run_metric ON samples(run_id, metric);
+"""
+
+
+@dataclass
+class Comparison:
+    """Base vs head result for one metric."""
+    metric: str
+    unit: str
+    base: List[float]
+    head: List[float]
+    threshold: float
+    p_value: Optional[float] = None
+    status: str = "ok"     # ok | regression | improved | noisy | insufficient
+
+    @property
+    def base_median(self) -> float:
+        return statistics.median(self.base)
+
+    @property
+    def head_median(self) -> float:
+        return statistics.median(self.head)
+
+    @property
+    def change(self) -> float:
+        if self.base_median == 0:
+            return 0.0 if self.head_median == 0 else math.inf
+        return (self.head_median - self.base_median) / abs(self.base_median)
+
+
+# ============================================================================
+# GIT / STORE
+# ============================================================================
+
+def git(*args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {' '.join(args)} failed")
+    return result.stdout.strip()
+
+
+def resolve_commit(ref: str) -> str:
+    """Full SHA of a ref; unknown refs are matched as SHA prefixes in the store."""
+    try:
+        return git("rev-parse", "--verify", f"{ref}^{{commit}}")
+    except (RuntimeError, FileNotFoundError):
+        return ref
+
+
+def current_commit() -> Tuple[str, bool]:
+    """(HEAD sha, working tree has uncommitted changes)."""
+    sha = git("rev-parse", "HEAD")
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    return sha, dirty
+
+
+def open_store(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record_run(conn: sqlite3.Connection, commit: Optional[str], source: str,
+               samples: List[Tuple[str, float, str]]) -> Tuple[str, int]:
+    """Store one run; returns (commit sha, run id)."""
+    if commit:
+        sha, dirty = resolve_commit(commit), False
+    else:
+        sha, dirty = current_commit()
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO runs (commit_sha, dirty, source, created_at, host) VALUES (?, ?, ?, ?, ?)",
+            (sha, int(dirty), source, datetime.now(timezone.utc).isoformat(timespec="seconds"), platform.node()),
+        )
+        run_id = cur.lastrowid
+        conn.executemany("INSERT INTO samples (run_id, metric, value, unit) VALUES (?, ?, ?, ?)",
+                         [(run_id, metric, float(value), unit) for metric, value, unit in samples])
+    return sha, run_id
+
+
+def load_samples(conn: sqlite3.Connection, ref: str) -> Dict[str, Tuple[str, List[float]]]:
+    """metric -> (unit, values) pooled over every run of a commit."""
+    sha = resolve_commit(ref)
+    rows = conn.execute(
+        "SELECT s.metric, s.unit, s.value FROM samples s JOIN runs r ON r.id = s.run_id "
+        "WHERE r.commit_sha = ? OR r.commit_sha LIKE ? ORDER BY r.id",
+        (sha, f"{sha}%") if len(sha) >= 7 else (sha, sha),
+    ).fetchall()
+    result: Dict[str, Tuple[str, List[float]]] = {}
+    for metric, unit, value in rows:
+        result.setdefault(metric, (unit, []))[1].append(value)
+    return result
+
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+def _normal_sf(z: float) -> float:
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_whitney_greater(base: List[float], head: List[float]) -> float:
+    """
+    One-sided Mann-Whitney U p-value for "head tends to be larger than base".
+
+    Exact distribution for small samples without ties, normal approximation
+    with tie correction otherwise.
+    """
+    n1, n2 = len(head), len(base)
+    combined = sorted([(v, 0) for v in head] + [(v, 1) for v in base])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    rank_sum = sum(r for r, (_, side) in zip(ranks, combined) if side == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2    # pairs where head > base
+
+    if tie_term == 0 and n1 + n2 <= 40:
+        # counts[k] = number of orderings with U == k
+        counts = _u_distribution(n1, n2)
+        total = sum(counts)
+        return sum(counts[int(math.ceil(u)):]) / total
+
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)   # continuity correction
+    return _normal_sf(z)
+
+
+def _u_distribution(n1: int, n2: int) -> List[int]:
+    """Frequencies of U = 0..n1*n2 under H0 (recurrence over the largest element)."""
+    # table[a][b] = distribution for sample sizes a, b
+    table: Dict[Tuple[int, int], List[int]] = {}
+    for a in range(n1 + 1):
+        for b in range(n2 + 1):
+            if a == 0 or b == 0:
+                table[(a, b)] = [1]
+                continue
+            dist = [0] * (a * b + 1)
+            for u, c in enumerate(table[(a - 1, b)]):   # largest value is from the first sample
+                dist[u + b] += c
+            for u, c in enumerate(table[(a, b - 1)]):   # largest value is from the second sample
+                dist[u] += c
+            table[(a, b)] = dist
+    return table[(n1, n2)]
+
+
+# ============================================================================
+# THRESHOLDS / COMPARE
+# ============================================================================
+
+def load_thresholds(config_path: Optional[str], overrides: List[str]) -> Tuple[float, List[Tuple[str, float]]]:
+    """(alpha, [(glob, fraction)]) - later entries win."""
+    alpha = DEFAULT_ALPHA
+    rules: List[Tuple[str, float]] = []
+    if config_path:
+        config = json.loads(Path(config_path).read_text(encoding="utf-8-sig"))
+        alpha = float(config.get("alpha", alpha))
+        rules.extend((glob, float(value)) for glob, value in config.get("thresholds", {}).items())
+    for item in overrides:
+        glob, _, value = item.rpartition("=")
+        if not glob:
+            raise ValueError(f"--threshold expects GLOB=FRACTION, got '{item}'")
+        rules.append((glob, float(value)))
+    return alpha, rules
+
+
+def threshold_for(metric: str, unit: str, rules: List[Tuple[str, float]]) -> float:
+    value = DEFAULT_THRESHOLDS.get(unit, DEFAULT_THRESHOLDS["count"])
+    for glob, fraction in rules:
+        if fnmatch.fnmatchcase(metric, glob):
+            value = fraction
+    return value
+
+
+def compare_runs(base: Dict[str, Tuple[str, List[float]]], head: Dict[str, Tuple[str, List[float]]],
+                 alpha: float, rules: List[Tuple[str, float]]) -> List[Comparison]:
+    results = []
+    for metric in sorted(set(base) & set(head)):
+        unit = head[metric][0]
+        c = Comparison(metric, unit, base[metric][1], head[metric][1], threshold_for(metric, unit, rules))
+        worse = c.change > c.threshold
+        better = c.change < -c.threshold
+        if unit == "ms":
+            if min(len(c.base), len(c.head)) < MIN_TIMING_SAMPLES:
+                c.status = "insufficient" if worse else ("improved" if better else "ok")
+            else:
+                c.p_value = mann_whitney_greater(c.base, c.head)
+                if worse:
+                    c.status = "regression" if c.p_value < alpha else "noisy"
+                elif better and mann_whitney_greater(c.head, c.base) < alpha:
+                    c.status = "improved"
+        else:
+            c.status = "regression" if worse else ("improved" if better else "ok")
+        results.append(c)
+    return results
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def unit_for(key: str) -> str:
+    lowered = key.lower()
+    if lowered.endswith(("ms", "_ms", "millis")):
+        return "ms"
+    if lowered.endswith(("bytes", "_bytes", "size")):
+        return "bytes"
+    return "count"
+
+
+def flatten_numeric(data, prefix: str) -> Iterator[Tuple[str, float]]:
+    """Numeric leaves as (dotted.name, value); list items are named by name/phase/id when present."""
+    if isinstance(data, bool):
+        return
+    if isinstance(data, (int, float)):
+        yield prefix, float(data)
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            yield from flatten_numeric(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, list):
+        for index, item in enumerate(data):
+            label = index
+            if isinstance(item, dict):
+                label = item.get("name") or item.get("phase") or item.get("id") or index
+            yield from flatten_numeric(item, f"{prefix}.{label}")
+
+
+def tree_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _timed(cmd: List[str]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000.0, result.returncode
+
+
+def run_bench(args) -> List[Tuple[str, float, str]]:
+    samples: List[Tuple[str, float, str]] = []
+    report_path, model_path = Path(args.report), Path(args.model)
+    if model_path.exists():
+        samples.append(("model.definition_bytes", tree_bytes(model_path), "bytes"))
+    if report_path.exists():
+        samples.append(("report.definition_bytes", tree_bytes(report_path / "definition"), "bytes"))
+        resources = report_path / "StaticResources"
+        if resources.exists():
+            samples.append(("report.static_resources_bytes", tree_bytes(resources), "bytes"))
+        for i in range(args.repeat):
+            elapsed, code = _timed([sys.executable, str(VALIDATOR_SCRIPT), str(report_path), "--check-only"])
+            samples.append(("validator.wall_ms", elapsed, "ms"))
+            print(f"  validator run {i + 1}/{args.repeat}: {elapsed:.0f} ms (exit {code})")
+    if args.generator_config and args.generator_base:
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(args.repeat):
+                out_dir = Path(tmp) / f"out{i}"
+                cmd = [sys.executable, str(GENERATOR_SCRIPT), "--config", args.generator_config,
+                       "--base", args.generator_base, "--out", str(out_dir)]
+                if model_path.exists():
+                    cmd += ["--model", str(model_path)]
+                elapsed, code = _timed(cmd)
+                samples.append(("generator.wall_ms", elapsed, "ms"))
+                print(f"  generator run {i + 1}/{args.repeat}: {elapsed:.0f} ms (exit {code})")
+                if code == 0 and i == 0:
+                    samples.append(("generator.output_bytes", tree_bytes(out_dir), "bytes"))
+    return samples
+
+
+def perf_analyzer_samples(exports: List[str]) -> List[Tuple[str, float, str]]:
+    from perf_analyzer_ingest import build_page_loads, build_visual_stats, collect_export_files, parse_export
+    from pbir_report import load_report
+
+    raw = []
+    for path in collect_export_files(exports):
+        file_samples, warnings = parse_export(path)
+        raw.extend(file_samples)
+        for warning in warnings:
+            print(f"[WARN] {warning}")
+    report = load_report(DEFAULT_REPORT_PATH) if DEFAULT_REPORT_PATH.exists() else None
+    visuals, _ = build_visual_stats(raw, report, None)
+    samples = []
+    for vs in visuals:
+        for s in vs.samples:
+            samples.append((f"pa.visual.{vs.visual_id}.total_ms", s.total_ms, "ms"))
+            samples.append((f"pa.visual.{vs.visual_id}.dax_ms", s.dax_ms, "ms"))
+    for page, loads in build_page_loads(visuals).items():
+        samples.extend((f"pa.page.{page}.load_ms", value, "ms") for value in loads)
+    return samples
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _fmt(value: float, unit: str) -> str:
+    if unit == "ms":
+        return f"{value:,.0f} ms"
+    if unit == "bytes":
+        return f"{value:,.0f} B"
+    return f"{value:g}"
+
+
+def print_comparison(base_ref: str, head_ref: str, results: List[Comparison], alpha: float) -> None:
+    print("=" * 80)
+    print(f"PERF COMPARE {base_ref} -> {head_ref}".center(80))
+    print("=" * 80)
+    print(f"Metrics compared: {len(results)}  (alpha {alpha:g}, timing metrics need n>={MIN_TIMING_SAMPLES})")
+    print()
+    markers = {"regression": "[ERROR]", "noisy": "[WARN]", "insufficient": "[WARN]",
+               "improved": "[SUCCESS]", "ok": "[OK]"}
+    for c in sorted(results, key=lambda c: (c.status != "regression", -c.change)):
+        p_text = f" p={c.p_value:.3f}" if c.p_value is not None else ""
+        change = "n/a" if math.isinf(c.change) else f"{c.change:+.1%}"
+        print(f"  {markers[c.status]:<9} {c.metric[:44]:<44} {_fmt(c.base_median, c.unit):>12} -> "
+              f"{_fmt(c.head_median, c.unit):>12} {change:>8} (limit {c.threshold:.0%}, "
+              f"n={len(c.base)}/{len(c.head)}{p_text})")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="SQLite performance history keyed by git commit, with a regression gate",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Record validator timings and model/report sizes for HEAD
+  python perf_history.py bench --repeat 7
+
+  # Record a generator profile and a Performance Analyzer session
+  python perf_history.py ingest-json out/validation_report.json --prefix generator
+  python perf_history.py ingest-pa PowerBIPerformanceData.json
+
+  # Gate a branch against main
+  python perf_history.py compare main HEAD --threshold "validator.*=0.2"
+        """
+    )
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="SQLite database (default: repo root)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("bench", help="Time the validator/generator and record model/report sizes")
+    bench.add_argument("--repeat", type=int, default=5, help="Timed runs per tool (default: 5)")
+    bench.add_argument("--report", default=str(DEFAULT_REPORT_PATH), help="Path to the .Report folder")
+    bench.add_argument("--model", default=str(DEFAULT_MODEL_PATH), help="Path to the .SemanticModel folder")
+    bench.add_argument("--generator-config", help="Also time pbir_generate.py with this config")
+    bench.add_argument("--generator-base", help="Base PBIR folder for pbir_generate.py")
+    bench.add_argument("--commit", help="Record against this commit instead of HEAD")
+
+    ingest_json = sub.add_parser("ingest-json", help="Record numeric leaves of a JSON result file")
+    ingest_json.add_argument("file", help="JSON file (e.g. validation_report.json)")
+    ingest_json.add_argument("--prefix", default="", help="Metric name prefix (default: file stem)")
+    ingest_json.add_argument("--include", action="append", default=[],
+                             help="Only record metrics matching this glob (repeatable)")
+    ingest_json.add_argument("--commit", help="Record against this commit instead of HEAD")
+
+    ingest_pa = sub.add_parser("ingest-pa", help="Record Performance Analyzer export timings")
+    ingest_pa.add_argument("exports", nargs="+", help="Export files or folders of them")
+    ingest_pa.add_argument("--commit", help="Record against this commit instead of HEAD")
+
+    list_cmd = sub.add_parser("list", help="List recorded runs or the history of metrics")
+    list_cmd.add_argument("--metric", help="Glob of metrics to show per commit")
+
+    compare = sub.add_parser("compare", help="Compare two commits; exit 1 on regressions")
+    compare.add_argument("base", help="Base commit/ref")
+    compare.add_argument("head", help="Head commit/ref")
+    compare.add_argument("--alpha", type=float, help=f"Significance level (default: {DEFAULT_ALPHA})")
+    compare.add_argument("--threshold", action="append", default=[],
+                         help="GLOB=FRACTION relative threshold override (repeatable)")
+    compare.add_argument("--config", help='JSON {"alpha": 0.05, "thresholds": {"GLOB": FRACTION}}')
+    compare.add_argument("--json", help="Write the comparison to this JSON file")
+    args = parser.parse_args()
+
+    conn = open_store(Path(args.db))
+
+    if args.command in ("bench", "ingest-json", "ingest-pa"):
+        if args.command == "bench":
+            print("Benchmarking...")
+            samples = run_bench(args)
+        elif args.command == "ingest-json":
+            path = Path(args.file)
+            if not path.exists():
+                print(f"ERROR: File not found: {path}")
+                sys.exit(1)
+            prefix = args.prefix or path.stem
+            data = json.loads(path.read_text(encoding="utf-8-sig"))
+            samples = [(name, value, unit_for(name)) for name, value in flatten_numeric(data, prefix)
+                       if not args.include or any(fnmatch.fnmatchcase(name, g) for g in args.include)]
+        else:
+            samples = perf_analyzer_samples(args.exports)
+        if not samples:
+            print("ERROR: Nothing to record")
+            sys.exit(1)
+        try:
+            sha, run_id = record_run(conn, args.commit, args.command, samples)
+        except (RuntimeError, FileNotFoundError) as e:
+            print(f"ERROR: Cannot determine the git commit ({e}); pass --commit")
+            sys.exit(1)
+        print(f"[SUCCESS] Run {run_id}: {len(samples)} sample(s) of {len({s[0] for s in samples})} "
+              f"metric(s) recorded for {sha[:12]}")
+        return
+
+    if args.command == "list":
+        if args.metric:
+            rows = conn.execute(
+                "SELECT r.commit_sha, s.metric, s.unit, COUNT(*), AVG(s.value), MIN(r.created_at) "
+                "FROM samples s JOIN runs r ON r.id = s.run_id GROUP BY r.commit_sha, s.metric "
+                "ORDER BY MIN(r.id)").fetchall()
+            for sha, metric, unit, n, mean, created in rows:
+                if fnmatch.fnmatchcase(metric, args.metric):
+                    print(f"  {created}  {sha[:12]}  {metric:<48} {_fmt(mean, unit):>14}  n={n}")
+        else:
+            rows = conn.execute(
+                "SELECT r.id, r.commit_sha, r.dirty, r.source, r.created_at, COUNT(s.metric) "
+                "FROM runs r LEFT JOIN samples s ON s.run_id = r.id GROUP BY r.id ORDER BY r.id").fetchall()
+            for run_id, sha, dirty, source, created, n in rows:
+                print(f"  #{run_id:<4} {created}  {sha[:12]}{'+dirty' if dirty else '      '}  "
+                      f"{source:<12} {n} sample(s)")
+        return
+
+    try:
+        alpha, rules = load_thresholds(args.config, args.threshold)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    if args.alpha is not None:
+        alpha = args.alpha
+    base, head = load_samples(conn, args.base), load_samples(conn, args.head)
+    for ref, data in ((args.base, base), (args.head, head)):
+        if not data:
+            print(f"ERROR: No runs recorded for '{ref}' ({resolve_commit(ref)[:12]})")
+            sys.exit(1)
+
+    results = compare_runs(base, head, alpha, rules)
+    print_comparison(args.base, args.head, results, alpha)
+    regressions = [c for c in results if c.status == "regression"]
+
+    if args.json:
+        out = {
+            "base": resolve_commit(args.base),
+            "head": resolve_commit(args.head),
+            "alpha": alpha,
+            "metrics": [
+                {"metric": c.metric, "unit": c.unit, "status": c.status, "baseMedian": c.base_median,
+                 "headMedian": c.head_median, "change": None if math.isinf(c.change) else round(c.change, 4),
+                 "threshold": c.threshold, "pValue": c.p_value, "n": [len(c.base), len(c.head)]}
+                for c in results
+            ],
+        }
+        Path(args.json).write_text(json.dumps(out, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    if regressions:
+        print(f"[ERROR] {len(regressions)} metric(s) regressed beyond their thresholds.")
+        sys.exit(1)
+    print("[SUCCESS] No significant regressions.")
+
+
+if __name__ == "__main__":
+    main()
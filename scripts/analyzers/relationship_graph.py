@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Relationship Graph and Filter-Propagation Lint
+
+Parses the model's relationships into a filter-propagation graph (filters
+flow from the "one" side to the "many" side, and both ways for
+bothDirections) and flags the patterns that make queries slower:
+
+- Bidirectional cross-filtering (extra filter propagation on every query,
+  and a common source of ambiguity)
+- Many-to-many cardinality (limited relationship: joined on values at
+  query time, no relationship index)
+- Inactive relationships only reached through USERELATIONSHIP (the filter
+  path is rebuilt in every CALCULATE that activates it), and inactive
+  relationships nothing uses (still validated and indexed at refresh)
+- Relationships keyed on text columns, worst for long high-cardinality
+  strings such as Page_URL (large dictionaries, slower joins than integers)
+- Ambiguous paths: more than one active filter path between two tables
+
+Each finding has a performance severity (HIGH / MEDIUM / LOW). The
+"Performance" checks of master_pbip_validator.py report the same findings.
+
+Usage:
+    python relationship_graph.py [semantic_model_path] [--json out.json]
+
+Options:
+    --json: Write the graph and findings as JSON
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from dax_cost_analyzer import HIGH_CARDINALITY_HINTS, detect_large_tables
+from dax_lexer import DaxSyntaxError, build_call_tree, iter_calls, tokenize
+from tmdl_model import SemanticModel, TmdlNode, load_semantic_model, split_column_ref
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+SEVERITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+# Longest filter path considered when looking for ambiguity
+MAX_PATH_LENGTH = 6
+
+
+@dataclass
+class Relationship:
+    """One relationship, with TMDL defaults applied."""
+    name: str
+    from_table: str
+    from_column: str
+    to_table: str
+    to_column: str
+    cross_filtering: str = "oneDirection"
+    from_cardinality: str = "many"
+    to_cardinality: str = "one"
+    is_active: bool = True
+    security_filtering: str = "oneDirection"
+    node: Optional[TmdlNode] = field(default=None, repr=False)
+
+    @property
+    def label(self) -> str:
+        return f"{self.from_table}[{self.from_column}] -> {self.to_table}[{self.to_column}]"
+
+    @property
+    def is_bidirectional(self) -> bool:
+        return self.cross_filtering == "bothDirections"
+
+    @property
+    def is_many_to_many(self) -> bool:
+        return self.from_cardinality == "many" and self.to_cardinality == "many"
+
+    def filter_edges(self) -> List[Tuple[str, str]]:
+        """Directed (filtering table, filtered table) pairs."""
+        if self.to_cardinality == "many" and self.from_cardinality == "one":
+            edges = [(self.from_table, self.to_table)]
+        else:
+            edges = [(self.to_table, self.from_table)]
+        if self.is_bidirectional:
+            edges.append((edges[0][1], edges[0][0]))
+        return edges
+
+    def columns(self) -> Set[Tuple[str, str]]:
+        return {(self.from_table, self.from_column), (self.to_table, self.to_column)}
+
+
+@dataclass
+class RelationshipFinding:
+    rule: str
+    severity: str           # HIGH / MEDIUM / LOW
+    relationship: str
+    message: str
+    suggestion: str
+    file_path: Optional[Path] = None
+    line_number: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "rule": self.rule, "severity": self.severity, "relationship": self.relationship,
+            "message": self.message, "suggestion": self.suggestion,
+            "file": str(self.file_path) if self.file_path else None, "line": self.line_number,
+        }
+
+
+def parse_relationships(model: SemanticModel) -> List[Relationship]:
+    relationships = []
+    for node in model.relationships:
+        from_table, from_column = split_column_ref(node.get("fromColumn"))
+        to_table, to_column = split_column_ref(node.get("toColumn"))
+        relationships.append(Relationship(
+            name=node.name,
+            from_table=from_table,
+            from_column=from_column,
+            to_table=to_table,
+            to_column=to_column,
+            cross_filtering=node.get("crossFilteringBehavior", "oneDirection"),
+            from_cardinality=node.get("fromCardinality", "many"),
+            to_cardinality=node.get("toCardinality", "one"),
+            is_active=node.get("isActive", "true").lower() != "false",
+            security_filtering=node.get("securityFilteringBehavior", "oneDirection"),
+            node=node,
+        ))
+    return relationships
+
+
+def userelationship_calls(model: SemanticModel) -> Dict[frozenset, List[str]]:
+    """{column pair -> [objects calling USERELATIONSHIP on it]} over all DAX in the model."""
+    found: Dict[frozenset, List[str]] = {}
+    expressions = []
+    for table in model.tables.values():
+        expressions += [(f"{table.name}[{m.name}]", m.expression or "") for m in table.measures]
+        expressions += [(f"{table.name}[{c.name}]", c.expression or "") for c in table.columns if c.is_calculated]
+        expressions += [(f"{table.name} (calculated table)", p.expression_properties.get("source", ""))
+                        for p in table.partitions if p.is_calculated]
+    for owner, text in expressions:
+        if "USERELATIONSHIP" not in text.upper():
+            continue
+        try:
+            tokens = tokenize(text)
+        except DaxSyntaxError:
+            continue
+        for call in iter_calls(build_call_tree(tokens)):
+            if call.name.upper() != "USERELATIONSHIP" or len(call.args) != 2:
+                continue
+            pair = []
+            for index in range(2):
+                arg = call.arg_tokens(tokens, index)
+                if len(arg) == 2 and arg[1].kind == "COLUMN":
+                    pair.append((arg[0].value, arg[1].value))
+            if len(pair) == 2:
+                found.setdefault(frozenset(pair), []).append(owner)
+    return found
+
+
+def column_data_type(model: SemanticModel, table: str, column: str) -> str:
+    """dataType of a column; inferred calculated-table columns take it from their source column."""
+    node = model.find_column(table, column)
+    if node is None:
+        return ""
+    data_type = node.get("dataType")
+    if not data_type and node.get("sourceColumn"):
+        source_table, source_column = split_column_ref(node.get("sourceColumn").replace("[", ".").rstrip("]"))
+        if source_table and source_table in model.tables and source_table != table:
+            return column_data_type(model, source_table, source_column)
+    return data_type
+
+
+def filter_paths(edges: Dict[str, Set[str]], start: str, end: str) -> List[List[str]]:
+    """All simple directed filter paths from start to end (bounded length)."""
+    paths: List[List[str]] = []
+    stack = [(start, [start])]
+    while stack:
+        node, path = stack.pop()
+        if len(path) > MAX_PATH_LENGTH:
+            continue
+        for nxt in sorted(edges.get(node, ())):
+            if nxt == end:
+                paths.append(path + [nxt])
+            elif nxt not in path:
+                stack.append((nxt, path + [nxt]))
+    return paths
+
+
+class RelationshipGraph:
+    """Filter-propagation graph of a semantic model and its lint findings."""
+
+    def __init__(self, model: SemanticModel):
+        self.model = model
+        self.relationships = parse_relationships(model)
+        self.large_tables = detect_large_tables(model)
+        self.findings: List[RelationshipFinding] = []
+
+    def _add(self, rule: str, severity: str, rel: Optional[Relationship], message: str, suggestion: str,
+             label: str = "") -> None:
+        self.findings.append(RelationshipFinding(
+            rule=rule,
+            severity=severity,
+            relationship=label or (rel.label if rel else ""),
+            message=message,
+            suggestion=suggestion,
+            file_path=rel.node.file_path if rel and rel.node else None,
+            line_number=rel.node.start_line if rel and rel.node else None,
+        ))
+
+    def active_edges(self) -> Dict[str, Set[str]]:
+        edges: Dict[str, Set[str]] = {}
+        for rel in self.relationships:
+            if rel.is_active:
+                for source, target in rel.filter_edges():
+                    edges.setdefault(source, set()).add(target)
+        return edges
+
+    def analyze(self) -> List[RelationshipFinding]:
+        self.findings = []
+        activations = userelationship_calls(self.model)
+
+        for rel in self.relationships:
+            touches_large = bool({rel.from_table, rel.to_table} & self.large_tables)
+
+            if rel.is_bidirectional:
+                self._add(
+                    "bidirectional", "HIGH" if touches_large else "MEDIUM", rel,
+                    "Bidirectional cross-filtering: every filter on either table propagates to the other "
+                    f"{'(fact-grain table involved)' if touches_large else ''}".rstrip(),
+                    "Use single direction; apply CROSSFILTER(..., Both) inside the measures that need it")
+            if rel.security_filtering == "bothDirections":
+                self._add(
+                    "bidirectional_security", "MEDIUM", rel,
+                    "Row-level security filters propagate in both directions",
+                    "Set securityFilteringBehavior to oneDirection unless RLS requires it")
+            if rel.is_many_to_many:
+                self._add(
+                    "many_to_many", "HIGH", rel,
+                    "Many-to-many cardinality: limited relationship joined on values at query time",
+                    "Add a bridge/dimension table with unique keys and use one-to-many relationships")
+
+            if not rel.is_active:
+                callers = activations.get(frozenset({(rel.from_table, rel.from_column),
+                                                     (rel.to_table, rel.to_column)}), [])
+                if callers:
+                    self._add(
+                        "inactive_userelationship", "LOW", rel,
+                        f"Inactive relationship only reached through USERELATIONSHIP in {len(callers)} "
+                        f"expression(s): {', '.join(sorted(set(callers))[:3])}",
+                        "If most visuals use it, make it active or model a role-playing dimension table")
+                else:
+                    self._add(
+                        "inactive_unused", "MEDIUM", rel,
+                        "Inactive relationship that no DAX activates (still validated at every refresh)",
+                        "Remove it")
+
+            data_type = (column_data_type(self.model, rel.from_table, rel.from_column)
+                         or column_data_type(self.model, rel.to_table, rel.to_column))
+            if data_type == "string":
+                long_text = any(h in rel.from_column.lower() or h in rel.to_column.lower()
+                                for h in HIGH_CARDINALITY_HINTS)
+                self._add(
+                    "text_key", "HIGH" if long_text and touches_large else "MEDIUM", rel,
+                    f"Relationship key is text ({rel.from_column}"
+                    f"{', high-cardinality' if long_text else ''}): large dictionary and string joins",
+                    "Join on an integer surrogate key (hash or index the value during load)")
+
+        self._check_ambiguity()
+        self.findings.sort(key=lambda f: (SEVERITY_ORDER[f.severity], f.rule, f.relationship))
+        return self.findings
+
+    def _check_ambiguity(self) -> None:
+        edges = self.active_edges()
+        tables = sorted(set(edges) | {t for targets in edges.values() for t in targets})
+        by_pair = {}
+        for rel in self.relationships:
+            if rel.is_active:
+                for source, target in rel.filter_edges():
+                    by_pair.setdefault((source, target), rel)
+        for start in tables:
+            for end in tables:
+                if start == end:
+                    continue
+                paths = filter_paths(edges, start, end)
+                if len(paths) > 1:
+                    routes = [" -> ".join(p) for p in paths[:3]]
+                    first_rel = by_pair.get((paths[0][0], paths[0][1]))
+                    self._add(
+                        "ambiguous_path", "HIGH", first_rel,
+                        f"{len(paths)} active filter paths from {start} to {end}: {'; '.join(routes)}",
+                        "Deactivate or make single-direction one of the relationships on the extra path",
+                        label=f"{start} -> {end}")
+
+
+def print_findings(graph: RelationshipGraph) -> None:
+    print("=" * 80)
+    print("Relationship Graph".center(80))
+    print("=" * 80)
+    print()
+    print(f"RELATIONSHIPS ({len(graph.relationships)})")
+    print("-" * 80)
+    for rel in graph.relationships:
+        flags = [rel.cross_filtering, f"{rel.from_cardinality}:{rel.to_cardinality}"]
+        if not rel.is_active:
+            flags.append("inactive")
+        print(f"  {rel.label}  ({', '.join(flags)})")
+    print()
+
+    print(f"FINDINGS ({len(graph.findings)})")
+    print("-" * 80)
+    if not graph.findings:
+        print("  [SUCCESS] No relationship performance issues found.")
+    for finding in graph.findings:
+        print(f"  [{finding.severity}] {finding.rule}: {finding.relationship}")
+        print(f"      {finding.message}")
+        print(f"      Fix: {finding.suggestion}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Relationship graph and filter-propagation performance lint",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Lint the bundled model
+  python relationship_graph.py
+
+  # JSON output
+  python relationship_graph.py "C:\\path\\to\\model.SemanticModel" --json relationships.json
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder (or its definition folder)")
+    parser.add_argument("--json", help="Write the graph and findings to this JSON file")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+
+    graph = RelationshipGraph(load_semantic_model(model_path))
+    graph.analyze()
+    print_findings(graph)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "relationships": [{
+                "name": r.name, "from": f"{r.from_table}[{r.from_column}]", "to": f"{r.to_table}[{r.to_column}]",
+                "crossFilteringBehavior": r.cross_filtering, "cardinality": f"{r.from_cardinality}:{r.to_cardinality}",
+                "isActive": r.is_active,
+            } for r in graph.relationships],
+            "findings": [f.to_dict() for f in graph.findings],
+        }, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    sys.exit(1 if any(f.severity == "HIGH" for f in graph.findings) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+TMDL Semantic Model Parser
+
+Shared, dependency-free parser for the TMDL files of a PBIP semantic model.
+The validators and generators have historically scraped TMDL with one-off
+regexes; this module parses the indentation-based object tree once so the
+analysis tools can work with tables, columns, measures, partitions and
+relationships directly.
+
+What it understands:
+- Object declarations (table, column, measure, partition, hierarchy, level,
+  annotation, variation, relationship, ref ..., perspective..., cultureInfo,
+  refreshPolicy, alternateOf, expression)
+- Quoted ('Name With Spaces') and unquoted names
+- Properties (key: value), flags (isHidden) and expression properties (source = ...)
+- Single-line, indented multi-line and ```fenced``` expressions
+- /// description comments
+
+Every node remembers its file and line span so tools can rewrite TMDL
+in place (remove a table, a column, a variation ...).
+
+Usage (as a module):
+    from tmdl_model import load_semantic_model
+    model = load_semantic_model(Path("press-room-dashboard.SemanticModel"))
+    for table, measure in model.iter_measures():
+        print(table.name, measure.name, measure.expression)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Keywords that open a new object (as opposed to a property line)
+OBJECT_KEYWORDS = {
+    "model", "database", "table", "column", "measure", "partition", "hierarchy",
+    "level", "annotation", "variation", "relationship", "ref", "perspective",
+    "perspectiveTable", "perspectiveColumn", "perspectiveMeasure", "perspectiveHierarchy",
+    "cultureInfo", "role", "tablePermission", "expression", "dataSource",
+    "calculationGroup", "calculationItem", "queryGroup", "extendedProperty",
+    "formatStringDefinition", "detailRowsDefinition", "dataAccessOptions",
+    "linguisticMetadata", "translations", "translation", "refreshPolicy",
+    "alternateOf",
+}
+
+# Keywords that may legitimately be used as bare flags/properties inside objects
+PROPERTY_RE = re.compile(r"^(?P<key>[A-Za-z_][A-Za-z0-9_]*)\s*:\s*(?P<value>.*)$")
+EXPR_PROPERTY_RE = re.compile(r"^(?P<key>[A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?P<value>.*)$")
+FLAG_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+FENCE = "```"
+
+
+@dataclass
+class TmdlNode:
+    """One TMDL object (table, column, measure, partition, ...)."""
+    kind: str
+    name: str
+    file_path: Path
+    start_line: int                     # 1-based, includes /// description lines
+    end_line: int                       # 1-based, inclusive
+    indent: int
+    expression: Optional[str] = None    # Text after "name =" (measures, calculated columns, partitions kind)
+    description: str = ""
+    properties: Dict[str, str] = field(default_factory=dict)
+    expression_properties: Dict[str, str] = field(default_factory=dict)  # source = ..., linguisticMetadata = ...
+    children: List["TmdlNode"] = field(default_factory=list)
+    parent: Optional["TmdlNode"] = field(default=None, repr=False)
+
+    def children_of(self, kind: str) -> List["TmdlNode"]:
+        return [c for c in self.children if c.kind == kind]
+
+    @property
+    def columns(self) -> List["TmdlNode"]:
+        return self.children_of("column")
+
+    @property
+    def measures(self) -> List["TmdlNode"]:
+        return self.children_of("measure")
+
+    @property
+    def partitions(self) -> List["TmdlNode"]:
+        return self.children_of("partition")
+
+    @property
+    def annotations(self) -> Dict[str, str]:
+        return {a.name: (a.expression or "") for a in self.children_of("annotation")}
+
+    @property
+    def is_hidden(self) -> bool:
+        return self.properties.get("isHidden", "false").lower() == "true"
+
+    @property
+    def is_calculated(self) -> bool:
+        """Calculated column (has a DAX expression) or calculated partition."""
+        if self.kind == "column":
+            return self.expression is not None
+        if self.kind == "partition":
+            return (self.expression or "").strip().lower() == "calculated"
+        return False
+
+    def get(self, key: str, default: str = "") -> str:
+        return self.properties.get(key, default)
+
+
+@dataclass
+class SemanticModel:
+    """Parsed semantic model (all TMDL files under definition/)."""
+    root: Path
+    tables: Dict[str, TmdlNode] = field(default_factory=dict)
+    relationships: List[TmdlNode] = field(default_factory=list)
+    model: Optional[TmdlNode] = None
+    files: Dict[Path, List[TmdlNode]] = field(default_factory=dict)
+
+    def iter_measures(self) -> Iterator[Tuple[TmdlNode, TmdlNode]]:
+        """Yield (table, measure) for every measure in the model."""
+        for table in self.tables.values():
+            for measure in table.measures:
+                yield table, measure
+
+    def iter_columns(self) -> Iterator[Tuple[TmdlNode, TmdlNode]]:
+        """Yield (table, column) for every column in the model."""
+        for table in self.tables.values():
+            for column in table.columns:
+                yield table, column
+
+    def measure_index(self) -> Dict[str, Tuple[TmdlNode, TmdlNode]]:
+        """Measure name -> (table, measure). Measure names are model-unique in DAX."""
+        return {m.name: (t, m) for t, m in self.iter_measures()}
+
+    def find_column(self, table_name: str, column_name: str) -> Optional[TmdlNode]:
+        table = self.tables.get(table_name)
+        if not table:
+            return None
+        for column in table.columns:
+            if column.name == column_name:
+                return column
+        return None
+
+
+# -----------------------------
+# Name helpers
+# -----------------------------
+
+def parse_name(text: str) -> Tuple[str, str]:
+    """
+    Parse a TMDL object name from the start of text.
+    Returns (name, remainder). Handles 'Quoted ''Names''' and unquoted names.
+    """
+    text = text.lstrip()
+    if text.startswith("'"):
+        i = 1
+        out = []
+        while i < len(text):
+            ch = text[i]
+            if ch == "'":
+                if i + 1 < len(text) and text[i + 1] == "'":
+                    out.append("'")
+                    i += 2
+                    continue
+                return "".join(out), text[i + 1:]
+            out.append(ch)
+            i += 1
+        return "".join(out), ""
+    m = re.match(r"[^\s=]+", text)
+    if not m:
+        return "", text
+    return m.group(0), text[m.end():]
+
+
+def quote_name(name: str) -> str:
+    """Quote a TMDL/DAX object name if it needs quoting."""
+    if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name):
+        return name
+    return "'" + name.replace("'", "''") + "'"
+
+
+def split_column_ref(ref: str) -> Tuple[str, str]:
+    """
+    Split a TMDL column reference (Table.Column, 'My Table'.'My Col') into (table, column).
+    """
+    ref = ref.strip()
+    if ref.startswith("'"):
+        table, rest = parse_name(ref)
+    else:
+        table, _, rest = ref.partition(".")
+        rest = "." + rest if rest else ""
+    rest = rest.strip()
+    if not rest.startswith("."):
+        return table, ""
+    column, _ = parse_name(rest[1:])
+    return table, column
+
+
+def _indent_of(line: str) -> int:
+    return len(line) - len(line.lstrip("\t"))
+
+
+def _dedent(lines: List[str]) -> str:
+    """Remove the common leading-tab indentation from expression lines."""
+    non_blank = [l for l in lines if l.strip()]
+    if not non_blank:
+        return ""
+    common = min(_indent_of(l) for l in non_blank)
+    return "\n".join(l[common:] if l.strip() else "" for l in lines).strip("\n")
+
+
+# -----------------------------
+# Parser
+# -----------------------------
+
+def _read_expression(first: str, lines: List[str], index: int, owner_indent: int) -> Tuple[str, int]:
+    """
+    Read an expression that starts after '=' on line `index`.
+    Returns (expression_text, last_line_index_consumed).
+    """
+    first = first.strip()
+
+    if first.startswith(FENCE):
+        rest = first[len(FENCE):]
+        if FENCE in rest:
+            return rest[:rest.index(FENCE)].strip(), index
+        body: List[str] = [rest] if rest.strip() else []
+        j = index + 1
+        while j < len(lines):
+            stripped = lines[j].strip()
+            if stripped.endswith(FENCE):
+                tail = stripped[:-len(FENCE)]
+                if tail.strip():
+                    body.append(lines[j].rstrip()[:-len(FENCE)])
+                return _dedent(body), j
+            body.append(lines[j].rstrip("\n"))
+            j += 1
+        return _dedent(body), len(lines) - 1
+
+    body = [first] if first else []
+    continuation: List[str] = []
+    last = index
+    j = index + 1
+    while j < len(lines):
+        line = lines[j]
+        if not line.strip():
+            continuation.append("")
+            j += 1
+            continue
+        if PROPERTY_RE.match(line.strip()):
+            # "key: value" is never DAX/M; Desktop sometimes over-indents properties
+            break
+        if _indent_of(line) >= owner_indent + 2:
+            continuation.append(line.rstrip("\n"))
+            last = j
+            j += 1
+            continue
+        break
+    # Trailing blank lines belong to the surrounding object, not the expression
+    while continuation and not continuation[-1].strip():
+        continuation.pop()
+    if continuation:
+        text = _dedent(continuation)
+        return (first + "\n" + text).strip() if first else text, last
+    return first, index
+
+
+def parse_tmdl_file(file_path: Path) -> List[TmdlNode]:
+    """Parse one TMDL file into a list of top-level nodes."""
+    lines = file_path.read_text(encoding="utf-8-sig").splitlines()
+    roots: List[TmdlNode] = []
+    stack: List[TmdlNode] = []
+    pending_description: List[str] = []
+    pending_start: Optional[int] = None
+
+    i = 0
+    while i < len(lines):
+        raw = lines[i]
+        stripped = raw.strip()
+        indent = _indent_of(raw)
+
+        if not stripped:
+            i += 1
+            continue
+
+        if stripped.startswith("///"):
+            if pending_start is None:
+                pending_start = i + 1
+            pending_description.append(stripped[3:].strip())
+            i += 1
+            continue
+
+        # Close objects that this line is not nested in
+        while stack and stack[-1].indent >= indent:
+            stack.pop()
+
+        keyword = stripped.split(None, 1)[0]
+        after_keyword = stripped[len(keyword):]
+        is_object = (
+            keyword in OBJECT_KEYWORDS
+            and not after_keyword.lstrip().startswith(":")
+            and not (keyword in {"linguisticMetadata", "expression"} and after_keyword.lstrip().startswith("="))
+        )
+
+        if is_object:
+            kind = keyword
+            rest = after_keyword
+            if keyword == "ref":
+                sub, rest = parse_name(rest)
+                kind = f"ref {sub}"
+            name, rest = parse_name(rest) if rest.strip() else ("", "")
+            expression = None
+            end = i
+            rest = rest.strip()
+            if rest.startswith("="):
+                expression, end = _read_expression(rest[1:], lines, i, indent)
+
+            node = TmdlNode(
+                kind=kind,
+                name=name,
+                file_path=file_path,
+                start_line=pending_start or (i + 1),
+                end_line=end + 1,
+                indent=indent,
+                expression=expression,
+                description=" ".join(pending_description),
+            )
+            if stack:
+                node.parent = stack[-1]
+                stack[-1].children.append(node)
+            else:
+                roots.append(node)
+            stack.append(node)
+            pending_description = []
+            pending_start = None
+            i = end + 1
+            continue
+
+        pending_description = []
+        pending_start = None
+        owner = stack[-1] if stack else None
+
+        m = PROPERTY_RE.match(stripped)
+        if m and owner is not None:
+            owner.properties[m.group("key")] = m.group("value").strip()
+            i += 1
+            continue
+
+        m = EXPR_PROPERTY_RE.match(stripped)
+        if m and owner is not None:
+            value, end = _read_expression(m.group("value"), lines, i, indent)
+            owner.expression_properties[m.group("key")] = value
+            i = end + 1
+            continue
+
+        if FLAG_RE.match(stripped) and owner is not None:
+            owner.properties[stripped] = "true"
+        i += 1
+
+    # Extend each node's end_line to cover its children/properties
+    def _finish(node: TmdlNode, limit: int) -> None:
+        last = node.end_line
+        for child in node.children:
+            _finish(child, limit)
+            last = max(last, child.end_line)
+        node.end_line = max(last, _last_owned_line(lines, node, limit))
+
+    for idx, root in enumerate(roots):
+        limit = roots[idx + 1].start_line - 1 if idx + 1 < len(roots) else len(lines)
+        _finish(root, limit)
+
+    return roots
+
+
+def _last_owned_line(lines: List[str], node: TmdlNode, limit: int) -> int:
+    """Last non-blank line (1-based) indented deeper than node, before the next sibling."""
+    last = node.end_line
+    j = node.end_line  # 0-based index of the line after end_line
+    in_fence = False
+    while j < min(limit, len(lines)):
+        line = lines[j]
+        stripped = line.strip()
+        if stripped:
+            if not in_fence and _indent_of(line) <= node.indent:
+                break
+            if stripped.count(FENCE) % 2 == 1:
+                in_fence = not in_fence
+            last = j + 1
+        j += 1
+    return last
+
+
+def resolve_definition_dir(path: Path) -> Path:
+    """Accept a .SemanticModel folder or its definition/ folder."""
+    path = Path(path)
+    if (path / "definition").is_dir():
+        return path / "definition"
+    return path
+
+
+def load_semantic_model(path: Path, include_cultures: bool = False) -> SemanticModel:
+    """
+    Parse every .tmdl file of a semantic model.
+
+    Culture files (linguistic metadata) are large and irrelevant to most analyses,
+    so they are skipped unless include_cultures=True.
+    """
+    definition_dir = resolve_definition_dir(path)
+    if not definition_dir.is_dir():
+        raise FileNotFoundError(f"Semantic model definition folder not found: {definition_dir}")
+
+    model = SemanticModel(root=definition_dir)
+    for fp in sorted(definition_dir.rglob("*.tmdl")):
+        if not include_cultures and fp.parent.name == "cultures":
+            continue
+        nodes = parse_tmdl_file(fp)
+        model.files[fp] = nodes
+        for node in nodes:
+            if node.kind == "table":
+                model.tables[node.name] = node
+            elif node.kind == "relationship":
+                model.relationships.append(node)
+            elif node.kind == "model":
+                model.model = node
+    return model
+
+
+def find_semantic_model_dir(report_path: Path) -> Optional[Path]:
+    """Locate the sibling .SemanticModel/definition folder of a .Report folder (validator convention)."""
+    report_path = Path(report_path)
+    if not report_path.parent.exists():
+        return None
+    for item in report_path.parent.iterdir():
+        if item.is_dir() and item.name.endswith(".SemanticModel"):
+            return item / "definition"
+    return None
+
+
+# -----------------------------
+# Rewriting
+# -----------------------------
+
+def remove_line_spans(file_path: Path, spans: List[Tuple[int, int]]) -> int:
+    """
+    Delete 1-based inclusive line spans (e.g. node.start_line..node.end_line) from a TMDL file.
+
+    A blank line left doubled by the removal is dropped as well, so objects stay
+    separated by exactly one blank line. Returns the number of lines removed.
+    """
+    text = file_path.read_text(encoding="utf-8-sig")
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = text.splitlines()
+    drop = set()
+    for start, end in spans:
+        drop.update(range(start - 1, end))
+    kept: List[str] = []
+    after_removal = False
+    for idx, line in enumerate(lines):
+        if idx in drop:
+            after_removal = True
+            continue
+        if after_removal and not line.strip() and (not kept or not kept[-1].strip()):
+            continue
+        after_removal = after_removal and not line.strip()
+        kept.append(line)
+    file_path.write_text(newline.join(kept) + newline, encoding="utf-8")
+    return len(lines) - len(kept)
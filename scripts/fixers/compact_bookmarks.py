@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Bookmark State Compaction and Validation
+
+Parses every definition/bookmarks/*.bookmark.json together with
+bookmarks.json and the report's pages/visuals, so bookmark problems that
+only show up across files are caught, and captured state that Power BI never
+applies is removed (smaller files, faster bookmark switching).
+
+Validation:
+- bookmarks.json entries without a bookmark file, duplicate entries, and
+  bookmark files missing from bookmarks.json (hidden from the pane)
+- "name" that does not match the file name
+- activeSection / targetVisualNames pointing to pages or visuals that no
+  longer exist
+- Buttons (visualLink) navigating to bookmarks that do not exist
+- Duplicate/equivalent bookmarks: same captured state and options after
+  compaction (only displayName/name differ)
+
+Compaction (written with --fix):
+- State of pages that no longer exist (explorationState.sections.<page>)
+- State of visuals that no longer exist on their page (visualContainers)
+- State of visuals not in targetVisualNames when the bookmark applies only
+  to its target visuals (applyOnlyToTargetVisuals: true; when the flag is
+  absent the bookmark applies to every visual and nothing is stripped)
+- Filter payloads canonicalized: duplicate filters and duplicate In values
+  dropped, empty filter containers removed
+
+Per-bookmark size (bytes before/after, pages, visual states, filters) is
+always reported.
+
+Usage:
+    python compact_bookmarks.py [report_path] [--fix] [--verbose] [--json FILE]
+
+Options:
+    --fix: Rewrite the compacted bookmark files (default: report only)
+    --verbose: List every stripped state / canonicalized filter
+    --json: Write findings and the size report to a JSON file
+"""
+
+import argparse
+import copy
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+
+from pbir_report import load_report  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_REPORT_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.Report"
+
+BOOKMARK_SUFFIX = ".bookmark.json"
+# Keys identifying a bookmark rather than the state it applies
+IDENTITY_KEYS = {"$schema", "name", "displayName"}
+
+
+@dataclass
+class BookmarkFinding:
+    """One validation finding or compaction step."""
+    severity: str          # ERROR / WARNING / INFO
+    bookmark: str          # Bookmark name, or "bookmarks.json"
+    path: Path
+    issue_type: str
+    message: str
+    fixable: bool = False
+
+
+@dataclass
+class BookmarkFile:
+    """One *.bookmark.json."""
+    name: str
+    path: Path
+    data: Dict[str, Any]
+    original_bytes: int
+    changes: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changes)
+
+    def serialized_bytes(self) -> int:
+        return len(json.dumps(self.data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+    @property
+    def exploration_state(self) -> Dict[str, Any]:
+        state = self.data.get("explorationState")
+        return state if isinstance(state, dict) else {}
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        options = self.data.get("options")
+        return options if isinstance(options, dict) else {}
+
+
+@dataclass
+class BookmarkSet:
+    """All bookmarks of a report plus what they can point at."""
+    bookmarks_dir: Path
+    files: Dict[str, BookmarkFile] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None          # bookmarks.json
+    page_visuals: Dict[str, Set[str]] = field(default_factory=dict)   # page name -> visual names
+    bookmark_links: List[Tuple[str, str]] = field(default_factory=list)  # (visual location, bookmark name)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def metadata_path(self) -> Path:
+        return self.bookmarks_dir / "bookmarks.json"
+
+    def all_visuals(self) -> Set[str]:
+        return {v for names in self.page_visuals.values() for v in names}
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _iter_bookmark_links(node: Any) -> Iterator[str]:
+    """Bookmark names referenced by button / visualLink properties: "bookmark": {"expr": {"Literal": ...}}."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "bookmark" and isinstance(value, dict):
+                literal = value.get("expr", {}).get("Literal", {}).get("Value")
+                if isinstance(literal, str) and len(literal) >= 2 and literal[0] == literal[-1] == "'":
+                    yield literal[1:-1]
+                    continue
+            yield from _iter_bookmark_links(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _iter_bookmark_links(item)
+
+
+def load_bookmark_set(report_path: Path) -> BookmarkSet:
+    report = load_report(report_path)
+    bset = BookmarkSet(bookmarks_dir=report.root / "definition" / "bookmarks", errors=list(report.errors))
+
+    for page in report.pages.values():
+        page_name = page.data.get("name", page.page_id)
+        bset.page_visuals[page_name] = {v.data.get("name", v.visual_id) for v in page.visuals}
+        for visual in page.visuals:
+            for target in _iter_bookmark_links(visual.data.get("visual", {})):
+                bset.bookmark_links.append((f"{page.page_id}/{visual.visual_id}", target))
+            for target in _iter_bookmark_links(visual.data.get("visualContainerObjects", {})):
+                bset.bookmark_links.append((f"{page.page_id}/{visual.visual_id}", target))
+
+    for name, data in report.bookmarks.items():
+        path = report.bookmark_paths[name]
+        bset.files[name] = BookmarkFile(name=name, path=path, data=data, original_bytes=path.stat().st_size)
+
+    if bset.metadata_path.exists():
+        try:
+            bset.metadata = json.loads(bset.metadata_path.read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError) as e:
+            bset.errors.append(f"{bset.metadata_path}: {e}")
+    return bset
+
+
+# ============================================================================
+# FILTER CANONICALIZATION
+# ============================================================================
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def _dedupe_in_values(node: Any) -> int:
+    """Drop repeated rows of In.Values lists (a selection is a set). Returns rows removed."""
+    removed = 0
+    if isinstance(node, dict):
+        in_clause = node.get("In")
+        if isinstance(in_clause, dict) and isinstance(in_clause.get("Values"), list):
+            seen, kept = set(), []
+            for row in in_clause["Values"]:
+                key = canonical_json(row)
+                if key not in seen:
+                    seen.add(key)
+                    kept.append(row)
+            removed += len(in_clause["Values"]) - len(kept)
+            in_clause["Values"] = kept
+        for value in node.values():
+            removed += _dedupe_in_values(value)
+    elif isinstance(node, list):
+        for item in node:
+            removed += _dedupe_in_values(item)
+    return removed
+
+
+def canonicalize_filters(owner: Dict[str, Any], label: str, changes: List[str]) -> None:
+    """Canonicalize owner["filters"] in place ({"byExpr": [...], ...}), recording what changed."""
+    filters = owner.get("filters")
+    if not isinstance(filters, dict):
+        return
+    for kind in list(filters):
+        entries = filters[kind]
+        if isinstance(entries, list):
+            seen, kept = set(), []
+            for entry in entries:
+                key = canonical_json(entry)
+                if key not in seen:
+                    seen.add(key)
+                    kept.append(entry)
+            if len(kept) < len(entries):
+                changes.append(f"{label}: removed {len(entries) - len(kept)} duplicate {kind} filter(s)")
+            rows = _dedupe_in_values(kept)
+            if rows:
+                changes.append(f"{label}: removed {rows} duplicate In value(s) in {kind} filters")
+            filters[kind] = kept
+            if not kept:
+                del filters[kind]
+        elif isinstance(entries, dict) and not entries:
+            del filters[kind]
+    if not filters:
+        del owner["filters"]
+        changes.append(f"{label}: removed empty filters")
+
+
+def count_filters(node: Any) -> int:
+    """Filter payloads held anywhere in a bookmark's state."""
+    if isinstance(node, dict):
+        total = 0
+        for key, value in node.items():
+            if key == "filters" and isinstance(value, dict):
+                total += sum(len(v) for v in value.values() if isinstance(v, list))
+            else:
+                total += count_filters(value)
+        return total
+    if isinstance(node, list):
+        return sum(count_filters(item) for item in node)
+    return 0
+
+
+# ============================================================================
+# VALIDATION + COMPACTION
+# ============================================================================
+
+def applies_only_to_targets(bookmark: BookmarkFile) -> bool:
+    targets = bookmark.options.get("targetVisualNames") or []
+    return bool(targets) and bookmark.options.get("applyOnlyToTargetVisuals") is True
+
+
+def compact_bookmark(bset: BookmarkSet, bookmark: BookmarkFile) -> List[BookmarkFinding]:
+    """Strip unused state and canonicalize filters of one bookmark in memory; returns what was done."""
+    findings: List[BookmarkFinding] = []
+    state = bookmark.exploration_state
+    if not state:
+        return findings
+
+    def found(severity: str, issue_type: str, message: str, fixable: bool = True) -> None:
+        findings.append(BookmarkFinding(severity, bookmark.name, bookmark.path, issue_type, message, fixable))
+        if fixable:
+            bookmark.changes.append(message)
+
+    targets = set(bookmark.options.get("targetVisualNames") or [])
+    only_targets = applies_only_to_targets(bookmark)
+
+    filter_changes: List[str] = []
+    canonicalize_filters(state, "report", filter_changes)
+    sections = state.get("sections")
+    if isinstance(sections, dict):
+        for page_name in list(sections):
+            section = sections[page_name]
+            if page_name not in bset.page_visuals:
+                del sections[page_name]
+                found("WARNING", "bookmark_stale_page", f"State for page '{page_name}' which does not exist")
+                continue
+            if not isinstance(section, dict):
+                continue
+            canonicalize_filters(section, f"page {page_name}", filter_changes)
+            page_visuals = bset.page_visuals[page_name]
+            for container_key in ("visualContainers", "visualContainerGroups"):
+                containers = section.get(container_key)
+                if not isinstance(containers, dict):
+                    continue
+                for visual_name in list(containers):
+                    if visual_name not in page_visuals:
+                        del containers[visual_name]
+                        found("WARNING", "bookmark_stale_visual",
+                              f"State for visual '{visual_name}' which does not exist on page '{page_name}'")
+                    elif only_targets and visual_name not in targets:
+                        del containers[visual_name]
+                        found("INFO", "bookmark_untargeted_visual",
+                              f"State for visual '{visual_name}' which is not in targetVisualNames (never applied)")
+                    elif isinstance(containers[visual_name], dict):
+                        canonicalize_filters(containers[visual_name], f"visual {visual_name}", filter_changes)
+    for message in filter_changes:
+        found("INFO", "bookmark_filter_canonical", message)
+
+    active = state.get("activeSection")
+    if active and active not in bset.page_visuals and not bookmark.options.get("suppressActiveSection"):
+        found("WARNING", "bookmark_missing_active_page",
+              f"activeSection '{active}' is not a page of this report (bookmark navigates nowhere)", fixable=False)
+
+    missing_targets = sorted(targets - bset.all_visuals())
+    if missing_targets:
+        found("WARNING", "bookmark_missing_target",
+              f"targetVisualNames references missing visual(s): {', '.join(missing_targets)}", fixable=False)
+    return findings
+
+
+def bookmark_signature(bookmark: BookmarkFile) -> str:
+    """Canonical form of what a bookmark applies (filter lists order-independent)."""
+    def norm(node: Any, in_filters: bool = False) -> Any:
+        if isinstance(node, dict):
+            return {k: norm(v, in_filters or k == "filters") for k, v in node.items()}
+        if isinstance(node, list):
+            items = [norm(v, in_filters) for v in node]
+            return sorted(items, key=canonical_json) if in_filters else items
+        return node
+    applied = {k: v for k, v in bookmark.data.items() if k not in IDENTITY_KEYS}
+    return canonical_json(norm(applied))
+
+
+def equivalent_groups(bset: BookmarkSet) -> List[List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for name, bookmark in bset.files.items():
+        groups.setdefault(bookmark_signature(bookmark), []).append(name)
+    return [sorted(names) for names in groups.values() if len(names) > 1]
+
+
+def _metadata_names(items: Any) -> Iterator[str]:
+    """Bookmark names in bookmarks.json items (groups carry children)."""
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        if isinstance(item.get("children"), list):
+            for child in item["children"]:
+                if isinstance(child, str):
+                    yield child
+                elif isinstance(child, dict) and "name" in child:
+                    yield child["name"]
+        elif "name" in item:
+            yield item["name"]
+
+
+def analyze_bookmarks(bset: BookmarkSet) -> List[BookmarkFinding]:
+    """Validate the whole bookmark set and compact every bookmark in memory."""
+    findings: List[BookmarkFinding] = []
+    for bookmark in bset.files.values():
+        expected = bookmark.path.name[:-len(BOOKMARK_SUFFIX)]
+        if bookmark.name != expected:
+            findings.append(BookmarkFinding("WARNING", bookmark.name, bookmark.path, "bookmark_name_mismatch",
+                                            f"\"name\" is '{bookmark.name}' but the file is '{bookmark.path.name}'"))
+        findings.extend(compact_bookmark(bset, bookmark))
+
+    if bset.files and bset.metadata is None:
+        findings.append(BookmarkFinding("WARNING", "bookmarks.json", bset.metadata_path, "bookmarks_json_missing",
+                                        "bookmarks.json is missing: no bookmark is listed in the Bookmarks pane"))
+    elif bset.metadata is not None:
+        listed = list(_metadata_names(bset.metadata.get("items")))
+        seen: Set[str] = set()
+        for name in listed:
+            if name in seen:
+                findings.append(BookmarkFinding("ERROR", "bookmarks.json", bset.metadata_path,
+                                                "bookmark_listed_twice", f"Bookmark '{name}' is listed more than once"))
+            seen.add(name)
+            if name not in bset.files:
+                findings.append(BookmarkFinding("ERROR", "bookmarks.json", bset.metadata_path,
+                                                "bookmark_file_missing",
+                                                f"Bookmark '{name}' is listed but {name}{BOOKMARK_SUFFIX} does not exist"))
+        for name, bookmark in bset.files.items():
+            if name not in seen:
+                findings.append(BookmarkFinding("WARNING", name, bookmark.path, "bookmark_not_listed",
+                                                "Bookmark file is not listed in bookmarks.json (hidden from the pane)"))
+
+    for location, target in bset.bookmark_links:
+        if target not in bset.files:
+            findings.append(BookmarkFinding("ERROR", target, bset.bookmarks_dir, "bookmark_link_broken",
+                                            f"Visual {location} navigates to bookmark '{target}' which does not exist"))
+
+    for names in equivalent_groups(bset):
+        first = bset.files[names[0]]
+        findings.append(BookmarkFinding(
+            "WARNING", names[0], first.path, "bookmark_equivalent",
+            f"{len(names)} bookmarks apply identical state and options: {', '.join(names)}"
+        ))
+    return findings
+
+
+def size_rows(bset: BookmarkSet) -> List[Dict[str, Any]]:
+    rows = []
+    for name, bookmark in sorted(bset.files.items(), key=lambda item: -item[1].original_bytes):
+        sections = bookmark.exploration_state.get("sections")
+        sections = sections if isinstance(sections, dict) else {}
+        visual_states = sum(len(s.get("visualContainers") or {}) for s in sections.values() if isinstance(s, dict))
+        rows.append({
+            "bookmark": name,
+            "displayName": bookmark.data.get("displayName", name),
+            "path": str(bookmark.path),
+            "before": bookmark.original_bytes,
+            "after": bookmark.serialized_bytes() if bookmark.changed else bookmark.original_bytes,
+            "pages": len(sections),
+            "visualStates": visual_states,
+            "filters": count_filters(bookmark.exploration_state),
+        })
+    return rows
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate and compact report bookmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Findings and per-bookmark sizes only
+  python compact_bookmarks.py
+
+  # Compact a report, listing every change
+  python compact_bookmarks.py "C:\\path\\to\\report.Report" --fix --verbose
+        """
+    )
+    parser.add_argument("report_path", nargs="?", default=str(DEFAULT_REPORT_PATH),
+                        help="Path to the .Report folder")
+    parser.add_argument("--fix", action="store_true", help="Rewrite the compacted bookmark files")
+    parser.add_argument("--verbose", action="store_true", help="List every stripped state / canonicalized filter")
+    parser.add_argument("--json", metavar="FILE", help="Write findings and the size report to a JSON file")
+    args = parser.parse_args()
+
+    report_path = Path(args.report_path)
+    try:
+        bset = load_bookmark_set(report_path)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("Bookmark Compaction")
+    print("=" * 80)
+    print(f"Report: {report_path}")
+    print(f"Mode: {'WRITE' if args.fix else 'DRY-RUN'}")
+    print(f"Bookmarks: {len(bset.files)}  Pages: {len(bset.page_visuals)}  "
+          f"Visuals: {len(bset.all_visuals())}  Bookmark links: {len(bset.bookmark_links)}")
+    print()
+    for error in bset.errors:
+        print(f"  [ERROR] {error}")
+
+    originals = {name: copy.deepcopy(b.data) for name, b in bset.files.items()}
+    findings = analyze_bookmarks(bset)
+
+    problems = [f for f in findings if f.severity != "INFO" or args.verbose]
+    fixes = [f for f in findings if f.fixable]
+    if problems:
+        print("FINDINGS")
+        print("-" * 80)
+        for f in problems:
+            marker = {"ERROR": "[ERROR]", "WARNING": "[WARN]", "INFO": "[INFO]"}[f.severity]
+            print(f"  {marker}{' [FIXABLE]' if f.fixable else ''} {f.bookmark}: {f.message}")
+        print()
+    print(f"Compaction steps: {len(fixes)} in {sum(1 for b in bset.files.values() if b.changed)} bookmark(s)")
+    print()
+
+    rows = size_rows(bset)
+    if rows:
+        print(f"  {'Bookmark':<34} {'Pages':>5} {'Visuals':>7} {'Filters':>7} {'Before':>9} {'After':>9} {'Saved':>7}")
+        print("  " + "-" * 84)
+        for r in rows:
+            print(f"  {r['bookmark'][:34]:<34} {r['pages']:>5} {r['visualStates']:>7} {r['filters']:>7} "
+                  f"{r['before']:>9,} {r['after']:>9,} {r['before'] - r['after']:>7,}")
+        before, after = sum(r["before"] for r in rows), sum(r["after"] for r in rows)
+        print("  " + "-" * 84)
+        print(f"  {'TOTAL':<58} {before:>9,} {after:>9,} {before - after:>7,}")
+        print()
+
+    if args.json:
+        report = {
+            "reportPath": str(report_path),
+            "dryRun": not args.fix,
+            "findings": [{"severity": f.severity, "bookmark": f.bookmark, "path": str(f.path),
+                          "type": f.issue_type, "message": f.message, "fixable": f.fixable} for f in findings],
+            "equivalentGroups": equivalent_groups(bset),
+            "bookmarks": rows,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    written = 0
+    if args.fix:
+        for name, bookmark in bset.files.items():
+            if bookmark.changed and bookmark.data != originals[name]:
+                bookmark.path.write_text(json.dumps(bookmark.data, indent=2, ensure_ascii=False), encoding="utf-8")
+                written += 1
+        print(f"[SUCCESS] Rewrote {written} bookmark file(s)" if written else "[OK] Nothing to rewrite")
+
+    if any(f.severity == "ERROR" for f in findings):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Theme Formatting Hoister
+
+Diffs per-visual formatting (visual.objects and visual.visualContainerObjects)
+against the registered custom theme and moves repeated literals into the
+theme's visualStyles, so each visual.json only carries what is really
+specific to it.
+
+- Redundant: a visual property equal to the value the theme already applies
+  (visualStyles[<type>]["*"] or visualStyles["*"]["*"]) is stripped
+- Hoisted: a property set by EVERY visual of a type, with one value shared by
+  at least --min-visuals of them, is written to visualStyles[<type>]["*"] and
+  stripped from the visuals that match; visuals with a different value keep
+  their explicit override, so rendering does not change
+- Only plain literals are considered (booleans, numbers, text, solid colors).
+  Measure-driven colors, theme color references, datetimes, images, filters
+  and generator placeholders (__NAME__) always stay on the visual
+- Only files that change are rewritten (with --fix; the default only reports)
+
+Usage:
+    python hoist_theme_formatting.py [report_path] [--fix] [--min-visuals 2] [--theme FILE] [--verbose] [--json FILE]
+
+Options:
+    --fix: Rewrite the visuals and the theme (default: report bytes saved only)
+    --min-visuals: Minimum number of visuals sharing a value before it is hoisted (default: 2)
+    --theme: Theme JSON to update (default: customTheme registered in report.json)
+    --verbose: List every stripped/hoisted property
+    --json: Write the size report to a JSON file
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_REPORT_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.Report"
+
+FORMAT_SECTIONS = ("objects", "visualContainerObjects")
+
+NUMBER_LITERAL_RE = re.compile(r"^(-?\d+(?:\.\d+)?)([DLM])$")
+PLACEHOLDER_RE = re.compile(r"__[A-Z0-9_]+__")
+
+# (visual type, object, selector id, property)
+PropertyKey = Tuple[str, str, Optional[str], str]
+
+_UNSUPPORTED = object()
+
+
+@dataclass
+class VisualFile:
+    """One visual.json and its parsed content."""
+    path: Path
+    visual_id: str
+    visual_type: str
+    data: Dict
+    original_bytes: int
+    changed: bool = False
+
+    def serialized_bytes(self) -> int:
+        if not self.changed:
+            return self.original_bytes
+        return len(json.dumps(self.data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
+@dataclass
+class FormatProperty:
+    """A single literal formatting property found on a visual."""
+    visual: VisualFile
+    section: str
+    obj: str
+    selector_id: Optional[str]
+    prop: str
+    value: Any
+    entry: Dict = field(repr=False)
+
+    @property
+    def key(self) -> PropertyKey:
+        return (self.visual.visual_type, self.obj, self.selector_id, self.prop)
+
+
+# ============================================================================
+# VALUE CONVERSION
+# ============================================================================
+
+def literal_to_theme_value(value: str) -> Any:
+    """Convert a PBIR Literal value ("true", "14D", "'text'") to its theme JSON form."""
+    if value in ("true", "false"):
+        return value == "true"
+    m = NUMBER_LITERAL_RE.match(value)
+    if m:
+        number = float(m.group(1))
+        return int(number) if number.is_integer() else number
+    if len(value) >= 2 and value.startswith("'") and value.endswith("'"):
+        text = value[1:-1].replace("''", "'")
+        if PLACEHOLDER_RE.search(text):
+            return _UNSUPPORTED
+        return text
+    return _UNSUPPORTED  # datetime'...', null, binary, ...
+
+
+def property_to_theme_value(prop_value: Any) -> Any:
+    """Theme JSON value for a visual property, or _UNSUPPORTED when it must stay on the visual."""
+    if not isinstance(prop_value, dict):
+        return _UNSUPPORTED
+    if set(prop_value) == {"expr"}:
+        literal = prop_value["expr"].get("Literal") if isinstance(prop_value["expr"], dict) else None
+        if isinstance(literal, dict) and isinstance(literal.get("Value"), str) and len(prop_value["expr"]) == 1:
+            return literal_to_theme_value(literal["Value"])
+        return _UNSUPPORTED
+    if set(prop_value) == {"solid"} and isinstance(prop_value["solid"], dict) and set(prop_value["solid"]) == {"color"}:
+        color = property_to_theme_value(prop_value["solid"]["color"])
+        if isinstance(color, str) and color.startswith("#"):
+            return {"solid": {"color": color}}
+    return _UNSUPPORTED
+
+
+def normalize_value(value: Any) -> str:
+    """Comparable form of a theme value (hex colors are case-insensitive)."""
+    def norm(v):
+        if isinstance(v, dict):
+            return {k: norm(x) for k, x in v.items()}
+        if isinstance(v, str) and re.fullmatch(r"#[0-9A-Fa-f]{3,8}", v):
+            return v.upper()
+        if isinstance(v, float) and v.is_integer():
+            return int(v)
+        return v
+    return json.dumps(norm(value), sort_keys=True)
+
+
+def selector_id(entry: Dict) -> Tuple[bool, Optional[str]]:
+    """(supported, id) for an object entry's selector; only {} and {"id": X} map to the theme."""
+    selector = entry.get("selector")
+    if selector is None:
+        return True, None
+    if isinstance(selector, dict) and set(selector) == {"id"} and isinstance(selector["id"], str):
+        return True, selector["id"]
+    return False, None
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def resolve_theme_path(report_path: Path) -> Optional[Path]:
+    """Registered custom theme file referenced by definition/report.json."""
+    report_json = report_path / "definition" / "report.json"
+    if not report_json.exists():
+        return None
+    data = json.loads(report_json.read_text(encoding="utf-8-sig"))
+    custom = data.get("themeCollection", {}).get("customTheme", {})
+    name = custom.get("name")
+    if not name:
+        return None
+    if custom.get("type") == "RegisteredResources":
+        return report_path / "StaticResources" / "RegisteredResources" / name
+    return report_path / "StaticResources" / "SharedResources" / "BaseThemes" / name
+
+
+def load_visuals(report_path: Path) -> List[VisualFile]:
+    visuals = []
+    for path in sorted((report_path / "definition" / "pages").glob("*/visuals/*/visual.json")):
+        raw = path.read_bytes()
+        try:
+            data = json.loads(raw.decode("utf-8-sig"))
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"  [WARN] {path}: skipped ({e})")
+            continue
+        visual_type = data.get("visual", {}).get("visualType")
+        if not visual_type:
+            continue  # Visual groups have no formatting to hoist
+        visuals.append(VisualFile(path, path.parent.name, visual_type, data, len(raw)))
+    return visuals
+
+
+def collect_properties(visuals: List[VisualFile]) -> List[FormatProperty]:
+    """All literal formatting properties that could live in a theme."""
+    found = []
+    for visual in visuals:
+        section_owner = visual.data.get("visual", {})
+        for section in FORMAT_SECTIONS:
+            for obj, entries in (section_owner.get(section) or {}).items():
+                if not isinstance(entries, list):
+                    continue
+                for entry in entries:
+                    ok, sel = selector_id(entry)
+                    if not ok:
+                        continue
+                    for prop, prop_value in (entry.get("properties") or {}).items():
+                        value = property_to_theme_value(prop_value)
+                        if value is _UNSUPPORTED:
+                            continue
+                        found.append(FormatProperty(visual, section, obj, sel, prop, value, entry))
+    return found
+
+
+# ============================================================================
+# THEME
+# ============================================================================
+
+def _theme_entry(styles: Dict, visual_type: str, obj: str, sel: Optional[str]) -> Optional[Dict]:
+    for entry in styles.get(visual_type, {}).get("*", {}).get(obj, []) or []:
+        if isinstance(entry, dict) and entry.get("$id") == sel:
+            return entry
+    return None
+
+
+def effective_theme_value(styles: Dict, key: PropertyKey) -> Any:
+    """Value the theme applies for a property (type-specific first, then "*")."""
+    visual_type, obj, sel, prop = key
+    for style_type in (visual_type, "*"):
+        entry = _theme_entry(styles, style_type, obj, sel)
+        if entry is not None and prop in entry:
+            return entry[prop]
+    return _UNSUPPORTED
+
+
+def set_theme_value(styles: Dict, key: PropertyKey, value: Any) -> None:
+    visual_type, obj, sel, prop = key
+    entries = styles.setdefault(visual_type, {}).setdefault("*", {}).setdefault(obj, [])
+    entry = _theme_entry(styles, visual_type, obj, sel)
+    if entry is None:
+        entry = {"$id": sel} if sel is not None else {}
+        entries.append(entry)
+    entry[prop] = value
+
+
+# ============================================================================
+# PLANNING / APPLYING
+# ============================================================================
+
+def plan_changes(props: List[FormatProperty], visuals: List[VisualFile], styles: Dict,
+                 min_visuals: int) -> Tuple[List[FormatProperty], Dict[PropertyKey, Any], List[FormatProperty]]:
+    """
+    Returns (redundant, hoisted, stripped_by_hoist).
+
+    redundant: properties already equal to the theme value
+    hoisted: key -> value to write into visualStyles
+    stripped_by_hoist: properties that match a hoisted value
+    """
+    type_counts = Counter(v.visual_type for v in visuals)
+    by_key: Dict[PropertyKey, List[FormatProperty]] = defaultdict(list)
+    redundant = []
+    for p in props:
+        theme_value = effective_theme_value(styles, p.key)
+        if theme_value is not _UNSUPPORTED and normalize_value(theme_value) == normalize_value(p.value):
+            redundant.append(p)
+        else:
+            by_key[p.key].append(p)
+
+    redundant_keys = {p.key for p in redundant}
+    hoisted: Dict[PropertyKey, Any] = {}
+    stripped = []
+    for key, group in sorted(by_key.items(), key=lambda kv: tuple(str(x) for x in kv[0])):
+        if key in redundant_keys:
+            continue  # Some visuals already rely on the current theme value
+        setters = {id(p.visual) for p in group}
+        if len(setters) != len(group):
+            continue  # Same property set twice on one visual: leave it alone
+        # Every visual of the type must set the property, otherwise hoisting
+        # would change how the visuals that rely on the default render
+        if len(setters) < type_counts[key[0]]:
+            continue
+        values = Counter(normalize_value(p.value) for p in group)
+        best, count = values.most_common(1)[0]
+        if count < min_visuals:
+            continue
+        matching = [p for p in group if normalize_value(p.value) == best]
+        hoisted[key] = matching[0].value
+        stripped.extend(matching)
+    return redundant, hoisted, stripped
+
+
+def strip_property(p: FormatProperty) -> None:
+    """Remove one property and prune emptied entries/objects/sections."""
+    visual_data = p.visual.data["visual"]
+    properties = p.entry.get("properties", {})
+    properties.pop(p.prop, None)
+    p.visual.changed = True
+    if properties:
+        return
+    if set(p.entry) - {"properties", "selector"}:
+        return
+    entries = visual_data[p.section][p.obj]
+    entries[:] = [e for e in entries if e is not p.entry]
+    if not entries:
+        del visual_data[p.section][p.obj]
+    if not visual_data[p.section]:
+        del visual_data[p.section]
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hoist repeated per-visual formatting into the report theme",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Show bytes saved only
+  python hoist_theme_formatting.py
+
+  # Hoist only values shared by 5+ visuals of a type
+  python hoist_theme_formatting.py "C:\\path\\to\\report.Report" --fix --min-visuals 5 --verbose
+        """
+    )
+    parser.add_argument("report_path", nargs="?", default=str(DEFAULT_REPORT_PATH),
+                        help="Path to the .Report folder")
+    parser.add_argument("--fix", action="store_true", help="Rewrite the visuals and the theme")
+    parser.add_argument("--min-visuals", type=int, default=2,
+                        help="Minimum visuals sharing a value before it is hoisted (default: 2)")
+    parser.add_argument("--theme", help="Theme JSON to update (default: customTheme from report.json)")
+    parser.add_argument("--verbose", action="store_true", help="List every stripped/hoisted property")
+    parser.add_argument("--json", metavar="FILE", help="Write the size report to a JSON file")
+    args = parser.parse_args()
+
+    report_path = Path(args.report_path)
+    theme_path = Path(args.theme) if args.theme else resolve_theme_path(report_path)
+    if theme_path is None or not theme_path.exists():
+        print(f"ERROR: Theme not found: {theme_path or 'no customTheme in definition/report.json'}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("Theme Formatting Hoister")
+    print("=" * 80)
+    print(f"Report: {report_path}")
+    print(f"Theme: {theme_path.name}")
+    print(f"Mode: {'WRITE' if args.fix else 'DRY-RUN'}")
+    print()
+
+    theme_raw = theme_path.read_bytes()
+    theme = json.loads(theme_raw.decode("utf-8-sig"))
+    styles = theme.setdefault("visualStyles", {})
+
+    visuals = load_visuals(report_path)
+    props = collect_properties(visuals)
+    redundant, hoisted, stripped = plan_changes(props, visuals, styles, args.min_visuals)
+
+    for key, value in hoisted.items():
+        set_theme_value(styles, key, value)
+    for p in redundant + stripped:
+        strip_property(p)
+
+    theme_changed = bool(hoisted)
+    theme_after = (len(json.dumps(theme, indent=2, ensure_ascii=False).encode("utf-8"))
+                   if theme_changed else len(theme_raw))
+
+    print(f"Visuals scanned: {len(visuals)} ({len(props)} literal formatting properties)")
+    print(f"Redundant with theme: {len(redundant)}")
+    print(f"Hoisted into theme: {len(hoisted)} ({len(stripped)} visual properties stripped)")
+    print()
+
+    if args.verbose and (redundant or hoisted):
+        print("PROPERTIES")
+        print("-" * 80)
+        for p in redundant:
+            print(f"  [INFO] {p.visual.visual_id} {p.obj}.{p.prop}: equals theme value, stripped")
+        for key, value in hoisted.items():
+            visual_type, obj, sel, prop = key
+            count = sum(1 for p in stripped if p.key == key)
+            target = f"{visual_type}.{obj}" + (f"[$id={sel}]" if sel else "")
+            print(f"  [INFO] {target}.{prop} = {json.dumps(value)} (from {count} visual(s))")
+        print()
+
+    rows = []
+    print(f"  {'Visual':<24} {'Type':<18} {'Before':>9} {'After':>9} {'Saved':>7}")
+    print("  " + "-" * 72)
+    for v in visuals:
+        after = v.serialized_bytes()
+        rows.append({"visual": v.visual_id, "type": v.visual_type, "path": str(v.path),
+                     "before": v.original_bytes, "after": after})
+        if v.changed:
+            print(f"  {v.visual_id:<24} {v.visual_type[:18]:<18} {v.original_bytes:>9,} {after:>9,} "
+                  f"{v.original_bytes - after:>7,}")
+    visuals_before = sum(r["before"] for r in rows)
+    visuals_after = sum(r["after"] for r in rows)
+    print("  " + "-" * 72)
+    print(f"  {'VISUALS':<43} {visuals_before:>9,} {visuals_after:>9,} {visuals_before - visuals_after:>7,}")
+    print(f"  {'THEME':<43} {len(theme_raw):>9,} {theme_after:>9,} {len(theme_raw) - theme_after:>7,}")
+    net = (visuals_before + len(theme_raw)) - (visuals_after + theme_after)
+    print(f"  {'NET SAVED':<43} {'':>9} {'':>9} {net:>7,}")
+    print()
+
+    if args.json:
+        report = {
+            "reportPath": str(report_path),
+            "theme": str(theme_path),
+            "dryRun": not args.fix,
+            "redundant": len(redundant),
+            "hoisted": [{"visualType": k[0], "object": k[1], "selectorId": k[2], "property": k[3],
+                         "value": v, "visuals": sum(1 for p in stripped if p.key == k)}
+                        for k, v in hoisted.items()],
+            "visuals": rows,
+            "themeBytes": {"before": len(theme_raw), "after": theme_after},
+            "netSavedBytes": net,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    if not args.fix:
+        print("No files written (dry-run). Re-run with --fix to rewrite them.")
+        return
+    written = 0
+    for v in visuals:
+        if v.changed:
+            v.path.write_text(json.dumps(v.data, indent=2, ensure_ascii=False), encoding="utf-8")
+            written += 1
+    if theme_changed:
+        theme_path.write_text(json.dumps(theme, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[SUCCESS] {written} visual(s) rewritten" + (", theme updated." if theme_changed else "."))
+
+
+if __name__ == "__main__":
+    main()
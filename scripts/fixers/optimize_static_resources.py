@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+StaticResources Optimizer
+
+Pure-Python optimization pass over StaticResources/RegisteredResources.
+Every byte in RegisteredResources is embedded in the published report and
+downloaded when the report loads.
+
+- SVG: drop XML comments, <metadata>, editor namespaces (inkscape/sodipodi),
+  collapse indentation whitespace and round coordinates to N significant
+  digits (transforms, stdDeviation and exponent literals are left as-is)
+- PNG: lossless recompression (drop ancillary text/time chunks, pick the
+  smallest row-filter strategy, zlib level 9)
+- PNG: optionally downscale images larger than the 1280x720 canvas
+- Rewrite background_manifest.json with the resolved file names and sizes
+- Fail (exit 1) when a page background exceeds the size budget
+
+Usage:
+    python optimize_static_resources.py [report_path] [--fix] [--precision 5] [--resize] [--thorough] [--max-background-kb 100]
+
+Options:
+    --fix: Write the optimized files and the manifest (default: report savings only)
+    --precision: Significant digits kept for SVG coordinates (default: 5)
+    --resize: Downscale PNGs larger than the canvas to 1280x720
+    --thorough: Also try paeth/adaptive PNG filters (slower)
+    --max-background-kb: Size budget for a single page background (default: 100)
+"""
+
+import argparse
+import json
+import math
+import re
+import struct
+import sys
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_REPORT_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.Report"
+
+CANVAS_WIDTH = 1280
+CANVAS_HEIGHT = 720
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Ancillary chunks that never affect rendering
+PNG_DROP_CHUNKS = {b"tEXt", b"zTXt", b"iTXt", b"tIME", b"eXIf", b"dSIG"}
+
+# Bytes per pixel for 8-bit non-palette color types
+PNG_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+# SVG attributes holding coordinates/lengths, safe to round to significant digits.
+# Matrix and scale values (transform, gradientTransform, patternTransform) and
+# stdDeviation are multiplied into the geometry, so they are never rounded.
+SVG_NUMERIC_ATTRIBUTES = {
+    "d", "points", "viewBox", "x", "y", "x1", "y1", "x2", "y2",
+    "cx", "cy", "r", "rx", "ry", "width", "height", "stroke-width", "dx", "dy",
+    "fx", "fy",
+}
+
+SVG_NUMBER_RE = re.compile(r"-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+
+SVG_EDITOR_NAMESPACES = ("inkscape", "sodipodi", "sketch", "serif")
+
+
+@dataclass
+class ResourceResult:
+    """Optimization result for one file."""
+    path: Path
+    original_bytes: int
+    optimized_bytes: int
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+
+# ============================================================================
+# SVG
+# ============================================================================
+
+def _format_number(match: re.Match, precision: int) -> str:
+    """Round a decimal to `precision` significant digits (integer digits are always kept)."""
+    text = match.group(0)
+    if "." not in text or "e" in text.lower():
+        return text
+    value = float(text)
+    if value == 0:
+        return "0"
+    decimals = max(0, precision - 1 - math.floor(math.log10(abs(value))))
+    rounded = f"{round(value, decimals):.{decimals}f}"
+    rounded = rounded.rstrip("0").rstrip(".") if "." in rounded else rounded
+    if rounded in ("-0", ""):
+        return "0"
+    if text.lstrip("-").startswith("."):
+        # Keep ".5" as ".5": in path data "1.5.5" is two numbers and "1.50.5" would grow the file
+        rounded = re.sub(r"^(-?)0\.", r"\1.", rounded)
+    return rounded
+
+
+def _round_numbers(value: str, precision: int) -> str:
+    return SVG_NUMBER_RE.sub(lambda m: _format_number(m, precision), value)
+
+
+def minify_svg(text: str, precision: int = 5) -> str:
+    """Minify SVG text without changing how it renders."""
+    # Keep CDATA (e.g. <style>) untouched
+    parts = re.split(r"(<!\[CDATA\[.*?\]\]>)", text, flags=re.DOTALL)
+    out = []
+    for part in parts:
+        if part.startswith("<![CDATA["):
+            out.append(part)
+            continue
+        part = re.sub(r"<!--.*?-->", "", part, flags=re.DOTALL)
+        part = re.sub(r"<metadata\b.*?</metadata>|<metadata\b[^>]*/>", "", part, flags=re.DOTALL)
+        for ns in SVG_EDITOR_NAMESPACES:
+            part = re.sub(rf"<{ns}:[^>]*/>|<{ns}:(\w+)\b.*?</{ns}:\1>", "", part, flags=re.DOTALL)
+            part = re.sub(rf'\s+(?:xmlns:)?{ns}(?::[\w-]+)?="[^"]*"', "", part)
+
+        def round_attr(m: re.Match) -> str:
+            name, quote, value = m.group(1), m.group(2), m.group(3)
+            if name in SVG_NUMERIC_ATTRIBUTES:
+                value = _round_numbers(value, precision)
+                if name in ("d", "points"):
+                    value = re.sub(r"\s+", " ", value).strip()
+            return f"{name}={quote}{value}{quote}"
+
+        part = re.sub(r'([\w:-]+)=(["\'])(.*?)\2', round_attr, part, flags=re.DOTALL)
+        out.append(part)
+    text = "".join(out)
+
+    # Collapse indentation between tags, but not inside <text> (whitespace is content there)
+    pieces = re.split(r"(<text\b.*?</text>)", text, flags=re.DOTALL)
+    text = "".join(
+        p if p.startswith("<text") else re.sub(r">\s*\n\s*<", "><", p)
+        for p in pieces
+    )
+    return text.strip() + "\n"
+
+
+# ============================================================================
+# PNG
+# ============================================================================
+
+def read_png_chunks(data: bytes) -> List[Tuple[bytes, bytes]]:
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG file")
+    chunks = []
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, ctype = struct.unpack(">I4s", data[pos:pos + 8])
+        chunks.append((ctype, data[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+        if ctype == b"IEND":
+            break
+    return chunks
+
+
+def _png_chunk(ctype: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + ctype + payload + struct.pack(">I", zlib.crc32(ctype + payload) & 0xFFFFFFFF)
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def unfilter_scanlines(raw: bytes, width: int, height: int, bpp: int) -> List[bytearray]:
+    """Undo PNG row filters; returns one bytearray per row."""
+    stride = width * bpp
+    rows: List[bytearray] = []
+    prev = bytearray(stride)
+    pos = 0
+    for _ in range(height):
+        ftype = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if ftype == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif ftype == 2:
+            for i in range(stride):
+                line[i] = (line[i] + prev[i]) & 0xFF
+        elif ftype == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif ftype == 4:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                upleft = prev[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + _paeth(left, prev[i], upleft)) & 0xFF
+        elif ftype != 0:
+            raise ValueError(f"Unknown PNG filter type {ftype}")
+        rows.append(line)
+        prev = line
+    return rows
+
+
+def _filter_row(ftype: int, line: bytearray, prev: bytearray, bpp: int) -> bytes:
+    if ftype == 0:
+        return bytes(line)
+    if ftype == 1:
+        return bytes((line[i] - (line[i - bpp] if i >= bpp else 0)) & 0xFF for i in range(len(line)))
+    if ftype == 2:
+        return bytes((line[i] - prev[i]) & 0xFF for i in range(len(line)))
+    if ftype == 3:
+        return bytes((line[i] - (((line[i - bpp] if i >= bpp else 0) + prev[i]) >> 1)) & 0xFF
+                     for i in range(len(line)))
+    return bytes((line[i] - _paeth(line[i - bpp] if i >= bpp else 0, prev[i],
+                                   prev[i - bpp] if i >= bpp else 0)) & 0xFF
+                 for i in range(len(line)))
+
+
+def filter_scanlines(rows: List[bytearray], bpp: int, strategy: str) -> bytes:
+    """Re-filter rows: 'none', 'sub', 'up', 'paeth' or 'adaptive' (min sum of abs per row)."""
+    fixed = {"none": 0, "sub": 1, "up": 2, "average": 3, "paeth": 4}
+    out = bytearray()
+    prev = bytearray(len(rows[0]) if rows else 0)
+    for line in rows:
+        if strategy == "adaptive":
+            best = None
+            for ftype in range(5):
+                filtered = _filter_row(ftype, line, prev, bpp)
+                score = sum(b if b < 128 else 256 - b for b in filtered)
+                if best is None or score < best[0]:
+                    best = (score, ftype, filtered)
+            out.append(best[1])
+            out += best[2]
+        else:
+            ftype = fixed[strategy]
+            out.append(ftype)
+            out += _filter_row(ftype, line, prev, bpp)
+        prev = line
+    return bytes(out)
+
+
+def downscale_rows(rows: List[bytearray], width: int, height: int, bpp: int,
+                   new_width: int, new_height: int) -> List[bytearray]:
+    """Box-filter downscale (averages every source pixel covered by a target pixel)."""
+    x_edges = [x * width // new_width for x in range(new_width + 1)]
+    y_edges = [y * height // new_height for y in range(new_height + 1)]
+    out: List[bytearray] = []
+    for ty in range(new_height):
+        y0, y1 = y_edges[ty], max(y_edges[ty + 1], y_edges[ty] + 1)
+        src_rows = rows[y0:y1]
+        line = bytearray(new_width * bpp)
+        for tx in range(new_width):
+            x0, x1 = x_edges[tx], max(x_edges[tx + 1], x_edges[tx] + 1)
+            count = (x1 - x0) * len(src_rows)
+            for c in range(bpp):
+                total = 0
+                for row in src_rows:
+                    total += sum(row[x * bpp + c] for x in range(x0, x1))
+                line[tx * bpp + c] = (total + count // 2) // count
+        out.append(line)
+    return out
+
+
+def optimize_png(data: bytes, resize: bool = False, thorough: bool = False) -> Tuple[bytes, List[str]]:
+    """
+    Losslessly recompress (and optionally downscale) a PNG. Returns (bytes, notes).
+
+    The fast pass tries the none/sub/up filters; thorough adds paeth and
+    per-row adaptive filtering (several times slower in pure Python).
+    """
+    notes: List[str] = []
+    chunks = read_png_chunks(data)
+    header = next(payload for ctype, payload in chunks if ctype == b"IHDR")
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+    idat = b"".join(payload for ctype, payload in chunks if ctype == b"IDAT")
+    raw = zlib.decompress(idat)
+
+    kept = [(ctype, payload) for ctype, payload in chunks
+            if ctype not in PNG_DROP_CHUNKS and ctype not in (b"IHDR", b"IDAT", b"IEND")]
+    dropped = [ctype.decode("ascii") for ctype, _ in chunks if ctype in PNG_DROP_CHUNKS]
+    if dropped:
+        notes.append(f"dropped chunks: {', '.join(dropped)}")
+
+    candidates = [zlib.compress(raw, 9)]
+
+    if bit_depth == 8 and color_type in PNG_CHANNELS and interlace == 0:
+        bpp = PNG_CHANNELS[color_type]
+        rows = unfilter_scanlines(raw, width, height, bpp)
+
+        if resize and (width > CANVAS_WIDTH or height > CANVAS_HEIGHT):
+            scale = min(CANVAS_WIDTH / width, CANVAS_HEIGHT / height)
+            new_width, new_height = max(1, round(width * scale)), max(1, round(height * scale))
+            rows = downscale_rows(rows, width, height, bpp, new_width, new_height)
+            notes.append(f"resized {width}x{height} -> {new_width}x{new_height}")
+            width, height = new_width, new_height
+            header = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+            candidates = []
+
+        strategies = ("none", "sub", "up", "paeth", "adaptive") if thorough else ("none", "sub", "up")
+        for strategy in strategies:
+            candidates.append(zlib.compress(filter_scanlines(rows, bpp, strategy), 9))
+    elif resize and (width > CANVAS_WIDTH or height > CANVAS_HEIGHT):
+        notes.append("resize skipped (only 8-bit non-interlaced truecolor/grayscale supported)")
+
+    best = min(candidates, key=len)
+    out = PNG_SIGNATURE + _png_chunk(b"IHDR", header)
+    for ctype, payload in kept:
+        if ctype in (b"PLTE", b"tRNS", b"sRGB", b"gAMA", b"cHRM", b"iCCP", b"pHYs", b"sBIT", b"bKGD"):
+            out += _png_chunk(ctype, payload)
+    out += _png_chunk(b"IDAT", best) + _png_chunk(b"IEND", b"")
+
+    # Never make a file bigger
+    if len(out) >= len(data) and not any(n.startswith("resized") for n in notes):
+        return data, notes
+    return out, notes
+
+
+# ============================================================================
+# MANIFEST / BUDGET
+# ============================================================================
+
+def resolve_resource(resources_dir: Path, filename: str) -> Optional[Path]:
+    """
+    Find the registered file for a manifest name.
+
+    Power BI appends a numeric suffix on registration
+    (background_channels.svg -> background_channels4943707189684421.svg), and
+    backgrounds may have been exported as PNG instead of SVG.
+    """
+    exact = resources_dir / filename
+    if exact.exists():
+        return exact
+    stem, suffix = Path(filename).stem, Path(filename).suffix
+    for ext in (suffix, ".png", ".svg"):
+        for candidate in sorted(resources_dir.glob(f"{stem}*{ext}")):
+            if re.fullmatch(re.escape(stem) + r"\d*", candidate.stem):
+                return candidate
+    return None
+
+
+def page_background_items(report_path: Path) -> Dict[str, str]:
+    """page folder -> RegisteredResources item name of its background image."""
+    result = {}
+    pages_dir = report_path / "definition" / "pages"
+    for page_json_path in sorted(pages_dir.glob("*/page.json")):
+        try:
+            page_data = json.loads(page_json_path.read_text(encoding="utf-8-sig"))
+        except Exception:
+            continue  # Skip read errors
+        for bg in page_data.get("objects", {}).get("background", []):
+            item = (bg.get("properties", {}).get("image", {}).get("image", {})
+                    .get("url", {}).get("expr", {}).get("ResourcePackageItem", {}).get("ItemName"))
+            if item:
+                result[page_json_path.parent.name] = item
+    return result
+
+
+def update_manifest(resources_dir: Path, manifest: Dict, report_path: Path) -> List[str]:
+    """Point manifest entries at the registered files and refresh size_kb. Returns warnings."""
+    warnings = []
+    for entry in manifest.get("files", []):
+        resolved = resolve_resource(resources_dir, entry.get("filename", ""))
+        if resolved is None:
+            warnings.append(f"Manifest entry '{entry.get('page')}' -> {entry.get('filename')} not found")
+            continue
+        entry["filename"] = resolved.name
+        entry["path"] = str(resolved.relative_to(report_path.parent)).replace("/", "\\")
+        entry["size_kb"] = resolved.stat().st_size / 1024
+    return warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Optimize StaticResources/RegisteredResources (SVG minify, PNG recompress)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Show savings only
+  python optimize_static_resources.py
+
+  # Optimize, downscale oversized PNGs and enforce a 50 KB background budget
+  python optimize_static_resources.py "C:\\path\\to\\report.Report" --fix --resize --max-background-kb 50
+        """
+    )
+    parser.add_argument("report_path", nargs="?", default=str(DEFAULT_REPORT_PATH),
+                        help="Path to the .Report folder")
+    parser.add_argument("--fix", action="store_true", help="Write the optimized files and the manifest")
+    parser.add_argument("--precision", type=int, default=5,
+                        help="Significant digits for SVG coordinates (default: 5)")
+    parser.add_argument("--resize", action="store_true",
+                        help=f"Downscale PNGs larger than {CANVAS_WIDTH}x{CANVAS_HEIGHT}")
+    parser.add_argument("--thorough", action="store_true", help="Also try paeth/adaptive PNG filters (slower)")
+    parser.add_argument("--max-background-kb", type=float, default=100.0,
+                        help="Size budget for a single page background in KB (default: 100)")
+    args = parser.parse_args()
+
+    report_path = Path(args.report_path)
+    resources_dir = report_path / "StaticResources" / "RegisteredResources"
+    if not resources_dir.exists():
+        print(f"ERROR: RegisteredResources not found: {resources_dir}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("StaticResources Optimizer")
+    print("=" * 80)
+    print(f"Resources: {resources_dir}")
+    print(f"Mode: {'WRITE' if args.fix else 'DRY-RUN'}")
+    print()
+
+    results: List[ResourceResult] = []
+    sizes: Dict[str, int] = {}
+    for path in sorted(resources_dir.iterdir()):
+        if not path.is_file():
+            continue
+        data = path.read_bytes()
+        notes: List[str] = []
+        try:
+            if path.suffix.lower() == ".svg":
+                optimized = minify_svg(data.decode("utf-8-sig"), args.precision).encode("utf-8")
+                if len(optimized) >= len(data):
+                    optimized = data
+            elif path.suffix.lower() == ".png":
+                optimized, notes = optimize_png(data, resize=args.resize, thorough=args.thorough)
+            else:
+                sizes[path.name] = len(data)
+                continue
+        except (ValueError, zlib.error, UnicodeDecodeError) as e:
+            print(f"  [WARN] {path.name}: skipped ({e})")
+            sizes[path.name] = len(data)
+            continue
+
+        results.append(ResourceResult(path, len(data), len(optimized), notes))
+        sizes[path.name] = len(optimized)
+        if args.fix and optimized != data:
+            path.write_bytes(optimized)
+
+    print(f"  {'File':<45} {'Before':>9} {'After':>9} {'Saved':>7}")
+    print("  " + "-" * 72)
+    for r in results:
+        pct = (r.saved_bytes / r.original_bytes * 100) if r.original_bytes else 0
+        print(f"  {r.path.name[:45]:<45} {r.original_bytes:>9,} {r.optimized_bytes:>9,} {pct:>6.1f}%")
+        for note in r.notes:
+            print(f"      {note}")
+    total_before = sum(r.original_bytes for r in results)
+    total_after = sum(r.optimized_bytes for r in results)
+    print("  " + "-" * 72)
+    print(f"  {'TOTAL':<45} {total_before:>9,} {total_after:>9,} {total_before - total_after:>7,}")
+    print()
+
+    # Manifest
+    manifest_path = resources_dir / "background_manifest.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8-sig"))
+        for warning in update_manifest(resources_dir, manifest, report_path):
+            print(f"  [WARN] {warning}")
+        if not args.fix:
+            print("Manifest: not written (dry-run)")
+        else:
+            manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"🧾 Manifest updated: {manifest_path}")
+        print()
+    else:
+        manifest = {"files": []}
+
+    # Budget: backgrounds referenced by pages and listed in the manifest
+    budget_bytes = args.max_background_kb * 1024
+    backgrounds = set(page_background_items(report_path).values())
+    backgrounds |= {e["filename"] for e in manifest.get("files", []) if e.get("filename") in sizes}
+    over_budget = sorted(name for name in backgrounds if sizes.get(name, 0) > budget_bytes)
+
+    print(f"BACKGROUND BUDGET ({args.max_background_kb:g} KB)")
+    print("-" * 80)
+    for name in sorted(backgrounds):
+        marker = "[ERROR]" if name in over_budget else "[OK]"
+        print(f"  {marker} {name}: {sizes.get(name, 0) / 1024:.1f} KB")
+    print()
+
+    if over_budget:
+        print(f"[ERROR] {len(over_budget)} page background(s) exceed the {args.max_background_kb:g} KB budget.")
+        sys.exit(1)
+    print("[SUCCESS] All page backgrounds within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Unused Measure / Column / Table Pruner
+
+check_all_measure_names.py lists which measures the visuals bind to. This
+tool goes further: it combines every place that can keep a semantic-model
+object alive and reports what nothing reaches.
+
+Usage roots:
+- Visual projections, sorts, conditional formatting and visual filters
+- Page- and report-level filters, bookmark state
+- Relationship columns, key columns, hierarchy levels
+- Objects protected with --keep
+
+Reachability then follows measure -> measure/column references, calculated
+column and calculated table expressions, sortByColumn and M query references.
+Everything not reached is a pruning candidate. Unused imported columns and
+tables still cost refresh time and VertiPaq memory on every refresh.
+
+The plan is ordered so it is safe to apply top to bottom: dependent measures
+before the measures they use, columns before their tables. Pruned imported
+columns are also dropped from the partition's M query (a final
+Table.RemoveColumns step) so refresh stops loading them; queries that cannot
+be rewritten are reported. Auto date/time
+tables (LocalDateTable_*, DateTableTemplate_*) are left to
+remove_auto_date_tables.py and skipped here.
+
+Usage:
+    python prune_unused_model_objects.py [semantic_model_path] [--report path.Report] [--keep "Metrics[Total*]"] [--fix]
+
+Options:
+    --report: .Report folder(s) bound to the model (repeatable; default: sibling report)
+    --keep: fnmatch pattern of objects to protect ("Table", "Table[Object]"; repeatable)
+    --only: Limit the plan to measures, columns and/or tables
+    --explain: Show why an object is kept (usage chain)
+    --fix: Rewrite the TMDL files (and M queries) according to the plan
+    --json: Write the plan as JSON
+"""
+
+import argparse
+import fnmatch
+import json
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+
+from dax_lexer import DaxSyntaxError, declared_variables, extract_references, tokenize  # noqa: E402
+from pbir_report import find_report_dir, load_report  # noqa: E402
+from remove_auto_date_tables import is_auto_date_table  # noqa: E402
+from tmdl_model import (  # noqa: E402
+    SemanticModel, TmdlNode, load_semantic_model, parse_tmdl_file, quote_name, remove_line_spans,
+    split_column_ref,
+)
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+# Graph node ids: ("table", T, ""), ("column", T, C), ("measure", T, M)
+ObjectId = Tuple[str, str, str]
+
+
+def object_label(obj: ObjectId) -> str:
+    kind, table, name = obj
+    return table if kind == "table" else f"{table}[{name}]"
+
+
+@dataclass
+class PruneCandidate:
+    """One object in the safe-delete plan."""
+    kind: str                 # measure | column | table
+    table: str
+    name: str
+    node: TmdlNode
+    detail: str = ""
+
+    @property
+    def label(self) -> str:
+        return self.table if self.kind == "table" else f"{self.table}[{self.name}]"
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "table": self.table,
+            "name": self.name,
+            "file": str(self.node.file_path),
+            "lines": [self.node.start_line, self.node.end_line],
+            "detail": self.detail,
+        }
+
+
+@dataclass
+class PrunePlan:
+    measures: List[PruneCandidate] = field(default_factory=list)
+    columns: List[PruneCandidate] = field(default_factory=list)
+    tables: List[PruneCandidate] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+    def all(self) -> List[PruneCandidate]:
+        return self.measures + self.columns + self.tables
+
+
+def is_calculated_table(table: TmdlNode) -> bool:
+    return any(p.is_calculated for p in table.partitions)
+
+
+class UsageGraph:
+    """Reachability over measures, columns and tables from report/model roots."""
+
+    def __init__(self, model: SemanticModel):
+        self.model = model
+        self.measures: Dict[str, ObjectId] = {
+            m.name: ("measure", t.name, m.name) for t, m in model.iter_measures()
+        }
+        self.columns_by_name: Dict[str, List[ObjectId]] = {}
+        for t, c in model.iter_columns():
+            self.columns_by_name.setdefault(c.name, []).append(("column", t.name, c.name))
+        self.edges: Dict[ObjectId, Set[ObjectId]] = {}
+        self.roots: Dict[ObjectId, str] = {}
+        self.parent: Dict[ObjectId, Optional[ObjectId]] = {}
+        self._build_edges()
+
+    def _add(self, src: ObjectId, dst: ObjectId) -> None:
+        self.edges.setdefault(src, set()).add(dst)
+
+    def _dax_targets(self, expression: str, home_table: str) -> Set[ObjectId]:
+        """Objects referenced by a DAX expression (conservative on ambiguity)."""
+        targets: Set[ObjectId] = set()
+        try:
+            tokens = tokenize(expression)
+        except DaxSyntaxError:
+            # Unparseable: keep every object whose name appears in the text
+            for name, mid in self.measures.items():
+                if f"[{name}]" in expression:
+                    targets.add(mid)
+            for name, cols in self.columns_by_name.items():
+                if f"[{name}]" in expression:
+                    targets.update(cols)
+            return targets
+
+        for ref in extract_references(tokens, declared_variables(tokens)):
+            if ref.kind == "column":
+                if self.model.find_column(ref.table, ref.name):
+                    targets.add(("column", ref.table, ref.name))
+                elif ref.name in self.measures:
+                    targets.add(self.measures[ref.name])
+                elif ref.table in self.model.tables:
+                    targets.add(("table", ref.table, ""))
+            elif ref.kind == "measure":
+                if ref.name in self.measures:
+                    targets.add(self.measures[ref.name])
+                elif self.model.find_column(home_table, ref.name):
+                    targets.add(("column", home_table, ref.name))
+                else:
+                    # Column in row context of some iterator: keep every column with that name
+                    targets.update(self.columns_by_name.get(ref.name, []))
+            elif ref.kind == "table" and ref.table in self.model.tables:
+                # Whole-table reference (COUNTROWS(T), FILTER(T, ...)): the table and all its columns
+                targets.add(("table", ref.table, ""))
+                for c in self.model.tables[ref.table].columns:
+                    targets.add(("column", ref.table, c.name))
+        return targets
+
+    def _build_edges(self) -> None:
+        table_names = list(self.model.tables)
+        for table in self.model.tables.values():
+            tid: ObjectId = ("table", table.name, "")
+
+            for measure in table.measures:
+                mid: ObjectId = ("measure", table.name, measure.name)
+                self._add(mid, tid)
+                texts = [measure.expression or ""] + [c.expression or "" for c in measure.children
+                                                      if c.kind in ("formatStringDefinition", "detailRowsDefinition")]
+                for text in texts:
+                    for target in self._dax_targets(text, table.name):
+                        self._add(mid, target)
+
+            for column in table.columns:
+                cid: ObjectId = ("column", table.name, column.name)
+                self._add(cid, tid)
+                if column.is_calculated:
+                    for target in self._dax_targets(column.expression or "", table.name):
+                        self._add(cid, target)
+                sort_by = column.get("sortByColumn")
+                if sort_by:
+                    name = sort_by.strip("'").replace("''", "'")
+                    self._add(cid, ("column", table.name, name))
+
+            for partition in table.partitions:
+                source = partition.expression_properties.get("source", "")
+                if partition.is_calculated:
+                    for target in self._dax_targets(source, table.name):
+                        self._add(tid, target)
+                else:
+                    # M query referencing other queries by name (#"Name" or a bare identifier
+                    # outside string literals such as file paths, and outside comments)
+                    quoted = set(re.findall(r'#"((?:[^"]|"")*)"', source))
+                    code = re.sub(r'"(?:[^"]|"")*"|//[^\n]*|/\*.*?\*/', " ", source, flags=re.DOTALL)
+                    for other in table_names:
+                        if other != table.name and (other in quoted or re.search(
+                                rf'(?<![\w.]){re.escape(other)}(?![\w])', code)):
+                            self._add(tid, ("table", other, ""))
+
+    # ------------------------------------------------------------------
+    # Roots
+    # ------------------------------------------------------------------
+
+    def add_root(self, obj: ObjectId, reason: str) -> None:
+        self.roots.setdefault(obj, reason)
+
+    def add_model_roots(self) -> None:
+        for rel in self.model.relationships:
+            for key in ("fromColumn", "toColumn"):
+                table, column = split_column_ref(rel.get(key))
+                if table and column:
+                    self.add_root(("column", table, column), f"relationship {rel.name}")
+        for table in self.model.tables.values():
+            for column in table.columns:
+                if column.get("isKey") == "true":
+                    self.add_root(("column", table.name, column.name), "key column")
+            for hierarchy in table.children_of("hierarchy"):
+                for level in hierarchy.children_of("level"):
+                    column = level.get("column").strip("'").replace("''", "'")
+                    if column:
+                        self.add_root(("column", table.name, column), f"hierarchy {hierarchy.name}")
+            if is_auto_date_table(table):
+                self.add_root(("table", table.name, ""), "auto date/time table")
+                for column in table.columns:
+                    self.add_root(("column", table.name, column.name), "auto date/time table")
+
+    def add_report_roots(self, report_path: Path) -> None:
+        report = load_report(report_path)
+        for location, ref in report.iter_all_field_refs():
+            if ref.kind == "Measure" and ref.prop in self.measures:
+                self.add_root(self.measures[ref.prop], location)
+            elif ref.kind == "Column":
+                self.add_root(("column", ref.entity, ref.prop), location)
+
+    def add_keep_roots(self, patterns: Iterable[str]) -> None:
+        patterns = list(patterns)
+        if not patterns:
+            return
+        objects: List[ObjectId] = list(self.measures.values())
+        for cols in self.columns_by_name.values():
+            objects.extend(cols)
+        objects.extend(("table", t, "") for t in self.model.tables)
+        for obj in objects:
+            label = object_label(obj)
+            if any(fnmatch.fnmatchcase(label, p) or fnmatch.fnmatchcase(obj[2], p) for p in patterns):
+                self.add_root(obj, "--keep")
+
+    # ------------------------------------------------------------------
+    # Reachability
+    # ------------------------------------------------------------------
+
+    def reachable(self) -> Set[ObjectId]:
+        seen: Set[ObjectId] = set(self.roots)
+        self.parent = {root: None for root in self.roots}
+        queue = deque(sorted(self.roots))
+        while queue:
+            obj = queue.popleft()
+            for dep in sorted(self.edges.get(obj, ())):
+                if dep not in seen:
+                    seen.add(dep)
+                    self.parent[dep] = obj
+                    queue.append(dep)
+        return seen
+
+    def explain(self, obj: ObjectId) -> List[str]:
+        """Usage chain from a root to obj (call after reachable())."""
+        if obj not in self.parent:
+            return []
+        chain = []
+        node: Optional[ObjectId] = obj
+        while node is not None:
+            chain.append(object_label(node))
+            root = node
+            node = self.parent.get(node)
+        chain.append(f"({self.roots.get(root, '?')})")
+        return list(reversed(chain))
+
+
+def build_plan(model: SemanticModel, graph: UsageGraph, used: Set[ObjectId]) -> PrunePlan:
+    plan = PrunePlan()
+
+    for table in model.tables.values():
+        if is_auto_date_table(table):
+            plan.skipped.append(f"{table.name} (auto date/time table)")
+            continue
+        calculated = is_calculated_table(table)
+        if ("table", table.name, "") not in used:
+            kind = "calculated" if calculated else "import"
+            plan.tables.append(PruneCandidate(
+                "table", table.name, "", table,
+                f"{kind} table, {len(table.columns)} columns, {len(table.measures)} measures"))
+            continue
+
+        for column in table.columns:
+            if ("column", table.name, column.name) in used:
+                continue
+            if column.is_calculated:
+                plan.columns.append(PruneCandidate("column", table.name, column.name, column, "calculated column"))
+            elif calculated:
+                # Columns of a calculated table are inferred from its expression
+                plan.skipped.append(f"{table.name}[{column.name}] (column of calculated table)")
+            else:
+                plan.columns.append(PruneCandidate("column", table.name, column.name, column,
+                                                   f"imported {column.get('dataType', '?')} column"))
+
+    dead_tables = {c.table for c in plan.tables}
+    unused_measures = {
+        m.name: (t, m) for t, m in model.iter_measures()
+        if ("measure", t.name, m.name) not in used and t.name not in dead_tables
+    }
+
+    # Safe order: a measure is listed only after every unused measure that references it
+    remaining = dict(unused_measures)
+    while remaining:
+        referenced = set()
+        for name, (t, _) in remaining.items():
+            for dep in graph.edges.get(("measure", t.name, name), ()):
+                if dep[0] == "measure" and dep[2] in remaining and dep[2] != name:
+                    referenced.add(dep[2])
+        batch = sorted(n for n in remaining if n not in referenced) or sorted(remaining)
+        for name in batch:
+            t, m = remaining.pop(name)
+            plan.measures.append(PruneCandidate("measure", t.name, name, m, m.get("displayFolder")))
+
+    plan.columns.sort(key=lambda c: (c.detail != "calculated column", c.table, c.name))
+    return plan
+
+
+# ============================================================================
+# APPLY
+# ============================================================================
+
+REMOVED_COLUMNS_STEP = '#"Removed Unused Columns"'
+M_STEP_NAME = r'#"(?:[^"]|"")*"|[A-Za-z_][\w.]*'
+
+
+def m_string(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def remove_columns_from_query(lines: List[str], columns: List[str]) -> bool:
+    """
+    Add the columns to a final Table.RemoveColumns step of a let ... in query (lines edited in place).
+    Returns False when the query does not have the "in" / result step layout Power Query writes.
+    """
+    in_index = next((i for i in range(len(lines) - 1, -1, -1) if lines[i].strip() == "in"), None)
+    if in_index is None:
+        return False
+    result_index = next((i for i in range(in_index + 1, len(lines)) if lines[i].strip()), None)
+    last_index = next((i for i in range(in_index - 1, -1, -1)
+                       if lines[i].strip() and not lines[i].strip().startswith("//")), None)
+    if result_index is None or last_index is None:
+        return False
+    result = lines[result_index].strip()
+    if not re.fullmatch(M_STEP_NAME, result) or "//" in lines[last_index]:
+        return False
+
+    if result == REMOVED_COLUMNS_STEP:
+        m = re.match(r'^(\s*#"Removed Unused Columns" = Table\.RemoveColumns\(.*, \{)(.*)(\}, MissingField\.Ignore\))$',
+                     lines[last_index])
+        if m is None:
+            return False
+        existing = re.findall(r'"((?:[^"]|"")*)"', m.group(2))
+        names = existing + [c for c in columns if c.replace('"', '""') not in existing]
+        lines[last_index] = m.group(1) + ", ".join(f'"{n}"' if n in existing else m_string(n) for n in names) + m.group(3)
+        return True
+
+    indent = re.match(r"\s*", lines[last_index]).group(0)
+    step = (f"{indent}{REMOVED_COLUMNS_STEP} = Table.RemoveColumns({result}, "
+            f"{{{', '.join(m_string(c) for c in columns)}}}, MissingField.Ignore)")
+    lines[last_index] = lines[last_index].rstrip() + ","
+    lines.insert(last_index + 1, step)
+    result_index += 1
+    lines[result_index] = re.match(r"\s*", lines[result_index]).group(0) + REMOVED_COLUMNS_STEP
+    return True
+
+
+def prune_query_columns(file_path: Path, table_name: str, columns: List[str]) -> List[str]:
+    """Drop pruned source columns from the M partitions of an import table. Returns log entries."""
+    log: List[str] = []
+    text = file_path.read_text(encoding="utf-8-sig")
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = text.splitlines()
+    table = next((n for n in parse_tmdl_file(file_path) if n.kind == "table" and n.name == table_name), None)
+    partitions = [p for p in table.partitions if (p.expression or "").strip().lower() == "m"] if table else []
+    if not partitions:
+        return [f"[WARN] {table_name}: no M partition found; {', '.join(columns)} may still be loaded on refresh"]
+    # Bottom-up so earlier partitions keep their line numbers
+    for partition in sorted(partitions, key=lambda p: -p.start_line):
+        block = lines[partition.start_line - 1:partition.end_line]
+        if remove_columns_from_query(block, columns):
+            lines[partition.start_line - 1:partition.end_line] = block
+            log.append(f"removed {', '.join(columns)} from the M query of partition {partition.name}")
+        else:
+            log.append(f"[WARN] partition {partition.name}: M query not rewritten; remove "
+                       f"{', '.join(columns)} in Power Query or refresh keeps loading them")
+    file_path.write_text(newline.join(lines) + newline, encoding="utf-8")
+    return log
+
+def apply_plan(model: SemanticModel, plan: PrunePlan, kinds: Set[str]) -> List[str]:
+    """Rewrite TMDL for the selected plan sections. Returns a change log."""
+    log: List[str] = []
+    spans: Dict[Path, List[Tuple[int, int]]] = {}
+    dead_tables = {c.table for c in plan.tables} if "tables" in kinds else set()
+    removed: Set[Tuple[str, str]] = set()     # (table, object) for perspective cleanup
+    query_columns: Dict[Tuple[Path, str], List[str]] = {}   # import columns still produced by M
+
+    for candidate in plan.measures + plan.columns:
+        section = "measures" if candidate.kind == "measure" else "columns"
+        if section not in kinds or candidate.table in dead_tables:
+            continue
+        spans.setdefault(candidate.node.file_path, []).append(
+            (candidate.node.start_line, candidate.node.end_line))
+        removed.add((candidate.table, candidate.name))
+        log.append(f"removed {candidate.kind} {candidate.label}")
+        if candidate.kind == "column" and not candidate.node.is_calculated:
+            source = candidate.node.get("sourceColumn") or candidate.name
+            query_columns.setdefault((candidate.node.file_path, candidate.table), []).append(
+                source[1:-1] if source.startswith("[") and source.endswith("]") else source)
+
+    for candidate in plan.tables:
+        if "tables" not in kinds:
+            continue
+        candidate.node.file_path.unlink()
+        log.append(f"deleted {candidate.node.file_path.name}")
+
+    # model.tmdl: ref table lines and PBI_QueryOrder
+    if dead_tables and model.model is not None:
+        model_file = model.model.file_path
+        for node in model.files.get(model_file, []):
+            if node.kind == "ref table" and node.name in dead_tables:
+                spans.setdefault(model_file, []).append((node.start_line, node.end_line))
+                log.append(f"removed 'ref table {quote_name(node.name)}' from {model_file.name}")
+
+    # Perspectives
+    for file_path, nodes in model.files.items():
+        for node in nodes:
+            if node.kind != "perspective":
+                continue
+            for pt in node.children_of("perspectiveTable"):
+                if pt.name in dead_tables:
+                    spans.setdefault(file_path, []).append((pt.start_line, pt.end_line))
+                    log.append(f"removed perspectiveTable {pt.name} from {file_path.name}")
+                    continue
+                for child in pt.children:
+                    if child.kind in ("perspectiveMeasure", "perspectiveColumn") and (pt.name, child.name) in removed:
+                        spans.setdefault(file_path, []).append((child.start_line, child.end_line))
+
+    for file_path, file_spans in spans.items():
+        if file_path.exists():
+            remove_line_spans(file_path, file_spans)
+
+    for (file_path, table_name), columns in query_columns.items():
+        log.extend(prune_query_columns(file_path, table_name, columns))
+
+    if dead_tables and model.model is not None:
+        model_file = model.model.file_path
+        text = model_file.read_text(encoding="utf-8-sig")
+        m = re.search(r"^(annotation PBI_QueryOrder = )(\[.*\])$", text, flags=re.MULTILINE)
+        if m:
+            order = [name for name in json.loads(m.group(2)) if name not in dead_tables]
+            text = text[:m.start(2)] + json.dumps(order, separators=(",", ":")) + text[m.end(2):]
+            model_file.write_text(text, encoding="utf-8")
+
+    return log
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_plan(plan: PrunePlan, kinds: Set[str], total_measures: int, total_columns: int) -> None:
+    print("=" * 80)
+    print("Unused Model Objects - Safe-Delete Plan".center(80))
+    print("=" * 80)
+    print()
+    step = 1
+    if "measures" in kinds:
+        print(f"STEP {step}: MEASURES ({len(plan.measures)} of {total_measures} unused, dependents first)")
+        print("-" * 80)
+        for c in plan.measures:
+            folder = f"  [{c.detail}]" if c.detail else ""
+            print(f"  {c.label}{folder}")
+        print()
+        step += 1
+    if "columns" in kinds:
+        print(f"STEP {step}: COLUMNS ({len(plan.columns)} of {total_columns} unused)")
+        print("-" * 80)
+        for c in plan.columns:
+            print(f"  {c.label:<60} {c.detail}")
+        print()
+        step += 1
+    if "tables" in kinds:
+        print(f"STEP {step}: TABLES ({len(plan.tables)} unused)")
+        print("-" * 80)
+        for c in plan.tables:
+            print(f"  {c.label:<40} {c.detail}")
+        print()
+    if plan.skipped:
+        print(f"SKIPPED ({len(plan.skipped)})")
+        print("-" * 80)
+        for s in plan.skipped:
+            print(f"  [INFO] {s}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find and prune unused measures, columns and tables",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Show the safe-delete plan
+  python prune_unused_model_objects.py
+
+  # Why is a measure kept?
+  python prune_unused_model_objects.py --explain "Metrics[Total Views]"
+
+  # Remove unused tables only
+  python prune_unused_model_objects.py --only tables --fix
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder")
+    parser.add_argument("--report", action="append", default=[],
+                        help="Report folder bound to the model (repeatable)")
+    parser.add_argument("--keep", action="append", default=[], help="fnmatch pattern of objects to protect")
+    parser.add_argument("--only", nargs="+", choices=["measures", "columns", "tables"],
+                        default=["measures", "columns", "tables"], help="Plan sections to include")
+    parser.add_argument("--explain", help='Show why an object is kept, e.g. "Metrics[Total Views]"')
+    parser.add_argument("--fix", action="store_true", help="Rewrite TMDL according to the plan")
+    parser.add_argument("--json", help="Write the plan to this JSON file")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+
+    reports = [Path(r) for r in args.report]
+    if not reports:
+        sibling = find_report_dir(model_path.resolve())
+        if sibling is None:
+            print("ERROR: No .Report folder found; pass --report")
+            sys.exit(1)
+        reports = [sibling]
+
+    model = load_semantic_model(model_path)
+    graph = UsageGraph(model)
+    graph.add_model_roots()
+    for report_path in reports:
+        graph.add_report_roots(report_path)
+    graph.add_keep_roots(args.keep)
+    used = graph.reachable()
+
+    if args.explain:
+        table, _, name = args.explain.partition("[")
+        name = name.rstrip("]")
+        obj: ObjectId = ("table", table, "") if not name else (
+            graph.measures.get(name) if name in graph.measures else ("column", table, name))
+        chain = graph.explain(obj)
+        if chain:
+            print(" <- ".join(reversed(chain)))
+        else:
+            print(f"{args.explain}: not reachable from any report or model usage")
+        return
+
+    plan = build_plan(model, graph, used)
+    kinds = set(args.only)
+    print(f"Reports: {', '.join(str(r) for r in reports)}")
+    print(f"Usage roots: {len(graph.roots)}  Reachable objects: {len(used)}")
+    print()
+    print_plan(plan, kinds, len(graph.measures), sum(len(v) for v in graph.columns_by_name.values()))
+
+    if args.json:
+        out = {
+            "measures": [c.to_dict() for c in plan.measures] if "measures" in kinds else [],
+            "columns": [c.to_dict() for c in plan.columns] if "columns" in kinds else [],
+            "tables": [c.to_dict() for c in plan.tables] if "tables" in kinds else [],
+            "skipped": plan.skipped,
+        }
+        Path(args.json).write_text(json.dumps(out, indent=2), encoding="utf-8")
+        print(f"🧾 JSON plan: {args.json}")
+
+    if args.fix:
+        log = apply_plan(model, plan, kinds)
+        print("APPLIED")
+        print("-" * 80)
+        for entry in log:
+            print(f"  {entry}")
+        print()
+        changes = [entry for entry in log if not entry.startswith("[WARN]")]
+        print(f"[SUCCESS] {len(changes)} change(s) written. Culture linguistic metadata may still list removed "
+              f"objects; it is ignored by the engine.")
+    else:
+        print("[INFO] Dry run. Re-run with --fix to rewrite the TMDL.")
+
+
+if __name__ == "__main__":
+    main()
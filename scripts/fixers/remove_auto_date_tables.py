@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Auto Date/Time Table Detector and Remover
+
+With "Auto date/time" enabled, Power BI Desktop adds a hidden
+LocalDateTable_<guid> calculated table for every date column, plus a
+DateTableTemplate_<guid> they are cloned from. Each one costs refresh time
+and memory. They are wired in through:
+
+- `variation` blocks on the date columns (defaultHierarchy -> LocalDateTable)
+- relationships from the date column to LocalDateTable[Date]
+- `ref table` lines in model.tmdl and perspective entries
+
+This pass finds all of them and, with --fix, removes them and rewrites
+model.tmdl. It also sets __PBI_TimeIntelligenceEnabled = 0 so Desktop does
+not regenerate the tables. Removal is refused while DAX still uses the
+tables or the Column.[Variation] syntax (unless --force).
+
+The same detection backs the "Performance" check in master_pbip_validator.py.
+
+Usage:
+    python remove_auto_date_tables.py [semantic_model_path] [--fix] [--force]
+
+Options:
+    --fix: Remove the tables, variations, relationships and references
+    --force: Remove even if DAX still references the auto date tables
+"""
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+
+from tmdl_model import (  # noqa: E402
+    SemanticModel, TmdlNode, load_semantic_model, remove_line_spans, split_column_ref,
+)
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+GUID = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+AUTO_DATE_NAME_RE = re.compile(rf"^(LocalDateTable|DateTableTemplate)_{GUID}$")
+AUTO_DATE_ANNOTATIONS = {"__PBI_LocalDateTable", "__PBI_TemplateDateTable"}
+
+# Column.[Variation] syntax, e.g. Fact_Press_Analytics[Date].[Year]
+VARIATION_SYNTAX_RE = re.compile(r"\]\s*\.\s*\[")
+
+
+@dataclass
+class AutoDateFindings:
+    """Everything auto date/time left in a model."""
+    tables: List[TmdlNode] = field(default_factory=list)
+    variations: List[Tuple[str, str, TmdlNode]] = field(default_factory=list)   # (table, column, node)
+    relationships: List[TmdlNode] = field(default_factory=list)
+    ref_lines: List[TmdlNode] = field(default_factory=list)
+    perspective_entries: List[TmdlNode] = field(default_factory=list)
+    dax_references: List[str] = field(default_factory=list)
+    culture_references: Dict[str, int] = field(default_factory=dict)
+    time_intelligence_enabled: bool = False
+
+    @property
+    def table_names(self) -> List[str]:
+        return [t.name for t in self.tables]
+
+    @property
+    def found(self) -> bool:
+        return bool(self.tables or self.variations or self.relationships or self.ref_lines)
+
+    def table_size_bytes(self) -> int:
+        return sum(t.file_path.stat().st_size for t in self.tables if t.file_path.exists())
+
+
+def is_auto_date_table(table: TmdlNode) -> bool:
+    return bool(AUTO_DATE_ANNOTATIONS & set(table.annotations)) or bool(AUTO_DATE_NAME_RE.match(table.name))
+
+
+def find_auto_date_artifacts(model: SemanticModel) -> AutoDateFindings:
+    """Collect auto date tables and every object that points at them."""
+    findings = AutoDateFindings()
+    findings.tables = [t for t in model.tables.values() if is_auto_date_table(t)]
+    names = set(findings.table_names)
+    if model.model is not None:
+        findings.time_intelligence_enabled = (
+            model.model.annotations.get("__PBI_TimeIntelligenceEnabled", "0").strip() == "1")
+
+    auto_relationships = set()
+    for rel in model.relationships:
+        from_table, _ = split_column_ref(rel.get("fromColumn"))
+        to_table, _ = split_column_ref(rel.get("toColumn"))
+        if from_table in names or to_table in names:
+            findings.relationships.append(rel)
+            auto_relationships.add(rel.name)
+
+    for table in model.tables.values():
+        if table.name in names:
+            continue
+        for column in table.columns:
+            for variation in column.children_of("variation"):
+                hierarchy = variation.get("defaultHierarchy")
+                if variation.get("relationship") in auto_relationships or any(n in hierarchy for n in names):
+                    findings.variations.append((table.name, column.name, variation))
+
+        expressions = [(m.name, m.expression or "") for m in table.measures]
+        expressions += [(c.name, c.expression or "") for c in table.columns if c.is_calculated]
+        expressions += [(p.name, p.expression_properties.get("source", ""))
+                        for p in table.partitions if p.is_calculated]
+        for obj_name, text in expressions:
+            if any(n in text for n in names) or VARIATION_SYNTAX_RE.search(text):
+                findings.dax_references.append(f"{table.name}[{obj_name}]")
+
+    for file_path, nodes in model.files.items():
+        for node in nodes:
+            if node.kind == "ref table" and node.name in names:
+                findings.ref_lines.append(node)
+            elif node.kind == "perspective":
+                findings.perspective_entries.extend(
+                    pt for pt in node.children_of("perspectiveTable") if pt.name in names)
+
+    cultures_dir = model.root / "cultures"
+    if cultures_dir.is_dir():
+        for culture_file in sorted(cultures_dir.glob("*.tmdl")):
+            text = culture_file.read_text(encoding="utf-8-sig")
+            count = sum(text.count(n) for n in names)
+            if count:
+                findings.culture_references[culture_file.name] = count
+    return findings
+
+
+def remove_auto_date_artifacts(model: SemanticModel, findings: AutoDateFindings) -> List[str]:
+    """Delete auto date tables and rewrite the TMDL that references them. Returns changed files."""
+    spans: Dict[Path, List[Tuple[int, int]]] = {}
+    for node in findings.relationships + findings.ref_lines + findings.perspective_entries:
+        spans.setdefault(node.file_path, []).append((node.start_line, node.end_line))
+    for _, _, node in findings.variations:
+        spans.setdefault(node.file_path, []).append((node.start_line, node.end_line))
+
+    changed: List[str] = []
+    for file_path, file_spans in spans.items():
+        remove_line_spans(file_path, file_spans)
+        changed.append(str(file_path))
+
+    for table in findings.tables:
+        if table.file_path.exists():
+            table.file_path.unlink()
+            changed.append(str(table.file_path))
+
+    if findings.time_intelligence_enabled and model.model is not None:
+        model_file = model.model.file_path
+        text = model_file.read_text(encoding="utf-8-sig")
+        text = re.sub(r"^(annotation __PBI_TimeIntelligenceEnabled = )1\s*$", r"\g<1>0", text, flags=re.MULTILINE)
+        model_file.write_text(text, encoding="utf-8")
+        if str(model_file) not in changed:
+            changed.append(str(model_file))
+    return changed
+
+
+def print_findings(findings: AutoDateFindings) -> None:
+    print("=" * 80)
+    print("Auto Date/Time Tables".center(80))
+    print("=" * 80)
+    print()
+    if not findings.found:
+        print("[SUCCESS] No auto date/time tables found.")
+        return
+
+    print(f"TABLES ({len(findings.tables)}, {findings.table_size_bytes() / 1024:.1f} KB of TMDL)")
+    print("-" * 80)
+    for table in findings.tables:
+        print(f"  {table.name}  ({len(table.columns)} columns)")
+    print()
+    if findings.variations:
+        print(f"VARIATIONS ({len(findings.variations)})")
+        print("-" * 80)
+        for table, column, node in findings.variations:
+            print(f"  {table}[{column}] variation {node.name} -> {node.get('defaultHierarchy')}")
+        print()
+    if findings.relationships:
+        print(f"RELATIONSHIPS ({len(findings.relationships)})")
+        print("-" * 80)
+        for rel in findings.relationships:
+            print(f"  {rel.get('fromColumn')} -> {rel.get('toColumn')}")
+        print()
+    print(f"model.tmdl ref table lines: {len(findings.ref_lines)}")
+    print(f"Perspective entries: {len(findings.perspective_entries)}")
+    print(f"__PBI_TimeIntelligenceEnabled: {'1 (Desktop will regenerate the tables)' if findings.time_intelligence_enabled else '0'}")
+    for name, count in findings.culture_references.items():
+        print(f"[INFO] cultures/{name}: {count} linguistic metadata references (trim with trim_linguistic_metadata.py)")
+    print()
+    if findings.dax_references:
+        print("[ERROR] DAX still references auto date tables or Column.[Variation] syntax:")
+        for ref in findings.dax_references:
+            print(f"  {ref}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Detect and remove auto date/time tables",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Report only
+  python remove_auto_date_tables.py
+
+  # Remove them
+  python remove_auto_date_tables.py "C:\\path\\to\\model.SemanticModel" --fix
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder")
+    parser.add_argument("--fix", action="store_true", help="Remove auto date tables and their references")
+    parser.add_argument("--force", action="store_true", help="Remove even if DAX still references them")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+
+    model = load_semantic_model(model_path)
+    findings = find_auto_date_artifacts(model)
+    print_findings(findings)
+
+    if not findings.found or not args.fix:
+        return
+    if findings.dax_references and not args.force:
+        print("[ERROR] Not removing: rewrite the DAX above to use Dim_Date, or pass --force.")
+        sys.exit(1)
+
+    changed = remove_auto_date_artifacts(model, findings)
+    print("Fixed files:")
+    for path in changed:
+        print(f"  - {path}")
+    print()
+    print(f"[SUCCESS] Removed {len(findings.tables)} auto date/time table(s).")
+
+
+if __name__ == "__main__":
+    main()
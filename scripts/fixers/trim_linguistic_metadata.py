@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Linguistic Metadata Analyzer and Trimmer
+
+cultures/<culture>.tmdl holds the Q&A linguistic schema as one JSON blob
+(linguisticMetadata). Desktop regenerates it as the model changes but never
+cleans it up, so it keeps entries for tables and columns that were deleted
+(e.g. after remove_auto_date_tables.py) or hidden (LocalDateTable, staging
+tables). In this model it is larger than the rest of the TMDL combined and
+is read by every tool that scans *.tmdl.
+
+The schema has two sections:
+- Entities: one entry per table / column / measure / hierarchy, bound with
+  ConceptualEntity (+ ConceptualProperty or Hierarchy/HierarchyLevel),
+  each with its Terms (synonyms)
+- Relationships: phrasings between entities, referencing them by key in
+  Roles[*].Target.Entity
+
+This pass resolves every binding against the TMDL model and reports, per
+entry and per table, what is dead weight:
+
+- missing_table / missing_property: the object no longer exists
+- hidden_table / hidden_property: Q&A never surfaces hidden objects
+- dangling_role: a relationship whose role targets a removed or unknown entity
+
+With --fix the entries are removed (relationships referencing removed
+entities go with them) and the JSON is rewritten in place with the same
+formatting. --drop-suggested also strips Thesaurus-suggested synonym terms
+(State: Suggested), which Q&A only uses as low-weight fallbacks.
+
+Usage:
+    python trim_linguistic_metadata.py [semantic_model_path] [--fix] [--keep-hidden] [--drop-suggested]
+
+Options:
+    --fix: Rewrite the culture files without the reported entries
+    --keep-hidden: Only prune entries for objects that no longer exist
+    --drop-suggested: Also remove Thesaurus-suggested terms
+    --verbose: List every entry, not only the per-table summary
+    --json: Write the findings to a JSON file
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+
+from tmdl_model import SemanticModel, TmdlNode, load_semantic_model, parse_tmdl_file  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+
+HIDDEN_REASONS = {"hidden_table", "hidden_property"}
+
+
+@dataclass
+class LinguisticEntry:
+    """One Entities or Relationships entry that can be pruned."""
+    section: str            # Entities | Relationships
+    key: str
+    table: str
+    target: str             # property / hierarchy, "" for the table itself
+    reason: str
+    size_bytes: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "section": self.section, "key": self.key, "table": self.table,
+            "target": self.target, "reason": self.reason, "size_bytes": self.size_bytes,
+        }
+
+
+@dataclass
+class CultureFile:
+    """A culture TMDL file and its parsed linguistic schema."""
+    path: Path
+    culture: str
+    schema: Dict[str, Any]
+    size_bytes: int
+    findings: List[LinguisticEntry] = field(default_factory=list)
+    suggested_terms: int = 0
+    suggested_bytes: int = 0
+
+
+def entry_size(key: str, value: Any) -> int:
+    """Serialized size of one entry at its nesting level (2-space JSON plus the TMDL tab indent)."""
+    lines = json.dumps({key: value}, indent=2, ensure_ascii=False).splitlines()[1:-1]
+    return sum(len(line) + 4 for line in lines)
+
+
+def load_culture_files(model_path: Path) -> List[CultureFile]:
+    cultures_dir = model_path / "cultures"
+    out: List[CultureFile] = []
+    if not cultures_dir.is_dir():
+        return out
+    for fp in sorted(cultures_dir.glob("*.tmdl")):
+        for node in parse_tmdl_file(fp):
+            if node.kind != "cultureInfo":
+                continue
+            text = node.expression_properties.get("linguisticMetadata")
+            if not text:
+                continue
+            try:
+                schema = json.loads(text)
+            except json.JSONDecodeError as exc:
+                print(f"[WARN] {fp.name}: linguisticMetadata is not valid JSON ({exc})")
+                continue
+            out.append(CultureFile(fp, node.name, schema, fp.stat().st_size))
+    return out
+
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+def model_objects(table: TmdlNode) -> Tuple[Dict[str, TmdlNode], Dict[str, TmdlNode]]:
+    """(columns + measures, hierarchies) of a table by name."""
+    properties = {c.name: c for c in table.columns}
+    properties.update({m.name: m for m in table.measures})
+    hierarchies = {h.name: h for h in table.children_of("hierarchy")}
+    return properties, hierarchies
+
+
+def classify_binding(model: SemanticModel, binding: Dict[str, Any]) -> Tuple[str, str, Optional[str]]:
+    """(table, target, reason or None) for an Entities binding."""
+    table_name = binding.get("ConceptualEntity", "")
+    table = model.tables.get(table_name)
+    target = binding.get("ConceptualProperty") or binding.get("Hierarchy") or ""
+    if table is None:
+        return table_name, target, "missing_table"
+    if table.is_hidden:
+        return table_name, target, "hidden_table"
+    properties, hierarchies = model_objects(table)
+    if "ConceptualProperty" in binding:
+        obj = properties.get(binding["ConceptualProperty"])
+    elif "Hierarchy" in binding:
+        obj = hierarchies.get(binding["Hierarchy"])
+        level = binding.get("HierarchyLevel")
+        if obj is not None and level:
+            target = f"{target}.{level}"
+            if level not in {lv.name for lv in obj.children_of("level")}:
+                obj = None
+    else:
+        return table_name, target, None
+    if obj is None:
+        return table_name, target, "missing_property"
+    if obj.is_hidden:
+        return table_name, target, "hidden_property"
+    return table_name, target, None
+
+
+def analyze_culture(model: SemanticModel, culture: CultureFile, keep_hidden: bool = False) -> None:
+    """Fill culture.findings (entities first, then relationships that depend on them)."""
+    entities: Dict[str, Any] = culture.schema.get("Entities", {})
+    relationships: Dict[str, Any] = culture.schema.get("Relationships", {})
+    removed: Set[str] = set()
+    culture.findings = []
+
+    for key, value in entities.items():
+        binding = value.get("Definition", {}).get("Binding", {})
+        table, target, reason = classify_binding(model, binding)
+        if reason is None or (keep_hidden and reason in HIDDEN_REASONS):
+            continue
+        removed.add(key)
+        culture.findings.append(LinguisticEntry("Entities", key, table, target, reason, entry_size(key, value)))
+
+    for key, value in relationships.items():
+        table = value.get("Binding", {}).get("ConceptualEntity", "")
+        targets = [role.get("Target", {}).get("Entity", "") for role in value.get("Roles", {}).values()]
+        bad = [t for t in targets if t in removed or t not in entities]
+        if bad:
+            culture.findings.append(LinguisticEntry("Relationships", key, table, ", ".join(bad), "dangling_role",
+                                                    entry_size(key, value)))
+
+    culture.suggested_terms = 0
+    culture.suggested_bytes = 0
+    for key, value in entities.items():
+        if key in removed:
+            continue
+        for term in value.get("Terms", []):
+            for name, detail in term.items():
+                if detail.get("State") == "Suggested":
+                    culture.suggested_terms += 1
+                    culture.suggested_bytes += entry_size(name, detail) + 16
+
+
+def trimmed_schema(culture: CultureFile, drop_suggested: bool) -> Dict[str, Any]:
+    removed = {(f.section, f.key) for f in culture.findings}
+    schema = dict(culture.schema)
+    for section in ("Entities", "Relationships"):
+        if section in schema:
+            schema[section] = {k: v for k, v in schema[section].items() if (section, k) not in removed}
+    if drop_suggested:
+        entities = {}
+        for key, value in schema.get("Entities", {}).items():
+            terms = [t for t in value.get("Terms", [])
+                     if not any(d.get("State") == "Suggested" for d in t.values())]
+            entities[key] = dict(value, Terms=terms) if "Terms" in value else value
+        schema["Entities"] = entities
+    return schema
+
+
+# ============================================================================
+# REWRITE
+# ============================================================================
+
+def write_linguistic_metadata(path: Path, schema: Dict[str, Any]) -> int:
+    """Replace the linguisticMetadata JSON block, keeping indentation and newlines. Returns the new size."""
+    text = path.read_text(encoding="utf-8-sig")
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = text.splitlines()
+    start = next(i for i, line in enumerate(lines) if line.strip().startswith("linguisticMetadata ="))
+    first = start + 1
+    while first < len(lines) and not lines[first].strip():
+        first += 1
+    prefix = lines[first][:len(lines[first]) - len(lines[first].lstrip())]
+    end = first
+    while end < len(lines):
+        line = lines[end]
+        if line.strip() and not line.startswith(prefix):
+            break
+        end += 1
+    while end > first and not lines[end - 1].strip():
+        end -= 1
+    body = [prefix + line for line in json.dumps(schema, indent=2, ensure_ascii=False).splitlines()]
+    new_text = newline.join(lines[:first] + body + lines[end:]) + newline
+    path.write_text(new_text, encoding="utf-8")
+    return len(new_text.encode("utf-8"))
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_report(model: SemanticModel, cultures: List[CultureFile], verbose: bool) -> None:
+    print("=" * 80)
+    print("Linguistic Metadata".center(80))
+    print("=" * 80)
+    print()
+    tmdl_bytes = sum(fp.stat().st_size for fp in model.files)
+    for culture in cultures:
+        entities = culture.schema.get("Entities", {})
+        relationships = culture.schema.get("Relationships", {})
+        prunable = sum(f.size_bytes for f in culture.findings)
+        print(f"{culture.path.name}: {culture.size_bytes / 1024:,.1f} KB "
+              f"(rest of the model: {tmdl_bytes / 1024:,.1f} KB)")
+        print(f"  Entities: {len(entities)}   Relationships: {len(relationships)}   "
+              f"Suggested terms: {culture.suggested_terms} ({culture.suggested_bytes / 1024:,.1f} KB)")
+        print()
+        if not culture.findings:
+            print("  [SUCCESS] No entries for deleted or hidden objects.")
+            print()
+            continue
+
+        by_table: Dict[str, Dict[str, List[LinguisticEntry]]] = defaultdict(lambda: defaultdict(list))
+        for f in culture.findings:
+            by_table[f.table][f.reason].append(f)
+        print("  PRUNABLE ENTRIES BY TABLE")
+        print("  " + "-" * 78)
+        print(f"  {'Table':<44} {'Reason':<18} {'Entries':>7} {'KB':>8}")
+        for table, reasons in sorted(by_table.items(), key=lambda kv: -sum(
+                f.size_bytes for fs in kv[1].values() for f in fs)):
+            for reason, entries in sorted(reasons.items()):
+                size = sum(f.size_bytes for f in entries)
+                print(f"  {table[:44]:<44} {reason:<18} {len(entries):>7} {size / 1024:>8.1f}")
+        print()
+        if verbose:
+            for f in culture.findings:
+                target = f"[{f.target}]" if f.target else ""
+                print(f"  [{f.reason}] {f.section}.{f.key}  {f.table}{target}  {f.size_bytes:,} B")
+            print()
+        share = prunable / culture.size_bytes * 100 if culture.size_bytes else 0.0
+        print(f"  [WARN] {len(culture.findings)} prunable entries, {prunable / 1024:,.1f} KB ({share:.1f}% of the file)")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report and prune linguistic metadata for deleted or hidden model objects",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Report only
+  python trim_linguistic_metadata.py
+
+  # Prune entries for deleted and hidden objects
+  python trim_linguistic_metadata.py --fix
+
+  # Prune deleted objects only, and drop Thesaurus synonyms
+  python trim_linguistic_metadata.py --fix --keep-hidden --drop-suggested
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder")
+    parser.add_argument("--fix", action="store_true", help="Rewrite the culture files without the entries")
+    parser.add_argument("--keep-hidden", action="store_true", help="Only prune entries for deleted objects")
+    parser.add_argument("--drop-suggested", action="store_true", help="Also remove Thesaurus-suggested terms")
+    parser.add_argument("--verbose", action="store_true", help="List every prunable entry")
+    parser.add_argument("--json", help="Write findings to this JSON file")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+
+    model = load_semantic_model(model_path)
+    cultures = load_culture_files(model.root)
+    if not cultures:
+        print("[INFO] No culture files with linguistic metadata found.")
+        return
+    for culture in cultures:
+        analyze_culture(model, culture, args.keep_hidden)
+    print_report(model, cultures, args.verbose)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            culture.path.name: {
+                "size_bytes": culture.size_bytes,
+                "suggested_terms": culture.suggested_terms,
+                "suggested_bytes": culture.suggested_bytes,
+                "findings": [f.to_dict() for f in culture.findings],
+            } for culture in cultures
+        }, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    if not args.fix:
+        return
+    changed = []
+    for culture in cultures:
+        if not culture.findings and not (args.drop_suggested and culture.suggested_terms):
+            continue
+        new_size = write_linguistic_metadata(culture.path, trimmed_schema(culture, args.drop_suggested))
+        changed.append((culture, new_size))
+    if not changed:
+        print("[SUCCESS] Nothing to prune.")
+        return
+    print("Fixed files:")
+    for culture, new_size in changed:
+        print(f"  - {culture.path}: {culture.size_bytes / 1024:,.1f} KB -> {new_size / 1024:,.1f} KB")
+    print()
+    print(f"[SUCCESS] Trimmed {len(changed)} culture file(s).")
+
+
+if __name__ == "__main__":
+    main()
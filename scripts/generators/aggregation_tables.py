@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Aggregation Table Generator
+
+Most Core KPI and Time Intelligence measures in Metrics.tmdl come down to
+SUM(Fact_Press_Analytics[Views]) or SUM(Fact_Press_Analytics[Active_Users])
+sliced by date and channel, and every query scans the fact table at its
+detail grain (date x page x channel). This tool reads the measure
+definitions (with their full dependency closure) and the visuals' field
+usage, evaluates candidate aggregation tables and reports which measures
+and visuals each one would answer:
+
+    Agg_Press_Daily_Channel    Date x Channel_Group     (relationship to Dim_Date)
+    Agg_Press_Monthly_Channel  Year_Month x Channel_Group (GroupBy on Dim_Date[Year_Month])
+
+A measure hits an aggregation when everything it reads from the fact table
+is a SUM of a mapped column (Views, Active_Users), COUNTROWS of the fact
+table, or a filter on a grain column, and its date filters are no finer
+than the grain (time intelligence needs day grain). Measures that iterate
+the fact table, aggregate other columns (DISTINCTCOUNT(Page_URL), MAX(Date))
+or filter page attributes (Page_Type, Dim_Press_Releases) miss. SUMs of
+calculated alias columns (Users = [Active_Users], Sessions = [Views]) are
+reported as near misses with the rewrite that makes them hit.
+
+A visual hits when its measures hit and its grouping columns and the page's
+slicers are answerable at the aggregation grain.
+
+The emitted TMDL has a hidden import table whose M partition is the fact
+query (without incremental refresh range filters) followed by
+Table.Group, plus alternateOf mappings (groupBy / sum / count). The daily
+table also gets its Dim_Date relationship. Power BI only redirects queries
+to user-defined aggregations while the detail table is DirectQuery; the
+tool warns while Fact_Press_Analytics is still import.
+
+Usage:
+    python aggregation_tables.py [semantic_model_path] [--report path.Report] [--write]
+
+Options:
+    --report: .Report folder(s) to read visual usage from (repeatable; default: sibling report)
+    --agg: Only consider these aggregations (repeatable)
+    --show-tmdl: Print the generated TMDL
+    --write: Add the aggregation tables that have hits to the model
+    --json: Write the hit report as JSON
+"""
+
+import argparse
+import json
+import re
+import sys
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from dax_lexer import DaxSyntaxError, build_call_tree, iter_calls, tokenize  # noqa: E402
+from incremental_refresh_policy import m_ident, parse_let, remove_range_filters  # noqa: E402
+from measure_dependency_graph import MeasureDependencyGraph  # noqa: E402
+from pbir_report import ReportModel, find_report_dir, load_report  # noqa: E402
+from tmdl_model import SemanticModel, load_semantic_model, quote_name, split_column_ref  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+FACT_TABLE = "Fact_Press_Analytics"
+DATE_TABLE = "Dim_Date"
+
+# Fact columns an aggregation can SUM (fact column -> aggregation column)
+SUM_COLUMNS = {"Views": "Views", "Active_Users": "Active_Users"}
+ROW_COUNT_COLUMN = "Row_Count"
+
+# Dim_Date columns that are constant within a month
+MONTH_COLUMNS = {"Year", "Quarter", "Month", "Month_Name", "Year_Month", "Is_YTD"}
+
+TIME_INTELLIGENCE = {
+    "DATESYTD", "DATESMTD", "DATESQTD", "DATESINPERIOD", "DATESBETWEEN", "DATEADD",
+    "SAMEPERIODLASTYEAR", "PARALLELPERIOD", "PREVIOUSDAY", "PREVIOUSMONTH", "PREVIOUSYEAR",
+    "NEXTDAY", "NEXTMONTH", "TOTALYTD", "TOTALMTD", "TOTALQTD", "FIRSTDATE", "LASTDATE",
+}
+COLUMN_AGGREGATES = {
+    "SUM", "MIN", "MAX", "AVERAGE", "COUNT", "COUNTA", "COUNTBLANK", "DISTINCTCOUNT",
+    "DISTINCTCOUNTNOBLANK", "MEDIAN", "APPROXIMATEDISTINCTCOUNT",
+}
+GRAIN_RANK = {"month": 1, "day": 0}
+
+
+@dataclass
+class GroupColumn:
+    name: str                   # column in the aggregation table
+    data_type: str
+    base: Tuple[str, str]       # (table, column) it stands in for
+    m_expression: str = ""      # M to derive it from the fact row ("" = same-named fact column)
+    relationship: bool = False  # True: joined to the dimension instead of a groupBy mapping
+
+
+@dataclass
+class AggSpec:
+    name: str
+    grain: str                  # "day" or "month"
+    description: str
+    group_by: List[GroupColumn]
+
+    @property
+    def fact_columns(self) -> Set[str]:
+        """Fact columns that can be used as filters/group-bys at this grain."""
+        return {g.base[1] for g in self.group_by if g.base[0] == FACT_TABLE} | \
+               ({"Date"} if self.grain == "day" else set())
+
+
+AGGREGATIONS = [
+    AggSpec(
+        name="Agg_Press_Daily_Channel",
+        grain="day",
+        description="Views and users per day and channel group",
+        group_by=[
+            GroupColumn("Date", "dateTime", (DATE_TABLE, "Date"), relationship=True),
+            GroupColumn("Channel_Group", "string", (FACT_TABLE, "Channel_Group")),
+        ],
+    ),
+    AggSpec(
+        name="Agg_Press_Monthly_Channel",
+        grain="month",
+        description="Views and users per month and channel group",
+        group_by=[
+            GroupColumn("Year_Month", "string", (DATE_TABLE, "Year_Month"),
+                        m_expression='Text.From(Date.Year([Date])) & "-" & '
+                                     'Text.PadStart(Text.From(Date.Month([Date])), 2, "0")'),
+            GroupColumn("Channel_Group", "string", (FACT_TABLE, "Channel_Group")),
+        ],
+    ),
+]
+
+
+# ============================================================================
+# REQUIREMENTS
+# ============================================================================
+
+@dataclass
+class Requirements:
+    """What a measure (or visual) needs from the fact table."""
+    sums: Set[str] = field(default_factory=set)             # SUM(Fact[col])
+    count_rows: bool = False                                # COUNTROWS(Fact)
+    filter_columns: Set[str] = field(default_factory=set)   # Fact columns used as filters/group-bys
+    date_grain: Optional[str] = None                        # None, "month" or "day"
+    blockers: Set[str] = field(default_factory=set)         # reasons no aggregation can answer it
+    touches_fact: bool = False
+
+    def merge(self, other: "Requirements") -> None:
+        self.sums |= other.sums
+        self.count_rows |= other.count_rows
+        self.filter_columns |= other.filter_columns
+        self.blockers |= other.blockers
+        self.touches_fact |= other.touches_fact
+        self.need_date(other.date_grain)
+
+    def need_date(self, grain: Optional[str]) -> None:
+        if grain is None:
+            return
+        if self.date_grain is None or GRAIN_RANK[grain] < GRAIN_RANK[self.date_grain]:
+            self.date_grain = grain
+
+
+@dataclass
+class Verdict:
+    hit: bool
+    reasons: List[str] = field(default_factory=list)
+    rewrites: List[str] = field(default_factory=list)       # near miss: rewrites that would make it hit
+
+
+class AggregationPlanner:
+    """Measure/visual requirements and their match against candidate aggregations."""
+
+    def __init__(self, model: SemanticModel):
+        self.model = model
+        self.graph = MeasureDependencyGraph(model)
+        self.aliases = self._alias_columns()
+        self.dimension_keys = self._dimension_keys()
+        self._own: Dict[str, Requirements] = {}
+
+    def _alias_columns(self) -> Dict[str, str]:
+        """Calculated fact columns that are just another fact column (Users = [Active_Users])."""
+        aliases = {}
+        fact = self.model.tables.get(FACT_TABLE)
+        for column in fact.columns if fact else []:
+            if not column.is_calculated:
+                continue
+            m = re.fullmatch(r"\s*(?:'?" + re.escape(FACT_TABLE) + r"'?)?\[([^\]]+)\]\s*", column.expression or "")
+            if m and m.group(1) in SUM_COLUMNS:
+                aliases[column.name] = m.group(1)
+        return aliases
+
+    def _dimension_keys(self) -> Dict[str, str]:
+        """Dimension table -> fact column its filters travel through (Dim_Date handled by grain)."""
+        keys = {}
+        for rel in self.model.relationships:
+            from_table, from_column = split_column_ref(rel.get("fromColumn"))
+            to_table, _ = split_column_ref(rel.get("toColumn"))
+            if from_table == FACT_TABLE and to_table != DATE_TABLE:
+                keys[to_table] = from_column
+        return keys
+
+    # ------------------------------------------------------------------
+    # Column usage
+    # ------------------------------------------------------------------
+
+    def column_requirement(self, req: Requirements, table: str, column: str, how: str = "filter") -> None:
+        """Record the use of table[column] as a filter/group-by (how='filter')."""
+        if table == DATE_TABLE:
+            req.need_date("month" if column in MONTH_COLUMNS else "day")
+        elif table == FACT_TABLE:
+            req.touches_fact = True
+            if column == "Date":
+                req.need_date("day")
+            elif how == "filter":
+                req.filter_columns.add(column)
+        elif table in self.dimension_keys:
+            req.touches_fact = True
+            req.filter_columns.add(self.dimension_keys[table])
+
+    def own_requirements(self, measure: str) -> Requirements:
+        if measure in self._own:
+            return self._own[measure]
+        req = Requirements()
+        self._own[measure] = req
+        table_node, node = self.model.measure_index()[measure]
+        try:
+            tokens = tokenize(node.expression or "")
+        except DaxSyntaxError:
+            req.blockers.add("DAX could not be parsed")
+            return req
+        calls = list(iter_calls(build_call_tree(tokens)))
+
+        def innermost(index: int):
+            owner = None
+            for call in calls:
+                if call.start < index <= call.end and (owner is None or call.start > owner.start):
+                    owner = call
+            return owner
+
+        for call in calls:
+            if call.name.upper() in TIME_INTELLIGENCE:
+                req.need_date("day")
+
+        for i, tok in enumerate(tokens):
+            if tok.kind == "COLUMN" and i > 0 and tokens[i - 1].kind in ("TABLE", "IDENT"):
+                table, column = tokens[i - 1].value, tok.value
+                if table != FACT_TABLE:
+                    self.column_requirement(req, table, column)
+                    continue
+                req.touches_fact = True
+                call = innermost(i)
+                name = call.name.upper() if call else ""
+                sole_arg = call is not None and len(call.args) == 1 and call.args[0] == (i - 1, i + 1)
+                if name == "SUM" and sole_arg:
+                    req.sums.add(column)
+                elif name in COLUMN_AGGREGATES and sole_arg:
+                    req.blockers.add(f"{name}({FACT_TABLE}[{column}]) has no aggregation mapping")
+                else:
+                    self.column_requirement(req, table, column)
+            elif tok.kind in ("TABLE", "IDENT") and tok.value == FACT_TABLE and \
+                    (i + 1 >= len(tokens) or tokens[i + 1].kind != "COLUMN"):
+                req.touches_fact = True
+                call = innermost(i)
+                if call is not None and call.name.upper() == "COUNTROWS" and call.args[:1] == [(i, i + 1)]:
+                    req.count_rows = True
+                else:
+                    owner = call.name.upper() if call else "expression"
+                    req.blockers.add(f"{owner}() over the {FACT_TABLE} table (row-level scan)")
+        return req
+
+    def measure_requirements(self, measure: str) -> Requirements:
+        req = Requirements()
+        closure = self.graph.closure(measure)
+        for name in sorted(closure.measures | {measure}):
+            if name in self.graph.nodes:
+                req.merge(self.own_requirements(name))
+        return req
+
+    def visual_requirements(self, measures: Set[str], columns: Set[Tuple[str, str]]) -> Requirements:
+        req = Requirements()
+        for measure in measures:
+            if measure in self.graph.nodes:
+                req.merge(self.measure_requirements(measure))
+        for table, column in columns:
+            self.column_requirement(req, table, column)
+        return req
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def match(self, req: Requirements, agg: AggSpec) -> Verdict:
+        reasons: List[str] = sorted(req.blockers)
+        rewrites: List[str] = []
+        for column in sorted(req.sums):
+            if column in SUM_COLUMNS:
+                continue
+            if column in self.aliases:
+                rewrites.append(f"SUM({FACT_TABLE}[{column}]) -> SUM({FACT_TABLE}[{self.aliases[column]}])")
+            else:
+                reasons.append(f"SUM({FACT_TABLE}[{column}]) is not aggregated")
+        for column in sorted(req.filter_columns - agg.fact_columns):
+            reasons.append(f"filters {FACT_TABLE}[{column}] (not in the {agg.grain} x channel grain)")
+        if req.date_grain and GRAIN_RANK[req.date_grain] < GRAIN_RANK[agg.grain]:
+            reasons.append(f"needs {req.date_grain}-level dates")
+        return Verdict(hit=not reasons and not rewrites, reasons=reasons, rewrites=rewrites)
+
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+@dataclass
+class AggReport:
+    agg: AggSpec
+    measure_hits: List[str] = field(default_factory=list)
+    near_misses: Dict[str, List[str]] = field(default_factory=dict)
+    misses: Dict[str, List[str]] = field(default_factory=dict)
+    visual_hits: List[Tuple[str, str, str]] = field(default_factory=list)     # (page, visual, type)
+    visual_misses: List[Tuple[str, str, str, List[str]]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            "aggregation": self.agg.name,
+            "grain": self.agg.grain,
+            "measure_hits": self.measure_hits,
+            "near_misses": self.near_misses,
+            "misses": self.misses,
+            "visual_hits": [{"page": p, "visual": v, "type": t} for p, v, t in self.visual_hits],
+            "visual_misses": [{"page": p, "visual": v, "type": t, "reasons": r}
+                              for p, v, t, r in self.visual_misses],
+        }
+
+
+def page_filter_columns(page) -> Set[Tuple[str, str]]:
+    """Columns of the page's slicers: they filter every other visual on the page."""
+    columns: Set[Tuple[str, str]] = set()
+    for visual in page.visuals:
+        if visual.visual_type == "slicer":
+            columns |= visual.columns()
+    return columns
+
+
+def analyze(planner: AggregationPlanner, reports: List[ReportModel], aggs: List[AggSpec]) -> List[AggReport]:
+    results = [AggReport(agg) for agg in aggs]
+    for measure in sorted(planner.graph.nodes):
+        req = planner.measure_requirements(measure)
+        if not req.touches_fact:
+            continue
+        for result in results:
+            verdict = planner.match(req, result.agg)
+            if verdict.hit:
+                result.measure_hits.append(measure)
+            elif verdict.rewrites and not verdict.reasons:
+                result.near_misses[measure] = verdict.rewrites
+            else:
+                result.misses[measure] = verdict.reasons + verdict.rewrites
+
+    for report in reports:
+        for page_id in report.page_order or list(report.pages):
+            page = report.pages[page_id]
+            slicer_columns = page_filter_columns(page)
+            for visual in page.visuals:
+                if not visual.is_data_bound or visual.visual_type == "slicer":
+                    continue
+                measures = {prop for _, prop in visual.measures()}
+                req = planner.visual_requirements(measures, visual.columns() | slicer_columns)
+                if not req.touches_fact:
+                    continue
+                for result in results:
+                    verdict = planner.match(req, result.agg)
+                    entry = (page.display_name, visual.visual_id, visual.visual_type)
+                    if verdict.hit:
+                        result.visual_hits.append(entry)
+                    else:
+                        result.visual_misses.append(entry + (verdict.reasons + verdict.rewrites,))
+    return results
+
+
+# ============================================================================
+# TMDL
+# ============================================================================
+
+def fact_partition_source(model: SemanticModel) -> Optional[str]:
+    fact = model.tables.get(FACT_TABLE)
+    partitions = [p for p in fact.partitions if (p.expression or "").strip() == "m"] if fact else []
+    return partitions[0].expression_properties.get("source") if partitions else None
+
+
+def aggregation_m(fact_source: str, agg: AggSpec) -> str:
+    """Fact query (full history) + grain derivation + Table.Group."""
+    source = remove_range_filters(fact_source)
+    query = parse_let(source)
+    if query is None:
+        raise ValueError(f"{FACT_TABLE} partition is not a let ... in expression")
+    last = query.steps[-1]
+    line_start = source.rfind("\n", 0, last.name_start) + 1
+    indent = source[line_start:last.name_start]
+    current = query.result
+    steps = []
+    for group in agg.group_by:
+        if group.m_expression:
+            name = f"Added {group.name}"
+            steps.append(f'{indent}{m_ident(name)} = Table.AddColumn({current}, "{group.name}", '
+                         f'each {group.m_expression}, type text)')
+            current = m_ident(name)
+    keys = ", ".join(f'"{g.name}"' for g in agg.group_by)
+    sums = [f'{{"{target}", each List.Sum([{column}]), Int64.Type}}' for column, target in SUM_COLUMNS.items()]
+    sums.append(f'{{"{ROW_COUNT_COLUMN}", each Table.RowCount(_), Int64.Type}}')
+    grouped = m_ident(f"Grouped by {agg.grain.title()} and Channel")
+    steps.append(f"{indent}{grouped} = Table.Group({current}, {{{keys}}}, {{{', '.join(sums)}}})")
+    return "\n".join([
+        source[:last.body_end] + ",",
+        f"{indent}// Aggregation for {agg.name}: generated by scripts/generators/aggregation_tables.py",
+        ",\n".join(steps),
+        "in",
+        f"{indent}{grouped}",
+    ])
+
+
+def column_block(name: str, data_type: str, alternate: List[str]) -> List[str]:
+    lines = [
+        f"\tcolumn {quote_name(name)}",
+        f"\t\tdataType: {data_type}",
+        "\t\tisHidden",
+        f"\t\tlineageTag: {uuid.uuid4()}",
+        "\t\tsummarizeBy: none",
+        f"\t\tsourceColumn: {name}",
+    ]
+    if alternate:
+        lines += ["", "\t\talternateOf"] + [f"\t\t\t{line}" for line in alternate]
+    lines += ["", "\t\tannotation SummarizationSetBy = Automatic", ""]
+    return lines
+
+
+def aggregation_tmdl(agg: AggSpec, fact_source: str) -> str:
+    lines = [
+        f"/// Aggregation of {FACT_TABLE}: {agg.description}. Generated by scripts/generators/aggregation_tables.py.",
+        f"table {agg.name}",
+        "\tisHidden",
+        f"\tlineageTag: {uuid.uuid4()}",
+        "",
+    ]
+    for group in agg.group_by:
+        alternate = [] if group.relationship else [
+            f"baseColumn: {quote_name(group.base[0])}.{quote_name(group.base[1])}", "summarization: groupBy"]
+        lines += column_block(group.name, group.data_type, alternate)
+    for column, target in SUM_COLUMNS.items():
+        lines += column_block(target, "int64", [f"baseColumn: {FACT_TABLE}.{quote_name(column)}", "summarization: sum"])
+    lines += column_block(ROW_COUNT_COLUMN, "int64", [f"baseTable: {FACT_TABLE}", "summarization: count"])
+    lines += [
+        f"\tpartition {agg.name} = m",
+        "\t\tmode: import",
+        "\t\tsource = ```",
+    ]
+    lines += [f"\t\t\t\t{l}" if l.strip() else "" for l in aggregation_m(fact_source, agg).splitlines()]
+    lines += ["\t\t\t\t```", "", "\tannotation PBI_ResultType = Table", ""]
+    return "\n".join(lines)
+
+
+def relationship_tmdl(agg: AggSpec) -> List[str]:
+    blocks = []
+    for group in agg.group_by:
+        if group.relationship:
+            from_ref = f"{agg.name}.{quote_name(group.name)}"
+            to_ref = f"{quote_name(group.base[0])}.{quote_name(group.base[1])}"
+            name = f"{agg.name}[{group.name}] -> {group.base[0]}[{group.base[1]}]"
+            blocks.append("\n".join([
+                f"relationship {quote_name(name)}",
+                f"\tfromColumn: {from_ref}",
+                f"\ttoColumn: {to_ref}",
+            ]))
+    return blocks
+
+
+def write_aggregation(model: SemanticModel, agg: AggSpec, fact_source: str) -> List[Path]:
+    changed = []
+    table_path = model.root / "tables" / f"{agg.name}.tmdl"
+    table_path.write_text(aggregation_tmdl(agg, fact_source), encoding="utf-8")
+    changed.append(table_path)
+
+    relationships = relationship_tmdl(agg)
+    if relationships:
+        rel_path = model.root / "relationships.tmdl"
+        text = rel_path.read_text(encoding="utf-8-sig").rstrip("\n") if rel_path.exists() else ""
+        rel_path.write_text(text + "\n\n" + "\n\n".join(relationships) + "\n", encoding="utf-8")
+        changed.append(rel_path)
+
+    if model.model is not None:
+        model_path = model.model.file_path
+        lines = model_path.read_text(encoding="utf-8-sig").splitlines()
+        ref_indices = [i for i, l in enumerate(lines) if l.startswith("ref table ")]
+        at = ref_indices[-1] + 1 if ref_indices else len(lines)
+        lines.insert(at, f"ref table {quote_name(agg.name)}")
+        text = "\n".join(lines) + "\n"
+        text = re.sub(r'^(annotation PBI_QueryOrder = \[.*?)\][ \t]*$',
+                      lambda m: f'{m.group(1)},"{agg.name}"]', text, count=1, flags=re.MULTILINE)
+        model_path.write_text(text, encoding="utf-8")
+        changed.append(model_path)
+    return changed
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def print_results(results: List[AggReport], planner: AggregationPlanner, fact_mode_import: bool) -> None:
+    print("=" * 80)
+    print("Aggregation Table Candidates".center(80))
+    print("=" * 80)
+    print()
+    if planner.aliases:
+        alias_text = ", ".join(f"{a} = [{b}]" for a, b in sorted(planner.aliases.items()))
+        print(f"Alias columns on {FACT_TABLE}: {alias_text}")
+        print()
+
+    for result in results:
+        total = len(result.measure_hits) + len(result.near_misses) + len(result.misses)
+        print(f"{result.agg.name}  ({result.agg.description})")
+        print("-" * 80)
+        print(f"  Measures reading {FACT_TABLE}: {total}")
+        print(f"  Hit: {len(result.measure_hits)}   Near miss: {len(result.near_misses)}   "
+              f"Miss: {len(result.misses)}")
+        for measure in result.measure_hits:
+            print(f"    [HIT]  {measure}")
+        for measure, rewrites in result.near_misses.items():
+            print(f"    [NEAR] {measure}: {'; '.join(rewrites)}")
+        reasons = Counter(r for rs in result.misses.values() for r in rs)
+        if reasons:
+            print("  Top miss reasons:")
+            for reason, count in reasons.most_common(6):
+                print(f"    {count:>4}  {reason}")
+        if result.visual_hits or result.visual_misses:
+            print(f"  Visuals: {len(result.visual_hits)} hit, {len(result.visual_misses)} miss")
+            for page, visual, vtype in result.visual_hits:
+                print(f"    [HIT]  {page} / {visual} ({vtype})")
+            for page, visual, vtype, why in result.visual_misses[:15]:
+                print(f"    [MISS] {page} / {visual} ({vtype}): {why[0] if why else ''}")
+        print()
+
+    if fact_mode_import:
+        print(f"[WARN] {FACT_TABLE} is an import table. Power BI only redirects queries to user-defined")
+        print("       aggregations (alternateOf) when the detail table is DirectQuery; the mappings take")
+        print("       effect once the fact table moves to DirectQuery in a composite model.")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Propose and generate aggregation tables for the fact table",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Hit report for the bundled dashboard
+  python aggregation_tables.py
+
+  # Include a generated report's visuals and print the TMDL
+  python aggregation_tables.py --report ./out/press-room-dashboard.Report --show-tmdl
+
+  # Add the daily aggregation to the model
+  python aggregation_tables.py --agg Agg_Press_Daily_Channel --write
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder")
+    parser.add_argument("--report", action="append", default=[],
+                        help=".Report folder(s) for visual usage (default: sibling report)")
+    parser.add_argument("--agg", action="append", default=[], choices=[a.name for a in AGGREGATIONS],
+                        help="Only consider these aggregations")
+    parser.add_argument("--show-tmdl", action="store_true", help="Print the generated TMDL")
+    parser.add_argument("--write", action="store_true", help="Add aggregations with hits to the model")
+    parser.add_argument("--json", help="Write the hit report to this JSON file")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+    model = load_semantic_model(model_path)
+    if FACT_TABLE not in model.tables:
+        print(f"ERROR: {FACT_TABLE} not found in the model")
+        sys.exit(1)
+
+    report_paths = [Path(p) for p in args.report]
+    if not report_paths:
+        default_report = find_report_dir(model_path)
+        report_paths = [default_report] if default_report else []
+    reports = [load_report(p) for p in report_paths]
+
+    aggs = [a for a in AGGREGATIONS if not args.agg or a.name in args.agg]
+    planner = AggregationPlanner(model)
+    results = analyze(planner, reports, aggs)
+    fact = model.tables[FACT_TABLE]
+    fact_mode_import = all(p.get("mode", "import") == "import" for p in fact.partitions)
+    print_results(results, planner, fact_mode_import)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "reports": [str(p) for p in report_paths],
+            "aggregations": [r.to_dict() for r in results],
+        }, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+    fact_source = fact_partition_source(model)
+    if (args.show_tmdl or args.write) and not fact_source:
+        print(f"ERROR: {FACT_TABLE} has no M partition to aggregate from")
+        sys.exit(1)
+    if args.show_tmdl:
+        for result in results:
+            print(aggregation_tmdl(result.agg, fact_source))
+            for block in relationship_tmdl(result.agg):
+                print(block)
+                print()
+
+    if args.write:
+        for result in results:
+            if not result.measure_hits:
+                print(f"[INFO] {result.agg.name}: no measure hits, not written")
+                continue
+            if result.agg.name in model.tables:
+                print(f"[INFO] {result.agg.name}: already in the model")
+                continue
+            for path in write_aggregation(model, result.agg, fact_source):
+                print(f"🧾 Updated: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Incremental Refresh Policy Generator
+
+Fact_Press_Analytics has a single import partition that reloads the whole
+GA4 history on every refresh. This tool rewrites the model for incremental
+refresh:
+
+- expressions.tmdl gets the RangeStart / RangeEnd DateTime parameters
+- the partition's M gets a Table.SelectRows step on [Date] using
+  RangeStart (inclusive) and RangeEnd (exclusive), inserted directly after
+  every Table.TransformColumnTypes step that types Date and feeds the
+  result, with later steps re-pointed at the filter
+- the table gets a refreshPolicy block (rolling window + incremental
+  periods, sourceExpression = the filtered query)
+
+After publishing, the service splits the table into period partitions and a
+daily refresh only reprocesses the incremental window (by default the
+latest day). The CSV sources do not fold, so each refreshed partition still
+reads the file, but only its own rows are loaded and compressed.
+
+--check validates an existing setup without changing anything: the
+parameters exist and are DateTime parameter queries, the filter is on the
+typed Date column after Table.TransformColumnTypes (filtering the text
+column compares text with datetime and fails), the boundaries are
+half-open so rows are neither duplicated nor dropped between partitions,
+the filter is part of the query result, and sourceExpression matches the
+partition.
+
+Usage:
+    python incremental_refresh_policy.py [semantic_model_path] [options]
+
+Options:
+    --table: Table to configure (default: Fact_Press_Analytics)
+    --date-column: Column to filter (default: Date)
+    --rolling-window N --rolling-granularity G: History kept (default: 3 year)
+    --incremental N --incremental-granularity G: Periods refreshed each run (default: 1 day)
+    --only-complete-periods: Skip the current, incomplete period (incrementalPeriodsOffset -1)
+    --range-start / --range-end: Parameter values used by Desktop (default: last 30 days)
+    --dry-run: Print the rewritten query and policy without writing
+    --check: Validate the existing RangeStart/RangeEnd filter and policy only
+"""
+
+import argparse
+import re
+import sys
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+
+from tmdl_model import SemanticModel, TmdlNode, load_semantic_model  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+DEFAULT_TABLE = "Fact_Press_Analytics"
+GRANULARITIES = ["day", "month", "quarter", "year"]
+PARAMETERS = ["RangeStart", "RangeEnd"]
+
+
+# ============================================================================
+# M LET PARSING
+# ============================================================================
+
+@dataclass
+class MToken:
+    kind: str       # ident, string, comment, punct, space
+    text: str
+    start: int
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+@dataclass
+class MStep:
+    name: str
+    name_start: int
+    expr_start: int
+    expr_end: int           # offset of the separating comma (or of "in")
+    body_end: int           # end of the expression's last token
+    expression: str
+    references: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class MQuery:
+    text: str
+    steps: List[MStep]
+    result: str
+    result_start: int
+    result_references: Set[str]
+
+    def step(self, name: str) -> Optional[MStep]:
+        return next((s for s in self.steps if s.name == name), None)
+
+    def lineage(self) -> List[str]:
+        """Steps the result depends on, nearest first."""
+        seen: List[str] = []
+        queue = [r for r in self.result_references if self.step(r)]
+        while queue:
+            name = queue.pop(0)
+            if name in seen:
+                continue
+            seen.append(name)
+            queue.extend(r for r in self.step(name).references if self.step(r) and r not in seen)
+        return seen
+
+    def ancestors(self, name: str) -> Set[str]:
+        out: Set[str] = set()
+        queue = [name]
+        while queue:
+            current = self.step(queue.pop())
+            if current is None or current.name in out:
+                continue
+            out.add(current.name)
+            queue.extend(current.references)
+        return out
+
+
+def tokenize_m(text: str) -> List[MToken]:
+    tokens: List[MToken] = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch.isspace():
+            j = i
+            while j < len(text) and text[j].isspace():
+                j += 1
+            tokens.append(MToken("space", text[i:j], i))
+        elif text.startswith("//", i):
+            j = text.find("\n", i)
+            j = len(text) if j < 0 else j
+            tokens.append(MToken("comment", text[i:j], i))
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            j = len(text) if j < 0 else j + 2
+            tokens.append(MToken("comment", text[i:j], i))
+        elif ch == '"' or text.startswith('#"', i):
+            j = i + (2 if ch == "#" else 1)
+            while j < len(text):
+                if text[j] == '"':
+                    if text.startswith('""', j):
+                        j += 2
+                        continue
+                    j += 1
+                    break
+                j += 1
+            tokens.append(MToken("ident" if ch == "#" else "string", text[i:j], i))
+        elif ch.isalpha() or ch == "_":
+            j = i
+            while j < len(text) and (text[j].isalnum() or text[j] in "_."):
+                j += 1
+            tokens.append(MToken("ident", text[i:j], i))
+        else:
+            tokens.append(MToken("punct", ch, i))
+        i = tokens[-1].end
+    return tokens
+
+
+def ident_name(token_text: str) -> str:
+    if token_text.startswith('#"'):
+        return token_text[2:-1].replace('""', '"')
+    return token_text
+
+
+def m_ident(name: str) -> str:
+    if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name):
+        return name
+    return '#"' + name.replace('"', '""') + '"'
+
+
+def parse_let(text: str) -> Optional[MQuery]:
+    """Split a top-level let ... in ... expression into its steps."""
+    tokens = [t for t in tokenize_m(text) if t.kind not in ("space", "comment")]
+    if not tokens or tokens[0].text != "let":
+        return None
+    depth = 0
+    segments: List[List[MToken]] = [[]]
+    in_token: Optional[MToken] = None
+    for token in tokens[1:]:
+        if token.kind == "punct" and token.text in "([{":
+            depth += 1
+        elif token.kind == "punct" and token.text in ")]}":
+            depth -= 1
+        if depth == 0 and token.kind == "ident" and token.text == "in":
+            in_token = token
+            break
+        if depth == 0 and token.kind == "punct" and token.text == ",":
+            segments[-1].append(token)
+            segments.append([])
+            continue
+        segments[-1].append(token)
+    if in_token is None:
+        return None
+
+    steps: List[MStep] = []
+    for segment in segments:
+        if len(segment) < 3 or segment[1].text != "=":
+            return None
+        end = segment[-1].start if segment[-1].text == "," else in_token.start
+        body = [t for t in segment[2:] if t.text != "," or t is not segment[-1]]
+        expr_start = body[0].start if body else segment[1].end
+        expr_end = (body[-1].end if body else expr_start)
+        steps.append(MStep(
+            name=ident_name(segment[0].text),
+            name_start=segment[0].start,
+            expr_start=expr_start,
+            expr_end=end,
+            body_end=expr_end,
+            expression=text[expr_start:expr_end],
+            references={ident_name(t.text) for t in body if t.kind == "ident"},
+        ))
+    result_tokens = [t for t in tokens if t.start > in_token.start]
+    result_start = result_tokens[0].start if result_tokens else len(text)
+    return MQuery(
+        text=text,
+        steps=steps,
+        result=text[result_start:].strip(),
+        result_start=result_start,
+        result_references={ident_name(t.text) for t in result_tokens if t.kind == "ident"},
+    )
+
+
+def types_column(step: MStep, column: str) -> Optional[str]:
+    """'date'/'datetime'/... if the step is a TransformColumnTypes that types `column`."""
+    if not step.expression.lstrip().startswith("Table.TransformColumnTypes"):
+        return None
+    m = re.search(r'\{\s*"' + re.escape(column) + r'"\s*,\s*(type\s+(date|datetime|datetimezone)|'
+                  r'(Date|DateTime|DateTimeZone)\.Type)\s*\}', step.expression)
+    if not m:
+        return None
+    return (m.group(2) or m.group(3)).lower()
+
+
+# ============================================================================
+# REWRITE
+# ============================================================================
+
+def filter_step_name(typed_step: str) -> str:
+    return f"{typed_step} - Refresh Range"
+
+
+def filter_expression(source_step: str, column: str, column_type: str) -> str:
+    if column_type == "date":
+        low, high = "Date.From(RangeStart)", "Date.From(RangeEnd)"
+    else:
+        low, high = "RangeStart", "RangeEnd"
+    return (f"Table.SelectRows({m_ident(source_step)}, "
+            f"each [{column}] >= {low} and [{column}] < {high})")
+
+
+def add_range_filters(text: str, column: str) -> Tuple[str, List[str]]:
+    """
+    Insert a RangeStart/RangeEnd filter after each Date-typing step that feeds
+    the result. Returns (new M, typed step names). Already-filtered steps are skipped.
+    """
+    query = parse_let(text)
+    if query is None:
+        raise ValueError("partition source is not a let ... in expression")
+    lineage = query.lineage()
+    typed = [s for s in query.steps if s.name in lineage and types_column(s, column)]
+    existing = {s.name for s in query.steps}
+
+    tokens = tokenize_m(text)
+    edits: List[Tuple[int, int, str]] = []      # (start, end, replacement)
+    done: List[str] = []
+    for step in typed:
+        name = filter_step_name(step.name)
+        if name in existing:
+            continue
+        done.append(step.name)
+        for token in tokens:
+            if token.start >= step.expr_end and token.kind == "ident" and ident_name(token.text) == step.name:
+                edits.append((token.start, token.end, m_ident(name)))
+        line_start = text.rfind("\n", 0, step.name_start) + 1
+        indent = text[line_start:step.name_start]
+        new_step = f"{indent}{m_ident(name)} = {filter_expression(step.name, column, types_column(step, column))}"
+        if step is query.steps[-1]:
+            edits.append((step.body_end, step.body_end, f",\n{new_step}"))
+        else:
+            comma_line_end = text.find("\n", step.expr_end)
+            comma_line_end = len(text) if comma_line_end < 0 else comma_line_end
+            edits.append((comma_line_end, comma_line_end, f"\n{new_step},"))
+
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1]), reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text, done
+
+
+def remove_range_filters(text: str) -> str:
+    """Inverse of add_range_filters: drop RangeStart/RangeEnd filter steps (full-history query)."""
+    query = parse_let(text)
+    if query is None:
+        return text
+    tokens = tokenize_m(text)
+    edits: List[Tuple[int, int, str]] = []
+    for index, step in enumerate(query.steps):
+        inputs = [r for r in step.references if query.step(r)]
+        if not ({"RangeStart", "RangeEnd"} <= step.references and len(inputs) == 1
+                and step.expression.lstrip().startswith("Table.SelectRows")):
+            continue
+        for token in tokens:
+            if token.start >= step.expr_end and token.kind == "ident" and ident_name(token.text) == step.name:
+                edits.append((token.start, token.end, m_ident(inputs[0])))
+        if step is query.steps[-1] and index > 0:
+            edits.append((query.steps[index - 1].body_end, step.body_end, ""))
+        else:
+            line_end = text.find("\n", step.expr_end)
+            edits.append((text.rfind("\n", 0, step.name_start), len(text) if line_end < 0 else line_end, ""))
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1]), reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def parameter_expression(name: str, value: date) -> str:
+    return (f"#datetime({value.year}, {value.month}, {value.day}, 0, 0, 0) "
+            f"meta [IsParameterQuery=true, Type=\"DateTime\", IsParameterQueryRequired=true]")
+
+
+def find_expressions(model: SemanticModel) -> Dict[str, TmdlNode]:
+    return {n.name: n for nodes in model.files.values() for n in nodes if n.kind == "expression"}
+
+
+def write_parameters(model: SemanticModel, values: Dict[str, date]) -> Optional[Path]:
+    """Append missing RangeStart/RangeEnd to expressions.tmdl."""
+    existing = find_expressions(model)
+    missing = [p for p in PARAMETERS if p not in existing]
+    if not missing:
+        return None
+    path = model.root / "expressions.tmdl"
+    text = path.read_text(encoding="utf-8-sig").rstrip("\n") + "\n\n" if path.exists() else ""
+    blocks = []
+    for name in missing:
+        blocks.append("\n".join([
+            f"expression {name} = {parameter_expression(name, values[name])}",
+            f"\tlineageTag: {uuid.uuid4()}",
+            "",
+            "\tannotation PBI_ResultType = DateTime",
+        ]))
+    path.write_text(text + "\n\n".join(blocks) + "\n", encoding="utf-8")
+    return path
+
+
+def add_query_order(model: SemanticModel) -> Optional[Path]:
+    if model.model is None:
+        return None
+    path = model.model.file_path
+    text = path.read_text(encoding="utf-8-sig")
+    m = re.search(r"^annotation PBI_QueryOrder = (\[.*\])\s*$", text, flags=re.MULTILINE)
+    if not m:
+        return None
+    names = re.findall(r'"((?:[^"\\]|\\.)*)"', m.group(1))
+    missing = [p for p in PARAMETERS if p not in names]
+    if not missing:
+        return None
+    order = "[" + ",".join(f'"{n}"' for n in missing + names) + "]"
+    path.write_text(text[:m.start(1)] + order + text[m.end(1):], encoding="utf-8")
+    return path
+
+
+@dataclass
+class PolicySettings:
+    rolling_periods: int = 3
+    rolling_granularity: str = "year"
+    incremental_periods: int = 1
+    incremental_granularity: str = "day"
+    only_complete_periods: bool = False
+
+    def properties(self) -> List[Tuple[str, str]]:
+        props = [
+            ("policyType", "basic"),
+            ("rollingWindowGranularity", self.rolling_granularity),
+            ("rollingWindowPeriods", str(self.rolling_periods)),
+            ("incrementalGranularity", self.incremental_granularity),
+            ("incrementalPeriods", str(self.incremental_periods)),
+        ]
+        if self.only_complete_periods:
+            props.append(("incrementalPeriodsOffset", "-1"))
+        return props
+
+
+def fenced(lines_indent: str, text: str) -> List[str]:
+    return [f"{lines_indent}\t\t{l}" if l.strip() else "" for l in text.splitlines()] + [f"{lines_indent}\t\t```"]
+
+
+def rewrite_table(table: TmdlNode, partition: TmdlNode, new_source: str, settings: PolicySettings) -> Path:
+    """Replace the partition source and insert/refresh the refreshPolicy block."""
+    path = table.file_path
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+
+    start = next(i for i in range(partition.start_line - 1, partition.end_line)
+                 if lines[i].strip().startswith("source ="))
+    end = start
+    if lines[start].strip().endswith("```"):
+        end = next(i for i in range(start + 1, partition.end_line) if lines[i].strip() == "```")
+    source_indent = lines[start][:len(lines[start]) - len(lines[start].lstrip("\t"))]
+    lines[start:end + 1] = [f"{source_indent}source = ```"] + fenced(source_indent, new_source)
+
+    policy_indent = "\t" * (table.indent + 1)
+    block = [f"{policy_indent}refreshPolicy"]
+    block += [f"{policy_indent}\t{k}: {v}" for k, v in settings.properties()]
+    block += [f"{policy_indent}\tsourceExpression = ```"] + fenced(policy_indent + "\t", new_source)
+    block.append("")
+
+    existing = table.children_of("refreshPolicy")
+    if existing:
+        policy = existing[0]
+        span_end = policy.end_line
+        while span_end < len(lines) and not lines[span_end].strip():
+            span_end += 1
+        lines[policy.start_line - 1:span_end] = block
+    else:
+        at = partition.start_line - 1
+        lines[at:at] = block
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+# ============================================================================
+# CHECK
+# ============================================================================
+
+@dataclass
+class CheckResult:
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    info: List[str] = field(default_factory=list)
+
+
+RANGE_FILTER_RE = re.compile(
+    r"\[(?P<col1>[^\]]+)\]\s*(?P<op1>>=|>)\s*(?:Date(?:Time)?\.From\()?RangeStart\)?\s*and\s*"
+    r"\[(?P<col2>[^\]]+)\]\s*(?P<op2><=|<)\s*(?:Date(?:Time)?\.From\()?RangeEnd\)?")
+
+
+def check_query(text: str, column: str, result: CheckResult, label: str) -> None:
+    query = parse_let(text)
+    if query is None:
+        result.errors.append(f"{label}: not a let ... in expression")
+        return
+    filters = [s for s in query.steps if {"RangeStart", "RangeEnd"} <= s.references]
+    if not filters:
+        result.errors.append(f"{label}: no step filters on RangeStart and RangeEnd")
+        return
+    lineage = set(query.lineage())
+    for step in filters:
+        if step.name not in lineage:
+            result.errors.append(f"{label}: filter '{step.name}' is not used by the query result")
+        if not step.expression.lstrip().startswith("Table.SelectRows"):
+            result.warnings.append(f"{label}: filter '{step.name}' is not a Table.SelectRows step")
+        m = RANGE_FILTER_RE.search(step.expression)
+        if not m:
+            result.warnings.append(f"{label}: could not read the range condition of '{step.name}'")
+        else:
+            if m.group("col1") != column or m.group("col2") != column:
+                result.errors.append(f"{label}: '{step.name}' filters [{m.group('col1')}], expected [{column}]")
+            if (m.group("op1"), m.group("op2")) != (">=", "<"):
+                result.errors.append(
+                    f"{label}: '{step.name}' uses {m.group('op1')} RangeStart / {m.group('op2')} RangeEnd; "
+                    "use >= and < so rows on a boundary land in exactly one partition")
+        inputs = [r for r in step.references if query.step(r)]
+        typed = [a for i in inputs for a in query.ancestors(i) if types_column(query.step(a), column)]
+        if not typed:
+            result.errors.append(
+                f"{label}: '{step.name}' runs before Table.TransformColumnTypes types [{column}] "
+                "(text compared with datetime)")
+        else:
+            result.info.append(f"{label}: '{step.name}' filters typed [{column}] from '{typed[0]}'")
+
+
+def check_setup(model: SemanticModel, table_name: str, column: str) -> CheckResult:
+    result = CheckResult()
+    expressions = find_expressions(model)
+    for name in PARAMETERS:
+        node = expressions.get(name)
+        if node is None:
+            result.errors.append(f"Parameter {name} is missing (expressions.tmdl)")
+        elif not re.search(r"IsParameterQuery\s*=\s*true", node.expression or "") or \
+                not re.search(r'Type\s*=\s*"DateTime"', node.expression or ""):
+            result.errors.append(f"Parameter {name} must be a DateTime parameter query")
+
+    table = model.tables.get(table_name)
+    if table is None:
+        result.errors.append(f"Table {table_name} not found")
+        return result
+    partitions = [p for p in table.partitions if (p.expression or "").strip() == "m"]
+    if len(partitions) != 1:
+        result.errors.append(f"{table_name}: expected one M partition, found {len(partitions)}")
+        return result
+    source = partitions[0].expression_properties.get("source", "")
+    check_query(source, column, result, f"partition {partitions[0].name}")
+
+    policies = table.children_of("refreshPolicy")
+    if not policies:
+        result.errors.append(f"{table_name}: no refreshPolicy block")
+        return result
+    policy = policies[0]
+    for key in ("rollingWindowGranularity", "incrementalGranularity"):
+        if policy.get(key) not in GRANULARITIES:
+            result.errors.append(f"refreshPolicy {key}: {policy.get(key) or 'missing'}")
+    for key in ("rollingWindowPeriods", "incrementalPeriods"):
+        if not policy.get(key).isdigit() or int(policy.get(key)) < 1:
+            result.errors.append(f"refreshPolicy {key}: {policy.get(key) or 'missing'}")
+    policy_source = policy.expression_properties.get("sourceExpression", "")
+    if not policy_source:
+        result.errors.append("refreshPolicy has no sourceExpression")
+    elif policy_source.strip() != source.strip():
+        result.warnings.append("refreshPolicy sourceExpression differs from the partition source")
+    return result
+
+
+def print_check(result: CheckResult) -> None:
+    print("CHECK")
+    print("-" * 80)
+    for line in result.info:
+        print(f"  [INFO] {line}")
+    for line in result.warnings:
+        print(f"  [WARN] {line}")
+    for line in result.errors:
+        print(f"  [ERROR] {line}")
+    if not result.errors:
+        print("  [SUCCESS] Incremental refresh setup is valid")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Add an incremental refresh policy to the fact table",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Preview: keep 3 years, refresh the last day
+  python incremental_refresh_policy.py --dry-run
+
+  # Keep 24 months, refresh the last 3 complete days
+  python incremental_refresh_policy.py --rolling-window 24 --rolling-granularity month --incremental 3 --only-complete-periods
+
+  # Validate an existing setup
+  python incremental_refresh_policy.py --check
+        """
+    )
+    parser.add_argument("model_path", nargs="?", default=str(DEFAULT_MODEL_PATH),
+                        help="Path to the .SemanticModel folder")
+    parser.add_argument("--table", default=DEFAULT_TABLE, help=f"Table to configure (default: {DEFAULT_TABLE})")
+    parser.add_argument("--date-column", default="Date", help="Column to filter (default: Date)")
+    parser.add_argument("--rolling-window", type=int, default=3, help="Periods of history to keep (default: 3)")
+    parser.add_argument("--rolling-granularity", choices=GRANULARITIES, default="year",
+                        help="Rolling window granularity (default: year)")
+    parser.add_argument("--incremental", type=int, default=1, help="Periods refreshed each run (default: 1)")
+    parser.add_argument("--incremental-granularity", choices=GRANULARITIES, default="day",
+                        help="Incremental granularity (default: day)")
+    parser.add_argument("--only-complete-periods", action="store_true",
+                        help="Do not refresh the current, incomplete period")
+    parser.add_argument("--range-start", type=date.fromisoformat, help="RangeStart value for Desktop (YYYY-MM-DD)")
+    parser.add_argument("--range-end", type=date.fromisoformat, help="RangeEnd value for Desktop (YYYY-MM-DD)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the changes without writing")
+    parser.add_argument("--check", action="store_true", help="Only validate the existing setup")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        print(f"ERROR: Semantic model path not found: {model_path}")
+        sys.exit(1)
+    if args.rolling_window < 1 or args.incremental < 1:
+        print("ERROR: --rolling-window and --incremental must be at least 1")
+        sys.exit(1)
+    if GRANULARITIES.index(args.incremental_granularity) > GRANULARITIES.index(args.rolling_granularity):
+        print("ERROR: --incremental-granularity cannot be coarser than --rolling-granularity")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("Incremental Refresh Policy".center(80))
+    print("=" * 80)
+    print()
+
+    model = load_semantic_model(model_path)
+    if args.check:
+        result = check_setup(model, args.table, args.date_column)
+        print_check(result)
+        sys.exit(1 if result.errors else 0)
+
+    table = model.tables.get(args.table)
+    if table is None:
+        print(f"ERROR: Table not found: {args.table}")
+        sys.exit(1)
+    partitions = [p for p in table.partitions if (p.expression or "").strip() == "m"]
+    if len(partitions) != 1:
+        print(f"ERROR: {args.table} needs exactly one M partition, found {len(partitions)}")
+        sys.exit(1)
+    partition = partitions[0]
+
+    try:
+        new_source, filtered = add_range_filters(partition.expression_properties.get("source", ""),
+                                                 args.date_column)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    query = parse_let(new_source)
+    if not any({"RangeStart", "RangeEnd"} <= s.references for s in query.steps):
+        print(f"ERROR: No Table.TransformColumnTypes step types [{args.date_column}] as a date; "
+              "add one before configuring incremental refresh.")
+        sys.exit(1)
+
+    settings = PolicySettings(args.rolling_window, args.rolling_granularity, args.incremental,
+                              args.incremental_granularity, args.only_complete_periods)
+    today = date.today()
+    values = {"RangeStart": args.range_start or today - timedelta(days=30),
+              "RangeEnd": args.range_end or today}
+
+    print(f"Table: {args.table}   Partition: {partition.name}")
+    print(f"Keep {settings.rolling_periods} {settings.rolling_granularity}(s), "
+          f"refresh the last {settings.incremental_periods} {settings.incremental_granularity}(s)"
+          f"{' (complete periods only)' if settings.only_complete_periods else ''}")
+    for name in filtered:
+        print(f"  + filter after '{name}': {filter_step_name(name)}")
+    if not filtered:
+        print("  Range filters already present")
+    print()
+
+    if args.dry_run:
+        print(new_source)
+        print()
+        for key, value in settings.properties():
+            print(f"{key}: {value}")
+        return
+
+    changed = [rewrite_table(table, partition, new_source, settings)]
+    for path in (write_parameters(model, values), add_query_order(model)):
+        if path is not None:
+            changed.append(path)
+    print("Updated files:")
+    for path in changed:
+        print(f"  - {path}")
+    print()
+
+    result = check_setup(load_semantic_model(model_path), args.table, args.date_column)
+    print_check(result)
+    sys.exit(1 if result.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+"""
+Calculated Summary Table Materializer
+
+PressRelease_Summary and Dim_Press_Releases are DAX calculated tables built
+with SUMMARIZE over Fact_Press_Analytics, so every refresh first loads the
+fact table, then evaluates Page_Title (a character-by-character
+CONCATENATEX over GENERATESERIES per row) and Page_Type, then scans the fact
+table again per group. This script computes both tables offline from the
+pre-joined fact file written by prejoin_fact_sources.py and emits them as
+CSV import sources:
+
+    PressRelease_Summary.csv  Page_URL, Total Views (Press Release rows only, blank otherwise)
+    Dim_Press_Releases.csv    Page_URL, Page_Title, Page_Type, Total_Views, Total_Users, Publish_Date
+
+The engine streams the fact file in chunks and aggregates with NumPy
+(np.unique group codes, np.add.at / np.minimum.at per chunk, merged into
+running per-URL accumulators). Page_Title and Page_Type are evaluated once
+per distinct URL instead of once per row. Page_URL groups are
+case-insensitive and keep the first spelling seen, as VertiPaq does.
+
+Days_Since_Publication uses TODAY(), so it stays in the model as a DAX
+calculated column on the imported Publish_Date and still moves with each
+refresh. Age_Category and Views_Category are unchanged.
+
+The other calculated tables (Landing_Page_Channel_Metrics,
+PR_Distribution_Categories, Traffic_Breakdown_Categories) are DATATABLE
+literals with no dependency on the fact table; they are reported and left
+as they are.
+
+The reconciliation report compares the NumPy result, cell by cell, with a
+row-at-a-time evaluation of the DAX expressions (SUMMARIZE/CALCULATE/
+ALLEXCEPT semantics, blanks included) and checks the totals against the
+fact file. --dax-export additionally compares against tables exported from
+the model itself (e.g. DAX Studio: EVALUATE 'Dim_Press_Releases' -> CSV).
+
+Usage:
+    python materialize_summary_tables.py --fact ./data/fact_press_analytics.csv
+    python materialize_summary_tables.py --data-dir ./data --write-partitions
+    python materialize_summary_tables.py --self-test
+
+Options:
+    --fact: Pre-joined fact CSV (output of prejoin_fact_sources.py)
+    --data-dir: Use fact_press_analytics.csv in this folder
+    --out-dir: Where to write the summary CSVs (default: the fact file's folder)
+    --chunk-size: Fact rows per aggregation batch (default: 200000)
+    --dax-export: Folder with <Table>.csv exports of the DAX versions to reconcile against
+    --report: Reconciliation report path (default: <out-dir>/summary_reconciliation.json)
+    --write-partitions: Switch the calculated partitions to M partitions reading the CSVs
+    --self-test: Reconcile the engine on a built-in fixture
+
+Requires numpy.
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from prejoin_fact_sources import FACT_TABLE, OUTPUT_COLUMNS, read_output  # noqa: E402
+from tmdl_model import SemanticModel, TmdlNode, load_semantic_model, quote_name  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+FACT_FILE_NAME = "fact_press_analytics.csv"
+
+# (column, TMDL dataType, M type) in output order
+SUMMARY_TABLES: Dict[str, List[Tuple[str, str, str]]] = {
+    "PressRelease_Summary": [
+        ("Page_URL", "string", "type text"),
+        ("Total Views", "int64", "Int64.Type"),
+    ],
+    "Dim_Press_Releases": [
+        ("Page_URL", "string", "type text"),
+        ("Page_Title", "string", "type text"),
+        ("Page_Type", "string", "type text"),
+        ("Total_Views", "int64", "Int64.Type"),
+        ("Total_Users", "int64", "Int64.Type"),
+        ("Publish_Date", "dateTime", "type date"),
+    ],
+}
+
+# Columns of the calculated tables that stay DAX after the switch
+KEPT_CALCULATED = {
+    ("Dim_Press_Releases", "Days_Since_Publication"):
+        ("DATEDIFF(Dim_Press_Releases[Publish_Date], TODAY(), DAY)", "int64"),
+}
+
+ACRONYMS = [("Hhs", "HHS"), ("Cdc", "CDC"), ("Fda", "FDA"), ("Nih", "NIH"), ("Cms", "CMS"),
+            ("Hrsa", "HRSA"), ("Barda", "BARDA"), ("Prwora", "PRWORA"), ("Doge", "DOGE"), ("Mrna", "mRNA")]
+LANDING_TITLE = "Press Room | HHS.gov"
+
+NO_DAY = 2 ** 63 - 1                        # min_day sentinel: no non-blank Date
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+SummaryRow = Tuple
+Table = Dict[str, SummaryRow]       # case-folded Page_URL -> row
+
+
+# ============================================================================
+# FACT CALCULATED COLUMNS (DAX semantics)
+# ============================================================================
+
+def contains_string(text: Optional[str], find: str) -> bool:
+    """CONTAINSSTRING is case-insensitive."""
+    return find.lower() in (text or "").lower()
+
+
+def dax_trim(text: str) -> str:
+    """TRIM drops leading/trailing spaces and collapses inner runs to one space."""
+    return re.sub(r" {2,}", " ", text.strip(" "))
+
+
+def page_type(url: Optional[str]) -> str:
+    if contains_string(url, "/press-room/index"):
+        return "Landing Page"
+    if contains_string(url, "/press-room/") and not contains_string(url, "index"):
+        return "Press Release"
+    return "Other"
+
+
+def page_title(url: Optional[str]) -> str:
+    """Fact_Press_Analytics[Page_Title], step for step."""
+    if contains_string(url, "/press-room/index"):
+        clean_path = LANDING_TITLE
+    else:
+        clean_path = (url or "").replace("/press-room/", "").replace(".html", "").replace("-", " ")
+    if clean_path == LANDING_TITLE:
+        proper = clean_path
+    else:
+        chars = []
+        for i, current in enumerate(clean_path):
+            prev = " " if i == 0 else clean_path[i - 1]
+            chars.append(current.upper() if prev == " " else current.lower())
+        proper = dax_trim("".join(chars))
+    for old, new in ACRONYMS:
+        proper = proper.replace(old, new)
+    return proper
+
+
+def url_key(url: Optional[str]) -> str:
+    return (url or "").lower()
+
+
+# ============================================================================
+# NUMPY ENGINE
+# ============================================================================
+
+@dataclass
+class UrlAccumulator:
+    """Running per-URL aggregates, grown as new URLs appear."""
+    keys: Dict[str, int] = field(default_factory=dict)
+    urls: List[str] = field(default_factory=list)
+    views: "np.ndarray" = None
+    views_count: "np.ndarray" = None
+    users: "np.ndarray" = None
+    users_count: "np.ndarray" = None
+    min_day: "np.ndarray" = None
+    fact_rows: int = 0
+    fact_views: int = 0
+
+    def __post_init__(self):
+        self.views = np.zeros(0, dtype=np.int64)
+        self.views_count = np.zeros(0, dtype=np.int64)
+        self.users = np.zeros(0, dtype=np.int64)
+        self.users_count = np.zeros(0, dtype=np.int64)
+        self.min_day = np.zeros(0, dtype=np.int64)
+
+    def slots(self, urls: Sequence[str]) -> "np.ndarray":
+        """Global slot for each chunk-local URL (first spelling wins)."""
+        out = np.empty(len(urls), dtype=np.int64)
+        for i, url in enumerate(urls):
+            key = url.lower()
+            slot = self.keys.get(key)
+            if slot is None:
+                slot = self.keys[key] = len(self.urls)
+                self.urls.append(url)
+            out[i] = slot
+        grow = len(self.urls) - len(self.views)
+        if grow:
+            self.views = np.concatenate([self.views, np.zeros(grow, dtype=np.int64)])
+            self.views_count = np.concatenate([self.views_count, np.zeros(grow, dtype=np.int64)])
+            self.users = np.concatenate([self.users, np.zeros(grow, dtype=np.int64)])
+            self.users_count = np.concatenate([self.users_count, np.zeros(grow, dtype=np.int64)])
+            self.min_day = np.concatenate([self.min_day, np.full(grow, NO_DAY, dtype=np.int64)])
+        return out
+
+
+def read_fact_chunks(fact_path: Path, chunk_size: int) -> Iterator[List[List[str]]]:
+    with open(fact_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header != OUTPUT_COLUMNS:
+            raise ValueError(f"{fact_path}: expected columns {OUTPUT_COLUMNS}, found {header}")
+        chunk: List[List[str]] = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def nullable_int(values: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    present = np.array([v != "" for v in values], dtype=bool)
+    ints = np.zeros(len(values), dtype=np.int64)
+    if present.any():
+        ints[present] = np.array([v for v in values if v != ""], dtype=np.int64)
+    return ints, present
+
+
+def aggregate_chunk(acc: UrlAccumulator, rows: List[List[str]]) -> None:
+    columns = list(zip(*rows))
+    dates, urls, _, users_raw, views_raw = columns[:5]
+
+    url_array = np.array(urls, dtype=str)
+    lowered = np.char.lower(url_array)
+    _, first, inverse = np.unique(lowered, return_index=True, return_inverse=True)
+    slot_of_group = acc.slots([urls[i] for i in np.sort(first)])
+    # np.unique orders groups by key; map back to first-seen order used for slots
+    order = np.argsort(first)
+    group_slot = np.empty(len(first), dtype=np.int64)
+    group_slot[order] = slot_of_group
+    row_slot = group_slot[inverse.ravel()]
+
+    views, views_present = nullable_int(views_raw)
+    users, users_present = nullable_int(users_raw)
+    np.add.at(acc.views, row_slot, views)
+    np.add.at(acc.views_count, row_slot, views_present.astype(np.int64))
+    np.add.at(acc.users, row_slot, users)
+    np.add.at(acc.users_count, row_slot, users_present.astype(np.int64))
+
+    days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    valid = np.array([d != "" for d in dates], dtype=bool)
+    np.minimum.at(acc.min_day, row_slot[valid], days[valid])
+
+    acc.fact_rows += len(rows)
+    acc.fact_views += int(views.sum())
+
+
+def build_tables(acc: UrlAccumulator) -> Dict[str, Table]:
+    """Turn the accumulators into the two summary tables."""
+    types = [page_type(u) for u in acc.urls]
+    titles = [page_title(u) for u in acc.urls]
+    is_pr = np.array([t == "Press Release" for t in types], dtype=bool)
+    has_pr_views = is_pr & (acc.views_count > 0)
+
+    summary: Table = {}
+    dim: Table = {}
+    for i, url in enumerate(acc.urls):
+        key = url_key(url)
+        views = int(acc.views[i]) if acc.views_count[i] else None
+        users = int(acc.users[i]) if acc.users_count[i] else None
+        publish = (date.fromordinal(int(acc.min_day[i]) + EPOCH_ORDINAL)
+                   if acc.min_day[i] != NO_DAY else None)
+        summary[key] = (url, int(acc.views[i]) if has_pr_views[i] else None)
+        dim[key] = (url, titles[i], types[i], views, users, publish)
+    return {"PressRelease_Summary": summary, "Dim_Press_Releases": dim}
+
+
+def materialize(fact_path: Path, chunk_size: int) -> Tuple[Dict[str, Table], UrlAccumulator]:
+    acc = UrlAccumulator()
+    for rows in read_fact_chunks(fact_path, chunk_size):
+        aggregate_chunk(acc, rows)
+    return build_tables(acc), acc
+
+
+def format_value(value) -> str:
+    if value is None:
+        return ""
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def write_table(table_name: str, rows: Table, out_dir: Path) -> Path:
+    path = out_dir / f"{table_name}.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([c for c, _, _ in SUMMARY_TABLES[table_name]])
+        for key in sorted(rows):
+            writer.writerow([format_value(v) for v in rows[key]])
+    return path
+
+
+# ============================================================================
+# RECONCILIATION
+# ============================================================================
+
+def reference_dax_tables(fact_path: Path) -> Tuple[Dict[str, Table], Dict[str, int]]:
+    """Row-at-a-time evaluation of the two calculated table expressions."""
+    fact = read_output(fact_path)
+    rows = [{
+        "Date": r[0], "Page_URL": r[1], "Active_Users": r[3], "Views": r[4],
+        "Users": r[3],                              # Users = [Active_Users]
+        "Page_Title": page_title(r[1]),
+        "Page_Type": page_type(r[1]),
+    } for r in fact]
+
+    # SUMMARIZE groups on the stored column value; text compares case-insensitively
+    groups: Dict[str, List[dict]] = {}
+    for row in rows:
+        groups.setdefault(url_key(row["Page_URL"]), []).append(row)
+
+    def dax_sum(values):
+        values = [v for v in values if v is not None]
+        return sum(values) if values else None
+
+    summary: Table = {}
+    dim: Table = {}
+    for key, members in groups.items():
+        first = members[0]
+        pr_views = dax_sum(m["Views"] for m in members if m["Page_Type"] == "Press Release")
+        summary[key] = (first["Page_URL"], pr_views)
+        # ALLEXCEPT(Fact, Page_URL) keeps only the URL filter: MIN over every row of the URL
+        dates = [m["Date"] for m in members if m["Date"] is not None]
+        dim[key] = (first["Page_URL"], first["Page_Title"], first["Page_Type"],
+                    dax_sum(m["Views"] for m in members), dax_sum(m["Users"] for m in members),
+                    min(dates) if dates else None)
+
+    totals = {
+        "fact_rows": len(rows),
+        "fact_views": sum(r["Views"] or 0 for r in rows),
+        "press_release_views": sum(r["Views"] or 0 for r in rows if r["Page_Type"] == "Press Release"),
+        "distinct_urls": len(groups),
+    }
+    return {"PressRelease_Summary": summary, "Dim_Press_Releases": dim}, totals
+
+
+@dataclass
+class TableReconciliation:
+    table: str
+    source: str
+    expected_rows: int
+    actual_rows: int
+    missing: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+    mismatches: List[Dict] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.extra or self.mismatches)
+
+    def to_dict(self) -> Dict:
+        return {
+            "table": self.table, "source": self.source, "ok": self.ok,
+            "expected_rows": self.expected_rows, "actual_rows": self.actual_rows,
+            "missing": self.missing[:20], "extra": self.extra[:20],
+            "mismatch_count": len(self.mismatches), "mismatches": self.mismatches[:20],
+        }
+
+
+def reconcile_table(table_name: str, source: str, expected: Table, actual: Table) -> TableReconciliation:
+    result = TableReconciliation(table_name, source, len(expected), len(actual))
+    columns = [c for c, _, _ in SUMMARY_TABLES[table_name]]
+    result.missing = sorted(expected[k][0] for k in expected.keys() - actual.keys())
+    result.extra = sorted(actual[k][0] for k in actual.keys() - expected.keys())
+    for key in sorted(expected.keys() & actual.keys()):
+        for column, want, got in zip(columns, expected[key], actual[key]):
+            same = want.lower() == got.lower() if column == "Page_URL" else want == got
+            if not same:
+                result.mismatches.append({"Page_URL": expected[key][0], "column": column,
+                                          "expected": format_value(want), "actual": format_value(got)})
+    return result
+
+
+def check_totals(tables: Dict[str, Table], totals: Dict[str, int]) -> List[str]:
+    """Invariants that hold for any correct SUMMARIZE of the fact table."""
+    problems = []
+    dim = tables["Dim_Press_Releases"]
+    summary = tables["PressRelease_Summary"]
+    dim_views = sum(r[3] or 0 for r in dim.values())
+    pr_views = sum(r[1] or 0 for r in summary.values())
+    if len(dim) != totals["distinct_urls"] or len(summary) != totals["distinct_urls"]:
+        problems.append(f"row counts {len(dim)}/{len(summary)} != distinct Page_URL {totals['distinct_urls']}")
+    if dim_views != totals["fact_views"]:
+        problems.append(f"SUM(Dim_Press_Releases[Total_Views]) {dim_views} != SUM(Fact[Views]) {totals['fact_views']}")
+    if pr_views != totals["press_release_views"]:
+        problems.append(f"SUM(PressRelease_Summary[Total Views]) {pr_views} != "
+                        f"Press Release views {totals['press_release_views']}")
+    return problems
+
+
+def parse_export_value(column: str, value: str):
+    value = value.strip()
+    if value == "":
+        return None
+    data_type = next(t for t in (c for table in SUMMARY_TABLES.values() for c in table) if t[0] == column)[1]
+    if data_type == "int64":
+        return int(float(value))
+    if data_type == "dateTime":
+        for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y", "%m/%d/%Y %I:%M:%S %p"):
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+        raise ValueError(f"Unrecognized date in export: {value!r}")
+    return value
+
+
+def read_dax_export(path: Path, table_name: str) -> Table:
+    """Read an EVALUATE export; headers may be 'Table[Column]' or '[Column]'."""
+    columns = [c for c, _, _ in SUMMARY_TABLES[table_name]]
+    rows: Table = {}
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = [re.sub(r"^.*\[(.*)\]$", r"\1", h.strip()) for h in next(reader)]
+        positions = [header.index(c) for c in columns]
+        for r in reader:
+            values = tuple(parse_export_value(c, r[p]) for c, p in zip(columns, positions))
+            rows[url_key(values[0])] = values
+    return rows
+
+
+# ============================================================================
+# SELF-TEST
+# ============================================================================
+
+SELF_TEST_FACT = (
+    "Date,Page_URL,Channel_Group,Active_Users,Views\n"
+    "2025-01-02,/press-room/hhs-and-cdc-announce-mrna-funding.html,Direct,10,20\n"
+    "2025-01-01,/press-room/hhs-and-cdc-announce-mrna-funding.html,Organic Search,5,7\n"
+    "2025-01-03,/Press-Room/HHS-and-CDC-announce-mRNA-funding.html,Direct,1,1\n"   # same group, other case
+    "2025-01-01,/press-room/index.html,Direct,100,300\n"
+    "2025-01-02,/press-room/fda--nih   update.html,Referral,2,\n"                  # null Views, spaces
+    "2025-01-02,/press-room/fda--nih   update.html,Direct,,\n"                     # all-null group sums
+    "2025-01-05,/about/index.html,Direct,3,4\n"
+    ",/about/contact.html,Direct,1,1\n"                                           # blank Date
+    "2025-01-04,,All Channels,1,1\n"                                              # blank Page_URL
+)
+SELF_TEST_TITLES = {
+    "/press-room/hhs-and-cdc-announce-mrna-funding.html": "HHS And CDC Announce mRNA Funding",
+    "/press-room/index.html": LANDING_TITLE,
+    "/press-room/fda--nih   update.html": "FDA NIH Update",
+}
+
+
+def run_self_test(chunk_size: int) -> bool:
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        fact_path = Path(tmp) / FACT_FILE_NAME
+        fact_path.write_text(SELF_TEST_FACT, encoding="utf-8")
+        tables, _ = materialize(fact_path, chunk_size)
+        expected, totals = reference_dax_tables(fact_path)
+        ok = True
+        for name in SUMMARY_TABLES:
+            result = reconcile_table(name, "reference", expected[name], tables[name])
+            print(f"  {name}: {result.actual_rows} rows, {'identical' if result.ok else 'MISMATCH'}")
+            ok &= result.ok
+        for problem in check_totals(tables, totals):
+            print(f"  [ERROR] {problem}")
+            ok = False
+        for url, want in SELF_TEST_TITLES.items():
+            got = page_title(url)
+            if got != want:
+                print(f"  [ERROR] Page_Title({url!r}) = {got!r}, expected {want!r}")
+                ok = False
+        group = tables["Dim_Press_Releases"][url_key("/press-room/hhs-and-cdc-announce-mrna-funding.html")]
+        if group[3:] != (28, 16, date(2025, 1, 1)) or len(tables["Dim_Press_Releases"]) != 6:
+            print(f"  [ERROR] Case-insensitive grouping: {group}")
+            ok = False
+        print(f"  [{'SUCCESS' if ok else 'ERROR'}] Self-test {'passed' if ok else 'failed'}")
+        return ok
+
+
+# ============================================================================
+# PARTITIONS
+# ============================================================================
+
+def partition_m(table_name: str, csv_path: str) -> str:
+    columns = SUMMARY_TABLES[table_name]
+    types = ", ".join(f'{{"{c}", {m}}}' for c, _, m in columns)
+    return "\n".join([
+        "let",
+        "    // Materialized by scripts/generators/materialize_summary_tables.py from the pre-joined fact file",
+        f"    Source = Csv.Document(File.Contents(\"{csv_path}\"),[Delimiter=\",\", Columns={len(columns)}, "
+        "Encoding=65001, QuoteStyle=QuoteStyle.Csv]),",
+        "    #\"Promoted Headers\" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),",
+        f"    #\"Changed Type\" = Table.TransformColumnTypes(#\"Promoted Headers\",{{{types}}})",
+        "in",
+        "    #\"Changed Type\"",
+    ])
+
+
+def static_calculated_tables(model: SemanticModel) -> List[str]:
+    """Calculated tables that do not read the fact table (nothing to materialize)."""
+    names = []
+    for table in model.tables.values():
+        for partition in table.partitions:
+            source = partition.expression_properties.get("source", "")
+            if partition.is_calculated and FACT_TABLE not in source and table.name not in SUMMARY_TABLES:
+                names.append(table.name)
+    return sorted(set(names))
+
+
+def rewrite_column(lines: List[str], column: TmdlNode, table_name: str) -> None:
+    """Turn an inferred calculated-table column into an import column (in place)."""
+    span = range(column.start_line - 1, column.end_line)
+    header = lines[span[0]]
+    indent = header[:len(header) - len(header.lstrip("\t"))] + "\t"
+    spec = {c: t for c, t, _ in SUMMARY_TABLES[table_name]}
+    kept = KEPT_CALCULATED.get((table_name, column.name))
+
+    body = [l for l in (lines[i] for i in span[1:])
+            if l.strip() != "isNameInferred" and not l.strip().startswith(("sourceColumn:", "dataType:"))]
+    if kept:
+        expression, data_type = kept
+        header = f"{header.rstrip()} = {expression}"
+        new = [header, f"{indent}dataType: {data_type}"] + body
+    else:
+        new = [header, f"{indent}dataType: {spec[column.name]}"] + body
+        # keep sourceColumn after the other properties, before blank/annotation lines
+        at = len(new)
+        while at > 1 and (new[at - 1].strip() == "" or new[at - 1].strip().startswith("annotation ")):
+            at -= 1
+        new.insert(at, f"{indent}sourceColumn: {column.name}")
+    lines[span[0]:span[-1] + 1] = new
+
+
+def write_partitions(model_path: Path, csv_paths: Dict[str, str]) -> List[Path]:
+    """Switch each summary table's calculated partition to an M import of its CSV."""
+    changed = []
+    model = load_semantic_model(model_path)
+    for table_name, csv_path in csv_paths.items():
+        table = model.tables.get(table_name)
+        if table is None:
+            print(f"  [WARN] {table_name}: not in model")
+            continue
+        partition = next((p for p in table.partitions if p.is_calculated), None)
+        if partition is None:
+            print(f"  [INFO] {table_name}: already an import partition, skipped")
+            continue
+        lines = table.file_path.read_text(encoding="utf-8-sig").splitlines()
+        header = lines[partition.start_line - 1]
+        indent = header[:len(header) - len(header.lstrip("\t"))]
+        body = [indent + "\t\t\t" + l for l in partition_m(table_name, csv_path).splitlines()]
+        block = [f"{indent}partition {quote_name(partition.name)} = m",
+                 f"{indent}\tmode: import",
+                 f"{indent}\tsource = ```"] + body + [f"{indent}\t\t\t```"]
+        end = partition.end_line
+        while end > partition.start_line and lines[end - 1].strip() == "":
+            end -= 1
+        lines[partition.start_line - 1:end] = block
+
+        wanted = {c for c, _, _ in SUMMARY_TABLES[table_name]} | {
+            c for t, c in KEPT_CALCULATED if t == table_name}
+        for column in sorted(table.columns, key=lambda c: c.start_line, reverse=True):
+            if column.name in wanted and not column.is_calculated:
+                rewrite_column(lines, column, table_name)
+        table.file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        changed.append(table.file_path)
+    return changed
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def print_reconciliation(results: List[TableReconciliation], problems: List[str]) -> None:
+    print("RECONCILIATION")
+    print("-" * 80)
+    for result in results:
+        status = "[SUCCESS] identical" if result.ok else "[ERROR] differs"
+        print(f"  {result.table:<22} vs {result.source:<12} {result.expected_rows:>8,} rows  {status}")
+        for url in result.missing[:5]:
+            print(f"      missing: {url}")
+        for url in result.extra[:5]:
+            print(f"      extra:   {url}")
+        for m in result.mismatches[:5]:
+            print(f"      {m['Page_URL']} [{m['column']}]: DAX {m['expected']!r} vs materialized {m['actual']!r}")
+    for problem in problems:
+        print(f"  [ERROR] Totals: {problem}")
+    if not problems:
+        print("  [SUCCESS] Totals match the fact table")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Materialize Fact_Press_Analytics summary tables offline",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build the CSVs next to the pre-joined fact file and reconcile
+  python materialize_summary_tables.py --data-dir ./data
+
+  # Also compare with tables exported from the current model, then switch partitions
+  python materialize_summary_tables.py --data-dir ./data --dax-export ./exports --write-partitions
+
+  # Check the engine without data
+  python materialize_summary_tables.py --self-test
+        """
+    )
+    parser.add_argument("--fact", help="Pre-joined fact CSV (prejoin_fact_sources.py output)")
+    parser.add_argument("--data-dir", help=f"Folder holding {FACT_FILE_NAME}")
+    parser.add_argument("--out-dir", help="Output folder (default: the fact file's folder)")
+    parser.add_argument("--model", default=str(DEFAULT_MODEL_PATH), help="Path to the .SemanticModel folder")
+    parser.add_argument("--chunk-size", type=int, default=200000, help="Fact rows per batch (default: 200000)")
+    parser.add_argument("--dax-export", help="Folder with <Table>.csv exports of the DAX tables")
+    parser.add_argument("--report", help="Reconciliation report JSON path")
+    parser.add_argument("--write-partitions", action="store_true",
+                        help="Switch the calculated partitions to M imports of the CSVs")
+    parser.add_argument("--self-test", action="store_true", help="Reconcile the engine on a built-in fixture")
+    args = parser.parse_args()
+
+    if np is None:
+        print("ERROR: numpy is required (pip install numpy)")
+        sys.exit(1)
+
+    if args.self_test:
+        print("Self-test (NumPy engine vs row-at-a-time DAX reference):")
+        sys.exit(0 if run_self_test(min(args.chunk_size, 3)) else 1)
+
+    if args.fact:
+        fact_path = Path(args.fact)
+    elif args.data_dir:
+        fact_path = Path(args.data_dir) / FACT_FILE_NAME
+    else:
+        print("ERROR: Pass --fact or --data-dir")
+        sys.exit(1)
+    if not fact_path.exists():
+        print(f"ERROR: Fact file not found: {fact_path}")
+        sys.exit(1)
+    out_dir = Path(args.out_dir) if args.out_dir else fact_path.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    print("=" * 80)
+    print("Calculated Summary Table Materializer")
+    print("=" * 80)
+    print(f"Fact:   {fact_path}")
+    print(f"Output: {out_dir}")
+    print()
+
+    started = datetime.now()
+    tables, acc = materialize(fact_path, args.chunk_size)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"  Fact rows: {acc.fact_rows:,}   Distinct Page_URL: {len(acc.urls):,}   ({elapsed:.2f}s)")
+    csv_paths: Dict[str, str] = {}
+    for name, rows in tables.items():
+        path = write_table(name, rows, out_dir)
+        csv_paths[name] = str(path.resolve())
+        print(f"  {name}: {len(rows):,} rows -> {path}")
+    print()
+
+    expected, totals = reference_dax_tables(fact_path)
+    results = [reconcile_table(name, "DAX logic", expected[name], tables[name]) for name in SUMMARY_TABLES]
+    if args.dax_export:
+        for name in SUMMARY_TABLES:
+            export = Path(args.dax_export) / f"{name}.csv"
+            if export.exists():
+                results.append(reconcile_table(name, "DAX export", read_dax_export(export, name), tables[name]))
+            else:
+                print(f"[WARN] No export for {name}: {export}")
+    problems = check_totals(tables, totals)
+    print_reconciliation(results, problems)
+
+    if Path(args.model).exists():
+        for name in static_calculated_tables(load_semantic_model(Path(args.model))):
+            print(f"[INFO] {name}: static calculated table (no {FACT_TABLE} dependency), left as is")
+        print()
+
+    ok = all(r.ok for r in results) and not problems
+    report_path = Path(args.report) if args.report else out_dir / "summary_reconciliation.json"
+    report_path.write_text(json.dumps({
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "fact_file": str(fact_path),
+        "ok": ok,
+        "totals": totals,
+        "outputs": csv_paths,
+        "tables": [r.to_dict() for r in results],
+        "totals_problems": problems,
+    }, indent=2), encoding="utf-8")
+    print(f"🧾 Reconciliation report: {report_path}")
+
+    if not ok:
+        print("[ERROR] Materialized tables differ from the DAX definitions; partitions not changed.")
+        sys.exit(1)
+    if args.write_partitions:
+        for path in write_partitions(Path(args.model), csv_paths):
+            print(f"🧾 Partition updated: {path}")
+
+
+if __name__ == "__main__":
+    main()
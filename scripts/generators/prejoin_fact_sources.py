@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Fact_Press_Analytics Pre-Join ETL
+
+The press_data_with_dates M partition of Fact_Press_Analytics loads two GA4
+exports on every refresh and joins them inside Power Query:
+
+    Trending_FILTERED.csv           (Page path and screen class, Date, Active users, Views)
+    press_data_with_dates_CLEAN.csv (... + Session default channel group)
+
+    1. Csv.Document(QuoteStyle.None), drop rows where Column2 = ""
+    2. PromoteHeaders, TransformColumnTypes (Date, Int64), RenameColumns
+    3. Channel: SelectColumns + Table.Distinct on {Date, Page_URL} (first row wins)
+    4. Table.NestedJoin LeftOuter on {Date, Page_URL}, expand Channel_Group
+    5. Table.ReplaceValue null -> "All Channels", SelectColumns (schema lock)
+
+This stage does the same work once, offline: the channel file is streamed
+into a hash index keyed by (Date, Page_URL) keeping the first occurrence,
+and the primary file is streamed in chunks, joined against the index and
+written to a single typed UTF-8 CSV (ISO dates, integer counts) that the
+partition reads directly. Memory is bounded by the channel index, not by
+the primary file.
+
+--append adds new GA4 export days (dates after the last one already in the
+output, tracked in <output>.state.json) without rebuilding the file. The state
+records the channel files by absolute path, so appends work from any folder;
+an existing output without its state file is refused rather than duplicated.
+
+--verify runs a step-by-step transliteration of the M query (whole tables
+in memory, join expanding every match) on the same inputs and compares it
+with the streaming result.
+--self-test does the same on a built-in fixture covering the edge cases
+(duplicate channel keys, unmatched rows, empty Column2, ragged rows,
+quoted commas, unparseable and non-finite numbers). The reference parses
+and types the CSVs with its own code, not the streaming path's.
+
+Usage:
+    python prejoin_fact_sources.py --primary Trending_FILTERED.csv --channel press_data_with_dates_CLEAN.csv --out fact_press_analytics.csv
+    python prejoin_fact_sources.py --data-dir ./data --verify
+    python prejoin_fact_sources.py --append --primary new_days.csv --channel new_days_channels.csv --out fact_press_analytics.csv
+
+Options:
+    --primary / --channel: Source CSVs (default: File.Contents paths from the partition)
+    --data-dir: Resolve the default source file names in this folder
+    --out: Output CSV (default: fact_press_analytics.csv next to the primary source)
+    --chunk-size: Primary rows per write batch (default: 50000)
+    --append: Append only dates newer than the output's last date
+    --verify: Parity check against the M-logic reference implementation
+    --self-test: Parity check on the built-in fixture
+    --emit-m: Print the M partition that reads the output file
+    --write-partition: Replace the partition source in Fact_Press_Analytics.tmdl
+"""
+
+import argparse
+import csv
+import json
+import math
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analyzers"))
+
+from tmdl_model import load_semantic_model  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.SemanticModel"
+FACT_TABLE = "Fact_Press_Analytics"
+PARTITION_NAME = "press_data_with_dates"
+
+PRIMARY_COLUMNS = 4
+CHANNEL_COLUMNS = 6
+SOURCE_ENCODING = "cp1252"          # Encoding=1252 in Csv.Document
+DEFAULT_CHANNEL = "All Channels"
+
+RENAMES = {
+    "Page path and screen class": "Page_URL",
+    "Session default channel group": "Channel_Group",
+    "Active users": "Active_Users",
+}
+OUTPUT_COLUMNS = ["Date", "Page_URL", "Channel_Group", "Active_Users", "Views"]
+
+Row = Tuple[Optional[date], Optional[str], str, Optional[int], Optional[int]]
+
+
+@dataclass
+class EtlStats:
+    primary_rows: int = 0
+    channel_rows: int = 0
+    channel_keys: int = 0
+    channel_duplicates: int = 0
+    matched: int = 0
+    defaulted: int = 0
+    type_errors: Counter = field(default_factory=Counter)
+    written: int = 0
+    skipped_existing: int = 0
+
+
+# ============================================================================
+# M SEMANTICS
+# ============================================================================
+
+def read_csv_none(path: Path, columns: int) -> Iterator[List[Optional[str]]]:
+    """
+    Csv.Document(..., Columns=N, QuoteStyle.None): every line is a row, split
+    on every comma, quotes are literal text; missing fields are null and
+    extra fields are dropped.
+    """
+    with open(path, "r", encoding=SOURCE_ENCODING, errors="replace", newline="") as f:
+        for line in f:
+            fields: List[Optional[str]] = line.rstrip("\r\n").split(",")[:columns]
+            fields += [None] * (columns - len(fields))
+            yield fields
+
+
+def filtered_rows(rows: Iterable[List[Optional[str]]]) -> Iterator[List[Optional[str]]]:
+    """Table.SelectRows(each [Column2] <> "") - a null Column2 is kept, as in M."""
+    for row in rows:
+        if row[1] != "":
+            yield row
+
+
+def to_date(value: Optional[str]) -> Optional[date]:
+    """type date with en-US culture (ISO, M/D/YYYY, YYYYMMDD, optional time part)."""
+    if value is None:
+        return None
+    text = value.strip()
+    if not text:
+        return None
+    text = re.split(r"[ T]", text, maxsplit=1)[0]
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%Y%m%d", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Cannot convert {value!r} to date")
+
+
+def to_int64(value: Optional[str]) -> Optional[int]:
+    """Int64.Type: numeric text, rounded half to even like Int64.From. inf/nan are conversion errors."""
+    if value is None:
+        return None
+    text = value.strip()
+    if not text:
+        return None
+    number = float(text)
+    if not math.isfinite(number):
+        raise ValueError(f"Cannot convert {value!r} to Int64")
+    return int(round(number))
+
+
+def typed_record(header: Sequence[Optional[str]], row: Sequence[Optional[str]],
+                 stats: Optional[EtlStats] = None) -> Dict[str, object]:
+    """PromoteHeaders + TransformColumnTypes + RenameColumns for one row. Conversion errors become null."""
+    record: Dict[str, object] = {}
+    for name, value in zip(header, row):
+        if name is None:
+            continue
+        try:
+            if name == "Date":
+                converted: object = to_date(value)
+            elif name in ("Active users", "Views"):
+                converted = to_int64(value)
+            else:
+                converted = value
+        except ValueError:
+            converted = None
+            if stats is not None:
+                stats.type_errors[name] += 1
+        record[RENAMES.get(name, name)] = converted
+    return record
+
+
+def check_header(header: Sequence[Optional[str]], required: Sequence[str], path: Path) -> None:
+    """MissingField.Error of the final SelectColumns."""
+    renamed = {RENAMES.get(h, h) for h in header if h is not None}
+    missing = [c for c in required if c not in renamed]
+    if missing:
+        raise ValueError(f"{path.name}: missing column(s) {', '.join(missing)} (header: {list(header)})")
+
+
+# ============================================================================
+# STREAMING PIPELINE
+# ============================================================================
+
+def build_channel_index(paths: Sequence[Path], stats: EtlStats) -> Dict[Tuple, str]:
+    """(Date, Page_URL) -> Channel_Group, first occurrence wins (Table.Distinct)."""
+    index: Dict[Tuple, Optional[str]] = {}
+    for path in paths:
+        rows = filtered_rows(read_csv_none(path, CHANNEL_COLUMNS))
+        header = next(rows, None)
+        if header is None:
+            continue
+        check_header(header, ["Date", "Page_URL", "Channel_Group"], path)
+        for row in rows:
+            record = typed_record(header, row, stats)
+            key = (record.get("Date"), record.get("Page_URL"))
+            stats.channel_rows += 1
+            if key in index:
+                stats.channel_duplicates += 1
+                continue
+            index[key] = record.get("Channel_Group")
+    stats.channel_keys = len(index)
+    return index
+
+
+def join_primary(path: Path, index: Dict[Tuple, Optional[str]], stats: EtlStats,
+                 after: Optional[date] = None) -> Iterator[Row]:
+    """Stream the primary file, left-join against the channel index and default the channel."""
+    rows = filtered_rows(read_csv_none(path, PRIMARY_COLUMNS))
+    header = next(rows, None)
+    if header is None:
+        return
+    check_header(header, ["Date", "Page_URL", "Active_Users", "Views"], path)
+    for row in rows:
+        record = typed_record(header, row, stats)
+        stats.primary_rows += 1
+        row_date = record.get("Date")
+        if after is not None and (row_date is None or row_date <= after):
+            stats.skipped_existing += 1
+            continue
+        key = (row_date, record.get("Page_URL"))
+        channel = index.get(key)
+        if channel is None:
+            channel = DEFAULT_CHANNEL
+            stats.defaulted += 1
+        else:
+            stats.matched += 1
+        yield (row_date, record.get("Page_URL"), channel, record.get("Active_Users"), record.get("Views"))
+
+
+def format_row(row: Row) -> List[str]:
+    return ["" if v is None else (v.isoformat() if isinstance(v, date) else str(v)) for v in row]
+
+
+def write_rows(rows: Iterable[Row], out_path: Path, chunk_size: int, append: bool) -> Tuple[int, Optional[date]]:
+    """Write rows in chunks. Returns (rows written, max date written)."""
+    written = 0
+    max_date: Optional[date] = None
+    mode = "a" if append and out_path.exists() else "w"
+    with open(out_path, mode, encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if mode == "w":
+            writer.writerow(OUTPUT_COLUMNS)
+        chunk: List[List[str]] = []
+        for row in rows:
+            chunk.append(format_row(row))
+            if row[0] is not None and (max_date is None or row[0] > max_date):
+                max_date = row[0]
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                written += len(chunk)
+                chunk = []
+        writer.writerows(chunk)
+        written += len(chunk)
+    return written, max_date
+
+
+def state_path(out_path: Path) -> Path:
+    return out_path.with_name(out_path.name + ".state.json")
+
+
+def load_state(out_path: Path) -> Dict:
+    path = state_path(out_path)
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_state(out_path: Path, state: Dict) -> None:
+    state_path(out_path).write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+def state_sources(out_path: Path, state: Dict) -> Tuple[List[Path], List[str]]:
+    """Channel files recorded in the state (absolute; older relative entries resolve next to the state file)."""
+    found, missing = [], []
+    for entry in state.get("channel_sources", []):
+        path = Path(entry)
+        if not path.is_absolute() and not path.exists():
+            path = state_path(out_path).parent / path
+        if path.exists():
+            found.append(path.resolve())
+        else:
+            missing.append(entry)
+    return found, missing
+
+
+# ============================================================================
+# PARITY
+# ============================================================================
+
+def reference_m_pipeline(primary: Path, channel: Path) -> List[Row]:
+    """
+    Step-by-step transliteration of the M query on whole in-memory tables (the join keeps every match).
+
+    Parsing and typing are written separately from read_csv_none/typed_record, so a bug in the
+    streaming path's CSV splitting or type conversion shows up as a parity mismatch.
+    """
+    def csv_document(path: Path, columns: int) -> List[List[Optional[str]]]:
+        text = path.read_text(encoding=SOURCE_ENCODING, errors="replace")
+        lines = re.split(r"\r\n|\r|\n", text)
+        if lines and lines[-1] == "":
+            lines.pop()
+        table = []
+        for line in lines:                                                    # QuoteStyle.None
+            fields = line.split(",")
+            table.append([fields[i] if i < len(fields) else None for i in range(columns)])
+        return table
+
+    def as_date(value: Optional[str]) -> Optional[date]:
+        if value is None or not value.strip():
+            return None
+        text = value.strip().replace("T", " ").split(" ")[0]
+        try:
+            if "-" in text:
+                year, month, day = text.split("-")
+                return date(int(year), int(month), int(day))
+            if "/" in text:
+                first, second, third = text.split("/")
+                if len(first) == 4:
+                    return date(int(first), int(second), int(third))
+                return date(int(third), int(first), int(second))
+            if len(text) == 8 and text.isdigit():
+                return date(int(text[:4]), int(text[4:6]), int(text[6:]))
+        except ValueError:
+            return None
+        return None
+
+    def as_int64(value: Optional[str]) -> Optional[int]:
+        if value is None or not value.strip():
+            return None
+        try:
+            number = Decimal(value.strip())
+        except InvalidOperation:
+            return None
+        if not number.is_finite():
+            return None
+        return int(number.to_integral_value(rounding=ROUND_HALF_EVEN))
+
+    def load(path: Path, columns: int) -> List[Dict[str, object]]:
+        table = [r for r in csv_document(path, columns) if r[1] != ""]        # SelectRows
+        if not table:
+            return []
+        header, body = table[0], table[1:]                                    # PromoteHeaders
+        records = []
+        for r in body:
+            record: Dict[str, object] = {}
+            for name, value in zip(header, r):
+                if name is None:
+                    continue
+                if name == "Date":                                            # TransformColumnTypes
+                    value = as_date(value)
+                elif name in ("Active users", "Views"):
+                    value = as_int64(value)
+                record[RENAMES.get(name, name)] = value                       # RenameColumns
+            records.append(record)
+        return records
+
+    primary_table = load(primary, PRIMARY_COLUMNS)
+    channel_table = [{k: r.get(k) for k in ("Date", "Page_URL", "Channel_Group")}  # SelectColumns
+                     for r in load(channel, CHANNEL_COLUMNS)]
+
+    seen = set()
+    distinct: List[Dict[str, object]] = []                                     # Table.Distinct
+    for r in channel_table:
+        if (r["Date"], r["Page_URL"]) not in seen:
+            seen.add((r["Date"], r["Page_URL"]))
+            distinct.append(r)
+
+    nested_tables: Dict[Tuple, List[Dict[str, object]]] = {}                  # NestedJoin: all matches
+    for c in distinct:
+        nested_tables.setdefault((c["Date"], c["Page_URL"]), []).append(c)
+
+    result: List[Row] = []
+    for p in primary_table:                                                    # LeftOuter
+        nested = nested_tables.get((p.get("Date"), p.get("Page_URL")), [])
+        expanded = [c["Channel_Group"] for c in nested] or [None]              # ExpandTableColumn
+        for channel_group in expanded:
+            channel_group = DEFAULT_CHANNEL if channel_group is None else channel_group   # ReplaceValue
+            result.append((p.get("Date"), p.get("Page_URL"), channel_group,
+                           p.get("Active_Users"), p.get("Views")))
+    return result
+
+
+def read_output(out_path: Path) -> List[Row]:
+    rows: List[Row] = []
+    with open(out_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for r in reader:
+            rows.append((
+                date.fromisoformat(r[0]) if r[0] else None,
+                r[1], r[2],
+                int(r[3]) if r[3] else None,
+                int(r[4]) if r[4] else None,
+            ))
+    return rows
+
+
+def parity_report(expected: List[Row], actual: List[Row]) -> bool:
+    """Multiset comparison (NestedJoin does not guarantee row order)."""
+    exp, act = Counter(expected), Counter(actual)
+    missing, extra = exp - act, act - exp
+    print(f"  Reference rows (M logic): {len(expected):,}")
+    print(f"  Streaming rows:           {len(actual):,}")
+    if not missing and not extra:
+        print("  [SUCCESS] Parity: identical row multisets")
+        return True
+    print(f"  [ERROR] Parity mismatch: {sum(missing.values())} missing, {sum(extra.values())} extra")
+    for row in list(missing)[:5]:
+        print(f"    missing: {format_row(row)}")
+    for row in list(extra)[:5]:
+        print(f"    extra:   {format_row(row)}")
+    return False
+
+
+SELF_TEST_PRIMARY = (
+    "Page path and screen class,Date,Active users,Views\n"
+    "/news/a.html,2025-01-01,10,20\n"
+    "/news/a.html,2025-01-02,5,7\n"
+    "/news/b.html,2025-01-01,1,2.5\n"          # Int64 rounds half to even -> 2
+    ",2025-01-03,1,1\n"                         # empty Page_URL is kept (filter is on Column2)
+    "/news/c.html,,3,3\n"                       # empty Column2 (Date) -> dropped
+    "/news/d.html,2025-01-04,x,4\n"             # bad Int64 -> null
+    "/news/\"q\".html,2025-01-04,1,1,extra\n"   # quotes are literal, extra field dropped
+    "\"/news/f,g.html\",2025-01-05,2,3\n"        # quoted comma still splits: Date/Active users -> null
+    "/news/h.html,2025-01-06,inf,nan\n"         # non-finite numbers -> null
+    "/news/e.html\n"                            # ragged row: Column2 null -> kept
+)
+SELF_TEST_CHANNEL = (
+    "Page path and screen class,Date,Session default channel group,Active users,Views,Sessions\n"
+    "/news/a.html,2025-01-01,Organic Search,1,1,1\n"
+    "/news/a.html,2025-01-01,Direct,1,1,1\n"    # duplicate key -> first wins
+    "/news/b.html,2025-01-01,Referral,1,1,1\n"
+    "/news/b.html,2025-01-09,Email,1,1,1\n"     # no primary row
+    "/news/\"q\".html,2025-01-04,Social,1,1,1\n"
+    ",2025-01-03,,1,1,1\n"                      # empty channel text is not null -> stays ""
+    "/news/h.html,2025-01-06,\"Paid, Social\",1,1,1\n"   # quoted comma splits the channel text
+)
+
+
+def run_self_test(chunk_size: int) -> bool:
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        primary, channel, out = tmp_dir / "primary.csv", tmp_dir / "channel.csv", tmp_dir / "out.csv"
+        primary.write_text(SELF_TEST_PRIMARY, encoding=SOURCE_ENCODING)
+        channel.write_text(SELF_TEST_CHANNEL, encoding=SOURCE_ENCODING)
+        stats = EtlStats()
+        index = build_channel_index([channel], stats)
+        write_rows(join_primary(primary, index, stats), out, chunk_size, append=False)
+        ok = parity_report(reference_m_pipeline(primary, channel), read_output(out))
+
+        expected_channels = {
+            (date(2025, 1, 1), "/news/a.html"): "Organic Search",
+            (date(2025, 1, 2), "/news/a.html"): DEFAULT_CHANNEL,
+            (date(2025, 1, 3), ""): "",
+        }
+        for row in read_output(out):
+            want = expected_channels.get((row[0], row[1]))
+            if want is not None and row[2] != want:
+                print(f"  [ERROR] {row[1]} {row[0]}: channel {row[2]!r}, expected {want!r}")
+                ok = False
+        return ok
+
+
+# ============================================================================
+# PARTITION
+# ============================================================================
+
+def partition_m(out_path: str) -> str:
+    return "\n".join([
+        "let",
+        "    // Pre-joined by scripts/generators/prejoin_fact_sources.py (dedupe, left join, \"All Channels\" default)",
+        f"    Source = Csv.Document(File.Contents(\"{out_path}\"),[Delimiter=\",\", Columns={len(OUTPUT_COLUMNS)}, "
+        "Encoding=65001, QuoteStyle=QuoteStyle.Csv]),",
+        "    #\"Promoted Headers\" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),",
+        "    #\"Changed Type\" = Table.TransformColumnTypes(#\"Promoted Headers\",{{\"Date\", type date}, "
+        "{\"Page_URL\", type text}, {\"Channel_Group\", type text}, {\"Active_Users\", Int64.Type}, {\"Views\", Int64.Type}}),",
+        "    #\"Schema Lock\" = Table.SelectColumns(#\"Changed Type\", {\"Date\", \"Page_URL\", \"Channel_Group\", "
+        "\"Active_Users\", \"Views\"}, MissingField.Error)",
+        "in",
+        "    #\"Schema Lock\"",
+    ])
+
+
+def source_paths_from_partition(model_path: Path) -> List[str]:
+    """File.Contents paths of the press_data_with_dates partition (primary first)."""
+    model = load_semantic_model(model_path)
+    table = model.tables.get(FACT_TABLE)
+    if table is None:
+        return []
+    for partition in table.partitions:
+        if partition.name == PARTITION_NAME:
+            source = partition.expression_properties.get("source", "")
+            code = "\n".join(l for l in source.splitlines() if not l.strip().startswith("//"))
+            return re.findall(r'File\.Contents\("([^"]+)"\)', code)
+    return []
+
+
+def write_partition(model_path: Path, out_path: str) -> Path:
+    """Replace the fenced source of the press_data_with_dates partition."""
+    model = load_semantic_model(model_path)
+    partition = next(p for p in model.tables[FACT_TABLE].partitions if p.name == PARTITION_NAME)
+    file_path = partition.file_path
+    lines = file_path.read_text(encoding="utf-8-sig").splitlines()
+    start = next(i for i in range(partition.start_line - 1, partition.end_line)
+                 if lines[i].strip().startswith("source ="))
+    end = start
+    if lines[start].strip().endswith("```"):
+        end = next(i for i in range(start + 1, partition.end_line) if lines[i].strip() == "```")
+    indent = lines[start][:len(lines[start]) - len(lines[start].lstrip("\t"))]
+    body = [indent + "\t\t" + l for l in partition_m(out_path).splitlines()]
+    lines[start:end + 1] = [indent + "source = ```"] + body + [indent + "\t\t```"]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+def resolve_source(value: Optional[str], default: Optional[str], data_dir: Optional[str]) -> Optional[Path]:
+    if value:
+        return Path(value)
+    if default is None:
+        return None
+    name = re.split(r"[\\/]", default)[-1]
+    return Path(data_dir) / name if data_dir else Path(default)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-join the Fact_Press_Analytics CSV sources offline",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build the pre-joined file from the partition's own source names
+  python prejoin_fact_sources.py --data-dir ./data --verify
+
+  # Append a new GA4 export day
+  python prejoin_fact_sources.py --append --primary Trending_2025-06-01.csv --channel channels_2025-06-01.csv --out ./data/fact_press_analytics.csv
+
+  # Check the join logic without data
+  python prejoin_fact_sources.py --self-test
+        """
+    )
+    parser.add_argument("--primary", help="Trending_FILTERED.csv (views/users per page and day)")
+    parser.add_argument("--channel", help="press_data_with_dates_CLEAN.csv (channel group per page and day)")
+    parser.add_argument("--data-dir", help="Folder holding the source files named in the partition")
+    parser.add_argument("--out", help="Output CSV (default: fact_press_analytics.csv next to the primary source)")
+    parser.add_argument("--model", default=str(DEFAULT_MODEL_PATH), help="Path to the .SemanticModel folder")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per write batch (default: 50000)")
+    parser.add_argument("--append", action="store_true", help="Append dates newer than the output's last date")
+    parser.add_argument("--verify", action="store_true", help="Parity check against the M-logic reference")
+    parser.add_argument("--self-test", action="store_true", help="Parity check on the built-in fixture")
+    parser.add_argument("--emit-m", action="store_true", help="Print the M partition that reads the output")
+    parser.add_argument("--write-partition", action="store_true",
+                        help=f"Point {FACT_TABLE}.{PARTITION_NAME} at the output file")
+    args = parser.parse_args()
+
+    if args.self_test:
+        print("Self-test (built-in fixture vs M-logic reference):")
+        sys.exit(0 if run_self_test(min(args.chunk_size, 2)) else 1)
+
+    defaults = source_paths_from_partition(Path(args.model)) if Path(args.model).exists() else []
+    primary = resolve_source(args.primary, defaults[0] if len(defaults) > 0 else None, args.data_dir)
+    channel = resolve_source(args.channel, defaults[1] if len(defaults) > 1 else None, args.data_dir)
+    if primary is None or channel is None:
+        print("ERROR: Pass --primary and --channel (no defaults found in the partition)")
+        sys.exit(1)
+    for path in (primary, channel):
+        if not path.exists():
+            print(f"ERROR: Source not found: {path}")
+            sys.exit(1)
+    out_path = Path(args.out) if args.out else primary.with_name("fact_press_analytics.csv")
+
+    print("=" * 80)
+    print("Fact_Press_Analytics Pre-Join")
+    print("=" * 80)
+    print(f"Primary: {primary}")
+    print(f"Channel: {channel}")
+    print(f"Output:  {out_path}")
+    print(f"Mode: {'APPEND' if args.append else 'FULL'}")
+    print()
+
+    if args.append and out_path.exists() and not state_path(out_path).exists():
+        print(f"ERROR: --append needs {state_path(out_path).name} next to the output to know which dates it holds; "
+              f"rebuild without --append")
+        sys.exit(1)
+
+    stats = EtlStats()
+    state = load_state(out_path) if args.append else {}
+    after = date.fromisoformat(state["max_date"]) if state.get("max_date") else None
+
+    # On append, earlier channel files keep precedence for (Date, Page_URL) keys
+    channel = channel.resolve()
+    previous, missing = state_sources(out_path, state)
+    for entry in missing:
+        print(f"[WARN] Channel source from an earlier run not found, its keys are not matched: {entry}")
+    channel_paths = [p for p in previous if p != channel]
+    channel_paths.append(channel)
+    index = build_channel_index(channel_paths, stats)
+
+    written, max_date = write_rows(join_primary(primary, index, stats, after=after), out_path,
+                                   args.chunk_size, append=args.append)
+    stats.written = written
+
+    max_dates = [d for d in (after, max_date) if d is not None]
+    save_state(out_path, {
+        "max_date": max(max_dates).isoformat() if max_dates else None,
+        "rows": state.get("rows", 0) + written if args.append else written,
+        "channel_sources": [str(p) for p in channel_paths],
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    })
+
+    print(f"  Channel rows: {stats.channel_rows:,} ({stats.channel_keys:,} keys, {stats.channel_duplicates:,} duplicates dropped)")
+    print(f"  Primary rows: {stats.primary_rows:,}")
+    print(f"  Matched: {stats.matched:,}   Defaulted to '{DEFAULT_CHANNEL}': {stats.defaulted:,}")
+    if stats.skipped_existing:
+        print(f"  Skipped (already in output): {stats.skipped_existing:,}")
+    for column, count in stats.type_errors.items():
+        print(f"  [WARN] {count:,} '{column}' values could not be converted (null, as M error rows)")
+    print(f"  Written: {written:,}")
+    print()
+
+    if args.verify:
+        if args.append:
+            print("[WARN] --verify compares full builds; skipped in --append mode")
+        else:
+            print("Parity check:")
+            if not parity_report(reference_m_pipeline(primary, channel), read_output(out_path)):
+                sys.exit(1)
+            print()
+
+    if args.emit_m:
+        print(partition_m(str(out_path.resolve())))
+        print()
+    if args.write_partition:
+        path = write_partition(Path(args.model), str(out_path.resolve()))
+        print(f"🧾 Partition updated: {path}")
+
+
+if __name__ == "__main__":
+    main()
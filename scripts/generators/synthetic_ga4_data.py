@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Synthetic GA4 Export Generator (scale testing)
+
+Writes GA4-shaped CSVs in the exact layout the Fact_Press_Analytics
+partition reads, at any multiple of today's volume (~6.3M views across 754
+URLs per year, channel data for 285 of them):
+
+    Trending_FILTERED.csv           Page path and screen class, Date, Active users, Views
+    press_data_with_dates_CLEAN.csv Page path and screen class, Date, Session default channel group,
+                                    Active users, Views, Sessions
+
+Both files keep Date in Column2 (the partition drops rows where it is
+empty) and contain no commas or quotes in values (QuoteStyle.None).
+
+Distributions:
+- URLs: /press-room/<slug>.html releases plus the /press-room/index.html
+  landing page and a few non-press pages, so Page_Type gets all three
+  values; slugs are realistic lengths for URL-heavy columns
+- Popularity is log-normal (a few releases take most of the traffic);
+  each release starts on its publish date, decays with its own half-life
+  and keeps a long-tail floor; weekends are quieter
+- Views ~ Poisson(expected), rows only where Views > 0 (GA4 omits empty
+  rows); Active users ~ Binomial(Views, per-URL ratio), at least 1
+- Channel rows split the same Views over channels with a per-URL
+  Dirichlet mix (Organic Search, Direct, Referral, Organic Social, Email,
+  ...), for the most popular URLs only
+
+Generation is vectorized per day with a per-day random stream seeded from
+--seed, so the output is identical whatever --chunk-days is. Lines are
+buffered for --chunk-days days and then written, so memory is constant in
+the number of days (proportional to the URL count).
+
+Usage:
+    python synthetic_ga4_data.py --scale 10 --out-dir ./synthetic
+    python synthetic_ga4_data.py --scale 100 --days 730 --out-dir ./synthetic --max-bytes 4G
+
+Options:
+    --out-dir: Output folder (default: ./synthetic_ga4)
+    --scale: Volume multiple of today's data (URLs and views; default: 1)
+    --urls: Explicit URL count (overrides --scale for URLs)
+    --start: First date (default: 2024-01-01, first date of Dim_Date)
+    --days: Number of days (default: 365)
+    --seed: Random seed (default: 42)
+    --channel-coverage: Share of URLs with channel rows (default: 285/754)
+    --date-format: iso | ga4 (YYYYMMDD) | us (M/D/YYYY) (default: iso)
+    --chunk-days: Days buffered per write (default: 7)
+    --max-bytes: Stop after the chunk that crosses this output size (e.g. 2G)
+    --json: Write a summary JSON
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+PRIMARY_FILE = "Trending_FILTERED.csv"
+CHANNEL_FILE = "press_data_with_dates_CLEAN.csv"
+PRIMARY_HEADER = "Page path and screen class,Date,Active users,Views"
+CHANNEL_HEADER = "Page path and screen class,Date,Session default channel group,Active users,Views,Sessions"
+
+# Today's volume (Fact_Press_Analytics partition comments)
+BASELINE_URLS = 754
+BASELINE_VIEWS_PER_YEAR = 6_300_000
+BASELINE_CHANNEL_URLS = 285
+
+CHANNELS = ["Organic Search", "Direct", "Referral", "Organic Social", "Email", "Unassigned",
+            "Paid Search", "Organic Video"]
+CHANNEL_WEIGHTS = [0.36, 0.28, 0.13, 0.11, 0.06, 0.03, 0.02, 0.01]
+WEEKDAY_FACTOR = [1.08, 1.1, 1.06, 1.02, 0.94, 0.58, 0.52]     # Monday .. Sunday
+LANDING_PAGE = "/press-room/index.html"
+OTHER_PAGES = ["/about/news/index.html", "/about/leadership/secretary/index.html", "/news/index.html",
+               "/about/agencies/index.html", "/press-room/media-contacts.html"]
+
+AGENCIES = ["hhs", "cdc", "fda", "nih", "cms", "hrsa", "samhsa", "acf", "aspr", "ihs", "ahrq", "acl"]
+VERBS = ["announces", "awards", "launches", "releases", "issues", "expands", "approves", "finalizes",
+         "statement-on", "marks", "proposes", "invests", "urges", "renews", "celebrates"]
+TOPICS = ["rural-health", "maternal-health", "opioid-response", "mental-health", "medicare-advantage",
+          "medicaid-coverage", "drug-pricing", "vaccine-access", "health-equity", "child-care",
+          "tribal-health", "cancer-research", "heat-safety", "nurse-workforce", "telehealth",
+          "organ-transplant", "food-safety", "long-covid", "suicide-prevention", "hiv-prevention",
+          "health-it", "primary-care", "disaster-preparedness", "hospital-price-transparency"]
+DETAILS = ["funding", "grants", "guidance", "final-rule", "proposed-rule", "initiative", "report",
+           "partnership", "awards", "pilot-program", "data-release", "action-plan", "new-resources"]
+QUALIFIERS = ["for-states", "nationwide", "in-underserved-communities", "for-families", "for-providers",
+              "across-the-country", "for-2025", "to-improve-outcomes", ""]
+
+
+@dataclass
+class GenerationStats:
+    urls: int = 0
+    channel_urls: int = 0
+    days: int = 0
+    first_date: str = ""
+    last_date: str = ""
+    primary_rows: int = 0
+    channel_rows: int = 0
+    views: int = 0
+    channel_views: int = 0
+    primary_bytes: int = 0
+    channel_bytes: int = 0
+    seconds: float = 0.0
+    stopped_early: bool = False
+
+
+# ============================================================================
+# URL POPULATION
+# ============================================================================
+
+@dataclass
+class UrlPopulation:
+    paths: List[str]
+    popularity: "np.ndarray"       # relative daily traffic at publication
+    publish_day: "np.ndarray"      # day index (may be negative = published before --start)
+    half_life: "np.ndarray"        # days
+    floor: "np.ndarray"            # long-tail share of the peak
+    user_ratio: "np.ndarray"       # Active users / Views
+    channel_mix: "np.ndarray"      # (channel URLs, channels)
+    channel_urls: "np.ndarray"     # indices into paths
+
+
+def make_slugs(rng: "np.random.Generator", count: int) -> List[str]:
+    parts = [rng.integers(0, len(words), count) for words in (AGENCIES, VERBS, TOPICS, DETAILS, QUALIFIERS)]
+    seen = {}
+    slugs = []
+    for a, v, t, d, q in zip(*(p.tolist() for p in parts)):
+        slug = "-".join(x for x in (AGENCIES[a], VERBS[v], TOPICS[t], DETAILS[d], QUALIFIERS[q]) if x)
+        n = seen.get(slug, 0)
+        seen[slug] = n + 1
+        slugs.append(slug if n == 0 else f"{slug}-{n + 1}")
+    return slugs
+
+
+def build_population(rng: "np.random.Generator", urls: int, days: int, channel_coverage: float) -> UrlPopulation:
+    other = min(len(OTHER_PAGES), max(urls // 150, 1))
+    releases = max(urls - 1 - other, 0)
+    paths = [LANDING_PAGE] + OTHER_PAGES[:other] + [f"/press-room/{s}.html" for s in make_slugs(rng, releases)]
+    n = len(paths)
+
+    popularity = rng.lognormal(mean=0.0, sigma=1.4, size=n)
+    publish_day = rng.integers(-180, days, size=n)
+    half_life = rng.lognormal(mean=math.log(4.0), sigma=0.8, size=n)
+    floor = rng.uniform(0.01, 0.05, size=n)
+    # Landing and site pages: evergreen, no decay
+    evergreen = np.arange(n) <= other
+    popularity[0] = np.median(popularity) * 25
+    popularity[1:other + 1] *= 0.15
+    publish_day[evergreen] = -10_000
+    half_life[evergreen] = np.inf
+    floor[evergreen] = 1.0
+    user_ratio = rng.beta(11, 9, size=n)
+
+    covered = int(round(n * channel_coverage))
+    channel_urls = np.sort(np.argsort(-popularity, kind="stable")[:covered])
+    channel_mix = rng.dirichlet(np.array(CHANNEL_WEIGHTS) * 40, size=covered)
+    return UrlPopulation(paths, popularity, publish_day, half_life, floor, user_ratio, channel_mix, channel_urls)
+
+
+def expected_views(population: UrlPopulation, day: int, weekday: int) -> "np.ndarray":
+    """Expected views per URL on one day (before normalization)."""
+    age = day - population.publish_day
+    with np.errstate(over="ignore", invalid="ignore"):
+        decay = np.where(np.isinf(population.half_life), 1.0, np.exp2(-np.maximum(age, 0) / population.half_life))
+    shape = np.where(age >= 0, np.maximum(decay, population.floor), 0.0)
+    return population.popularity * shape * WEEKDAY_FACTOR[weekday]
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def format_dates(dates: List[date], style: str) -> List[str]:
+    if style == "ga4":
+        return [d.strftime("%Y%m%d") for d in dates]
+    if style == "us":
+        return [f"{d.month}/{d.day}/{d.year}" for d in dates]
+    return [d.isoformat() for d in dates]
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text))
+
+
+def generate(out_dir: Path, urls: int, views_per_year: float, start: date, days: int, seed: int,
+             channel_coverage: float, date_style: str, chunk_days: int,
+             max_bytes: Optional[int] = None) -> GenerationStats:
+    stats = GenerationStats()
+    started = time.perf_counter()
+    population = build_population(np.random.default_rng(seed), urls, days, channel_coverage)
+    stats.urls = len(population.paths)
+    stats.channel_urls = len(population.channel_urls)
+    dates = [start + timedelta(days=i) for i in range(days)]
+    labels = format_dates(dates, date_style)
+
+    # Normalize the expected total to the requested volume (cheap pass, no sampling)
+    raw_total = sum(float(expected_views(population, i, d.weekday()).sum()) for i, d in enumerate(dates))
+    factor = views_per_year * days / 365.0 / raw_total if raw_total else 0.0
+
+    paths = np.array(population.paths, dtype=object)
+    channel_paths = paths[population.channel_urls]
+    channel_position = np.full(len(paths), -1)
+    channel_position[population.channel_urls] = np.arange(len(population.channel_urls))
+    channel_names = np.array(CHANNELS, dtype=object)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / PRIMARY_FILE, "w", encoding="utf-8", newline="") as primary, \
+            open(out_dir / CHANNEL_FILE, "w", encoding="utf-8", newline="") as channel:
+        primary.write(PRIMARY_HEADER + "\n")
+        channel.write(CHANNEL_HEADER + "\n")
+        stats.primary_bytes = len(PRIMARY_HEADER) + 1
+        stats.channel_bytes = len(CHANNEL_HEADER) + 1
+        primary_buffer: List[str] = []
+        channel_buffer: List[str] = []
+
+        for i, current in enumerate(dates):
+            rng = np.random.default_rng([seed, i])
+            views = rng.poisson(expected_views(population, i, current.weekday()) * factor)
+            active = np.flatnonzero(views)
+            day_views = views[active]
+            users = np.maximum(rng.binomial(day_views, population.user_ratio[active]), 1)
+            label = labels[i]
+            primary_buffer.append("".join(
+                f"{p},{label},{u},{v}\n" for p, u, v in zip(paths[active], users.tolist(), day_views.tolist())))
+            stats.primary_rows += len(active)
+            stats.views += int(day_views.sum())
+
+            covered = active[channel_position[active] >= 0]
+            if len(covered):
+                mix = population.channel_mix[channel_position[covered]]
+                split = rng.multinomial(views[covered], mix)                     # (urls, channels)
+                url_index, channel_index = np.nonzero(split)
+                channel_views = split[url_index, channel_index]
+                channel_users = np.maximum(
+                    rng.binomial(channel_views, population.user_ratio[covered][url_index]), 1)
+                sessions = channel_users + rng.binomial(channel_views - channel_users, 0.35)
+                # Within a page-day, the biggest channel first (first row wins in Table.Distinct)
+                order = np.lexsort((-channel_views, url_index))
+                rows_paths = channel_paths[channel_position[covered][url_index[order]]]
+                channel_buffer.append("".join(
+                    f"{p},{label},{c},{u},{v},{s}\n" for p, c, u, v, s in zip(
+                        rows_paths, channel_names[channel_index[order]], channel_users[order].tolist(),
+                        channel_views[order].tolist(), sessions[order].tolist())))
+                stats.channel_rows += len(order)
+                stats.channel_views += int(channel_views.sum())
+
+            stats.days = i + 1
+            if (i + 1) % chunk_days == 0 or i + 1 == days:
+                stats.primary_bytes += primary.write("".join(primary_buffer))
+                stats.channel_bytes += channel.write("".join(channel_buffer))
+                primary_buffer.clear()
+                channel_buffer.clear()
+                if sys.stdout.isatty():
+                    mb = (stats.primary_bytes + stats.channel_bytes) / (1 << 20)
+                    print(f"\r  {current.isoformat()}  {stats.primary_rows:,} rows  {mb:,.1f} MB", end="", flush=True)
+                if max_bytes and stats.primary_bytes + stats.channel_bytes >= max_bytes:
+                    stats.stopped_early = i + 1 < days
+                    break
+        if sys.stdout.isatty():
+            print()
+
+    stats.first_date = dates[0].isoformat() if dates else ""
+    stats.last_date = dates[stats.days - 1].isoformat() if stats.days else ""
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_summary(stats: GenerationStats, out_dir: Path) -> None:
+    print("=" * 80)
+    print("Synthetic GA4 Export".center(80))
+    print("=" * 80)
+    print()
+    print(f"Dates:        {stats.first_date} .. {stats.last_date} ({stats.days} days)")
+    print(f"URLs:         {stats.urls:,} ({stats.channel_urls:,} with channel rows)")
+    print(f"Views:        {stats.views:,} ({stats.channel_views:,} in channel rows)")
+    print()
+    print(f"  {PRIMARY_FILE:<36} {stats.primary_rows:>14,} rows  {stats.primary_bytes / (1 << 20):>10,.1f} MB")
+    print(f"  {CHANNEL_FILE:<36} {stats.channel_rows:>14,} rows  {stats.channel_bytes / (1 << 20):>10,.1f} MB")
+    total_mb = (stats.primary_bytes + stats.channel_bytes) / (1 << 20)
+    rate = total_mb / stats.seconds if stats.seconds else 0.0
+    print()
+    print(f"Time:         {stats.seconds:.1f}s ({rate:,.1f} MB/s)")
+    if stats.stopped_early:
+        print("[WARN] Stopped at --max-bytes before the last date")
+    print()
+    print(f"[SUCCESS] Written to {out_dir}")
+    print(f"[INFO] Next: python prejoin_fact_sources.py --data-dir {out_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate GA4-shaped CSVs for the Fact_Press_Analytics partition at any scale",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Today's volume, one year
+  python synthetic_ga4_data.py --out-dir ./synthetic
+
+  # 100x for two years, capped at 4 GB
+  python synthetic_ga4_data.py --scale 100 --days 730 --out-dir ./synthetic --max-bytes 4G
+
+  # Raw GA4 date format
+  python synthetic_ga4_data.py --scale 10 --date-format ga4 --out-dir ./synthetic
+        """
+    )
+    parser.add_argument("--out-dir", default="synthetic_ga4", help="Output folder (default: ./synthetic_ga4)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Volume multiple of today's data (default: 1)")
+    parser.add_argument("--urls", type=int, help="Explicit URL count (overrides --scale for URLs)")
+    parser.add_argument("--start", default="2024-01-01", help="First date (default: 2024-01-01)")
+    parser.add_argument("--days", type=int, default=365, help="Number of days (default: 365)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--channel-coverage", type=float, default=BASELINE_CHANNEL_URLS / BASELINE_URLS,
+                        help="Share of URLs with channel rows (default: 285/754)")
+    parser.add_argument("--date-format", choices=["iso", "ga4", "us"], default="iso",
+                        help="Date column format (default: iso)")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Days buffered per write (default: 7)")
+    parser.add_argument("--max-bytes", help="Stop after the chunk that crosses this size (e.g. 2G)")
+    parser.add_argument("--json", help="Write a summary JSON to this path")
+    args = parser.parse_args()
+
+    if np is None:
+        print("ERROR: numpy is required (pip install numpy)")
+        sys.exit(1)
+    if args.days < 1 or args.chunk_days < 1 or args.scale <= 0:
+        print("ERROR: --days, --chunk-days and --scale must be positive")
+        sys.exit(1)
+    if not 0.0 <= args.channel_coverage <= 1.0:
+        print("ERROR: --channel-coverage must be between 0 and 1")
+        sys.exit(1)
+    try:
+        start = date.fromisoformat(args.start)
+        max_bytes = parse_size(args.max_bytes) if args.max_bytes else None
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        sys.exit(1)
+
+    urls = args.urls or max(int(round(BASELINE_URLS * args.scale)), 2)
+    out_dir = Path(args.out_dir)
+    stats = generate(out_dir, urls, BASELINE_VIEWS_PER_YEAR * args.scale, start, args.days, args.seed,
+                     args.channel_coverage, args.date_format, args.chunk_days, max_bytes)
+    print_summary(stats, out_dir)
+
+    if args.json:
+        summary = asdict(stats)
+        summary.update({"seed": args.seed, "scale": args.scale, "date_format": args.date_format})
+        Path(args.json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"🧾 JSON report: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Changed-Files Scope for the Validators
+
+Shared helper behind --changed-since <ref> in master_pbip_validator.py and
+check_all_measure_names.py. It lists the files changed since a git ref
+(committed, staged, unstaged and untracked) and expands them to the set of
+report/model files whose checks can be affected:
+
+- visual.json            -> itself + its page.json (page budgets are per page)
+- deleted visual.json    -> its page.json
+- page.json / bookmarks / report.json / pages.json -> itself
+- table .tmdl            -> itself + every visual.json whose fields use that
+                            table (projections, sort, formatting, filters)
+- other .tmdl (model, relationships, expressions) -> itself (model checks)
+
+Usage (as a module):
+    from changed_files import changed_scope
+    scope = changed_scope(report_path, "origin/main")
+    validator = PBIPValidator(report_path, only_files=scope.files)
+
+Usage (standalone, prints the closure):
+    python changed_files.py <ref> [report_path]
+"""
+
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Shared tooling lives next to this folder
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+if str(SCRIPTS_DIR / "analyzers") not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR / "analyzers"))
+
+from pbir_report import extract_visual_field_refs  # noqa: E402
+from tmdl_model import find_semantic_model_dir, parse_tmdl_file, resolve_definition_dir  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+@dataclass
+class ChangedScope:
+    """Files to validate and why each one is in scope."""
+    ref: str
+    changed: List[Path] = field(default_factory=list)
+    files: Set[Path] = field(default_factory=set)
+    reasons: Dict[Path, str] = field(default_factory=dict)
+
+    def add(self, path: Path, reason: str) -> None:
+        path = path.resolve()
+        if path not in self.files:
+            self.files.add(path)
+            self.reasons[path] = reason
+
+
+def _git(repo_dir: Path, *args: str) -> List[str]:
+    result = subprocess.run(["git", *args], cwd=repo_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {' '.join(args)} failed")
+    return [line for line in result.stdout.splitlines() if line.strip()]
+
+
+def git_changed_files(repo_dir: Path, ref: str) -> List[Path]:
+    """Files that differ between ref and the working tree, plus untracked files (absolute paths)."""
+    top = Path(_git(repo_dir, "rev-parse", "--show-toplevel")[0])
+    names = _git(top, "diff", "--name-only", "--no-renames", ref, "--")
+    names += _git(top, "ls-files", "--others", "--exclude-standard")
+    return sorted({(top / name).resolve() for name in names})
+
+
+def _tables_defined_in(tmdl_path: Path) -> Set[str]:
+    """Table names declared in a .tmdl file (file stem for deleted/unparseable files)."""
+    if tmdl_path.exists():
+        try:
+            tables = {node.name for node in parse_tmdl_file(tmdl_path) if node.kind == "table"}
+            if tables:
+                return tables
+        except Exception:
+            pass  # Fall back to the naming convention tables/<Table>.tmdl
+    return {tmdl_path.stem} if tmdl_path.parent.name == "tables" else set()
+
+
+def visual_entities(pages_dir: Path) -> Dict[Path, Set[str]]:
+    """visual.json -> tables its fields reference."""
+    usage: Dict[Path, Set[str]] = {}
+    for path in sorted(pages_dir.glob("*/visuals/*/visual.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError):
+            usage[path.resolve()] = set()   # Validate it anyway: the checks report the parse error
+            continue
+        usage[path.resolve()] = {ref.entity for ref in extract_visual_field_refs(data)} if isinstance(data, dict) else set()
+    return usage
+
+
+def changed_scope(report_path: Path, ref: str, model_dir: Optional[Path] = None,
+                  changed: Optional[List[Path]] = None) -> ChangedScope:
+    """Changed files since ref and their dependents within one report + semantic model."""
+    report_path = Path(report_path).resolve()
+    pages_dir = report_path / "definition" / "pages"
+    model_dir = resolve_definition_dir(model_dir) if model_dir else find_semantic_model_dir(report_path)
+    model_dir = model_dir.resolve() if model_dir else None
+
+    scope = ChangedScope(ref=ref)
+    scope.changed = changed if changed is not None else git_changed_files(report_path, ref)
+    project_roots = [report_path] + ([model_dir.parent] if model_dir else [])
+
+    changed_tables: Set[str] = set()
+    for path in scope.changed:
+        if not any(root == path or root in path.parents for root in project_roots):
+            if path.parent == report_path.parent and path.suffix == ".pbip":
+                scope.add(path, "changed")
+            continue
+        if path.name == "visual.json" and pages_dir in path.parents:
+            if path.exists():
+                scope.add(path, "changed")
+            page_json = path.parents[2] / "page.json"
+            if page_json.exists():
+                scope.add(page_json, f"page of changed visual {path.parent.name}")
+        elif path.suffix == ".tmdl" and model_dir and model_dir in path.parents:
+            if path.exists():
+                scope.add(path, "changed")
+            if path.parent.name != "cultures":
+                changed_tables |= _tables_defined_in(path)
+        elif path.exists():
+            scope.add(path, "changed")
+
+    if changed_tables:
+        for visual, entities in visual_entities(pages_dir).items():
+            used = sorted(entities & changed_tables)
+            if used:
+                scope.add(visual, f"uses changed table(s) {', '.join(used)}")
+    return scope
+
+
+def print_scope(scope: ChangedScope, base: Path) -> None:
+    print(f"Changed since {scope.ref}: {len(scope.changed)} file(s); validating {len(scope.files)} file(s)")
+    for path in sorted(scope.files):
+        try:
+            shown = path.relative_to(base)
+        except ValueError:
+            shown = path
+        print(f"  {shown}  ({scope.reasons[path]})")
+    print()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print(__doc__)
+        sys.exit(0 if len(sys.argv) > 1 else 1)
+    ref = sys.argv[1]
+    report_path = Path(sys.argv[2]) if len(sys.argv) > 2 else \
+        Path(__file__).resolve().parents[2] / "press-room-dashboard.Report"
+    try:
+        scope = changed_scope(report_path, ref)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print_scope(scope, report_path.resolve().parent)
+
+
+if __name__ == "__main__":
+    main()
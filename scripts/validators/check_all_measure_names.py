@@ -6,6 +6,14 @@ This script:
 1. Extracts all measure names from visual.json files
 2. Extracts all measure names from the semantic model (TMDL files)
 3. Compares them to find mismatches
+
+Usage:
+    python check_all_measure_names.py [report_path] [--model PATH] [--changed-since REF]
+
+Options:
+    --model: Semantic model folder (default: sibling press-room-dashboard.SemanticModel)
+    --changed-since REF: Only check visuals changed since a git ref, plus every
+      visual using a table whose .tmdl changed
 """
 
 import json
@@ -97,14 +105,57 @@ def extract_measures_from_tmdl(tmdl_file: Path) -> dict:
     return measures, columns
 
 def main():
-    report_path = Path("C:/Users/farad/OneDrive/Desktop/press-room-fresh/press-room-dashboard.Report")
-    semantic_model_path = Path("C:/Users/farad/OneDrive/Desktop/press-room-fresh/press-room-dashboard.SemanticModel")
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Check all measure and column names in visuals against the semantic model",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Full check
+  python check_all_measure_names.py "C:\\path\\to\\report.Report"
+  
+  # Only visuals affected by changes since main
+  python check_all_measure_names.py "C:\\path\\to\\report.Report" --changed-since origin/main
+        """
+    )
+    parser.add_argument(
+        "report_path",
+        nargs="?",
+        default="C:/Users/farad/OneDrive/Desktop/press-room-fresh/press-room-dashboard.Report",
+        help="Path to the .Report folder (default: press-room-fresh report)"
+    )
+    parser.add_argument(
+        "--model",
+        help="Path to the .SemanticModel folder (default: sibling of the report)"
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only check visuals affected by files changed since this git ref"
+    )
+    args = parser.parse_args()
+    
+    report_path = Path(args.report_path)
+    semantic_model_path = Path(args.model) if args.model else \
+        report_path.parent / report_path.name.replace(".Report", ".SemanticModel")
     
     print("="*80)
     print("Check All Measure Names".center(80))
     print("="*80)
     print()
     
+    scope = None
+    if args.changed_since:
+        from changed_files import changed_scope
+        try:
+            scope = changed_scope(report_path, args.changed_since, model_dir=semantic_model_path)
+        except (RuntimeError, FileNotFoundError) as e:
+            print(f"[ERROR] --changed-since {args.changed_since}: {e}")
+            sys.exit(1)
+        print(f"Changed since {args.changed_since}: {len(scope.changed)} file(s)")
+        print()
+    
     # Step 1: Extract measures from visuals
     print("STEP 1: Extracting measures from visuals...")
     print("-" * 80)
@@ -113,6 +164,11 @@ def main():
     pages_dir = report_path / "definition" / "pages"
     
     visual_json_files = list(pages_dir.rglob("visuals/*/visual.json"))
+    if scope is not None:
+        visual_json_files = [p for p in visual_json_files if p.resolve() in scope.files]
+        if not visual_json_files:
+            print("[SUCCESS] No visuals changed - nothing to check.")
+            sys.exit(0)
     print(f"Found {len(visual_json_files)} visuals to check")
     
     for visual_json_path in visual_json_files:
@@ -251,8 +307,13 @@ def main():
             print(f"  {status} {measure}")
         print()
     
-    # List all measures in semantic model (for reference)
-    if semantic_measures:
+    # List all measures in semantic model (for reference). With --changed-since the
+    # [✓] marks would only reflect the changed visuals, so the list is left out
+    if semantic_measures and scope is not None:
+        print(f"All measures in semantic model: not listed with --changed-since "
+              f"(only {len(visual_json_files)} changed visual(s) checked)")
+        print()
+    elif semantic_measures:
         print("All measures in semantic model:")
         for measure in sorted(semantic_measures.keys()):
             table = semantic_measures[measure]["table"]
@@ -3,31 +3,43 @@ Master Power BI PBIP Validator and Fixer
 
 This comprehensive script validates and fixes all known common issues in Power BI Project files.
 It checks:
-- Schema validation errors
+- Schema validation errors (offline, against vendored $schema versions - see pbir_schema.py)
 - Visual container structure errors
 - Page structure errors
 - TMDL syntax errors
 - Field type errors
 - Cache issues
+- Per-page query load budgets (performance)
+- Relationship filter propagation (performance)
 - And more...
 
 Usage:
-    python master_pbip_validator.py [report_path] [--fix] [--verbose] [--check-only]
+    python master_pbip_validator.py [report_path] [--fix] [--verbose] [--check-only] [--changed-since REF]
     
 Options:
     --fix: Automatically fix issues where possible
     --check-only: Only check, don't fix (default)
     --verbose: Show detailed output for each check
+    --changed-since REF: Only validate files changed since a git ref and their
+      dependents (e.g. a changed table .tmdl re-checks every visual using it)
+    --max-visuals-per-page / --max-projections-per-bucket /
+    --max-measures-per-page / --max-slicers-per-page: Per-page query load budgets
 """
 
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Set
 from dataclasses import dataclass, field
 from enum import Enum
 import sys
 
+# Shared TMDL tooling lives next to this folder
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+for _tool_dir in ("analyzers", "fixers"):
+    if str(SCRIPTS_DIR / _tool_dir) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR / _tool_dir))
+
 class IssueSeverity(Enum):
     """Severity levels for issues."""
     ERROR = "ERROR"      # Blocks Power BI from opening
@@ -45,6 +57,7 @@ class ValidationIssue:
     fixable: bool = False
     fix_description: str = ""
     line_number: Optional[int] = None
+    perf_severity: Optional[str] = None  # HIGH / MEDIUM / LOW for performance findings
 
 @dataclass
 class ValidationResult:
@@ -57,17 +70,38 @@ class ValidationResult:
     issues: List[ValidationIssue] = field(default_factory=list)
     fixed_files: List[str] = field(default_factory=list)
 
+@dataclass
+class QueryLoadBudget:
+    """Per-page query load budgets (every data-bound visual issues its own query)."""
+    max_data_bound_visuals: int = 12
+    max_projections_per_bucket: int = 10
+    max_distinct_measures: int = 25
+    max_slicers: int = 6
+
 class PBIPValidator:
     """Master validator for Power BI PBIP projects."""
     
     # Valid object types in page.json objects section
     VALID_PAGE_OBJECT_TYPES = {"background", "outspace"}
+
+    # Visual types counted against the slicer budget
+    SLICER_VISUAL_TYPES = {"slicer", "advancedSlicerVisual", "listSlicer", "textSlicer"}
     
-    def __init__(self, report_path: Path, auto_fix: bool = False, verbose: bool = False):
+    def __init__(self, report_path: Path, auto_fix: bool = False, verbose: bool = False,
+                 query_budget: Optional[QueryLoadBudget] = None,
+                 only_files: Optional[Iterable[Path]] = None):
         self.report_path = Path(report_path)
         self.auto_fix = auto_fix
         self.verbose = verbose
+        self.query_budget = query_budget or QueryLoadBudget()
         self.results = ValidationResult()
+
+        # Optional scope: only check these files (and the pages/model they belong to)
+        self.only_files: Optional[Set[Path]] = (
+            {Path(p).resolve() for p in only_files} if only_files is not None else None
+        )
+        # Parsed semantic model, shared by the model checks (may be injected by a caller)
+        self.semantic_model = None
         
         # Paths
         self.report_dir = self.report_path / "definition"
@@ -89,16 +123,25 @@ class PBIPValidator:
         print(f"Mode: {'AUTO-FIX' if self.auto_fix else 'CHECK-ONLY'}")
         print()
 
+        if self.only_files is not None:
+            print(f"Scope: {len(self.only_files)} file(s)")
+            print()
+
         # Run all validators
-        self._check_pages_json_structure()
+        if self._in_scope(self.pages_dir / "pages.json"):
+            self._check_pages_json_structure()
         self._check_page_json_objects()
         self._check_visual_drillFilterOtherVisuals()
         self._check_visual_container_objects_position()
         self._check_visual_tooltip_structure()
-        self._check_relationships_description()
+        if self.semantic_model_dir and self._in_scope(self.semantic_model_dir / "relationships.tmdl"):
+            self._check_relationships_description()
         self._check_missing_schemas()
-        self._check_cache_files()
-        self._check_required_pbism_file()
+        self._check_json_schemas()
+        if self._in_scope(self.report_dir / "definition.pbir"):
+            self._check_cache_files()
+        if self.semantic_model_dir and self._in_scope(self.semantic_model_dir.parent / "definition.pbism"):
+            self._check_required_pbism_file()
         self._check_background_properties()
         self._check_visual_query_structure()
 
@@ -108,9 +151,19 @@ class PBIPValidator:
         self._check_filter_config_position()
         self._check_alt_text_in_visuals()
         self._check_bookmark_exploration_state()
+        if self._in_scope(self.report_dir / "bookmarks"):
+            self._check_bookmark_set()
         self._check_empty_projections_dict()
-        self._check_dataset_reference()
-        self._check_pbip_artifacts_structure()
+        if self._in_scope(self.report_dir / "report.json"):
+            self._check_dataset_reference()
+        if self._in_scope(self.report_path.parent / f"{self.report_path.parent.name}.pbip"):
+            self._check_pbip_artifacts_structure()
+
+        # PERFORMANCE CHECKS
+        self._check_page_query_load_budget()
+        if self.semantic_model_dir and self._in_scope(self.semantic_model_dir):
+            self._check_auto_date_tables()
+            self._check_relationship_graph()
 
         # Calculate totals
         self.results.total_issues = len(self.results.issues)
@@ -122,7 +175,8 @@ class PBIPValidator:
     
     def _add_issue(self, category: str, severity: IssueSeverity, file_path: str,
                    issue_type: str, message: str, fixable: bool = False,
-                   fix_description: str = "", line_number: Optional[int] = None):
+                   fix_description: str = "", line_number: Optional[int] = None,
+                   perf_severity: Optional[str] = None):
         """Add a validation issue."""
         issue = ValidationIssue(
             category=category,
@@ -132,13 +186,49 @@ class PBIPValidator:
             message=message,
             fixable=fixable,
             fix_description=fix_description,
-            line_number=line_number
+            line_number=line_number,
+            perf_severity=perf_severity
         )
         self.results.issues.append(issue)
         
         if self.verbose:
             print(f"  [{severity.value}] {file_path}: {message}")
     
+    def _in_scope(self, *paths: Path) -> bool:
+        """True when no scope is set, or a scoped file is one of paths (or inside a path folder)."""
+        if self.only_files is None:
+            return True
+        for path in paths:
+            resolved = Path(path).resolve()
+            if any(f == resolved or resolved in f.parents for f in self.only_files):
+                return True
+        return False
+
+    def _iter_files(self, root: Path, pattern: str, recursive: bool = True) -> Iterator[Path]:
+        """
+        root.rglob(pattern) / root.glob(pattern), limited to the scoped files.
+        Scoped runs never walk the tree, so a one-file check stays fast on big reports.
+        """
+        if self.only_files is None:
+            yield from (root.rglob(pattern) if recursive else root.glob(pattern))
+            return
+        resolved_root = root.resolve()
+        depth = len(Path(pattern).parts)
+        for f in sorted(self.only_files):
+            if resolved_root not in f.parents or not f.match(pattern):
+                continue
+            relative = f.relative_to(resolved_root)
+            if not recursive and len(relative.parts) != depth:
+                continue
+            yield root / relative
+
+    def _load_semantic_model(self):
+        """Parse the semantic model once per run (shared by the model-level checks)."""
+        if self.semantic_model is None:
+            from tmdl_model import load_semantic_model
+            self.semantic_model = load_semantic_model(self.semantic_model_dir)
+        return self.semantic_model
+
     # ============================================================================
     # VALIDATION CHECKS
     # ============================================================================
@@ -232,7 +322,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
         
-        for page_json_path in self.pages_dir.rglob("page.json"):
+        for page_json_path in self._iter_files(self.pages_dir, "page.json"):
             if page_json_path.name != "page.json" or page_json_path.parent.name == "pages":
                 continue
             
@@ -289,7 +379,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
         
-        for visual_json_path in self.pages_dir.rglob("visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visual.json"):
             try:
                 content = visual_json_path.read_text(encoding='utf-8')
                 
@@ -327,7 +417,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
         
-        for visual_json_path in self.pages_dir.rglob("visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visual.json"):
             try:
                 with open(visual_json_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -410,7 +500,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
 
-        for visual_json_path in self.pages_dir.rglob("visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visual.json"):
             try:
                 content = visual_json_path.read_text(encoding='utf-8')
 
@@ -517,7 +607,7 @@ class PBIPValidator:
         """Check for missing $schema properties in key files."""
         # Check page.json files
         if self.pages_dir.exists():
-            for page_json_path in self.pages_dir.rglob("page.json"):
+            for page_json_path in self._iter_files(self.pages_dir, "page.json"):
                 if page_json_path.name != "page.json" or page_json_path.parent.name == "pages":
                     continue
                 
@@ -546,6 +636,97 @@ class PBIPValidator:
                 except Exception:
                     pass  # Skip read errors
     
+    # Schema violations reported per file before the rest are summarized
+    MAX_SCHEMA_ERRORS_PER_FILE = 5
+
+    def _check_json_schemas(self):
+        """Validate every file that declares a $schema against the vendored, precompiled schema."""
+        from pbir_schema import (SCHEMA_COMPILE_ERRORS, SCHEMA_FILE_SUFFIXES, SCHEMA_URL_PREFIX, get_schema_store,
+                                 read_schema_url)
+
+        store = get_schema_store()
+        item_dirs = [self.report_path]
+        if self.semantic_model_dir:
+            item_dirs.append(self.semantic_model_dir.parent)
+
+        not_vendored: Dict[str, int] = {}
+        broken: Dict[str, str] = {}
+        subsets: Set[str] = set()
+        for item_dir in item_dirs:
+            if not item_dir.exists():
+                continue
+            for fp in self._iter_files(item_dir, "*"):
+                if fp.suffix not in SCHEMA_FILE_SUFFIXES or not fp.is_file():
+                    continue
+                data, url = read_schema_url(fp)
+                if url is None or url in broken:
+                    continue  # Unreadable files and missing $schema are reported by other checks
+                try:
+                    errors = store.validate(data, url)
+                except SCHEMA_COMPILE_ERRORS as e:
+                    # One untranslatable regex or bad $ref must not abort the whole run
+                    broken[url] = f"{type(e).__name__}: {e}"
+                    continue
+                if errors is None:
+                    not_vendored[url] = not_vendored.get(url, 0) + 1
+                    continue
+                if store.is_subset(url):
+                    subsets.add(url)
+                rel_path = str(fp.relative_to(item_dir))
+                for error in errors[:self.MAX_SCHEMA_ERRORS_PER_FILE]:
+                    self._add_issue(
+                        "Schema Validation",
+                        IssueSeverity.ERROR,
+                        rel_path,
+                        f"schema_{error.keyword}",
+                        f"{error.path}: {error.message} ({url.rsplit('/', 3)[-3]} {url.rsplit('/', 2)[-2]})",
+                        fixable=False
+                    )
+                if len(errors) > self.MAX_SCHEMA_ERRORS_PER_FILE:
+                    self._add_issue(
+                        "Schema Validation",
+                        IssueSeverity.ERROR,
+                        rel_path,
+                        "schema_more_errors",
+                        f"{len(errors) - self.MAX_SCHEMA_ERRORS_PER_FILE} more schema error(s) "
+                        f"(python scripts/validators/pbir_schema.py check \"{fp}\")",
+                        fixable=False
+                    )
+
+        try:
+            vendor_display = str(store.vendor_dir.relative_to(self.report_path.resolve().parent))
+        except ValueError:
+            vendor_display = str(store.vendor_dir)
+        for url, reason in sorted(broken.items()):
+            self._add_issue(
+                "Schema Validation",
+                IssueSeverity.WARNING,
+                f"{vendor_display}/{url[len(SCHEMA_URL_PREFIX):]}",
+                "schema_not_compilable",
+                f"Vendored schema could not be compiled ({reason}); files using it were not schema-validated",
+                fix_description="Delete the file and re-vendor it: python scripts/validators/pbir_schema.py sync <report_path>"
+            )
+        if subsets:
+            self._add_issue(
+                "Schema Validation",
+                IssueSeverity.INFO,
+                vendor_display,
+                "schema_offline_subset",
+                f"{len(subsets)} $schema version(s) were checked against offline subset schemas "
+                f"(required keys and value types only), not the official schemas",
+                fix_description="With network: python scripts/validators/pbir_schema.py sync --refresh <report_path>"
+            )
+        if not_vendored:
+            self._add_issue(
+                "Schema Validation",
+                IssueSeverity.INFO,
+                vendor_display,
+                "schema_not_vendored",
+                f"{len(not_vendored)} $schema version(s) used by {sum(not_vendored.values())} file(s) are not "
+                f"vendored, so those files were not schema-validated",
+                fix_description="Run: python scripts/validators/pbir_schema.py sync <report_path>"
+            )
+
     def _check_cache_files(self):
         """Check for cache files that should be deleted."""
         cache_files = []
@@ -666,7 +847,7 @@ class PBIPValidator:
         
         invalid_props = ["imageFit", "imageTransparency", "imagePosition"]
         
-        for page_json_path in self.pages_dir.rglob("page.json"):
+        for page_json_path in self._iter_files(self.pages_dir, "page.json"):
             if page_json_path.name != "page.json" or page_json_path.parent.name == "pages":
                 continue
             
@@ -777,7 +958,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
         
-        for visual_json_path in self.pages_dir.rglob("visuals/*/visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visuals/*/visual.json"):
             try:
                 with open(visual_json_path, 'r', encoding='utf-8') as f:
                     visual_data = json.load(f)
@@ -1014,7 +1195,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
 
-        for visual_json_path in self.pages_dir.rglob("visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visual.json"):
             try:
                 with open(visual_json_path, 'r', encoding='utf-8') as f:
                     visual_data = json.load(f)
@@ -1050,7 +1231,7 @@ class PBIPValidator:
         if not self.report_dir.exists():
             return
 
-        for json_file in self.report_dir.rglob("*.json"):
+        for json_file in self._iter_files(self.report_dir, "*.json"):
             try:
                 with open(json_file, 'rb') as f:
                     first_bytes = f.read(3)
@@ -1081,7 +1262,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
 
-        for visual_json_path in self.pages_dir.rglob("visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visual.json"):
             try:
                 with open(visual_json_path, 'r', encoding='utf-8') as f:
                     visual_data = json.load(f)
@@ -1115,7 +1296,7 @@ class PBIPValidator:
         if not self.pages_dir.exists():
             return
 
-        for visual_json_path in self.pages_dir.rglob("visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visual.json"):
             try:
                 with open(visual_json_path, 'r', encoding='utf-8') as f:
                     visual_data = json.load(f)
@@ -1150,7 +1331,7 @@ class PBIPValidator:
         if not bookmarks_dir.exists():
             return
 
-        for bookmark_file in bookmarks_dir.glob("*.bookmark.json"):
+        for bookmark_file in self._iter_files(bookmarks_dir, "*.bookmark.json", recursive=False):
             try:
                 with open(bookmark_file, 'r', encoding='utf-8') as f:
                     bookmark_data = json.load(f)
@@ -1194,12 +1375,41 @@ class PBIPValidator:
             except Exception:
                 pass  # Skip read errors
 
+    def _check_bookmark_set(self):
+        """Cross-file bookmark checks: bookmarks.json, stale/untargeted state, links, equivalent bookmarks."""
+        if not (self.report_dir / "bookmarks").exists():
+            return
+        from compact_bookmarks import analyze_bookmarks, load_bookmark_set
+
+        try:
+            bset = load_bookmark_set(self.report_path)
+        except FileNotFoundError:
+            return
+        originals = {name: json.dumps(b.data, sort_keys=True) for name, b in bset.files.items()}
+        for finding in analyze_bookmarks(bset):
+            self._add_issue(
+                "Bookmark Structure",
+                IssueSeverity(finding.severity),
+                str(finding.path.relative_to(self.report_path)),
+                finding.issue_type,
+                f"{finding.bookmark}: {finding.message}" if finding.bookmark not in finding.path.name else finding.message,
+                fixable=finding.fixable,
+                fix_description="Compact bookmark state (scripts/fixers/compact_bookmarks.py)" if finding.fixable else ""
+            )
+
+        if self.auto_fix:
+            for name, bookmark in bset.files.items():
+                if json.dumps(bookmark.data, sort_keys=True) != originals[name]:
+                    bookmark.path.write_text(json.dumps(bookmark.data, indent=2, ensure_ascii=False), encoding="utf-8")
+                    self.results.fixed += 1
+                    self.results.fixed_files.append(str(bookmark.path))
+
     def _check_empty_projections_dict(self):
         """Check for empty projections dict {} in query.queryState (should be removed)."""
         if not self.pages_dir.exists():
             return
 
-        for visual_json_path in self.pages_dir.rglob("visual.json"):
+        for visual_json_path in self._iter_files(self.pages_dir, "visual.json"):
             try:
                 with open(visual_json_path, 'r', encoding='utf-8') as f:
                     visual_data = json.load(f)
@@ -1317,6 +1527,204 @@ class PBIPValidator:
              pass  # Skip read errors
 
      # ============================================================================
+    # PERFORMANCE CHECKS
+    # ============================================================================
+
+    def _check_page_query_load_budget(self):
+        """Check per-page query load (data-bound visuals, projections, measures, slicers) against budgets."""
+        if not self.pages_dir.exists():
+            return
+
+        budget = self.query_budget
+
+        for page_json_path in sorted(self.pages_dir.glob("*/page.json")):
+            page_dir = page_json_path.parent
+            if not self._in_scope(page_dir):
+                continue  # Budgets are per page: only recount pages with a scoped file
+            page_rel = str(page_json_path.relative_to(self.report_path))
+
+            data_bound_visuals = 0
+            slicers = 0
+            distinct_measures = set()
+
+            for visual_json_path in sorted(page_dir.glob("visuals/*/visual.json")):
+                try:
+                    with open(visual_json_path, 'r', encoding='utf-8') as f:
+                        visual_data = json.load(f)
+                except Exception:
+                    continue  # Skip read errors
+
+                visual = visual_data.get("visual", {})
+                visual_type = visual.get("visualType", "unknown")
+                query_state = visual.get("query", {}).get("queryState", {}) or {}
+
+                projection_count = 0
+                for bucket_name, bucket in query_state.items():
+                    projections = bucket.get("projections", []) if isinstance(bucket, dict) else []
+                    if not isinstance(projections, list):
+                        continue
+                    projection_count += len(projections)
+
+                    if len(projections) > budget.max_projections_per_bucket:
+                        self._add_issue(
+                            "Performance",
+                            IssueSeverity.WARNING,
+                            str(visual_json_path.relative_to(self.report_path)),
+                            "projections_per_bucket_budget",
+                            f"{visual_type} bucket '{bucket_name}' has {len(projections)} projections "
+                            f"(budget: {budget.max_projections_per_bucket})",
+                            fix_description="Split the visual or move fields to a drillthrough/tooltip page"
+                        )
+
+                    for proj in projections:
+                        measure = proj.get("field", {}).get("Measure") if isinstance(proj, dict) else None
+                        if measure:
+                            entity = measure.get("Expression", {}).get("SourceRef", {}).get("Entity", "")
+                            distinct_measures.add((entity, measure.get("Property", "")))
+
+                if projection_count > 0:
+                    data_bound_visuals += 1
+                if visual_type in self.SLICER_VISUAL_TYPES:
+                    slicers += 1
+
+            if self.verbose:
+                print(f"  [INFO] {page_rel}: {data_bound_visuals} data-bound visuals, "
+                      f"{len(distinct_measures)} distinct measures, {slicers} slicers")
+
+            if data_bound_visuals > budget.max_data_bound_visuals:
+                self._add_issue(
+                    "Performance",
+                    IssueSeverity.WARNING,
+                    page_rel,
+                    "data_bound_visuals_budget",
+                    f"Page has {data_bound_visuals} data-bound visuals, each issuing its own query "
+                    f"(budget: {budget.max_data_bound_visuals})",
+                    fix_description="Move secondary visuals to another page, tooltip or drillthrough"
+                )
+
+            if len(distinct_measures) > budget.max_distinct_measures:
+                self._add_issue(
+                    "Performance",
+                    IssueSeverity.WARNING,
+                    page_rel,
+                    "distinct_measures_budget",
+                    f"Page evaluates {len(distinct_measures)} distinct measures "
+                    f"(budget: {budget.max_distinct_measures})",
+                    fix_description="Consolidate KPI cards into a multi-row card or table"
+                )
+
+            if slicers > budget.max_slicers:
+                self._add_issue(
+                    "Performance",
+                    IssueSeverity.WARNING,
+                    page_rel,
+                    "slicers_budget",
+                    f"Page has {slicers} slicers, each issuing its own query and re-querying on every change "
+                    f"(budget: {budget.max_slicers})",
+                    fix_description="Move rarely used slicers to the filter pane"
+                )
+
+    def _check_auto_date_tables(self):
+        """Check for auto date/time tables (LocalDateTable_*/DateTableTemplate_*) and their variations."""
+        if not self.semantic_model_dir or not self.semantic_model_dir.exists():
+            return
+
+        try:
+            from remove_auto_date_tables import find_auto_date_artifacts, remove_auto_date_artifacts
+        except ImportError:
+            return  # Shared tooling not available
+
+        try:
+            model = self._load_semantic_model()
+            findings = find_auto_date_artifacts(model)
+        except Exception:
+            return  # Skip unparseable models (TMDL checks report those)
+
+        if not findings.found:
+            return
+
+        model_root = self.semantic_model_dir.parent
+        for table in findings.tables:
+            self._add_issue(
+                "Performance",
+                IssueSeverity.WARNING,
+                str(table.file_path.relative_to(model_root)),
+                "auto_date_table",
+                f"Auto date/time table '{table.name}' ({len(table.columns)} columns) is refreshed and held in memory",
+                fixable=not findings.dax_references,
+                fix_description="Remove auto date/time tables, variations, relationships and ref table entries"
+            )
+
+        for table_name, column_name, variation in findings.variations:
+            self._add_issue(
+                "Performance",
+                IssueSeverity.WARNING,
+                str(variation.file_path.relative_to(model_root)),
+                "auto_date_variation",
+                f"{table_name}[{column_name}] has variation '{variation.name}' pointing at an auto date/time table",
+                fixable=not findings.dax_references,
+                fix_description="Remove the variation block",
+                line_number=variation.start_line
+            )
+
+        if findings.time_intelligence_enabled:
+            self._add_issue(
+                "Performance",
+                IssueSeverity.WARNING,
+                str(model.model.file_path.relative_to(model_root)),
+                "auto_date_time_enabled",
+                "__PBI_TimeIntelligenceEnabled = 1 (Desktop will regenerate auto date/time tables)",
+                fixable=True,
+                fix_description="Set __PBI_TimeIntelligenceEnabled = 0"
+            )
+
+        for reference in findings.dax_references:
+            self._add_issue(
+                "Performance",
+                IssueSeverity.INFO,
+                reference,
+                "auto_date_dax_reference",
+                "DAX references an auto date/time table or Column.[Variation]; auto date tables not removed",
+                fix_description="Rewrite against Dim_Date, then re-run with --fix"
+            )
+
+        if self.auto_fix and not findings.dax_references:
+            changed = remove_auto_date_artifacts(model, findings)
+            self.results.fixed += 1
+            self.results.fixed_files.extend(changed)
+            self.semantic_model = None  # Re-parse for the checks that follow
+
+    def _check_relationship_graph(self):
+        """Lint relationships for filter-propagation cost (bidirectional, M:M, text keys, ambiguity)."""
+        if not self.semantic_model_dir or not self.semantic_model_dir.exists():
+            return
+
+        try:
+            from relationship_graph import RelationshipGraph
+        except ImportError:
+            return  # Shared tooling not available
+
+        try:
+            graph = RelationshipGraph(self._load_semantic_model())
+            findings = graph.analyze()
+        except Exception:
+            return  # Skip unparseable models (TMDL checks report those)
+
+        model_root = self.semantic_model_dir.parent
+        for finding in findings:
+            file_path = finding.file_path.relative_to(model_root) if finding.file_path else self.semantic_model_dir.name
+            self._add_issue(
+                "Performance",
+                IssueSeverity.INFO if finding.severity == "LOW" else IssueSeverity.WARNING,
+                str(file_path),
+                f"relationship_{finding.rule}",
+                f"{finding.relationship}: {finding.message}",
+                fix_description=finding.suggestion,
+                line_number=finding.line_number,
+                perf_severity=finding.severity
+            )
+
+    # ============================================================================
      # REPORTING
      # ============================================================================
     
@@ -1353,7 +1761,8 @@ class PBIPValidator:
                 }[issue.severity]
                 
                 fixable_marker = " [FIXABLE]" if issue.fixable else ""
-                print(f"  {severity_marker}{fixable_marker} {issue.file_path}")
+                perf_marker = f" [PERF:{issue.perf_severity}]" if issue.perf_severity else ""
+                print(f"  {severity_marker}{perf_marker}{fixable_marker} {issue.file_path}")
                 print(f"    {issue.message}")
                 if issue.fix_description:
                     print(f"    Fix: {issue.fix_description}")
@@ -1399,6 +1808,9 @@ Examples:
   
   # Verbose output
   python master_pbip_validator.py "C:\\path\\to\\report.Report" --verbose
+  
+  # Pre-commit / CI: only what changed since main (plus dependent visuals)
+  python master_pbip_validator.py "C:\\path\\to\\report.Report" --changed-since origin/main
         """
     )
     
@@ -1427,6 +1839,40 @@ Examples:
         help="Show detailed output for each check"
     )
     
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only validate files changed since this git ref (working tree + untracked) and their dependents"
+    )
+    
+    parser.add_argument(
+        "--max-visuals-per-page",
+        type=int,
+        default=QueryLoadBudget.max_data_bound_visuals,
+        help=f"Budget: data-bound visuals per page (default: {QueryLoadBudget.max_data_bound_visuals})"
+    )
+    
+    parser.add_argument(
+        "--max-projections-per-bucket",
+        type=int,
+        default=QueryLoadBudget.max_projections_per_bucket,
+        help=f"Budget: projections per queryState bucket (default: {QueryLoadBudget.max_projections_per_bucket})"
+    )
+    
+    parser.add_argument(
+        "--max-measures-per-page",
+        type=int,
+        default=QueryLoadBudget.max_distinct_measures,
+        help=f"Budget: distinct measures per page (default: {QueryLoadBudget.max_distinct_measures})"
+    )
+    
+    parser.add_argument(
+        "--max-slicers-per-page",
+        type=int,
+        default=QueryLoadBudget.max_slicers,
+        help=f"Budget: slicers per page (default: {QueryLoadBudget.max_slicers})"
+    )
+    
     args = parser.parse_args()
     
     report_path = Path(args.report_path)
@@ -1437,7 +1883,29 @@ Examples:
     
     auto_fix = args.fix and not args.check_only
     
-    validator = PBIPValidator(report_path, auto_fix=auto_fix, verbose=args.verbose)
+    query_budget = QueryLoadBudget(
+        max_data_bound_visuals=args.max_visuals_per_page,
+        max_projections_per_bucket=args.max_projections_per_bucket,
+        max_distinct_measures=args.max_measures_per_page,
+        max_slicers=args.max_slicers_per_page
+    )
+    
+    only_files = None
+    if args.changed_since:
+        from changed_files import changed_scope, print_scope
+        try:
+            scope = changed_scope(report_path, args.changed_since)
+        except RuntimeError as e:
+            print(f"ERROR: --changed-since {args.changed_since}: {e}")
+            sys.exit(1)
+        print_scope(scope, report_path.resolve().parent)
+        if not scope.files:
+            print("[SUCCESS] No report or model files changed - nothing to validate.")
+            sys.exit(0)
+        only_files = scope.files
+    
+    validator = PBIPValidator(report_path, auto_fix=auto_fix, verbose=args.verbose,
+                              query_budget=query_budget, only_files=only_files)
     results = validator.validate_all()
     validator.print_report()
     
@@ -0,0 +1,717 @@
+#!/usr/bin/env python3
+"""
+Offline JSON Schema Validation for PBIR / PBIP Files
+
+Every PBIR file declares the schema it follows in "$schema"
+(e.g. .../report/definition/page/2.0.0/schema.json). This module validates
+files against vendored copies of those schemas, with no network access:
+
+- Vendored schemas live under scripts/validators/schemas/, mirroring the URL
+  path after https://developer.microsoft.com/json-schemas/
+  (schemas/fabric/item/report/definition/page/2.0.0/schema.json).
+- Each schema is compiled once into nested Python closures (types, regexes,
+  enums and $ref targets resolved up front) and cached in a process-wide
+  SchemaStore, so validating the next file - or the next run inside the
+  resident validation_server.py - repeats none of the interpretation work.
+- Supported keywords (draft-07 / 2019-09 / 2020-12 core): type, enum, const,
+  properties, patternProperties, additionalProperties, required,
+  propertyNames, min/maxProperties, dependentRequired, dependencies, items,
+  prefixItems, additionalItems, contains, min/maxItems, uniqueItems,
+  min/maxLength, pattern, minimum, maximum, exclusiveMinimum/Maximum,
+  multipleOf, allOf, anyOf, oneOf, not, if/then/else, $ref ($defs,
+  definitions, relative files). Annotations (format, description, ...) are
+  ignored.
+
+master_pbip_validator.py runs this for every file in scope ("Schema
+Validation" issues). Schemas that are not vendored yet are reported once as
+INFO; vendor them with the sync command (needs network once).
+
+Schemas whose "$comment" starts with "Offline subset" are hand-written
+stand-ins for the versions this report uses (required keys and value types
+only, other keys allowed), vendored where the official files could not be
+downloaded. list marks them [SUBSET]; sync --refresh replaces them with the
+official files.
+
+Usage:
+    python pbir_schema.py list [report_path]        # $schema versions in use and vendored status
+    python pbir_schema.py sync [report_path]        # download missing schemas (and their $refs)
+    python pbir_schema.py sync --refresh            # also replace offline subset schemas
+    python pbir_schema.py check PATH [PATH ...]     # validate files / folders (e.g. pbir_out)
+
+Options:
+    --schemas: Vendored schema folder (default: scripts/validators/schemas)
+    --max-errors: Errors printed per file (check, default: 10)
+    --refresh: With sync, re-download vendored offline subset schemas
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+VENDOR_DIR = Path(__file__).resolve().parent / "schemas"
+SCHEMA_URL_PREFIX = "https://developer.microsoft.com/json-schemas/"
+DEFAULT_REPORT_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.Report"
+
+# Raised while loading/compiling a vendored schema (untranslatable ECMA regex, bad $ref pointer, bad JSON)
+SCHEMA_COMPILE_ERRORS = (re.error, KeyError, IndexError, ValueError, TypeError)
+
+# "$comment" prefix of hand-written stand-ins for official schemas (replaced by sync --refresh)
+SUBSET_MARKER = "Offline subset"
+
+# Files of a PBIP item folder that carry a $schema
+SCHEMA_FILE_SUFFIXES = {".json", ".pbir", ".pbism", ".pbip"}
+
+
+@dataclass
+class SchemaError:
+    """One schema violation inside an instance document."""
+    path: str            # JSON path in the instance, e.g. $.visual.query
+    message: str
+    keyword: str         # Schema keyword that failed
+
+
+Validator = Callable[[Any, str], Iterator[SchemaError]]
+
+
+def _accept(instance: Any, path: str) -> Iterator[SchemaError]:
+    return iter(())
+
+
+def _reject(instance: Any, path: str) -> Iterator[SchemaError]:
+    yield SchemaError(path, "No value is allowed here", "false")
+
+
+def _is_valid(validator: Validator, instance: Any, path: str) -> bool:
+    return next(iter(validator(instance, path)), None) is None
+
+
+def _child_path(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    if re.match(r"^[A-Za-z_$][A-Za-z0-9_$]*$", key):
+        return f"{path}.{key}"
+    return f"{path}[{json.dumps(key)}]"
+
+
+def _canonical(value: Any) -> str:
+    """JSON equality key: 1 == 1.0 but True != 1, object key order ignored."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return json.dumps(value)
+
+
+def _short(value: Any, limit: int = 60) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+JSON_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+}
+
+
+# ============================================================================
+# Schema store + compiler
+# ============================================================================
+
+class SchemaStore:
+    """Loads vendored schemas and caches one compiled validator per schema location."""
+
+    def __init__(self, vendor_dir: Path = VENDOR_DIR):
+        self.vendor_dir = Path(vendor_dir)
+        self._documents: Dict[str, Optional[Any]] = {}
+        self._compiled: Dict[str, Validator] = {}
+        self.missing: Set[str] = set()
+
+    # ---- Documents ----------------------------------------------------------
+
+    def vendored_path(self, url: str) -> Optional[Path]:
+        if not url.startswith(SCHEMA_URL_PREFIX):
+            return None
+        return self.vendor_dir / url[len(SCHEMA_URL_PREFIX):]
+
+    def load_document(self, url: str) -> Optional[Any]:
+        if url not in self._documents:
+            path = self.vendored_path(url)
+            document = None
+            if path is not None and path.exists():
+                document = json.loads(path.read_text(encoding="utf-8-sig"))
+            else:
+                self.missing.add(url)
+            self._documents[url] = document
+        return self._documents[url]
+
+    def is_vendored(self, url: str) -> bool:
+        path = self.vendored_path(url)
+        return path is not None and path.exists()
+
+    def is_subset(self, url: str) -> bool:
+        """Vendored file is an offline subset, not the official schema."""
+        document = self.load_document(url) if self.is_vendored(url) else None
+        return isinstance(document, dict) and str(document.get("$comment", "")).startswith(SUBSET_MARKER)
+
+    # ---- Public API ---------------------------------------------------------
+
+    def validator_for(self, url: str) -> Optional[Validator]:
+        """Compiled validator of a schema URL, or None when it is not vendored."""
+        url = url.split("#", 1)[0]
+        if self.load_document(url) is None:
+            return None
+        return self._compile_location(url, "")
+
+    def validate(self, instance: Any, url: Optional[str] = None) -> Optional[List[SchemaError]]:
+        """Errors of instance against its $schema (or url); None when the schema is not vendored."""
+        url = url or (instance.get("$schema") if isinstance(instance, dict) else None)
+        if not isinstance(url, str):
+            return None
+        validator = self.validator_for(url)
+        if validator is None:
+            return None
+        return list(validator(instance, "$"))
+
+    # ---- Compilation --------------------------------------------------------
+
+    def _compile_location(self, url: str, pointer: str) -> Validator:
+        key = f"{url}#{pointer}"
+        if key in self._compiled:
+            return self._compiled[key]
+
+        # Recursive $refs reach this key again while it compiles: hand them a forwarder
+        target: List[Validator] = []
+        self._compiled[key] = lambda instance, path: target[0](instance, path)
+
+        try:
+            document = self.load_document(url)
+            if document is None:
+                raise KeyError(f"Schema not vendored: {url}")
+            compiled = self._compile(_resolve_pointer(document, pointer), url)
+        except Exception:
+            del self._compiled[key]   # Do not leave a forwarder with no target behind
+            raise
+        target.append(compiled)
+        self._compiled[key] = compiled
+        return compiled
+
+    def _compile_ref(self, ref: str, base_url: str) -> Validator:
+        url, _, fragment = urllib.parse.urljoin(base_url, ref).partition("#")
+        if self.load_document(url) is None:
+            missing = url
+
+            def unresolved(instance: Any, path: str) -> Iterator[SchemaError]:
+                yield SchemaError(path, f"Referenced schema not vendored: {missing}", "$ref")
+            return unresolved
+        return self._compile_location(url, urllib.parse.unquote(fragment))
+
+    def _compile(self, schema: Any, base_url: str) -> Validator:
+        if schema is True or schema == {}:
+            return _accept
+        if schema is False:
+            return _reject
+        if not isinstance(schema, dict):
+            return _accept
+
+        if isinstance(schema.get("$id"), str) and not schema["$id"].startswith("#"):
+            base_url = urllib.parse.urljoin(base_url, schema["$id"]).split("#", 1)[0]
+
+        checks: List[Validator] = []
+        if isinstance(schema.get("$ref"), str):
+            checks.append(self._compile_ref(schema["$ref"], base_url))
+        checks.extend(_compile_generic(schema))
+        checks.extend(self._compile_object(schema, base_url))
+        checks.extend(self._compile_array(schema, base_url))
+        checks.extend(_compile_string(schema))
+        checks.extend(_compile_number(schema))
+        checks.extend(self._compile_combinators(schema, base_url))
+
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def validate(instance: Any, path: str) -> Iterator[SchemaError]:
+            for check in checks:
+                yield from check(instance, path)
+        return validate
+
+    def _compile_object(self, schema: Dict[str, Any], base_url: str) -> List[Validator]:
+        checks: List[Validator] = []
+        properties = {name: self._compile(sub, base_url)
+                      for name, sub in (schema.get("properties") or {}).items()}
+        patterns = [(re.compile(p), self._compile(sub, base_url))
+                    for p, sub in (schema.get("patternProperties") or {}).items()]
+        additional = schema.get("additionalProperties", True)
+        additional_validator = None if additional is True else self._compile(additional, base_url)
+
+        if properties or patterns or additional_validator is not None:
+            def check_properties(instance: Any, path: str) -> Iterator[SchemaError]:
+                if not isinstance(instance, dict):
+                    return
+                for name, value in instance.items():
+                    matched = False
+                    sub = properties.get(name)
+                    if sub is not None:
+                        matched = True
+                        yield from sub(value, _child_path(path, name))
+                    for regex, pattern_validator in patterns:
+                        if regex.search(name):
+                            matched = True
+                            yield from pattern_validator(value, _child_path(path, name))
+                    if not matched and additional_validator is not None:
+                        if additional is False:
+                            yield SchemaError(path, f"Additional property '{name}' is not allowed",
+                                              "additionalProperties")
+                        else:
+                            yield from additional_validator(value, _child_path(path, name))
+            checks.append(check_properties)
+
+        required = [r for r in schema.get("required") or [] if isinstance(r, str)]
+        if required:
+            def check_required(instance: Any, path: str) -> Iterator[SchemaError]:
+                if isinstance(instance, dict):
+                    for name in required:
+                        if name not in instance:
+                            yield SchemaError(path, f"Missing required property '{name}'", "required")
+            checks.append(check_required)
+
+        if "propertyNames" in schema:
+            names_validator = self._compile(schema["propertyNames"], base_url)
+
+            def check_names(instance: Any, path: str) -> Iterator[SchemaError]:
+                if isinstance(instance, dict):
+                    for name in instance:
+                        if not _is_valid(names_validator, name, path):
+                            yield SchemaError(path, f"Property name '{name}' is not allowed", "propertyNames")
+            checks.append(check_names)
+
+        min_props, max_props = schema.get("minProperties"), schema.get("maxProperties")
+        if min_props is not None or max_props is not None:
+            def check_count(instance: Any, path: str) -> Iterator[SchemaError]:
+                if isinstance(instance, dict):
+                    if min_props is not None and len(instance) < min_props:
+                        yield SchemaError(path, f"Expected at least {min_props} properties", "minProperties")
+                    if max_props is not None and len(instance) > max_props:
+                        yield SchemaError(path, f"Expected at most {max_props} properties", "maxProperties")
+            checks.append(check_count)
+
+        # dependentRequired (2019-09) and the draft-07 "dependencies" keyword
+        dependent_required: Dict[str, List[str]] = dict(schema.get("dependentRequired") or {})
+        dependent_schemas: Dict[str, Validator] = {
+            name: self._compile(sub, base_url) for name, sub in (schema.get("dependentSchemas") or {}).items()
+        }
+        for name, dep in (schema.get("dependencies") or {}).items():
+            if isinstance(dep, list):
+                dependent_required[name] = dep
+            else:
+                dependent_schemas[name] = self._compile(dep, base_url)
+        if dependent_required or dependent_schemas:
+            def check_dependencies(instance: Any, path: str) -> Iterator[SchemaError]:
+                if not isinstance(instance, dict):
+                    return
+                for name, needed in dependent_required.items():
+                    if name in instance:
+                        for other in needed:
+                            if other not in instance:
+                                yield SchemaError(path, f"Property '{name}' requires '{other}'", "dependentRequired")
+                for name, sub in dependent_schemas.items():
+                    if name in instance:
+                        yield from sub(instance, path)
+            checks.append(check_dependencies)
+        return checks
+
+    def _compile_array(self, schema: Dict[str, Any], base_url: str) -> List[Validator]:
+        checks: List[Validator] = []
+        items = schema.get("items")
+        prefix_schemas = schema.get("prefixItems")
+        rest_schema: Any = True
+        if isinstance(items, list):                       # draft-07 tuple form
+            prefix_schemas, rest_schema = items, schema.get("additionalItems", True)
+        elif items is not None:
+            rest_schema = items
+        prefix = [self._compile(sub, base_url) for sub in prefix_schemas or []]
+        rest = None if rest_schema is True else self._compile(rest_schema, base_url)
+
+        if prefix or rest is not None:
+            def check_items(instance: Any, path: str) -> Iterator[SchemaError]:
+                if not isinstance(instance, list):
+                    return
+                for i, item in enumerate(instance):
+                    if i < len(prefix):
+                        yield from prefix[i](item, _child_path(path, i))
+                    elif rest is not None:
+                        if rest_schema is False:
+                            yield SchemaError(path, f"Array allows at most {len(prefix)} items", "items")
+                            return
+                        yield from rest(item, _child_path(path, i))
+            checks.append(check_items)
+
+        if "contains" in schema:
+            contains = self._compile(schema["contains"], base_url)
+            min_contains = schema.get("minContains", 1)
+
+            def check_contains(instance: Any, path: str) -> Iterator[SchemaError]:
+                if isinstance(instance, list):
+                    hits = sum(1 for i, item in enumerate(instance) if _is_valid(contains, item, _child_path(path, i)))
+                    if hits < min_contains:
+                        yield SchemaError(path, "Array does not contain a matching item", "contains")
+            checks.append(check_contains)
+
+        min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+        unique = schema.get("uniqueItems") is True
+        if min_items is not None or max_items is not None or unique:
+            def check_size(instance: Any, path: str) -> Iterator[SchemaError]:
+                if not isinstance(instance, list):
+                    return
+                if min_items is not None and len(instance) < min_items:
+                    yield SchemaError(path, f"Expected at least {min_items} items, got {len(instance)}", "minItems")
+                if max_items is not None and len(instance) > max_items:
+                    yield SchemaError(path, f"Expected at most {max_items} items, got {len(instance)}", "maxItems")
+                if unique and len({_canonical(item) for item in instance}) < len(instance):
+                    yield SchemaError(path, "Array items are not unique", "uniqueItems")
+            checks.append(check_size)
+        return checks
+
+    def _compile_combinators(self, schema: Dict[str, Any], base_url: str) -> List[Validator]:
+        checks: List[Validator] = []
+        for sub in schema.get("allOf") or []:
+            checks.append(self._compile(sub, base_url))
+
+        if schema.get("anyOf"):
+            any_of = [self._compile(sub, base_url) for sub in schema["anyOf"]]
+
+            def check_any_of(instance: Any, path: str) -> Iterator[SchemaError]:
+                if not any(_is_valid(v, instance, path) for v in any_of):
+                    yield SchemaError(path, f"Value {_short(instance)} matches none of {len(any_of)} anyOf alternatives",
+                                      "anyOf")
+            checks.append(check_any_of)
+
+        if schema.get("oneOf"):
+            one_of = [self._compile(sub, base_url) for sub in schema["oneOf"]]
+
+            def check_one_of(instance: Any, path: str) -> Iterator[SchemaError]:
+                matches = sum(1 for v in one_of if _is_valid(v, instance, path))
+                if matches != 1:
+                    yield SchemaError(path, f"Value {_short(instance)} matches {matches} of {len(one_of)} oneOf "
+                                            f"alternatives (expected exactly 1)", "oneOf")
+            checks.append(check_one_of)
+
+        if "not" in schema:
+            negated = self._compile(schema["not"], base_url)
+
+            def check_not(instance: Any, path: str) -> Iterator[SchemaError]:
+                if _is_valid(negated, instance, path):
+                    yield SchemaError(path, "Value matches a schema it must not match", "not")
+            checks.append(check_not)
+
+        if "if" in schema and ("then" in schema or "else" in schema):
+            condition = self._compile(schema["if"], base_url)
+            then_validator = self._compile(schema.get("then", True), base_url)
+            else_validator = self._compile(schema.get("else", True), base_url)
+
+            def check_if(instance: Any, path: str) -> Iterator[SchemaError]:
+                branch = then_validator if _is_valid(condition, instance, path) else else_validator
+                yield from branch(instance, path)
+            checks.append(check_if)
+        return checks
+
+
+def _resolve_pointer(document: Any, pointer: str) -> Any:
+    """Resolve a JSON pointer fragment ("/$defs/Foo") inside a schema document."""
+    node = document
+    for part in pointer.lstrip("/").split("/") if pointer.strip("/") else []:
+        part = part.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, list):
+            node = node[int(part)]
+        else:
+            node = node[part]
+    return node
+
+
+def _compile_generic(schema: Dict[str, Any]) -> List[Validator]:
+    checks: List[Validator] = []
+    types = schema.get("type")
+    if types is not None:
+        names = [types] if isinstance(types, str) else list(types)
+        type_checks = [JSON_TYPE_CHECKS[t] for t in names if t in JSON_TYPE_CHECKS]
+        expected = " or ".join(names)
+
+        def check_type(instance: Any, path: str) -> Iterator[SchemaError]:
+            if not any(check(instance) for check in type_checks):
+                yield SchemaError(path, f"Expected {expected}, got {_short(instance)}", "type")
+        checks.append(check_type)
+
+    if "enum" in schema and isinstance(schema["enum"], list):
+        allowed = {_canonical(v) for v in schema["enum"]}
+        shown = ", ".join(_short(v, 30) for v in schema["enum"][:8]) + (", ..." if len(schema["enum"]) > 8 else "")
+
+        def check_enum(instance: Any, path: str) -> Iterator[SchemaError]:
+            if _canonical(instance) not in allowed:
+                yield SchemaError(path, f"Value {_short(instance)} is not one of: {shown}", "enum")
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = _canonical(schema["const"])
+        const_shown = _short(schema["const"])
+
+        def check_const(instance: Any, path: str) -> Iterator[SchemaError]:
+            if _canonical(instance) != const:
+                yield SchemaError(path, f"Value {_short(instance)} must be {const_shown}", "const")
+        checks.append(check_const)
+    return checks
+
+
+def _compile_string(schema: Dict[str, Any]) -> List[Validator]:
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    regex = re.compile(schema["pattern"]) if isinstance(schema.get("pattern"), str) else None
+    if min_length is None and max_length is None and regex is None:
+        return []
+
+    def check_string(instance: Any, path: str) -> Iterator[SchemaError]:
+        if not isinstance(instance, str):
+            return
+        if min_length is not None and len(instance) < min_length:
+            yield SchemaError(path, f"String shorter than {min_length} characters", "minLength")
+        if max_length is not None and len(instance) > max_length:
+            yield SchemaError(path, f"String longer than {max_length} characters", "maxLength")
+        if regex is not None and not regex.search(instance):
+            yield SchemaError(path, f"String {_short(instance)} does not match pattern {regex.pattern}", "pattern")
+    return [check_string]
+
+
+def _compile_number(schema: Dict[str, Any]) -> List[Validator]:
+    bounds: List[Tuple[str, Callable[[float], bool], str]] = []
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    exclusive_min, exclusive_max = schema.get("exclusiveMinimum"), schema.get("exclusiveMaximum")
+    if exclusive_min is True:                 # draft-04 boolean form
+        exclusive_min, minimum = minimum, None
+    if exclusive_max is True:
+        exclusive_max, maximum = maximum, None
+    if isinstance(minimum, (int, float)):
+        bounds.append(("minimum", lambda v, b=minimum: v >= b, f">= {minimum}"))
+    if isinstance(maximum, (int, float)):
+        bounds.append(("maximum", lambda v, b=maximum: v <= b, f"<= {maximum}"))
+    if isinstance(exclusive_min, (int, float)) and not isinstance(exclusive_min, bool):
+        bounds.append(("exclusiveMinimum", lambda v, b=exclusive_min: v > b, f"> {exclusive_min}"))
+    if isinstance(exclusive_max, (int, float)) and not isinstance(exclusive_max, bool):
+        bounds.append(("exclusiveMaximum", lambda v, b=exclusive_max: v < b, f"< {exclusive_max}"))
+    multiple_of = schema.get("multipleOf")
+    if isinstance(multiple_of, (int, float)) and multiple_of > 0:
+        bounds.append(("multipleOf",
+                       lambda v, m=multiple_of: math.isclose(round(v / m) * m, v, rel_tol=1e-9, abs_tol=1e-12),
+                       f"a multiple of {multiple_of}"))
+    if not bounds:
+        return []
+
+    def check_number(instance: Any, path: str) -> Iterator[SchemaError]:
+        if isinstance(instance, bool) or not isinstance(instance, (int, float)):
+            return
+        for keyword, ok, expected in bounds:
+            if not ok(instance):
+                yield SchemaError(path, f"Value {instance} must be {expected}", keyword)
+    return [check_number]
+
+
+_DEFAULT_STORE: Optional[SchemaStore] = None
+
+
+def get_schema_store() -> SchemaStore:
+    """Process-wide store: compiled validators survive across files and validator runs."""
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = SchemaStore()
+    return _DEFAULT_STORE
+
+
+# ============================================================================
+# Files + CLI
+# ============================================================================
+
+def iter_schema_files(roots: Iterable[Path]) -> Iterator[Path]:
+    """JSON files (including .pbir/.pbism/.pbip) under the given files/folders."""
+    for root in roots:
+        root = Path(root)
+        if root.is_file():
+            yield root
+            continue
+        for fp in sorted(root.rglob("*")):
+            if fp.suffix in SCHEMA_FILE_SUFFIXES and fp.is_file():
+                yield fp
+
+
+def read_schema_url(fp: Path) -> Tuple[Optional[Any], Optional[str]]:
+    """(parsed document, $schema URL) - (None, None) for unreadable files."""
+    try:
+        data = json.loads(fp.read_text(encoding="utf-8-sig"))
+    except (OSError, ValueError):
+        return None, None
+    url = data.get("$schema") if isinstance(data, dict) else None
+    return data, url if isinstance(url, str) else None
+
+
+def project_roots(report_path: Path) -> List[Path]:
+    """A .Report folder plus its sibling .SemanticModel folder(s)."""
+    report_path = Path(report_path)
+    roots = [report_path]
+    if report_path.parent.exists():
+        roots += [p for p in sorted(report_path.parent.iterdir())
+                  if p.is_dir() and p.name.endswith(".SemanticModel")]
+    return roots
+
+
+def schema_usage(roots: Iterable[Path]) -> Dict[str, List[Path]]:
+    usage: Dict[str, List[Path]] = {}
+    for fp in iter_schema_files(roots):
+        _, url = read_schema_url(fp)
+        if url:
+            usage.setdefault(url, []).append(fp)
+    return usage
+
+
+def _external_refs(schema: Any, base_url: str) -> Set[str]:
+    refs: Set[str] = set()
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if isinstance(ref, str) and not ref.startswith("#"):
+            refs.add(urllib.parse.urljoin(base_url, ref).split("#", 1)[0])
+        for value in schema.values():
+            refs |= _external_refs(value, base_url)
+    elif isinstance(schema, list):
+        for value in schema:
+            refs |= _external_refs(value, base_url)
+    return refs
+
+
+def sync_schemas(store: SchemaStore, urls: Iterable[str], timeout: float = 30.0,
+                 refresh: bool = False) -> Tuple[List[str], List[str]]:
+    """Download missing schemas (following external $refs) into the vendor folder; refresh replaces subsets."""
+    fetched, failed = [], []
+    queue = sorted(set(urls))
+    seen: Set[str] = set()
+    while queue:
+        url = queue.pop(0)
+        if url in seen:
+            continue
+        seen.add(url)
+        path = store.vendored_path(url)
+        if path is None:
+            failed.append(f"{url} (not under {SCHEMA_URL_PREFIX})")
+            continue
+        if not path.exists() or (refresh and store.is_subset(url)):
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    body = response.read()
+                json.loads(body.decode("utf-8-sig"))
+            except Exception as e:
+                failed.append(f"{url} ({e})")
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            fetched.append(url)
+        document = json.loads(path.read_text(encoding="utf-8-sig"))
+        queue.extend(sorted(_external_refs(document, url) - seen))
+    return fetched, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline JSON Schema validation for PBIR / PBIP files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Which schema versions does the report use, and are they vendored?
+  python pbir_schema.py list
+
+  # Vendor the missing ones (one-time, needs network)
+  python pbir_schema.py sync "C:\\\\path\\\\to\\\\report.Report"
+
+  # Validate generator output offline
+  python pbir_schema.py check pbir_out
+        """
+    )
+    parser.add_argument("command", choices=["list", "sync", "check"])
+    parser.add_argument("paths", nargs="*", help="Report folder (list/sync) or files/folders to check")
+    parser.add_argument("--schemas", default=str(VENDOR_DIR), help="Vendored schema folder")
+    parser.add_argument("--max-errors", type=int, default=10, help="Errors printed per file (default: 10)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="With sync: replace offline subset schemas with the official files")
+    args = parser.parse_args()
+
+    store = SchemaStore(Path(args.schemas))
+    if args.command in ("list", "sync"):
+        report_path = Path(args.paths[0]) if args.paths else DEFAULT_REPORT_PATH
+        if not report_path.exists():
+            print(f"ERROR: Report path not found: {report_path}")
+            sys.exit(1)
+        usage = schema_usage(project_roots(report_path))
+        if args.command == "sync":
+            fetched, failed = sync_schemas(store, usage, refresh=args.refresh)
+            for url in fetched:
+                print(f"[OK] Vendored {url}")
+            for entry in failed:
+                print(f"[ERROR] {entry}")
+            print(f"\n{len(fetched)} schema(s) downloaded, {len(failed)} failed")
+            sys.exit(1 if failed else 0)
+        for url in sorted(usage):
+            status = ("[SUBSET]" if store.is_subset(url) else "[OK]  ") if store.is_vendored(url) else "[MISSING]"
+            print(f"  {status} {url}  ({len(usage[url])} file(s))")
+        missing = sum(1 for url in usage if not store.is_vendored(url))
+        subsets = sum(1 for url in usage if store.is_subset(url))
+        print(f"\n{len(usage)} schema version(s) in use, {missing} not vendored, {subsets} offline subset(s)")
+        sys.exit(0)
+
+    if not args.paths:
+        parser.error("check needs at least one file or folder")
+    checked = invalid = unvalidated = 0
+    broken: Dict[str, str] = {}
+    for fp in iter_schema_files(Path(p) for p in args.paths):
+        data, url = read_schema_url(fp)
+        if url is None:
+            continue
+        if url in broken:
+            unvalidated += 1
+            continue
+        try:
+            errors = store.validate(data, url)
+        except SCHEMA_COMPILE_ERRORS as e:
+            broken[url] = f"{type(e).__name__}: {e}"
+            unvalidated += 1
+            continue
+        if errors is None:
+            unvalidated += 1
+            continue
+        checked += 1
+        if errors:
+            invalid += 1
+            print(f"[ERROR] {fp}: {len(errors)} schema error(s)")
+            for error in errors[:args.max_errors]:
+                print(f"    {error.path}: {error.message}")
+            if len(errors) > args.max_errors:
+                print(f"    ... {len(errors) - args.max_errors} more")
+    print(f"\nValidated {checked} file(s): {invalid} invalid; {unvalidated} skipped (schema not vendored or not compilable)")
+    for url in sorted(store.missing):
+        print(f"  [MISSING] {url}")
+    for url, reason in sorted(broken.items()):
+        print(f"  [ERROR] {url}: schema could not be compiled ({reason})")
+    sys.exit(1 if invalid or broken else 0)
+
+
+if __name__ == "__main__":
+    main()
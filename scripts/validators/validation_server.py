@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+PBIP Validation Server (JSON-RPC 2.0 over stdio)
+
+Resident validator for editor integration. Every save that shells out to
+master_pbip_validator.py pays for Python startup, semantic model discovery
+and a full rescan; this server loads the semantic model, the field index
+(table -> columns / measures) and every visual's field references once, and
+on each "file changed" message re-checks only the affected files:
+
+- JSON syntax errors (with line/column)
+- master_pbip_validator.py checks, scoped to the changed files and their page
+  (queryState bucket structure, schema, BOM, tooltip, budgets, ...); vendored
+  JSON Schemas are compiled once at warm-up (pbir_schema.py)
+- Measure/column references against the warm field index (missing measures,
+  missing columns, measures on the wrong table)
+- A changed .tmdl file re-parses only that file, runs the model checks and
+  re-checks the references of every visual, returning the visuals whose
+  diagnostics changed
+
+Framing: LSP-style "Content-Length" headers, or one JSON message per line
+(replies use the framing of the request).
+
+Methods:
+    initialize            {"reportPath"?, "modelPath"?} -> warm-up summary
+    pbip/fileChanged      {"files": [path, ...]} -> diagnostics per affected file
+                          (as a notification: pushed as textDocument/publishDiagnostics)
+    textDocument/didSave, textDocument/didChange, workspace/didChangeWatchedFiles
+                          LSP notifications, handled like pbip/fileChanged
+    pbip/validate         {"files"?: [...]} -> diagnostics (all report/model files if omitted)
+    shutdown / exit
+
+Usage:
+    python validation_server.py [report_path] [--model path.SemanticModel]
+    python validation_server.py --check file1.json [file2.json ...]
+
+Options:
+    --model: Path to the .SemanticModel folder (default: sibling of the report)
+    --check: One-shot mode: print diagnostics for the given files and exit
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+# Shared tooling lives next to this folder
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+for _tool_dir in ("analyzers", "fixers", "validators"):
+    if str(SCRIPTS_DIR / _tool_dir) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR / _tool_dir))
+
+from master_pbip_validator import IssueSeverity, PBIPValidator  # noqa: E402
+from pbir_report import FieldRef, extract_visual_field_refs  # noqa: E402
+from pbir_schema import SCHEMA_COMPILE_ERRORS, get_schema_store, schema_usage  # noqa: E402
+from tmdl_model import SemanticModel, load_semantic_model, parse_tmdl_file  # noqa: E402
+
+DEFAULT_REPORT_PATH = Path(__file__).resolve().parents[2] / "press-room-dashboard.Report"
+
+SOURCE = "pbip-validator"
+
+# LSP DiagnosticSeverity
+SEVERITY = {IssueSeverity.ERROR: 1, IssueSeverity.WARNING: 2, IssueSeverity.INFO: 3}
+
+JSON_RPC_PARSE_ERROR = -32700
+JSON_RPC_METHOD_NOT_FOUND = -32601
+JSON_RPC_INTERNAL_ERROR = -32603
+
+
+def diagnostic(message: str, severity: int, code: str, line: int = 0, column: int = 0) -> Dict[str, Any]:
+    """LSP Diagnostic (0-based line/character)."""
+    return {
+        "range": {"start": {"line": line, "character": column}, "end": {"line": line, "character": column}},
+        "severity": severity,
+        "code": code,
+        "source": SOURCE,
+        "message": message,
+    }
+
+
+def path_from_uri(value: str) -> Path:
+    if value.startswith("file:"):
+        parsed = urlparse(value)
+        path = unquote(parsed.path)
+        if len(path) > 2 and path[0] == "/" and path[2] == ":":
+            path = path[1:]    # file:///C:/... on Windows
+        return Path(path)
+    return Path(value)
+
+
+def _line_of(text: str, needle: str) -> int:
+    """0-based line of the first occurrence of needle (0 when absent)."""
+    index = text.find(needle)
+    return text.count("\n", 0, index) if index >= 0 else 0
+
+
+# ============================================================================
+# WARM STATE
+# ============================================================================
+
+class ValidationSession:
+    """Parsed model, field index and per-visual field references, kept warm between requests."""
+
+    def __init__(self, report_path: Path, model_path: Optional[Path] = None):
+        self.report_path = Path(report_path).resolve()
+        self.pages_dir = self.report_path / "definition" / "pages"
+        if model_path is None:
+            model_path = next((p for p in sorted(self.report_path.parent.iterdir())
+                               if p.is_dir() and p.name.endswith(".SemanticModel")), None)
+        self.model_dir: Optional[Path] = None
+        if model_path is not None:
+            model_path = Path(model_path).resolve()
+            self.model_dir = model_path / "definition" if (model_path / "definition").is_dir() else model_path
+
+        self.model: Optional[SemanticModel] = None
+        self.columns: Dict[str, Set[str]] = {}
+        self.measures: Dict[str, Set[str]] = {}
+        self.measure_tables: Dict[str, str] = {}
+        self.visual_refs: Dict[Path, List[FieldRef]] = {}
+        self.visual_text: Dict[Path, str] = {}
+        self.ref_diagnostics: Dict[Path, List[Dict[str, Any]]] = {}
+        self.load_ms = 0.0
+
+    # -- loading -------------------------------------------------------------
+
+    def load(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        if self.model_dir is not None and self.model_dir.is_dir():
+            self.model = load_semantic_model(self.model_dir)
+            self._rebuild_index()
+        for path in sorted(self.pages_dir.glob("*/visuals/*/visual.json")):
+            try:
+                self._load_visual(path.resolve())
+            except (OSError, ValueError):
+                continue  # Reported when the file is checked
+        for path in self.visual_refs:
+            self.ref_diagnostics[path] = self._check_refs(path)
+        # Compile every vendored $schema in use now, so the first save does not pay for it
+        roots = [self.report_path] + ([self.model_dir.parent] if self.model_dir else [])
+        schemas = 0
+        for url in schema_usage(roots):
+            try:
+                schemas += get_schema_store().validator_for(url) is not None
+            except SCHEMA_COMPILE_ERRORS:
+                continue  # Reported by the schema check of the files that use it
+        self.load_ms = (time.perf_counter() - start) * 1000
+        return {
+            "reportPath": str(self.report_path),
+            "modelPath": str(self.model_dir) if self.model_dir else None,
+            "tables": len(self.columns),
+            "measures": len(self.measure_tables),
+            "visuals": len(self.visual_refs),
+            "schemas": schemas,
+            "loadMs": round(self.load_ms, 1),
+        }
+
+    def _rebuild_index(self) -> None:
+        """Rebuild tables and the field index from the parsed files."""
+        model = self.model
+        model.tables.clear()
+        model.relationships.clear()
+        model.model = None
+        for nodes in model.files.values():
+            for node in nodes:
+                if node.kind == "table":
+                    model.tables[node.name] = node
+                elif node.kind == "relationship":
+                    model.relationships.append(node)
+                elif node.kind == "model":
+                    model.model = node
+        self.columns = {name: {c.name for c in t.columns} for name, t in model.tables.items()}
+        self.measures = {name: {m.name for m in t.measures} for name, t in model.tables.items()}
+        self.measure_tables = {m: table for table, names in self.measures.items() for m in names}
+
+    def _load_visual(self, path: Path) -> None:
+        """(Re)read one visual's text and field references; raises when it does not parse."""
+        try:
+            text = path.read_text(encoding="utf-8-sig")
+            data = json.loads(text)
+        except (OSError, ValueError):
+            self.visual_refs.pop(path, None)
+            self.visual_text.pop(path, None)
+            raise
+        self.visual_text[path] = text
+        self.visual_refs[path] = extract_visual_field_refs(data) if isinstance(data, dict) else []
+
+    # -- checks --------------------------------------------------------------
+
+    def _check_refs(self, path: Path) -> List[Dict[str, Any]]:
+        """Field references of one visual against the warm field index."""
+        if self.model is None:
+            return []
+        text = self.visual_text.get(path, "")
+        result = []
+        seen: Set[Tuple[str, str, str]] = set()
+        for ref in self.visual_refs.get(path, []):
+            key = (ref.kind, ref.entity, ref.prop)
+            if key in seen:
+                continue
+            seen.add(key)
+            line = _line_of(text, json.dumps(ref.prop, ensure_ascii=False))
+            where = f" ({ref.source}{' ' + ref.bucket if ref.bucket else ''})"
+            if ref.entity not in self.columns:
+                result.append(diagnostic(f"Table '{ref.entity}' not found in the semantic model{where}",
+                                         1, "missing_table", line))
+            elif ref.kind == "Measure":
+                if ref.prop not in self.measure_tables:
+                    result.append(diagnostic(f"Measure '{ref.entity}[{ref.prop}]' not found in the semantic model"
+                                             f"{where}", 1, "missing_measure", line))
+                elif self.measure_tables[ref.prop] != ref.entity:
+                    result.append(diagnostic(
+                        f"Measure '{ref.prop}' is defined on '{self.measure_tables[ref.prop]}', "
+                        f"not '{ref.entity}'{where}", 1, "measure_wrong_table", line))
+            elif ref.prop not in self.columns[ref.entity]:
+                if ref.prop in self.measures.get(ref.entity, set()):
+                    result.append(diagnostic(f"'{ref.entity}[{ref.prop}]' is a measure but is bound as a column"
+                                             f"{where}", 1, "measure_bound_as_column", line))
+                else:
+                    result.append(diagnostic(f"Column '{ref.entity}[{ref.prop}]' not found in the semantic model"
+                                             f"{where}", 1, "missing_column", line))
+        return result
+
+    def _run_validator(self, files: List[Path]) -> Tuple[List, List[Path]]:
+        """Scoped master validator run; returns (issues, candidate files the issues may belong to)."""
+        validator = PBIPValidator(self.report_path, auto_fix=False, only_files=files)
+        if self.model is not None and self.model_dir is not None:
+            validator.semantic_model_dir = self.model_dir
+            validator.semantic_model = self.model
+        with contextlib.redirect_stdout(io.StringIO()):   # stdout is the protocol channel
+            issues = validator.validate_all().issues
+        candidates = list(files)
+        for f in files:
+            for parent in f.parents:
+                if parent.parent == self.pages_dir:
+                    candidates.append(parent / "page.json")
+                    break
+        return issues, candidates
+
+    def _issue_file(self, file_path: str, candidates: List[Path]) -> Path:
+        rel = file_path.replace("\\", "/").strip("/")
+        for c in candidates:
+            posix = c.as_posix()
+            if posix.endswith("/" + rel) or posix.endswith("/" + rel + "/visual.json"):
+                return c
+        for base in (self.report_path, self.report_path.parent, self.pages_dir,
+                     self.model_dir.parent if self.model_dir else None):
+            if base is not None and (base / rel).is_file():
+                return (base / rel).resolve()
+        return self.report_path
+
+    # -- requests ------------------------------------------------------------
+
+    def files_changed(self, files: List[Path]) -> Dict[Path, List[Dict[str, Any]]]:
+        """Refresh warm state for the changed files and return diagnostics per affected file."""
+        files = [Path(f).resolve() for f in files]
+        diagnostics: Dict[Path, List[Dict[str, Any]]] = {f: [] for f in files}
+        model_changed = False
+        for f in files:
+            if f.suffix == ".tmdl" and self.model is not None and self.model_dir in f.parents:
+                if f.parent.name == "cultures":
+                    continue  # Culture files are not part of the field index
+                if f.exists():
+                    self.model.files[f] = parse_tmdl_file(f)
+                else:
+                    self.model.files.pop(f, None)
+                model_changed = True
+            elif f.name == "visual.json" and self.pages_dir in f.parents:
+                if not f.exists():
+                    self.visual_refs.pop(f, None)
+                    self.visual_text.pop(f, None)
+                    self.ref_diagnostics.pop(f, None)
+                    continue
+                try:
+                    self._load_visual(f)
+                except (OSError, ValueError) as e:
+                    line, column = (e.lineno - 1, e.colno - 1) if isinstance(e, json.JSONDecodeError) else (0, 0)
+                    diagnostics[f].append(diagnostic(f"Invalid JSON: {e}", 1, "invalid_json", line, column))
+                    self.ref_diagnostics.pop(f, None)
+                    continue
+                self.ref_diagnostics[f] = self._check_refs(f)
+                diagnostics[f].extend(self.ref_diagnostics[f])
+            elif f.suffix == ".json" and f.exists():
+                try:
+                    json.loads(f.read_text(encoding="utf-8-sig"))
+                except ValueError as e:
+                    line, column = (e.lineno - 1, e.colno - 1) if isinstance(e, json.JSONDecodeError) else (0, 0)
+                    diagnostics[f].append(diagnostic(f"Invalid JSON: {e}", 1, "invalid_json", line, column))
+
+        if model_changed:
+            self._rebuild_index()
+            for path in list(self.visual_refs):
+                new = self._check_refs(path)
+                if new != self.ref_diagnostics.get(path) or path in diagnostics:
+                    diagnostics.setdefault(path, []).extend(new)
+                self.ref_diagnostics[path] = new
+
+        issues, candidates = self._run_validator([f for f in files if f.exists()])
+        for issue in issues:
+            target = self._issue_file(issue.file_path, candidates)
+            line = (issue.line_number - 1) if issue.line_number else 0
+            diagnostics.setdefault(target, []).append(
+                diagnostic(issue.message, SEVERITY[issue.severity], issue.issue_type, line))
+        return diagnostics
+
+    def all_files(self) -> List[Path]:
+        files = sorted(p.resolve() for p in (self.report_path / "definition").rglob("*.json"))
+        if self.model_dir is not None:
+            files += sorted(p.resolve() for p in self.model_dir.rglob("*.tmdl") if p.parent.name != "cultures")
+        return files
+
+
+# ============================================================================
+# JSON-RPC
+# ============================================================================
+
+class JsonRpcServer:
+    """Minimal JSON-RPC 2.0 endpoint over binary stdio."""
+
+    def __init__(self, session: ValidationSession, stdin: BinaryIO, stdout: BinaryIO):
+        self.session = session
+        self.stdin = stdin
+        self.stdout = stdout
+        self.framed = False
+        self.running = True
+
+    def read_message(self) -> Optional[Dict[str, Any]]:
+        while True:
+            line = self.stdin.readline()
+            if not line:
+                return None
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.lower().startswith(b"content-length:"):
+                self.framed = True
+                length = int(stripped.split(b":", 1)[1])
+                while self.stdin.readline().strip():
+                    pass    # Other headers end with an empty line
+                return json.loads(self.stdin.read(length).decode("utf-8"))
+            self.framed = False
+            return json.loads(stripped.decode("utf-8"))
+
+    def send(self, message: Dict[str, Any]) -> None:
+        payload = json.dumps({"jsonrpc": "2.0", **message}, ensure_ascii=False).encode("utf-8")
+        if self.framed:
+            self.stdout.write(b"Content-Length: %d\r\n\r\n" % len(payload) + payload)
+        else:
+            self.stdout.write(payload + b"\n")
+        self.stdout.flush()
+
+    def publish(self, diagnostics: Dict[Path, List[Dict[str, Any]]]) -> None:
+        for path, items in diagnostics.items():
+            self.send({"method": "textDocument/publishDiagnostics",
+                       "params": {"uri": path.as_uri(), "diagnostics": items}})
+
+    @staticmethod
+    def changed_files(method: str, params: Dict[str, Any]) -> List[Path]:
+        if method == "workspace/didChangeWatchedFiles":
+            return [path_from_uri(c["uri"]) for c in params.get("changes", [])]
+        if method.startswith("textDocument/"):
+            return [path_from_uri(params.get("textDocument", {}).get("uri", ""))]
+        return [path_from_uri(f) for f in params.get("files", [])]
+
+    def handle(self, message: Dict[str, Any]) -> None:
+        method = message.get("method", "")
+        params = message.get("params") or {}
+        msg_id = message.get("id")
+        start = time.perf_counter()
+        try:
+            if method == "initialize":
+                if params.get("reportPath"):
+                    self.session = ValidationSession(Path(params["reportPath"]),
+                                                     Path(params["modelPath"]) if params.get("modelPath") else None)
+                result: Any = self.session.load()
+            elif method in ("pbip/fileChanged", "textDocument/didSave", "textDocument/didChange",
+                            "workspace/didChangeWatchedFiles", "pbip/validate"):
+                files = self.changed_files(method, params)
+                if method == "pbip/validate" and not files:
+                    files = self.session.all_files()
+                diagnostics = self.session.files_changed(files)
+                if msg_id is None:
+                    self.publish(diagnostics)
+                    return
+                result = {
+                    "files": [{"file": str(p), "uri": p.as_uri(), "diagnostics": d}
+                              for p, d in sorted(diagnostics.items())],
+                    "elapsedMs": round((time.perf_counter() - start) * 1000, 1),
+                }
+            elif method == "shutdown":
+                result = None
+            elif method == "exit":
+                self.running = False
+                return
+            elif method == "initialized" or method.startswith("$/"):
+                return
+            else:
+                if msg_id is not None:
+                    self.send({"id": msg_id, "error": {"code": JSON_RPC_METHOD_NOT_FOUND,
+                                                       "message": f"Unknown method: {method}"}})
+                return
+        except Exception as e:  # Keep the server alive for the next save
+            if msg_id is not None:
+                self.send({"id": msg_id, "error": {"code": JSON_RPC_INTERNAL_ERROR, "message": str(e)}})
+            else:
+                print(f"[ERROR] {method}: {e}", file=sys.stderr)
+            return
+        if msg_id is not None:
+            self.send({"id": msg_id, "result": result})
+
+    def serve(self) -> None:
+        while self.running:
+            try:
+                message = self.read_message()
+            except ValueError as e:
+                self.send({"id": None, "error": {"code": JSON_RPC_PARSE_ERROR, "message": str(e)}})
+                continue
+            if message is None:
+                break
+            self.handle(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Resident PBIP validator speaking JSON-RPC over stdio",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Start the server (editor extension spawns this)
+  python validation_server.py "C:\\path\\to\\report.Report"
+
+  # One-shot diagnostics for a file (same checks, printed as JSON)
+  python validation_server.py --check definition/pages/<page>/visuals/<visual>/visual.json
+        """
+    )
+    parser.add_argument("report_path", nargs="?", default=str(DEFAULT_REPORT_PATH),
+                        help="Path to the .Report folder")
+    parser.add_argument("--model", help="Path to the .SemanticModel folder (default: sibling of the report)")
+    parser.add_argument("--check", nargs="+", metavar="FILE", help="Print diagnostics for these files and exit")
+    args = parser.parse_args()
+
+    report_path = Path(args.report_path)
+    if not report_path.exists():
+        print(f"ERROR: Report path not found: {report_path}", file=sys.stderr)
+        sys.exit(1)
+
+    session = ValidationSession(report_path, Path(args.model) if args.model else None)
+
+    if args.check:
+        summary = session.load()
+        start = time.perf_counter()
+        diagnostics = session.files_changed([Path(f) for f in args.check])
+        out = {
+            "warmup": summary,
+            "elapsedMs": round((time.perf_counter() - start) * 1000, 1),
+            "files": [{"file": str(p), "diagnostics": d} for p, d in sorted(diagnostics.items())],
+        }
+        print(json.dumps(out, indent=2, ensure_ascii=False))
+        sys.exit(1 if any(d["severity"] == 1 for f in out["files"] for d in f["diagnostics"]) else 0)
+
+    session.load()
+    print(f"[INFO] Validation server ready ({session.load_ms:.0f} ms warm-up)", file=sys.stderr)
+    JsonRpcServer(session, sys.stdin.buffer, sys.stdout.buffer).serve()
+
+
+if __name__ == "__main__":
+    main()